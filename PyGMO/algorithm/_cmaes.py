@@ -269,9 +269,7 @@ class py_cmaes(base):
                             random() * (ub[row] - lb[row])
 
             # insert in population
-            for i in range(lam):
-                #idx = pop.get_worst_idx()
-                pop.set_x(i, [newpop[j, i] for j in range(N)])
+            pop.set_x_batch(list(range(lam)), [[newpop[j, i] for j in range(N)] for i in range(lam)])
             counteval += lam
 
             # 2 - We extract the elite from this generation
@@ -157,8 +157,7 @@ class py_cross_entropy(base):
                             random() * (ub[col] - lb[col])
 
             # 6 - And perform reinsertion
-            for i in range(np):
-                pop.set_x(i, newpop[i])
+            pop.set_x_batch(list(range(np)), [newpop[i] for i in range(np)])
 
             # 7 - We print to screen if necessary
             if self.__screen_output:
@@ -77,10 +77,7 @@ struct meta_algorithm_pickle_suite : boost::python::pickle_suite
 	}
 	static boost::python::tuple getstate(const Algorithm &algo)
 	{
-		std::stringstream ss;
-		boost::archive::text_oarchive oa(ss);
-		oa << algo;
-		return boost::python::make_tuple(ss.str(),algo.get_algorithm());
+		return boost::python::make_tuple(py_archive_save(algo),algo.get_algorithm());
 	}
 	static void setstate(Algorithm &algo, boost::python::tuple state)
 	{
@@ -89,10 +86,7 @@ struct meta_algorithm_pickle_suite : boost::python::pickle_suite
 			PyErr_SetObject(PyExc_ValueError,("expected 2-item tuple in call to __setstate__; got %s" % state).ptr());
 			throw_error_already_set();
 		}
-		const std::string str = extract<std::string>(state[0]);
-		std::stringstream ss(str);
-		boost::archive::text_iarchive ia(ss);
-		ia >> algo;
+		py_archive_load(algo,extract<std::string>(state[0]));
 		const algorithm::base_ptr internal_algo = boost::python::extract<algorithm::base_ptr>(state[1]);
 		algo.set_algorithm(*internal_algo);
 	}
@@ -3,20 +3,32 @@ from PyGMO.core._core import *
 import threading as _threading
 import signal as _signal
 import os as _os
+import weakref as _weakref
 
 __doc__ = 'PyGMO core module.'
 __all__ = [
     'archipelago',
     'base_island',
     'champion',
+    'checkpointer',
     'distribution_type',
+    'executor_island',
+    'get_serialization_mode',
     'individual',
     'ipy_island',
     'island',
     'local_island',
+    'metrics_exporter',
     'migration_direction',
+    'migration_history',
+    'migration_history_policy',
+    'mp_island',
+    'nds_type',
+    'packed_population',
     'population',
-    'py_island']
+    'py_island',
+    'serialization_mode',
+    'set_serialization_mode']
 
 _orig_signal = _signal.getsignal(_signal.SIGINT)
 _main_pid = _os.getpid()
@@ -35,6 +47,70 @@ _signal.signal(_signal.SIGINT, _sigint_handler)
 # Global lock used when starting processes.
 _process_lock = _threading.Lock()
 
+# Archive format used by the C++ pickle suites. It is read from C++ every time
+# an exposed object is pickled, so it is shared by all the extension modules.
+# The serialization_mode context manager overrides it for the current thread only.
+_serialization_modes = ['text', 'binary']
+_serialization_mode = 'text'
+_serialization_mode_local = _threading.local()
+
+
+def _check_serialization_mode(mode):
+    if mode not in _serialization_modes:
+        raise ValueError(
+            "The serialization mode must be one of %s, but '%s' was given instead." %
+            (_serialization_modes, mode))
+
+
+def set_serialization_mode(mode):
+    """Select the default archive format used when pickling C++ objects.
+
+    *mode* can be 'text' (the default, portable across platforms) or 'binary'
+    (more compact and faster, but valid only among machines with the same
+    architecture). Objects pickled in either format can always be loaded,
+    regardless of the current mode.
+
+    The default is global to the process: it applies to problems, algorithms,
+    populations, islands and archipelagos alike, in all the threads that are
+    not inside a serialization_mode block.
+    """
+    global _serialization_mode
+    _check_serialization_mode(mode)
+    _serialization_mode = mode
+
+
+def get_serialization_mode():
+    """Return the archive format currently used by this thread when pickling C++ objects."""
+    return getattr(_serialization_mode_local, 'mode', None) or _serialization_mode
+
+
+class serialization_mode(object):
+
+    """Context manager selecting the archive format for the enclosed pickling calls.
+
+    Example::
+
+            with serialization_mode('binary'):
+                    s = pickle.dumps(archi)
+
+    The mode applies only to the calling thread, and the previous mode is
+    restored on exit. Other threads keep using their own mode or the default
+    set with set_serialization_mode().
+    """
+
+    def __init__(self, mode):
+        _check_serialization_mode(mode)
+        self.__mode = mode
+
+    def __enter__(self):
+        self.__previous = getattr(_serialization_mode_local, 'mode', None)
+        _serialization_mode_local.mode = self.__mode
+        return self
+
+    def __exit__(self, *args):
+        _serialization_mode_local.mode = self.__previous
+        return False
+
 # Raw C++ base island class.
 _base_island = _core._base_island
 
@@ -137,16 +213,29 @@ local_island.__original_init__ = local_island.__init__
 local_island.__init__ = _generic_island_ctor
 
 # This is the function that will be called by the separate process
-# spawned from py_island.
+# spawned from py_island. If a shared memory buffer is provided, the population
+# is read from it and written back into it, and only a small control message,
+# carrying the evolved problem (evaluation counters, best known vectors),
+# travels through the queue.
 
 
-def _process_target(q, a, p):
+def _process_target(q, a, p, shm=None):
     try:
+        if shm is not None:
+            pop = population(p)
+            pop._buffer_load(shm)
+            p = pop
         tmp = a.evolve(p)
-        q.put(tmp)
+        if shm is not None and tmp._buffer_dump(shm):
+            q.put((_SHM_DONE, tmp.problem))
+        else:
+            q.put(tmp)
     except BaseException as e:
         q.put(e)
 
+# Control message signalling that the evolved population is in the shared memory buffer.
+_SHM_DONE = '__py_island_shm_done__'
+
 
 class py_island(base_island):
 
@@ -155,26 +244,42 @@ class py_island(base_island):
     This island will launch evolutions using the multiprocessing module, available since Python 2.6.
     Each evolution is transparently dispatched to a Python interpreter in a separate process.
 
+    Decision, fitness and constraint vectors are exchanged with the process through a shared memory
+    buffer. Set the attribute *use_shared_memory* to False to transfer instead the pickled population
+    through the queue.
+
     """
     __init__ = _generic_island_ctor
 
+    use_shared_memory = True
+
     def _perform_evolution(self, algo, pop):
         try:
             import multiprocessing as mp
             q = mp.Queue()
+            if self.use_shared_memory:
+                shm = mp.RawArray('d', pop._buffer_size(len(pop)))
+                pop._buffer_dump(shm)
+                args = (q, algo, pop.problem, shm)
+            else:
+                args = (q, algo, pop)
             # Apparently creating/starting processes is _not_ thread safe:
             # http://bugs.python.org/issue1731717
             # http://stackoverflow.com/questions/1359795/error-while-using-multiprocessing-module-in-a-python-daemon
             # Protect with a global lock.
             with _process_lock:
                 process = mp.Process(
-                    target=_process_target, args=(q, algo, pop))
+                    target=_process_target, args=args)
                 process.start()
             retval = q.get()
             with _process_lock:
                 process.join()
             if isinstance(retval, BaseException):
                 raise retval
+            if isinstance(retval, tuple) and retval[0] == _SHM_DONE:
+                pop._buffer_load(shm)
+                pop._set_problem(retval[1])
+                return pop
             return retval
         except BaseException as e:
             print('Exception caught during evolution:')
@@ -184,6 +289,363 @@ class py_island(base_island):
     def get_name(self):
         return "Python multiprocessing island"
 
+# Sentinel sent back by a pool worker when it does not hold (or holds a stale copy of)
+# the algorithm and problem of the island requesting the evolution.
+_MP_MISSING_RESIDENTS = '__mp_island_missing_residents__'
+
+# This is the function run by each of the long-lived processes of the mp_island
+# worker pool. Algorithms and problems are kept resident in the worker, keyed by
+# island, so that only the individuals and the champion (in a buffer of doubles)
+# travel at each evolution, along with the number of evaluations performed, which
+# is added to the counters of the problem of the island.
+
+
+def _mp_digest(blob):
+    import hashlib
+    return hashlib.sha1(blob).hexdigest()
+
+
+def _mp_pop_dumps(pop):
+    buf = bytearray(8 * pop._buffer_size(len(pop)))
+    pop._buffer_dump(buf)
+    return buf
+
+
+def _mp_worker_target(in_q, out_q, max_residents):
+    import pickle
+    from collections import OrderedDict
+    residents = OrderedDict()
+    while True:
+        msg = in_q.get()
+        if msg is None:
+            break
+        key, fp, blobs, pop_state = msg
+        # The residents of the islands of a shard (key[1] is None) are shared, and keyed by fingerprint.
+        r_key = (key[0], fp) if key[1] is None else key
+        try:
+            if blobs is not None:
+                residents.pop(r_key, None)
+                residents[r_key] = (fp, pickle.loads(blobs[0]), pickle.loads(blobs[1]))
+            elif r_key not in residents or residents[r_key][0] != fp:
+                out_q.put(_MP_MISSING_RESIDENTS)
+                continue
+            # Mark as most recently used.
+            entry = residents.pop(r_key)
+            residents[r_key] = entry
+            while len(residents) > max_residents:
+                residents.popitem(last=False)
+            algo, prob = entry[1], entry[2]
+            # The population works on a copy of the resident problem, which is left untouched.
+            buf, nds_method, dom_tracking = pop_state
+            pop = population(prob)
+            pop.nds_method = nds_method
+            pop.dom_tracking = dom_tracking
+            pop._buffer_load(buf)
+            pop = algo.evolve(pop)
+            evolved = pop.problem
+            out_q.put((_mp_pop_dumps(pop), evolved.fevals - prob.fevals, evolved.cevals - prob.cevals))
+        except BaseException as e:
+            out_q.put(e)
+
+
+class _mp_worker_pool(object):
+
+    """Pool of long-lived worker processes used by :class:`mp_island`.
+
+    Each worker owns a private pair of queues. An island is bound to one worker on its
+    first evolution, so that the worker can keep its algorithm and problem resident.
+
+    """
+
+    def __init__(self, processes, max_residents):
+        import multiprocessing as mp
+        self._lock = _threading.Lock()
+        self._workers = []
+        self._next = 0
+        # Apparently creating/starting processes is _not_ thread safe, see py_island.
+        with _process_lock:
+            for i in range(processes):
+                in_q, out_q = mp.Queue(), mp.Queue()
+                p = mp.Process(target=_mp_worker_target, args=(in_q, out_q, max_residents))
+                p.daemon = True
+                p.start()
+                self._workers.append((p, in_q, out_q, _threading.Lock()))
+
+    def __len__(self):
+        return len(self._workers)
+
+    def assign(self):
+        """Return the index of the worker that will host a new island (round robin)."""
+        with self._lock:
+            retval = self._next
+            self._next = (self._next + 1) % len(self._workers)
+        return retval
+
+    def submit(self, idx, msg):
+        """Send msg to worker idx and wait for its reply."""
+        try:
+            import queue
+        except ImportError:
+            import Queue as queue
+        p, in_q, out_q, w_lock = self._workers[idx]
+        # A worker serves one request at a time: islands sharing it will queue here.
+        with w_lock:
+            in_q.put(msg)
+            while True:
+                try:
+                    return out_q.get(timeout=1.)
+                except queue.Empty:
+                    if not p.is_alive():
+                        raise RuntimeError('mp_island worker process %d died unexpectedly' % (idx,))
+
+    def shutdown(self):
+        for p, in_q, out_q, w_lock in self._workers:
+            with w_lock:
+                in_q.put(None)
+        with _process_lock:
+            for p, in_q, out_q, w_lock in self._workers:
+                p.join()
+        self._workers = []
+
+# The worker pool shared by all mp_island instances, created lazily.
+_mp_pool = None
+_mp_pool_lock = _threading.Lock()
+
+
+def _mp_get_pool():
+    global _mp_pool
+    with _mp_pool_lock:
+        if _mp_pool is None:
+            import multiprocessing as mp
+            _mp_pool = _mp_worker_pool(mp.cpu_count(), 64)
+        return _mp_pool
+
+
+def _mp_shutdown_pool():
+    global _mp_pool
+    with _mp_pool_lock:
+        if _mp_pool is not None and _os.getpid() == _main_pid:
+            _mp_pool.shutdown()
+        _mp_pool = None
+
+import atexit as _atexit
+_atexit.register(_mp_shutdown_pool)
+
+
+class mp_island(base_island):
+
+    """Python multiprocessing pool island.
+
+    Like :class:`py_island`, this island dispatches evolutions to separate Python processes, but
+    the processes belong to a pool of long-lived workers shared by all the mp_island instances
+    (by default one worker per core). Each worker keeps the algorithm and the problem of the islands
+    it serves resident in memory: at each evolution only the individuals and the champion are transferred,
+    while algorithm and problem are sent again only when they are replaced on the island.
+
+    See also :meth:`archipelago.shard`, which partitions the islands of an archipelago across the workers.
+
+    """
+    __init__ = _generic_island_ctor
+
+    @staticmethod
+    def init_pool(processes=None, max_residents=64):
+        """Start (or restart) the worker pool.
+
+        USAGE: mp_island.init_pool(processes = None, max_residents = 64)
+
+        * processes: number of worker processes (defaults to the number of cores)
+        * max_residents: maximum number of algorithm/problem pairs each worker keeps in memory
+        """
+        import multiprocessing as mp
+        global _mp_pool
+        if processes is None:
+            processes = mp.cpu_count()
+        if not isinstance(processes, int) or processes <= 0:
+            raise ValueError('the number of processes must be a strictly positive integer')
+        if not isinstance(max_residents, int) or max_residents <= 0:
+            raise ValueError('the maximum number of residents must be a strictly positive integer')
+        _mp_shutdown_pool()
+        with _mp_pool_lock:
+            _mp_pool = _mp_worker_pool(processes, max_residents)
+
+    @staticmethod
+    def shutdown_pool():
+        """Stop the worker processes. The pool will be started again by the next evolution."""
+        _mp_shutdown_pool()
+
+    @staticmethod
+    def get_pool_size():
+        """Return the number of worker processes in the pool (0 if the pool is not running)."""
+        with _mp_pool_lock:
+            return 0 if _mp_pool is None else len(_mp_pool)
+
+    def _set_algorithm(self, algo):
+        base_island.algorithm.fset(self, algo)
+        self.__dict__.pop('_mp_fp', None)
+
+    def _set_population(self, pop):
+        base_island.population.fset(self, pop)
+        self.__dict__.pop('_mp_fp', None)
+
+    # Replacing the algorithm or the population (hence the problem) invalidates the fingerprint of the residents.
+    algorithm = property(base_island.algorithm.fget, _set_algorithm)
+    population = property(base_island.population.fget, _set_population)
+
+    def _perform_evolution(self, algo, pop):
+        import pickle
+        try:
+            pool = _mp_get_pool()
+            # Fingerprint of the residents, computed when the algorithm or the problem is replaced: changes made
+            # to them by the evolutions (random number generators, evaluation counters) do not require an upload.
+            fp = self.__dict__.get('_mp_fp')
+            if fp is None:
+                fp = (_mp_digest(pickle.dumps(algo)), _mp_digest(pickle.dumps(pop.problem)))
+                self.__dict__['_mp_fp'] = fp
+            shard = self.__dict__.get('_mp_shard')
+            if shard is not None:
+                # Islands of a sharded archipelago are bound to a fixed worker, and share its
+                # residents with the other islands of the shard whose pickled algorithm and problem
+                # are identical.
+                worker = shard % len(pool)
+                key = (_os.getpid(), None)
+            else:
+                # The worker is bound to this Python object, copies of the island get their own.
+                if self.__dict__.get('_mp_owner') != id(self) or self.__dict__.get('_mp_pool_id') != id(pool):
+                    self.__dict__['_mp_owner'] = id(self)
+                    self.__dict__['_mp_pool_id'] = id(pool)
+                    self.__dict__['_mp_worker'] = pool.assign()
+                worker = self._mp_worker
+                key = (_os.getpid(), id(self))
+            pop_state = (_mp_pop_dumps(pop), pop.nds_method, pop.dom_tracking)
+            retval = pool.submit(worker, (key, fp, None, pop_state))
+            if isinstance(retval, str) and retval == _MP_MISSING_RESIDENTS:
+                blobs = (pickle.dumps(algo), pickle.dumps(pop.problem))
+                retval = pool.submit(worker, (key, fp, blobs, pop_state))
+            if isinstance(retval, BaseException):
+                raise retval
+            pop._buffer_load(retval[0])
+            pop._add_evals(retval[1], retval[2])
+            return pop
+        except BaseException as e:
+            print('Exception caught during evolution:')
+            print(e)
+            raise RuntimeError()
+
+    def get_name(self):
+        return "Python multiprocessing pool island"
+
+_archipelago_set_algorithm = archipelago.set_algorithm
+
+
+def _archipelago_set_algorithm_mp(self, n, algo):
+    """Set algorithm on island.
+
+    USAGE: archi.set_algorithm(n, algo)
+
+    * n: index of the island
+    * algo: the new algorithm
+    """
+    isl = self[n]
+    if isinstance(isl, mp_island):
+        # The island caches the fingerprint of its residents: replace the algorithm on a copy of the
+        # island, so that the fingerprint is invalidated, and put the copy back in place.
+        isl.algorithm = algo
+        self[n] = isl
+    else:
+        _archipelago_set_algorithm(self, n, algo)
+
+archipelago.set_algorithm = _archipelago_set_algorithm_mp
+
+# This is the function that will be submitted to the executor
+# in executor_island.
+
+
+def _executor_target(a, p):
+    try:
+        return a.evolve(p)
+    except BaseException as e:
+        return e
+
+# Executor used by the executor_island instances built without an explicit executor.
+_default_executor = None
+_default_executor_lock = _threading.Lock()
+
+
+def _get_default_executor():
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            _default_executor = ProcessPoolExecutor()
+        return _default_executor
+
+
+class _executor_ref(object):
+
+    """Reference to the executor of an executor_island.
+
+    Copies of an island share the executor of the original. Executors cannot be pickled,
+    so an unpickled island falls back to the default executor.
+    """
+
+    def __init__(self, executor=None):
+        self.executor = executor
+
+    def get(self):
+        return _get_default_executor() if self.executor is None else self.executor
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_executor_ref, ())
+
+
+class executor_island(base_island):
+
+    """Executor island.
+
+    This island dispatches evolutions to a :class:`concurrent.futures.Executor`, passed as the *executor*
+    keyword argument (a process pool, a thread pool, or any object implementing the same interface
+    such as the executors of a cluster scheduler). Many islands can share the same executor, so that
+    an archipelago with hundreds of islands runs on the executor's workers without spawning one process
+    per island. Copies of the island, including the ones made when pushing it into an archipelago,
+    share the executor of the original.
+
+    If no executor is given, a process pool with one worker per core shared by all the islands is used.
+    The executor is not pickled: an unpickled island uses the default process pool.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        executor = kwargs.pop('executor', None)
+        if executor is not None and not callable(getattr(executor, 'submit', None)):
+            raise TypeError("The executor must provide a submit() method.")
+        self._executor = _executor_ref(executor)
+        _generic_island_ctor(self, *args, **kwargs)
+
+    @property
+    def executor(self):
+        """Executor the evolutions are dispatched to."""
+        return self._executor.get()
+
+    def _perform_evolution(self, algo, pop):
+        try:
+            retval = self._executor.get().submit(_executor_target, algo, pop).result()
+            if isinstance(retval, BaseException):
+                raise retval
+            return retval
+        except BaseException as e:
+            print('Exception caught during evolution:')
+            print(e)
+            raise RuntimeError()
+
+    def get_name(self):
+        return "Executor island"
+
 # This is the function that will be called by the task client
 # in ipy_island.
 
@@ -258,6 +720,10 @@ def _get_island_list():
         from IPython.kernel.client import TaskClient, MapTask
     except ImportError:
         names = [n for n in names if n != 'ipy_island']
+    try:
+        import concurrent.futures
+    except ImportError:
+        names = [n for n in names if n != 'executor_island']
     return [core.__dict__[n] for n in names]
 
 
@@ -330,12 +796,65 @@ def _generic_archi_ctor(self, *args, **kwargs):
         if not isinstance(args[3], int):
             raise TypeError(
                 "The fourth unnamed argument must be an integer (i.e. population size)")
-        for n in range(args[2]):
-            self.push_back(island(args[0], args[1], args[3]))
+        self.push_back_islands(args[0], args[1], args[2], args[3])
 
 archipelago.__original_init__ = archipelago.__init__
 archipelago.__init__ = _generic_archi_ctor
 
+# This is the function that will be called by the worker processes
+# initialising the populations of Python problems in push_back_islands().
+
+
+def _init_population_target(args):
+    prob, n_individuals, seed = args
+    return population(prob, n_individuals, seed)
+
+
+def _archipelago_push_back_islands(self, algo, prob, n_islands, n_individuals, processes=None, **kwargs):
+    """Append islands, initialising their populations in parallel.
+
+    USAGE: archi.push_back_islands(algo, prob, n_islands, n_individuals, processes = None, s_policy = best_s_policy(), r_policy = fair_r_policy())
+
+    * algo: algorithm of the islands
+    * prob: problem of the islands
+    * n_islands: number of islands
+    * n_individuals: number of individuals in each island
+    * processes: number of threads or processes initialising the populations (see below)
+
+    Equivalent to pushing back island(algo, prob, n_individuals, ...) n_islands times, but the random individuals
+    of problems implemented in C++ are initialised and evaluated in parallel, by threads running without the GIL
+    (by default one per core, or processes). Problems calling into Python (implemented in Python, or meta-problems
+    wrapping them) are initialised serially in this process, unless processes is given: then they are initialised
+    by a pool of processes worker processes, which requires the problem to be picklable (and, on platforms starting
+    processes with spawn, the main module to be guarded by if __name__ == '__main__'). The island type is chosen
+    as in :func:`island`.
+    """
+    import multiprocessing as mp
+    if processes is not None and (not isinstance(processes, int) or processes <= 0):
+        raise ValueError('the number of processes must be a strictly positive integer')
+    if not isinstance(n_islands, int) or n_islands < 0:
+        raise ValueError('the number of islands must be a non-negative integer')
+    if not prob.is_thread_safe():
+        # The seeds are drawn here, so that the populations do not depend on the number of processes.
+        args = [(prob, n_individuals, population._get_seed()) for i in range(n_islands)]
+        if processes is not None and processes > 1 and n_islands > 1:
+            # See py_island about the lock.
+            with _process_lock:
+                pool = mp.Pool(min(processes, n_islands))
+            try:
+                pops = pool.map(_init_population_target, args)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            pops = [_init_population_target(a) for a in args]
+    else:
+        pops = archipelago._init_populations(prob, n_islands, n_individuals, mp.cpu_count() if processes is None else processes)
+    for pop in pops:
+        self.push_back(island(algo, pop, **kwargs))
+
+archipelago.push_back_islands = _archipelago_push_back_islands
+
 
 def _archipelago_draw(
         self,
@@ -437,6 +956,569 @@ def _archipelago_draw(
 archipelago.draw = _archipelago_draw
 
 
+# Threads removing the listeners of cancelled asynchronous evolutions, by archipelago.
+_archipelago_releases = _weakref.WeakKeyDictionary()
+
+
+class _archipelago_evolution(object):
+
+    """Asynchronous evolution of an archipelago, as returned by :meth:`archipelago.evolve_async`.
+
+    The object can be awaited, to wait for the end of the evolution of all the islands, or iterated
+    with ``async for``, yielding the index of each island as soon as its evolution is over. The
+    *generations* attribute holds the number of evolutions completed so far by each island.
+
+    The event loop is woken up through a pipe written by the archipelago's evolution threads, so that
+    no thread is spent waiting on the evolution. Cancelling the evolution (or a task awaiting it)
+    detaches it from the event loop and from the archipelago, without interrupting the islands.
+    """
+
+    _record_size = 8
+
+    def __init__(self, archi, n, loop):
+        from collections import deque
+        self._archi = archi
+        self._loop = loop
+        self._n_islands = len(archi)
+        self._n_done = 0
+        self._done = loop.create_future()
+        self._completed = deque()
+        self._waiters = deque()
+        self._buffer = b''
+        self._r = self._w = None
+        self.generations = [0] * self._n_islands
+        if self._n_islands == 0:
+            self._done.set_result(None)
+            return
+        self._r, self._w = _os.pipe()
+        try:
+            _os.set_blocking(self._r, False)
+            # The evolution threads must not be stalled if the loop stops reading (see the fd listener in core.cpp).
+            _os.set_blocking(self._w, False)
+            loop.add_reader(self._r, self._on_readable)
+        except BaseException:
+            _os.close(self._r)
+            _os.close(self._w)
+            raise
+        self._done.add_done_callback(self._on_done)
+        try:
+            archi._set_listener_fd(self._w)
+            archi.evolve(n)
+        except BaseException:
+            self._done.cancel()
+            raise
+
+    def _on_readable(self):
+        import struct
+        try:
+            self._buffer += _os.read(self._r, 4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        n_records = len(self._buffer) // self._record_size
+        for i in range(n_records):
+            idx, flag = struct.unpack_from('=II', self._buffer, i * self._record_size)
+            if flag:
+                self._island_done(idx)
+            else:
+                self.generations[idx] += 1
+        self._buffer = self._buffer[n_records * self._record_size:]
+
+    def _island_done(self, idx):
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+        if self._waiters:
+            self._waiters.popleft().set_result(idx)
+        else:
+            self._completed.append(idx)
+        self._n_done += 1
+        if self._n_done == self._n_islands and not self._done.done():
+            self._done.set_result(None)
+
+    def _on_done(self, fut):
+        self._finish(fut.cancelled())
+
+    def _finish(self, cancelled):
+        if self._r is None:
+            return
+        self._loop.remove_reader(self._r)
+        _os.close(self._r)
+        self._r = None
+        if cancelled:
+            # The islands may still be evolving: with the reading end closed their notifications fail, and the
+            # listener is removed by a helper thread once they are done, so that the event loop is not blocked.
+            import threading
+            t = threading.Thread(target=self._release_writer)
+            t.daemon = True
+            _archipelago_releases[self._archi] = t
+            t.start()
+        else:
+            # All the evolution threads are exiting, so the join() implied here does not block.
+            self._release_writer()
+        if not self._loop.is_closed():
+            for fut in self._waiters:
+                if not fut.done():
+                    fut.set_exception(StopAsyncIteration())
+        self._waiters.clear()
+
+    def _release_writer(self):
+        self._archi._set_listener_fd(-1)
+        _os.close(self._w)
+
+    def cancel(self):
+        """Stop following the evolution and release the event loop resources.
+
+        The evolution of the islands is not interrupted: use archipelago.join() to wait for it.
+        Pending ``async for`` iterations stop, and awaiting the object raises CancelledError.
+        """
+        if self._loop.is_closed():
+            # The done callbacks cannot be scheduled on a closed loop, hence the cleanup runs here.
+            self._done.remove_done_callback(self._on_done)
+            self._finish(True)
+        self._done.cancel()
+
+    def done(self):
+        """Return True if the evolution of all the islands is over."""
+        return self._done.done()
+
+    def __await__(self):
+        return self._done.__await__()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        fut = self._loop.create_future()
+        if self._completed:
+            fut.set_result(self._completed.popleft())
+        elif self._done.done():
+            fut.set_exception(StopAsyncIteration())
+        else:
+            self._waiters.append(fut)
+        return fut
+
+
+def _archipelago_evolve_async(self, n=1, loop=None):
+    """Evolve archipelago *n* times without blocking the asyncio event loop.
+
+    USAGE: await archi.evolve_async(n = 1)
+
+    The returned object can also be iterated with ``async for`` to get the index of each island
+    as soon as its evolution is over::
+
+            async for idx in archi.evolve_async(10):
+                    print('island %d done' % idx)
+
+    * n: number of evolutions of each island
+    * loop: event loop (defaults to the running event loop)
+
+    The event loop must support add_reader() (i.e., it must be a selector-based loop). A RuntimeError
+    is raised if the archipelago is already evolving.
+    """
+    import asyncio
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    if self.busy():
+        raise RuntimeError('the archipelago is already evolving')
+    # Wait for the listener of a cancelled evolution to be removed (quick, as the archipelago is not busy).
+    release = _archipelago_releases.pop(self, None)
+    if release is not None:
+        release.join()
+    return _archipelago_evolution(self, n, loop)
+
+archipelago.evolve_async = _archipelago_evolve_async
+
+
+# Version of the checkpoint format.
+_checkpoint_version = 1
+_checkpoint_manifest = 'manifest.json'
+
+
+def _checkpoint_read_manifest(path):
+    import json
+    with open(_os.path.join(path, _checkpoint_manifest), 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != _checkpoint_version:
+        raise ValueError('unsupported checkpoint version in %s' % path)
+    return manifest
+
+
+class checkpointer(object):
+
+    """Incremental on-disk checkpoints of an archipelago.
+
+    A checkpoint is a directory containing one chunk file per island (population, algorithm
+    with its internal state and rngs, migration policies), one chunk with the rest of the archipelago
+    (topology, migration attributes, pending migrants and rngs) and a manifest listing the chunks.
+    Each checkpoint rewrites only the chunks of the islands modified since the previous one, and
+    the manifest is replaced atomically, so that an interrupted checkpoint leaves the previous one valid.
+
+    Chunks are serialized in memory when :meth:`checkpoint` is called, and written to disk in a
+    background thread, overlapping with the next evolution of the archipelago. A checkpoint can
+    be loaded with :meth:`archipelago.restore`.
+
+    USAGE: cp = checkpointer(archi, path, background = True)
+
+    * archi: the archipelago
+    * path: checkpoint directory (created if it does not exist)
+    * background: write the chunks in a background thread
+    """
+
+    def __init__(self, archi, path, background=True):
+        if not isinstance(archi, archipelago):
+            raise TypeError('the first argument must be an archipelago')
+        if not _os.path.isdir(path):
+            _os.makedirs(path)
+        self._archi = archi
+        self._path = path
+        self._background = background
+        # Island versions and chunk files written by the previous checkpoint.
+        self._versions = {}
+        self._files = {}
+        self._seq = 0
+        self._thread = None
+        self._error = None
+        # Do not reuse the chunk names of an existing checkpoint.
+        try:
+            self._seq = _checkpoint_read_manifest(path)['seq']
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+    def checkpoint(self):
+        """Take a checkpoint.
+
+        Waits for the end of the ongoing evolution and of the previous checkpoint, then serializes
+        the modified islands and the archipelago state. The chunks are written in the background
+        if the checkpointer was built with *background* = True.
+        """
+        import pickle
+        self.wait()
+        archi = self._archi
+        archi.join()
+        versions = archi.get_island_versions()
+        self._seq += 1
+        chunks = []
+        with serialization_mode('binary'):
+            for i, v in enumerate(versions):
+                if self._versions.get(i) != v:
+                    name = 'island-%05d.%d.chunk' % (i, self._seq)
+                    chunks.append((name, pickle.dumps(archi[i], pickle.HIGHEST_PROTOCOL)))
+                    self._files[i] = name
+                    self._versions[i] = v
+            state = 'state.%d.chunk' % self._seq
+            chunks.append((state, archi._state_dumps()))
+        manifest = {
+            'version': _checkpoint_version,
+            'seq': self._seq,
+            'state': state,
+            'islands': [self._files[i] for i in range(len(versions))]}
+        if self._background:
+            self._thread = _threading.Thread(target=self._write, args=(chunks, manifest))
+            self._thread.start()
+        else:
+            self._write(chunks, manifest)
+            self.wait()
+
+    def _write(self, chunks, manifest):
+        import json
+        try:
+            for name, data in chunks:
+                with open(_os.path.join(self._path, name), 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    _os.fsync(f.fileno())
+            tmp = _os.path.join(self._path, _checkpoint_manifest + '.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(manifest, f)
+                f.flush()
+                _os.fsync(f.fileno())
+            getattr(_os, 'replace', _os.rename)(tmp, _os.path.join(self._path, _checkpoint_manifest))
+            # Remove the chunks which are not referenced anymore.
+            current = set(manifest['islands'] + [manifest['state']])
+            for name in _os.listdir(self._path):
+                if name.endswith('.chunk') and name not in current:
+                    _os.remove(_os.path.join(self._path, name))
+        except BaseException as e:
+            self._error = e
+
+    def wait(self):
+        """Wait for the pending checkpoint to be written, re-raising any error occurred while writing it."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            e, self._error = self._error, None
+            # The next checkpoint will rewrite everything.
+            self._versions = {}
+            self._files = {}
+            raise e
+
+    def evolve(self, n_rounds, n=1):
+        """Evolve the archipelago in rounds, taking a checkpoint after each round.
+
+        USAGE: cp.evolve(n_rounds, n = 1)
+
+        * n_rounds: number of rounds
+        * n: number of evolutions of each island in a round
+
+        Each checkpoint is written while the next round evolves. The method returns when the
+        last checkpoint is on disk.
+        """
+        for r in range(n_rounds):
+            self._archi.evolve(n)
+            self.checkpoint()
+        self.wait()
+
+
+def _archipelago_restore(path):
+    """Restore an archipelago from a checkpoint written by :class:`checkpointer`.
+
+    USAGE: archi = archipelago.restore(path)
+
+    The islands, the topology, the migration attributes, the pending migrants and the rngs
+    are restored exactly as they were when the checkpoint was taken.
+    """
+    import pickle
+    manifest = _checkpoint_read_manifest(path)
+    archi = archipelago()
+    for name in manifest['islands']:
+        with open(_os.path.join(path, name), 'rb') as f:
+            archi.push_back(pickle.load(f))
+    with open(_os.path.join(path, manifest['state']), 'rb') as f:
+        archi._state_loads(f.read())
+    return archi
+
+archipelago.restore = staticmethod(_archipelago_restore)
+
+
+def _archipelago_set_termination(self, target=None, stall_rounds=0, max_fevals=0, max_time=0):
+    """Set the criteria stopping the evolution of the archipelago.
+
+    USAGE: archi.set_termination(target = None, stall_rounds = 0, max_fevals = 0, max_time = 0)
+
+    * target: fitness vector, stop when the champion of an island is equal to or better than it
+    * stall_rounds: stop when each island has completed this number of rounds since the global champion last improved
+    * max_fevals: stop when the islands have performed in total this number of function evaluations
+    * max_time: stop when this number of milliseconds has elapsed
+
+    The criteria are checked by each island at the end of each of its evolution rounds, and apply to each call to
+    :meth:`archipelago.evolve`, :meth:`archipelago.evolve_batch` and :meth:`archipelago.evolve_t`. When one of them
+    is met, the islands stop at the end of their current round instead of performing all the requested evolutions,
+    and :attr:`archipelago.termination_reason` describes the criterion. The criteria left to their default value
+    are disabled, so that calling the method without arguments removes all the criteria.
+    """
+    if target is None:
+        target = []
+    self._set_termination(list(target), stall_rounds, max_fevals, float(max_time))
+
+archipelago.set_termination = _archipelago_set_termination
+
+
+def _archipelago_set_pool_size(self, size=None):
+    """Evolve the islands on a bounded pool of worker threads.
+
+    USAGE: archi.set_pool_size(size = None)
+
+    * size: number of worker threads, None for the number of hardware threads, 0 for one thread per island (the default mode)
+
+    In pooled mode the evolutions requested by :meth:`archipelago.evolve`, :meth:`archipelago.evolve_batch` and
+    :meth:`archipelago.evolve_t` are queued and performed one round at a time by the workers, so that archipelagos
+    with many more islands than cores do not spawn one thread per island. Migration works as in the default mode,
+    but the islands do not wait for each other before starting. Waits for the end of the ongoing evolution.
+    """
+    if size is None:
+        size = archipelago.get_default_pool_size()
+    self._set_pool_size(size)
+
+archipelago.set_pool_size = _archipelago_set_pool_size
+
+
+def _archipelago_shard(self, processes=None):
+    """Partition the islands across a fixed set of worker processes.
+
+    USAGE: archi.shard(processes = None)
+
+    * processes: number of worker processes (defaults to the number of cores)
+
+    Replaces each island with a :class:`mp_island` holding the same algorithm, population and migration
+    policies, and binds island i to worker i % processes. Each worker keeps the algorithms and problems of
+    its shard resident, sharing a single copy among the islands whose pickled algorithm and problem are
+    identical, so that problems implemented in Python are evaluated in parallel without contending for
+    the GIL of the parent process. Migration keeps being routed by
+    the archipelago in the parent process. The archipelago is switched to pooled mode with one thread per
+    worker (see :meth:`archipelago.set_pool_size`).
+
+    NOTE: the worker pool is shared by all the :class:`mp_island` instances, and it is restarted if its size
+    differs from processes.
+    """
+    import multiprocessing as mp
+    if processes is None:
+        processes = mp.cpu_count()
+    if not isinstance(processes, int) or processes <= 0:
+        raise ValueError('the number of processes must be a strictly positive integer')
+    self.join()
+    if mp_island.get_pool_size() != processes:
+        mp_island.init_pool(processes)
+    for i in range(len(self)):
+        isl = self[i]
+        shard = mp_island(isl.algorithm, isl.population, s_policy=isl.s_policy, r_policy=isl.r_policy)
+        shard._mp_shard = i % processes
+        self[i] = shard
+    self.set_pool_size(processes)
+
+archipelago.shard = _archipelago_shard
+
+
+def _archipelago_set_migr_history_capacity(self, capacity, policy=migration_history_policy.overwrite):
+    """Bound the migration history.
+
+    USAGE: archi.set_migr_history_capacity(capacity, policy = migration_history_policy.overwrite)
+
+    * capacity: maximum number of migration events stored
+    * policy: when the history is full, migration_history_policy.overwrite replaces the oldest events,
+      while migration_history_policy.decimate discards every other event and halves the recording rate
+
+    Waits for the end of the ongoing evolution and empties the history.
+    """
+    self._set_migr_history_capacity(capacity, policy)
+
+archipelago.set_migr_history_capacity = _archipelago_set_migr_history_capacity
+
+# Columns of the migration history, in the order in which they are stored.
+_migration_history_columns = ['round', 'source', 'destination', 'count']
+
+
+def _migration_history_as_numpy(self):
+    """Return the columns of the migration history as NumPy arrays.
+
+    USAGE: cols = archi.get_migr_history().as_numpy()
+
+    The result is a dictionary with the uint32 arrays 'round' (round of the destination island),
+    'source', 'destination' and 'count' (number of migrants), ordered from the oldest to the most
+    recent event. The four arrays are views on a single buffer filled directly from C++.
+    """
+    import numpy
+    data = numpy.frombuffer(self._columns(), dtype=numpy.uint32).reshape(4, len(self))
+    return dict(zip(_migration_history_columns, data))
+
+migration_history.as_numpy = _migration_history_as_numpy
+
+
+# Runtime counters of an island, in the order of the columns of the record array.
+_metrics_fields = [
+    ('rounds', 'u8'),
+    ('evolution_time', 'f8'),
+    ('fevals', 'u8'),
+    ('cevals', 'u8'),
+    ('migrants_sent', 'u8'),
+    ('migrants_received', 'u8'),
+    ('barrier_wait', 'f8'),
+    ('migration_wait', 'f8'),
+    ('improvements', 'u8'),
+    ('champion_improvement', 'f8')]
+
+
+def _archipelago_metrics(self, as_array=False):
+    """Snapshot of the runtime counters of the islands.
+
+    USAGE: archi.metrics(as_array = False)
+
+    * as_array: return a NumPy record array instead of a list of dictionaries
+
+    One entry is returned for each island, with the following counters (times in milliseconds):
+
+    * rounds: number of completed evolution rounds
+    * evolution_time: wall time spent in the algorithm
+    * fevals, cevals: objective function and constraints evaluations performed
+    * migrants_sent, migrants_received: individuals accepted by other islands and from other islands
+    * barrier_wait: time spent waiting for the other islands at the start of the evolution
+    * migration_wait: time spent waiting for the migration locks
+    * improvements: number of rounds that improved the champion
+    * champion_improvement: total decrease of the first objective of the champion
+
+    The counters accumulate until :meth:`archipelago.reset_metrics` is called. The snapshot does not wait
+    for the evolution to end, and it can be taken at any time.
+    """
+    metrics = self._get_metrics()
+    if not as_array:
+        return metrics
+    import numpy
+    return numpy.rec.fromrecords([tuple(m[name] for name, _ in _metrics_fields) for m in metrics], dtype=_metrics_fields)
+
+archipelago.metrics = _archipelago_metrics
+
+
+class metrics_exporter(object):
+
+    """Periodic export of the runtime counters of an archipelago to a file.
+
+    Every *interval* seconds a background thread appends to the file a JSON line with the
+    wall time of the snapshot and the counters of each island, as returned by :meth:`archipelago.metrics`::
+
+            {"time": 1418134022.5, "islands": [{"rounds": 10, "fevals": 2000, ...}, ...]}
+
+    USAGE: exporter = metrics_exporter(archi, path, interval = 1.0)
+
+    * archi: the archipelago
+    * path: file to which the lines are appended
+    * interval: seconds between two snapshots
+
+    The exporter can be used as a context manager, which starts it on entry and stops it on exit::
+
+            with metrics_exporter(archi, 'metrics.jsonl'):
+                    archi.evolve(100)
+                    archi.join()
+    """
+
+    def __init__(self, archi, path, interval=1.0):
+        if not isinstance(archi, archipelago):
+            raise TypeError('the first argument must be an archipelago')
+        if interval <= 0:
+            raise ValueError('the export interval must be positive')
+        self._archi = archi
+        self._path = path
+        self._interval = interval
+        self._stop = _threading.Event()
+        self._thread = None
+
+    def export(self):
+        """Append a snapshot of the counters to the file."""
+        import json
+        import time
+        line = json.dumps({'time': time.time(), 'islands': self._archi.metrics()})
+        with open(self._path, 'a') as f:
+            f.write(line + '\n')
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self.export()
+
+    def start(self):
+        """Start the periodic export."""
+        if self._thread is not None:
+            raise RuntimeError('the exporter is already running')
+        self._stop.clear()
+        self._thread = _threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the periodic export, writing a last snapshot."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.export()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+
 def _pop_ctor(self, prob_or_pop, n_individuals=0, seed=None):
     """
     Constructs a population.
@@ -471,6 +1553,59 @@ population._original_init = population.__init__
 population.__init__ = _pop_ctor
 
 
+# Fields of the individuals that can be read in bulk as NumPy arrays.
+_pop_fields = ['cur_x', 'cur_v', 'cur_c', 'cur_f', 'best_x', 'best_c', 'best_f']
+
+
+def _pop_get_array(self, field='cur_x'):
+    """
+    Returns one field of all the individuals as a 2-D NumPy array
+
+    USAGE: f = pop.get_array('cur_f')
+
+    * field: one of 'cur_x', 'cur_v', 'cur_c', 'cur_f', 'best_x', 'best_c', 'best_f'
+
+    The result has one row per individual, in the order of the population, and is
+    filled directly from C++ without building an individual for each row. The
+    array is a read-only copy: changing it does not change the population.
+    """
+    import numpy
+    if field not in _pop_fields:
+        raise ValueError('field must be one of ' + ', '.join(_pop_fields))
+    prob = self.problem
+    width = {'x': prob.dimension, 'v': prob.dimension, 'c': prob.c_dimension, 'f': prob.f_dimension}[field[-1]]
+    data = numpy.frombuffer(self._get_field(field), dtype=numpy.float64)
+    return data.reshape(len(self), width)
+
+population.get_array = _pop_get_array
+
+
+def _pop_set_array(self, field, values):
+    """
+    Sets the decision vectors or the velocities of all the individuals
+
+    USAGE: pop.set_array('cur_x', x)
+
+    * field: 'cur_x' or 'cur_v'
+    * values: array-like of shape (len(pop), problem dimension)
+
+    Setting 'cur_x' has the same effect as calling set_x() on every individual
+    (the individuals are evaluated and their bests and the champion are updated),
+    but the domination information is recomputed only once, at the end.
+    """
+    import numpy
+    if field not in ['cur_x', 'cur_v']:
+        raise ValueError("field must be either 'cur_x' or 'cur_v'")
+    values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+    if values.shape != (len(self), self.problem.dimension):
+        raise ValueError(
+            'values must have shape (%d, %d)' % (len(self), self.problem.dimension))
+    self._set_field(field, values)
+
+population.set_array = _pop_set_array
+packed_population.get_array = _pop_get_array
+
+
 def _pop_plot_pareto_fronts(
         pop,
         rgb=(
@@ -524,14 +1659,11 @@ def _pop_plot_pareto_fronts(
                   linspace(0.9 if rgb[1] else 0.1, 0.9, len(p_list)),
                   linspace(0.9 if rgb[2] else 0.1, 0.9, len(p_list))))
 
+    cur_f = pop.get_array('cur_f')
     for id_f, f in enumerate(p_list):
-        for ind in f:
-            plt.plot([pop[ind].cur_f[comp[0]]],
-                     [pop[ind].cur_f[comp[1]]],
-                     symbol,
-                     color=cl[id_f], markersize=size)
-        x = [pop[ind].cur_f[comp[0]] for ind in f]
-        y = [pop[ind].cur_f[comp[1]] for ind in f]
+        x = [cur_f[ind, comp[0]] for ind in f]
+        y = [cur_f[ind, comp[1]] for ind in f]
+        plt.plot(x, y, symbol, color=cl[id_f], markersize=size, linestyle='')
         tmp = [(a, b) for a, b in zip(x, y)]
         tmp = sorted(tmp, key=lambda k: k[0])
         plt.step([c[0] for c in tmp], [c[1]
@@ -542,11 +1674,11 @@ population.plot_pareto_fronts = _pop_plot_pareto_fronts
 
 
 def _pop_race(self, n_winners, min_trials=0, max_feval=500,
-              delta=0.05, racers_idx=[], race_best=True, screen_output=False):
+              delta=0.05, racers_idx=[], race_best=True, screen_output=False, n_threads=1):
     """
     Races individuals in a population
 
-    USAGE: pop.race(n_winners, min_trials = 0, max_feval = 500, delta = 0.05, racers_idx = [], race_best=True, screen_output=False)
+    USAGE: pop.race(n_winners, min_trials = 0, max_feval = 500, delta = 0.05, racers_idx = [], race_best=True, screen_output=False, n_threads=1)
 
     * n_winners: number of winners in the race
     * min_trials: minimum amount of evaluations before an individual can stop racing
@@ -554,8 +1686,17 @@ def _pop_race(self, n_winners, min_trials=0, max_feval=500,
     * delta: Statistical test confidence
     * racers_idx: indices of the individuals in pop to be raced
     * race_best: when True winners are the best, otherwise winners are the worst
-    * screen_output: produces some screen output at each iteration of the race
+    * screen_output: produces some screen output at each iteration of the race,
+      including the number of evaluations performed concurrently
+    * n_threads: number of threads evaluating the racers at each iteration. The result
+      of the race does not depend on it. Values greater than 1 require a problem
+      implemented in C++ (and not wrapping a problem implemented in Python, as
+      meta-problems such as noisy or robust can), and release the GIL during the race
     """
+    if not isinstance(n_threads, int) or n_threads <= 0:
+        raise ValueError('the number of threads must be a strictly positive integer')
+    if n_threads > 1 and not self._problem_reference.is_thread_safe():
+        raise ValueError('racing on several threads requires a problem implemented in C++, not wrapping a problem implemented in Python')
     arg_list = []
     arg_list.append(n_winners)
     arg_list.append(min_trials)
@@ -564,6 +1705,7 @@ def _pop_race(self, n_winners, min_trials=0, max_feval=500,
     arg_list.append(racers_idx)
     arg_list.append(race_best)
     arg_list.append(screen_output)
+    arg_list.append(n_threads)
     return self._orig_race(*arg_list)
 
 population._orig_race = population.race
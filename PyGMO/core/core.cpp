@@ -25,6 +25,11 @@
 // Workaround for http://mail.python.org/pipermail/new-bugs-announce/2011-March/010395.html
 #ifdef _WIN32
 #include <cmath>
+#include <io.h>
+#else
+#include <cerrno>
+#include <poll.h>
+#include <unistd.h>
 #endif
  
 #include <Python.h>
@@ -43,6 +48,9 @@
 #include <boost/python/overloads.hpp>
 #include <boost/utility.hpp> // For boost::noncopyable.
 #include <boost/array.hpp>
+#include <boost/cstdint.hpp>
+#include <algorithm>
+#include <cstddef>
 #include <sstream>
 #include <vector>
 
@@ -56,6 +64,7 @@
 #include "../../src/migration/best_s_policy.h"
 #include "../../src/migration/random_s_policy.h"
 #include "../../src/migration/fair_r_policy.h"
+#include "../../src/migration_history.h"
 #include "../../src/population.h"
 #include "../../src/problem/base.h"
 #include "../../src/topology/base.h"
@@ -82,8 +91,22 @@ static inline boost::python::tuple race_return_tuple(const population &pop, cons
 									double delta = 0.05,
 									const std::vector<population::size_type> &active_set = std::vector<population::size_type>(),
 									const bool race_best = true,
-									const bool screen_output = false) {
-	std::pair<std::vector<pagmo::population::size_type>, unsigned int> res = pop.race(n_final,min_trials, max_count, delta, active_set, race_best ,screen_output);
+									const bool screen_output = false,
+									const unsigned int n_threads = 1) {
+	std::pair<std::vector<pagmo::population::size_type>, unsigned int> res;
+	if (n_threads > 1 && pop.problem().is_thread_safe()) {
+		// The racers are evaluated by C++ threads: release the GIL while they run.
+		PyThreadState *thread_state = PyEval_SaveThread();
+		try {
+			res = pop.race(n_final,min_trials, max_count, delta, active_set, race_best ,screen_output, n_threads);
+		} catch (...) {
+			PyEval_RestoreThread(thread_state);
+			throw;
+		}
+		PyEval_RestoreThread(thread_state);
+	} else {
+		res = pop.race(n_final,min_trials, max_count, delta, active_set, race_best ,screen_output);
+	}
 	return boost::python::make_tuple(res.first,res.second);
 }
 
@@ -125,6 +148,195 @@ inline static void archipelago_set_algorithm(archipelago &archi, int n, const al
 	archi.set_algorithm(boost::numeric_cast<archipelago::size_type>(n),a);
 }
 
+// Initialise populations of a C++ problem in parallel, releasing the GIL during the initialisation. Problems calling
+// into Python (e.g., meta-problems wrapping a Python problem) are initialised serially, holding the GIL.
+inline static boost::python::list archipelago_init_populations(const problem::base &p, int n, int m, int n_threads)
+{
+	std::vector<population> pops;
+	if (!p.is_thread_safe()) {
+		pops = archipelago::init_populations(p,n,m,1);
+	} else {
+		PyThreadState *thread_state = PyEval_SaveThread();
+		try {
+			pops = archipelago::init_populations(p,n,m,boost::numeric_cast<unsigned int>(n_threads));
+		} catch (...) {
+			PyEval_RestoreThread(thread_state);
+			throw;
+		}
+		PyEval_RestoreThread(thread_state);
+	}
+	boost::python::list retval;
+	for (std::vector<population>::size_type i = 0; i < pops.size(); ++i) {
+		retval.append(pops[i]);
+	}
+	return retval;
+}
+
+// Archipelago listener writing (island index, flag) records of two 32-bit integers to a file descriptor. It is used to wake up
+// asyncio event loops from the evolution threads, without the need of acquiring the GIL.
+struct fd_listener
+{
+	explicit fd_listener(int fd):m_fd(fd) {}
+	void operator()(archipelago::size_type idx, bool flag) const
+	{
+		const boost::uint32_t record[2] = {boost::numeric_cast<boost::uint32_t>(idx),static_cast<boost::uint32_t>(flag)};
+		// Records are smaller than PIPE_BUF, hence they are written atomically. The pipe is non-blocking: when it is full
+		// (i.e., the event loop is not draining it) progress records are dropped, while termination records wait for room.
+		// Other errors (e.g., the reading end of the pipe has been closed) are ignored on purpose.
+#ifdef _WIN32
+		const int retval = ::_write(m_fd,record,sizeof(record));
+		(void)retval;
+#else
+		while (::write(m_fd,record,sizeof(record)) < 0) {
+			if (errno == EINTR) {
+				continue;
+			}
+			if (!flag || (errno != EAGAIN && errno != EWOULDBLOCK)) {
+				break;
+			}
+			::pollfd pfd;
+			pfd.fd = m_fd;
+			pfd.events = POLLOUT;
+			pfd.revents = 0;
+			if (::poll(&pfd,1,-1) < 0 && errno != EINTR) {
+				break;
+			}
+		}
+#endif
+	}
+	int m_fd;
+};
+
+inline static void archipelago_set_listener_fd(archipelago &archi, int fd)
+{
+	const archipelago::listener_type l = (fd < 0) ? archipelago::listener_type() : archipelago::listener_type(fd_listener(fd));
+	// Setting the listener waits for the ongoing evolutions, which may need the GIL for Python islands and problems.
+	PyThreadState *thread_state = PyEval_SaveThread();
+	try {
+		archi.set_listener(l);
+	} catch (...) {
+		PyEval_RestoreThread(thread_state);
+		throw;
+	}
+	PyEval_RestoreThread(thread_state);
+}
+
+// Serializable view of the state of an archipelago other than its islands, used for checkpointing.
+struct archipelago_state
+{
+	explicit archipelago_state(archipelago &archi):m_archi(archi) {}
+	template <class Archive>
+	void serialize(Archive &ar, const unsigned int)
+	{
+		archipelago_access::serialize_state(ar,m_archi);
+	}
+	archipelago &m_archi;
+};
+
+inline static boost::python::object archipelago_state_dumps(archipelago &archi)
+{
+	return py_archive_save(archipelago_state(archi));
+}
+
+inline static void archipelago_state_loads(archipelago &archi, const std::string &s)
+{
+	archipelago_state state(archi);
+	py_archive_load(state,s);
+}
+
+// Snapshot of the runtime counters of the islands, as a list of dictionaries.
+inline static boost::python::list archipelago_get_metrics(const archipelago &archi)
+{
+	const std::vector<archipelago::island_metrics> metrics(archi.get_metrics());
+	boost::python::list retval;
+	for (std::vector<archipelago::island_metrics>::size_type i = 0; i < metrics.size(); ++i) {
+		boost::python::dict d;
+		d["rounds"] = metrics[i].rounds;
+		d["evolution_time"] = metrics[i].evolution_time;
+		d["fevals"] = metrics[i].fevals;
+		d["cevals"] = metrics[i].cevals;
+		d["migrants_sent"] = metrics[i].migrants_sent;
+		d["migrants_received"] = metrics[i].migrants_received;
+		d["barrier_wait"] = metrics[i].barrier_wait;
+		d["migration_wait"] = metrics[i].migration_wait;
+		d["improvements"] = metrics[i].improvements;
+		d["champion_improvement"] = metrics[i].champion_improvement;
+		retval.append(d);
+	}
+	return retval;
+}
+
+// Decisions of the adaptive scheduler, as a list of dictionaries.
+inline static boost::python::list archipelago_get_allocation_log(const archipelago &archi)
+{
+	const std::vector<archipelago::allocation_event> log(archi.get_allocation_log());
+	boost::python::list retval;
+	for (std::vector<archipelago::allocation_event>::size_type i = 0; i < log.size(); ++i) {
+		boost::python::dict d;
+		d["step"] = log[i].step;
+		d["island"] = log[i].island;
+		d["score"] = log[i].score;
+		d["reward"] = log[i].reward;
+		d["cost"] = log[i].cost;
+		d["reseeded"] = log[i].reseeded;
+		retval.append(d);
+	}
+	return retval;
+}
+
+inline static void archipelago_set_termination(archipelago &archi, const fitness_vector &target, int stall_rounds, int max_fevals, double max_time)
+{
+	archipelago::termination_criteria c;
+	c.target = target;
+	c.stall_rounds = boost::numeric_cast<std::size_t>(stall_rounds);
+	c.max_fevals = boost::numeric_cast<std::size_t>(max_fevals);
+	c.max_time = max_time;
+	archi.set_termination_criteria(c);
+}
+
+inline static boost::python::dict archipelago_get_termination(const archipelago &archi)
+{
+	const archipelago::termination_criteria c(archi.get_termination_criteria());
+	boost::python::dict retval;
+	retval["target"] = c.target;
+	retval["stall_rounds"] = c.stall_rounds;
+	retval["max_fevals"] = c.max_fevals;
+	retval["max_time"] = c.max_time;
+	return retval;
+}
+
+// The columns of a migration history, copied one after the other in a bytes object.
+inline static boost::python::object migration_history_columns(const migration_history &h)
+{
+	PyObject *retval = PyBytes_FromStringAndSize(NULL,boost::numeric_cast<Py_ssize_t>(4 * h.size() * sizeof(migration_history::value_type)));
+	if (!retval) {
+		boost::python::throw_error_already_set();
+	}
+	h.copy_columns(reinterpret_cast<migration_history::value_type *>(PyBytes_AS_STRING(retval)));
+	return boost::python::object(boost::python::handle<>(retval));
+}
+
+inline static boost::python::dict migration_history_migrants_per_edge(const migration_history &h, int first, int last)
+{
+	const migration_history::edge_map_type edges(h.migrants_per_edge(boost::numeric_cast<std::size_t>(first),
+		(last < 0) ? std::size_t(-1) : boost::numeric_cast<std::size_t>(last)));
+	boost::python::dict retval;
+	for (migration_history::edge_map_type::const_iterator it = edges.begin(); it != edges.end(); ++it) {
+		retval[boost::python::make_tuple(it->first.first,it->first.second)] = it->second;
+	}
+	return retval;
+}
+
+inline static boost::python::dict migration_history_migrants_per_window(const migration_history &h, int w)
+{
+	const migration_history::window_map_type windows(h.migrants_per_window(boost::numeric_cast<std::size_t>(w)));
+	boost::python::dict retval;
+	for (migration_history::window_map_type::const_iterator it = windows.begin(); it != windows.end(); ++it) {
+		retval[it->first] = it->second;
+	}
+	return retval;
+}
+
 inline static population::individual_type population_get_individual(const population &pop, int n)
 {
 	return pop.get_individual(boost::numeric_cast<population::size_type>(n));
@@ -145,6 +357,246 @@ inline static void population_repair(population &pop, const int &idx, const algo
 	pop.repair(boost::numeric_cast<population::size_type>(idx),repair_algo);
 }
 
+// Flat representation of a population into a buffer of doubles, used to exchange populations between processes through shared memory.
+// Layout: [n. of individuals, champion flag, champion x, c, f, (cur_x, cur_v, cur_c, cur_f, best_x, best_c, best_f) for each individual].
+class population_buffer: boost::noncopyable
+{
+	public:
+		explicit population_buffer(const boost::python::object &buf, bool writable):m_view()
+		{
+			if (PyObject_GetBuffer(buf.ptr(),&m_view,writable ? (PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) : PyBUF_C_CONTIGUOUS) != 0) {
+				throw_error_already_set();
+			}
+		}
+		~population_buffer()
+		{
+			PyBuffer_Release(&m_view);
+		}
+		double *data() const
+		{
+			return static_cast<double *>(m_view.buf);
+		}
+		std::size_t size() const
+		{
+			return boost::numeric_cast<std::size_t>(m_view.len) / sizeof(double);
+		}
+		static std::size_t required_size(const problem::base &prob, population::size_type n)
+		{
+			const std::size_t d = prob.get_dimension(), c = prob.get_c_dimension(), f = prob.get_f_dimension();
+			return 2u + d + c + f + n * (3u * d + 2u * c + 2u * f);
+		}
+	private:
+		Py_buffer m_view;
+};
+
+static inline double *buffer_write(double *ptr, const std::vector<double> &v, std::vector<double>::size_type size)
+{
+	if (v.size() != size) {
+		pagmo_throw(value_error,"inconsistent vector size in population, cannot write it to buffer");
+	}
+	return std::copy(v.begin(),v.end(),ptr);
+}
+
+static inline const double *buffer_read(const double *ptr, std::vector<double> &v, std::vector<double>::size_type size)
+{
+	v.assign(ptr,ptr + size);
+	return ptr + size;
+}
+
+static inline std::size_t population_buffer_size(const population &pop, int n)
+{
+	return population_buffer::required_size(pop.problem(),boost::numeric_cast<population::size_type>(n));
+}
+
+// Write the population into buf. Returns false if the buffer is too small.
+static inline bool population_buffer_dump(const population &pop, const boost::python::object &buf)
+{
+	const population_buffer view(buf,true);
+	const problem::base &prob = pop.problem();
+	if (view.size() < population_buffer::required_size(prob,pop.size())) {
+		return false;
+	}
+	const std::size_t d = prob.get_dimension(), c = prob.get_c_dimension(), f = prob.get_f_dimension();
+	double *ptr = view.data();
+	*ptr++ = static_cast<double>(pop.size());
+	if (pop.size()) {
+		*ptr++ = 1.;
+		ptr = buffer_write(ptr,pop.champion().x,d);
+		ptr = buffer_write(ptr,pop.champion().c,c);
+		ptr = buffer_write(ptr,pop.champion().f,f);
+	} else {
+		*ptr++ = 0.;
+		ptr += d + c + f;
+	}
+	for (population::const_iterator it = pop.begin(); it != pop.end(); ++it) {
+		ptr = buffer_write(ptr,it->cur_x,d);
+		ptr = buffer_write(ptr,it->cur_v,d);
+		ptr = buffer_write(ptr,it->cur_c,c);
+		ptr = buffer_write(ptr,it->cur_f,f);
+		ptr = buffer_write(ptr,it->best_x,d);
+		ptr = buffer_write(ptr,it->best_c,c);
+		ptr = buffer_write(ptr,it->best_f,f);
+	}
+	return true;
+}
+
+// Restore the individuals and the champion of the population from buf, without re-evaluating them.
+static inline void population_buffer_load(population &pop, const boost::python::object &buf)
+{
+	const population_buffer view(buf,false);
+	const problem::base &prob = pop.problem();
+	const std::size_t d = prob.get_dimension(), c = prob.get_c_dimension(), f = prob.get_f_dimension();
+	const double *ptr = view.data();
+	if (view.size() < 2u) {
+		pagmo_throw(value_error,"buffer too small to contain a population");
+	}
+	const population::size_type n = boost::numeric_cast<population::size_type>(*ptr++);
+	if (view.size() < population_buffer::required_size(prob,n)) {
+		pagmo_throw(value_error,"buffer too small for the declared number of individuals");
+	}
+	population::champion_type &champ = population_access::get_champion(pop);
+	const bool has_champion = (*ptr++ != 0.);
+	if (has_champion) {
+		ptr = buffer_read(ptr,champ.x,d);
+		ptr = buffer_read(ptr,champ.c,c);
+		ptr = buffer_read(ptr,champ.f,f);
+	} else {
+		champ = population::champion_type();
+		ptr += d + c + f;
+	}
+	population::container_type &container = population_access::get_container(pop);
+	container.resize(n);
+	for (population::size_type i = 0; i < n; ++i) {
+		ptr = buffer_read(ptr,container[i].cur_x,d);
+		ptr = buffer_read(ptr,container[i].cur_v,d);
+		ptr = buffer_read(ptr,container[i].cur_c,c);
+		ptr = buffer_read(ptr,container[i].cur_f,f);
+		ptr = buffer_read(ptr,container[i].best_x,d);
+		ptr = buffer_read(ptr,container[i].best_c,c);
+		ptr = buffer_read(ptr,container[i].best_f,f);
+		// Without a stored champion, the best of the individuals in the buffer becomes the champion.
+		if (!has_champion && (i == 0 || prob.compare_fc(container[i].best_f,container[i].best_c,champ.f,champ.c))) {
+			champ.x = container[i].best_x;
+			champ.c = container[i].best_c;
+			champ.f = container[i].best_f;
+		}
+	}
+	population_access::rebuild_dom(pop);
+}
+
+// Member of an individual selected by name, and its width (number of doubles per individual).
+static inline std::vector<double> population::individual_type::*population_field(const problem::base &prob, const std::string &field, std::size_t &width)
+{
+	const std::size_t d = prob.get_dimension(), c = prob.get_c_dimension(), f = prob.get_f_dimension();
+	if (field == "cur_x") {
+		width = d;
+		return &population::individual_type::cur_x;
+	} else if (field == "cur_v") {
+		width = d;
+		return &population::individual_type::cur_v;
+	} else if (field == "cur_c") {
+		width = c;
+		return &population::individual_type::cur_c;
+	} else if (field == "cur_f") {
+		width = f;
+		return &population::individual_type::cur_f;
+	} else if (field == "best_x") {
+		width = d;
+		return &population::individual_type::best_x;
+	} else if (field == "best_c") {
+		width = c;
+		return &population::individual_type::best_c;
+	} else if (field == "best_f") {
+		width = f;
+		return &population::individual_type::best_f;
+	}
+	pagmo_throw(value_error,"invalid field name, must be one of cur_x, cur_v, cur_c, cur_f, best_x, best_c, best_f");
+}
+
+// One field of all the individuals, copied row after row in a bytes object.
+static inline boost::python::object population_get_field(const population &pop, const std::string &field)
+{
+	std::size_t width = 0;
+	std::vector<double> population::individual_type::*member = population_field(pop.problem(),field,width);
+	PyObject *retval = PyBytes_FromStringAndSize(NULL,boost::numeric_cast<Py_ssize_t>(pop.size() * width * sizeof(double)));
+	if (!retval) {
+		boost::python::throw_error_already_set();
+	}
+	double *ptr = reinterpret_cast<double *>(PyBytes_AS_STRING(retval));
+	for (population::const_iterator it = pop.begin(); it != pop.end(); ++it) {
+		ptr = buffer_write(ptr,(*it).*member,width);
+	}
+	return boost::python::object(boost::python::handle<>(retval));
+}
+
+// One field of all the individuals of a packed population, copied in a bytes object.
+static inline boost::python::object packed_population_get_field(const packed_population &pop, const std::string &field)
+{
+	static const char *names[] = {"cur_x","cur_v","cur_c","cur_f","best_x","best_c","best_f"};
+	for (int i = 0; i < 7; ++i) {
+		if (field != names[i]) {
+			continue;
+		}
+		const packed_population::range r = pop.get_field(static_cast<packed_population::field_type>(i));
+		PyObject *retval = PyBytes_FromStringAndSize(reinterpret_cast<const char *>(r.begin()),boost::numeric_cast<Py_ssize_t>(r.size() * sizeof(double)));
+		if (!retval) {
+			boost::python::throw_error_already_set();
+		}
+		return boost::python::object(boost::python::handle<>(retval));
+	}
+	pagmo_throw(value_error,"invalid field name, must be one of cur_x, cur_v, cur_c, cur_f, best_x, best_c, best_f");
+}
+
+static inline problem::base_ptr problem_from_packed_pop(const packed_population &pop)
+{
+	return pop.problem().clone();
+}
+
+// Set the decision vectors or the velocities of all the individuals from a buffer of doubles.
+static inline void population_set_field(population &pop, const std::string &field, const boost::python::object &buf)
+{
+	const population_buffer view(buf,false);
+	const problem::base &prob = pop.problem();
+	const std::size_t d = prob.get_dimension();
+	if (field != "cur_x" && field != "cur_v") {
+		pagmo_throw(value_error,"only the cur_x and cur_v fields can be set");
+	}
+	if (view.size() != pop.size() * d) {
+		pagmo_throw(value_error,"buffer size is not compatible with population size and problem dimension");
+	}
+	population::container_type &container = population_access::get_container(pop);
+	const double *ptr = view.data();
+	if (field == "cur_v") {
+		for (population::size_type i = 0; i < container.size(); ++i) {
+			ptr = buffer_read(ptr,container[i].cur_v,d);
+		}
+		return;
+	}
+	std::vector<population::size_type> idx(container.size());
+	std::vector<decision_vector> x(container.size());
+	for (population::size_type i = 0; i < container.size(); ++i) {
+		idx[i] = i;
+		ptr = buffer_read(ptr,x[i],d);
+	}
+	pop.set_x_batch(idx,x);
+}
+
+// Replace the problem of the population with a copy of prob (e.g. the same problem after an evolution in another process),
+// without re-evaluating the individuals.
+static inline void population_set_problem(population &pop, const problem::base &prob)
+{
+	if (!pop.problem().is_compatible(prob) || pop.problem().get_f_dimension() != prob.get_f_dimension()) {
+		pagmo_throw(value_error,"the problem is not compatible with the population");
+	}
+	population_access::get_problem_ptr(pop) = prob.clone();
+}
+
+// Add to the counters of the problem of the population the evaluations performed on a copy of it.
+static inline void population_add_evals(population &pop, unsigned int fevals, unsigned int cevals)
+{
+	pop.problem().add_evals(fevals,cevals);
+}
+
 struct __PAGMO_VISIBLE population_pickle_suite : boost::python::pickle_suite
 {
 	static boost::python::tuple getinitargs(const population &pop)
@@ -153,10 +605,7 @@ struct __PAGMO_VISIBLE population_pickle_suite : boost::python::pickle_suite
 	}
 	static boost::python::tuple getstate(const population &pop)
 	{
-		std::stringstream ss;
-		boost::archive::text_oarchive oa(ss);
-		oa << pop;
-		return boost::python::make_tuple(ss.str(),pop.problem().clone());
+		return boost::python::make_tuple(py_archive_save(pop),pop.problem().clone());
 	}
 	static void setstate(population &pop, boost::python::tuple state)
 	{
@@ -165,10 +614,7 @@ struct __PAGMO_VISIBLE population_pickle_suite : boost::python::pickle_suite
 			PyErr_SetObject(PyExc_ValueError,("expected 2-item tuple in call to __setstate__; got %s" % state).ptr());
 			throw_error_already_set();
 		}
-		const std::string str = extract<std::string>(state[0]);
-		std::stringstream ss(str);
-		boost::archive::text_iarchive ia(ss);
-		ia >> pop;
+		py_archive_load(pop,extract<std::string>(state[0]));
 		const problem::base_ptr prob = boost::python::extract<problem::base_ptr>(state[1]);
 		population_access::get_problem_ptr(pop) = prob->clone();
 	}
@@ -183,10 +629,7 @@ struct __PAGMO_VISIBLE island_pickle_suite : boost::python::pickle_suite
 	}
 	static boost::python::tuple getstate(const Island &isl)
 	{
-		std::stringstream ss;
-		boost::archive::text_oarchive oa(ss);
-		oa << isl;
-		return boost::python::make_tuple(ss.str(),isl.get_algorithm(),isl.get_population());
+		return boost::python::make_tuple(py_archive_save(isl),isl.get_algorithm(),isl.get_population());
 	}
 	static void setstate(Island &isl, boost::python::tuple state)
 	{
@@ -195,10 +638,7 @@ struct __PAGMO_VISIBLE island_pickle_suite : boost::python::pickle_suite
 			PyErr_SetObject(PyExc_ValueError,("expected 3-item tuple in call to __setstate__; got %s" % state).ptr());
 			throw_error_already_set();
 		}
-		const std::string str = extract<std::string>(state[0]);
-		std::stringstream ss(str);
-		boost::archive::text_iarchive ia(ss);
-		ia >> isl;
+		py_archive_load(isl,extract<std::string>(state[0]));
 		const algorithm::base_ptr algo = boost::python::extract<algorithm::base_ptr>(state[1]);
 		isl.set_algorithm(*algo);
 		const population pop = boost::python::extract<population>(state[2]);
@@ -214,10 +654,7 @@ struct __PAGMO_VISIBLE archipelago_pickle_suite : boost::python::pickle_suite
 	}
 	static boost::python::tuple getstate(const archipelago &archi)
 	{
-		std::stringstream ss;
-		boost::archive::text_oarchive oa(ss);
-		oa << archi;
-		return boost::python::make_tuple(ss.str(),archi.get_islands());
+		return boost::python::make_tuple(py_archive_save(archi),archi.get_islands());
 	}
 	static void setstate(archipelago &archi, boost::python::tuple state)
 	{
@@ -226,10 +663,7 @@ struct __PAGMO_VISIBLE archipelago_pickle_suite : boost::python::pickle_suite
 			PyErr_SetObject(PyExc_ValueError,("expected 2-item tuple in call to __setstate__; got %s" % state).ptr());
 			throw_error_already_set();
 		}
-		const std::string str = extract<std::string>(state[0]);
-		std::stringstream ss(str);
-		boost::archive::text_iarchive ia(ss);
-		ia >> archi;
+		py_archive_load(archi,extract<std::string>(state[0]));
 		// Recover seaparately the islands.
 		const std::vector<base_island_ptr> islands = extract<std::vector<base_island_ptr> >(state[1]);
 		pagmo_assert(islands.size() == archi.get_size());
@@ -300,6 +734,8 @@ BOOST_PYTHON_MODULE(_core)
 		.def("compute_nadir",&population::compute_nadir, "Get the nadir objective vector")
 		.def("compute_ideal",&population::compute_ideal, "Get the ideal objective vector")
 		.def("compute_pareto_fronts",&population::compute_pareto_fronts, "Computes all Pareto fronts")
+		.def("compute_first_front",&population::compute_first_front, "Computes the first Pareto front")
+		.add_property("nds_method",&population::get_nds_method,&population::set_nds_method,"Method used to compute the Pareto fronts.")
 //		.def("get_crowding_d",&population::get_crowding_d, "returns crowding distance")
 //		.def("update_pareto_information",&population::update_pareto_information, "updates crowding distance and front informations")
 		.def("get_best_idx",get_best_1_idx(&population::get_best_idx),"Get index of best individual.")
@@ -308,14 +744,41 @@ BOOST_PYTHON_MODULE(_core)
 		.def("set_x", &population_set_x,"Set decision vector of individual at position n.")
 		.def("set_v", &population_set_v,"Set velocity of individual at position n.")
 		.def("push_back", &population::push_back,"Append individual with given decision vector at the end of the population.")
+		.def("push_back_batch", &population::push_back_batch,"Append individuals with given decision vectors, evaluating them at once and rebuilding the domination lists once.")
+		.def("set_x_batch", &population::set_x_batch,"Set decision vectors of the individuals at the given positions, evaluating them at once and rebuilding the domination lists once.")
+		.add_property("dom_tracking",&population::get_dom_tracking,&population::set_dom_tracking,"Keep the domination lists and counts of the individuals up to date.")
 		.def("erase", &population::erase, "Erase individual at position")
 		.def("mean_velocity", &population::mean_velocity, "Calculates the mean velocity across particles")
 		.def("race", &race_return_tuple, "Race the individuals")
 		.def("repair", &population_repair, "Repair the individual at the given index")
 		.def("cpp_loads", &py_cpp_loads<population>)
 		.def("cpp_dumps", &py_cpp_dumps<population>)
+		.def("_buffer_size", &population_buffer_size, "Number of doubles needed to store a population of *n* individuals in a buffer.")
+		.def("_buffer_dump", &population_buffer_dump, "Write the population into a writable buffer of doubles, return False if the buffer is too small.")
+		.def("_set_problem", &population_set_problem, "Replace the problem with a compatible one, without re-evaluating the individuals.")
+		.def("_add_evals", &population_add_evals, "Add function and constraints evaluations to the counters of the problem.")
+		.def("_buffer_load", &population_buffer_load, "Restore individuals and champion from a buffer of doubles, without re-evaluation. If the buffer holds no champion, the best individual becomes the champion.")
+		.def("_get_field", &population_get_field, "Copy one field of all the individuals, row after row, into a bytes object of doubles.")
+		.def("_set_field", &population_set_field, "Set the decision vectors or the velocities of all the individuals from a buffer of doubles.")
+		.def("_get_seed", &population::getSeed, "Draw the seed of a new population from the global random number generator.")
+		.staticmethod("_get_seed")
+		.add_property("memory_footprint", &population::memory_footprint, "Number of bytes used by the individuals and the domination information.")
 		.def_pickle(population_pickle_suite());
 
+	// Packed population.
+	class_<packed_population>("packed_population", "Packed population class.", init<const population &>())
+		.def(init<const packed_population &>())
+		.def("__copy__", &Py_copy_from_ctor<packed_population>)
+		.def("__deepcopy__", &Py_deepcopy_from_ctor<packed_population>)
+		.def("__len__", &packed_population::size)
+		.add_property("problem",&problem_from_packed_pop)
+		.add_property("champion",make_function(&packed_population::champion,return_value_policy<copy_const_reference>()))
+		.add_property("memory_footprint", &packed_population::memory_footprint, "Number of bytes used by the packed population.")
+		.def("get_domination_list",&packed_population::get_domination_list, "Get the domination list for an individual")
+		.def("get_domination_count",&packed_population::get_domination_count, "Get the domination count for an individual")
+		.def("unpack", &packed_population::unpack, "Convert back to a population, without re-evaluation.")
+		.def("_get_field", &packed_population_get_field, "Copy one field of all the individuals, row after row, into a bytes object of doubles.");
+
 	// Individual and champion.
 	class_<population::individual_type>("individual","Individual class.",init<>())
 		.def("__repr__",&population::individual_type::human_readable)
@@ -359,6 +822,7 @@ BOOST_PYTHON_MODULE(_core)
 		.add_property("problem",&base_island::get_problem)
 		.add_property("algorithm",&base_island::get_algorithm,&island::set_algorithm)
 		.add_property("population",&base_island::get_population, &base_island::set_population)
+		.def("get_packed_population", &base_island::get_packed_population, "Get a packed copy of the island population.")
 		.add_property("s_policy",&base_island::get_s_policy)
 		.add_property("r_policy",&base_island::get_r_policy)
 		// Virtual methods.
@@ -397,12 +861,32 @@ BOOST_PYTHON_MODULE(_core)
 		.def("set_seeds", &archipelago::set_seeds)
 		.def("evolve", &archipelago::evolve,"Evolve archipelago *n* times.",boost::python::args("n"))
 		.def("evolve_batch", &archipelago::evolve_batch,"Evolve archipelago *n* times in batches of *b* islands.",boost::python::args("n","b"))
+		.def("evolve_adaptive", &archipelago::evolve_adaptive,"Evolve archipelago for *n* rounds in batches of *b* islands, allocating the rounds to the most productive islands.",
+			(boost::python::arg("n"),boost::python::arg("b"),boost::python::arg("c") = 1.,boost::python::arg("stall") = 0))
+		.def("get_allocation_log", &archipelago_get_allocation_log,"Get the decisions of the last adaptive evolution as a list of dictionaries.")
 		.def("evolve_t", &archipelago::evolve_t,"Evolve archipelago for at least *n* milliseconds.",boost::python::args("n"))
 		.def("join", &archipelago::join,"Wait for evolution to complete.")
 		.def("interrupt", &archipelago::interrupt,"Interrupt evolution.")
 		.def("busy", &archipelago::busy,"Check if archipelago is evolving.")
 		.def("push_back", &archipelago::push_back,"Append island.")
 		.def("set_algorithm", &archipelago_set_algorithm,"Set algorithm on island.")
+		.def("_set_listener_fd", &archipelago_set_listener_fd,"Write evolution notifications to file descriptor *fd* (a negative value disables notifications).",boost::python::args("fd"))
+		.def("get_island_versions", &archipelago::get_island_versions,"Get the number of modifications undergone by each island.")
+		.def("_get_metrics", &archipelago_get_metrics,"Get the runtime counters of the islands as a list of dictionaries.")
+		.def("reset_metrics", &archipelago::reset_metrics,"Reset the runtime counters of the islands.")
+		.def("_state_dumps", &archipelago_state_dumps,"Dump the state of the archipelago other than the islands.")
+		.def("_state_loads", &archipelago_state_loads,"Load the state of the archipelago other than the islands from string *str*.",boost::python::args("str"))
+		.def("_set_termination", &archipelago_set_termination)
+		.def("get_termination", &archipelago_get_termination,"Get the termination criteria as a dictionary.")
+		.add_property("termination_reason", &archipelago::get_termination_reason,"Criterion that stopped the last evolution (empty if none).")
+		.def("_set_pool_size", &archipelago::set_pool_size)
+		.add_property("pool_size", &archipelago::get_pool_size,"Number of worker threads evolving the islands (0 for one thread per island).")
+		.def("get_default_pool_size", &archipelago::get_default_pool_size,"Get the number of hardware threads available.")
+		.staticmethod("get_default_pool_size")
+		.def("_init_populations", &archipelago_init_populations)
+		.staticmethod("_init_populations")
+		.def("get_migr_history", &archipelago::get_migr_history,"Get a copy of the migration history.")
+		.def("_set_migr_history_capacity", &archipelago::set_migr_history_capacity)
 		.def("dump_migr_history", &archipelago::dump_migr_history)
 		.def("clear_migr_history", &archipelago::clear_migr_history)
 		.def("cpp_loads", &py_cpp_loads<archipelago>,
@@ -413,12 +897,41 @@ BOOST_PYTHON_MODULE(_core)
 		.def("cpp_dumps", &py_cpp_dumps<archipelago>,
 			"Dump C++ serialized representation.\n\n"
 			":Returns:\n"
-			"   string representing the serialized C++ representation\n"
+			"   string representing the serialized C++ representation (bytes in binary serialization mode)\n"
 		)
 		.add_property("topology", &archipelago::get_topology, &archipelago::set_topology,"Topology property.")
 		.add_property("distribution_type", &archipelago::get_distribution_type, &archipelago::set_distribution_type, "Distribution type property.")
 		.def_pickle(archipelago_pickle_suite());
 
+	// Population's non-dominated sorting algorithms.
+	enum_<population::nds_type>("nds_type")
+		.value("dom_lists",population::dom_lists)
+		.value("ens",population::ens)
+		.value("sweep_2d",population::sweep_2d);
+
+	// Migration history.
+	class_<migration_history>("migration_history", "Migration history class.", init<optional<const migration_history::size_type &,migration_history::policy_type> >())
+		.def(init<const migration_history &>())
+		.def("__copy__", &Py_copy_from_ctor<migration_history>)
+		.def("__deepcopy__", &Py_deepcopy_from_ctor<migration_history>)
+		.def("__len__", &migration_history::size)
+		.def("__repr__", &migration_history::human_readable)
+		.def("clear", &migration_history::clear,"Remove all the events.")
+		.add_property("capacity", &migration_history::get_capacity,"Maximum number of events.")
+		.add_property("policy", &migration_history::get_policy,"Policy used when the history is full.")
+		.add_property("stride", &migration_history::get_stride,"The history records one event every *stride*.")
+		.add_property("n_events", &migration_history::get_n_events,"Number of events received, including the discarded ones.")
+		.def("migrants_per_edge", &migration_history_migrants_per_edge,
+			"Number of migrants for each (source,destination) pair, over the events whose round is in [*first*,*last*) (a negative *last* means no upper bound).",
+			(boost::python::arg("first") = 0,boost::python::arg("last") = -1))
+		.def("migrants_per_window", &migration_history_migrants_per_window,
+			"Number of migrants for each window of *w* rounds, indexed by the first round of the window.",boost::python::args("w"))
+		.def("_columns", &migration_history_columns);
+
+	enum_<migration_history::policy_type>("migration_history_policy")
+		.value("overwrite",migration_history::overwrite)
+		.value("decimate",migration_history::decimate);
+
 	// Archipelago's migration strategies.
 	enum_<archipelago::distribution_type>("distribution_type")
 		.value("point_to_point",archipelago::point_to_point)
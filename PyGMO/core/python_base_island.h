@@ -205,10 +205,7 @@ struct python_base_island_pickle_suite : boost::python::pickle_suite
 	static boost::python::tuple getstate(boost::python::object obj)
 	{
 		const python_base_island &isl = boost::python::extract<python_base_island const &>(obj)();
-		std::stringstream ss;
-		boost::archive::text_oarchive oa(ss);
-		oa << isl;
-		return boost::python::make_tuple(obj.attr("__dict__"),ss.str(),isl.get_algorithm(),isl.get_population());
+		return boost::python::make_tuple(obj.attr("__dict__"),py_archive_save(isl),isl.get_algorithm(),isl.get_population());
 	}
 	static void setstate(boost::python::object obj, boost::python::tuple state)
 	{
@@ -222,10 +219,7 @@ struct python_base_island_pickle_suite : boost::python::pickle_suite
 		boost::python::dict d = boost::python::extract<boost::python::dict>(obj.attr("__dict__"))();
 		d.update(state[0]);
 		// Restore the internal state of the C++ object.
-		const std::string str = boost::python::extract<std::string>(state[1]);
-		std::stringstream ss(str);
-		boost::archive::text_iarchive ia(ss);
-		ia >> isl;
+		py_archive_load(isl,boost::python::extract<std::string>(state[1]));
 		// Restore separately the algorithm and the population.
 		// NOTE: here (and elsewhere in similar situations) we could avoid the need to deal separately with population and/or algorithm:
 		// as long as we are not dealing with Python-extended objects, we are sure that C++ serialization is enough. Optimize like this
@@ -0,0 +1,49 @@
+"""
+Measures the overhead of migration as the number of islands grows.
+
+Every island runs algorithm.null(), so the wall time of an evolution is
+dominated by the archipelago machinery: thread start-up, and the exchange of
+individuals through the migration buffers in pre_evolution/post_evolution.
+For each island count the script reports the average time of one evolution
+round in an unconnected archipelago (no migration) and with a few connected
+topologies, in both migration directions.
+"""
+from PyGMO import *
+import time
+
+isl_counts = [64, 256, 1024]
+pop_size = 10
+n_evolutions = 5
+topologies = [
+    ('ring', topology.ring),
+    ('barabasi_albert', topology.barabasi_albert),
+    ('fully_connected', topology.fully_connected)]
+directions = [
+    ('src', migration_direction.source),
+    ('dest', migration_direction.destination)]
+
+
+def evolution_time(n_isl, topo, direction):
+    """Average wall time, in seconds, of one evolution round of the archipelago."""
+    archi = archipelago(topology=topo(), migration_direction=direction)
+    for i in range(n_isl):
+        archi.push_back(local_island(algorithm.null(), problem.ackley(10), pop_size))
+    start = time.time()
+    archi.evolve(n_evolutions)
+    archi.join()
+    return (time.time() - start) / n_evolutions
+
+
+if __name__ == '__main__':
+    columns = ['unconnected'] + ['%s/%s' % (t, d) for t, _ in topologies for d, _ in directions]
+    print('%8s' % 'islands' + ''.join('%22s' % c for c in columns))
+    for n in isl_counts:
+        # Fully connected topologies grow quadratically, skip the largest sizes.
+        row = [evolution_time(n, topology.unconnected, migration_direction.destination)]
+        for _, topo in topologies:
+            for _, direction in directions:
+                if topo is topology.fully_connected and n > 256:
+                    row.append(float('nan'))
+                else:
+                    row.append(evolution_time(n, topo, direction))
+        print('%8d' % n + ''.join('%22.1f' % (1000 * t) for t in row))
@@ -0,0 +1,59 @@
+"""
+Compares the non-dominated sorting methods of the population.
+
+By default the Pareto fronts of a population are built from its domination
+lists, which take O(N^2) memory and time to maintain. The ens and sweep_2d
+methods (population.nds_method) sort the best fitness vectors directly. For
+each number of objectives and population size the script reports the time
+needed to compute all the Pareto fronts and the first front only. The time of
+the dom_lists method includes the construction of the domination lists, and
+is skipped for the largest populations.
+"""
+from PyGMO import *
+import random
+import time
+
+pop_sizes = [1000, 5000, 20000]
+f_dims = [2, 3, 5]
+max_dom_lists_size = 5000
+
+
+def random_population(prob, n):
+    """Population of n random individuals, without domination lists."""
+    pop = population(prob)
+    pop.dom_tracking = False
+    lb, ub = prob.lb, prob.ub
+    pop.push_back_batch([[random.uniform(l, u) for l, u in zip(lb, ub)] for i in range(n)])
+    return pop
+
+
+def sorting_times(pop, method):
+    """Wall times, in seconds, of compute_pareto_fronts() and compute_first_front()."""
+    start = time.time()
+    if method == nds_type.dom_lists:
+        pop.dom_tracking = True
+    pop.nds_method = method
+    pop.compute_pareto_fronts()
+    t_all = time.time() - start
+    start = time.time()
+    pop.compute_first_front()
+    t_first = time.time() - start
+    pop.nds_method = nds_type.dom_lists
+    pop.dom_tracking = False
+    return t_all, t_first
+
+
+if __name__ == '__main__':
+    print('%6s%8s%12s%16s%16s' % ('f_dim', 'size', 'method', 'all fronts [s]', 'first front [s]'))
+    for f_dim in f_dims:
+        prob = problem.dtlz(2, 5, f_dim)
+        for n in pop_sizes:
+            pop = random_population(prob, n)
+            methods = [nds_type.ens]
+            if f_dim == 2:
+                methods.append(nds_type.sweep_2d)
+            if n <= max_dom_lists_size:
+                methods.insert(0, nds_type.dom_lists)
+            for method in methods:
+                t_all, t_first = sorting_times(pop, method)
+                print('%6d%8d%12s%16.3f%16.3f' % (f_dim, n, method, t_all, t_first))
@@ -0,0 +1,50 @@
+"""
+Measures the speedup given by _objfun_batch_impl to a problem written in Python.
+
+The same NumPy model (a sum of squares of a random linear map) is defined twice:
+once with _objfun_impl only, evaluated one decision vector at a time, and once
+with _objfun_batch_impl too, which evaluates all the individuals of a population,
+or of an sga generation, with a single call. The script reports the time needed to
+create a population and to evolve it, and checks that the two populations are
+initialised identically.
+"""
+from PyGMO import *
+import numpy
+import time
+
+dim = 50
+pop_size = 10000
+gen = 5
+
+
+class linear_model(problem.base):
+
+    def __init__(self, dim=dim):
+        super(linear_model, self).__init__(dim)
+        self.set_bounds(-1, 1)
+        self._A = numpy.random.RandomState(0).rand(dim, dim)
+
+    def _objfun_impl(self, x):
+        return (float(((self._A.dot(x)) ** 2).sum()),)
+
+
+class batch_linear_model(linear_model):
+
+    def _objfun_batch_impl(self, X):
+        return ((X.dot(self._A.T)) ** 2).sum(axis=1)
+
+
+if __name__ == '__main__':
+    print('%24s%12s%12s' % ('problem', 'init [s]', 'evolve [s]'))
+    champions = []
+    for prob in [linear_model(), batch_linear_model()]:
+        start = time.time()
+        pop = population(prob, pop_size, 42)
+        t_init = time.time() - start
+        champions.append(pop.champion.f[0])
+        start = time.time()
+        pop = algorithm.sga(gen=gen).evolve(pop)
+        t_evolve = time.time() - start
+        print('%24s%12.3f%12.3f' % (type(prob).__name__, t_init, t_evolve))
+    if abs(champions[0] - champions[1]) > 1e-8 * abs(champions[0]):
+        raise RuntimeError('the batch evaluation changed the initial population')
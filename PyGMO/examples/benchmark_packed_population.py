@@ -0,0 +1,45 @@
+"""
+Compares a population with its packed_population copy.
+
+A population stores each individual as seven separate vectors and its
+domination list as one vector per individual. A packed_population stores each
+field in a single contiguous buffer and the domination lists in one flat
+array. For each population size the script reports the memory used by the two
+structures, the time needed to copy them and the time needed to pack and
+unpack the population.
+"""
+from PyGMO import *
+import copy
+import random
+import time
+
+pop_sizes = [1000, 10000, 100000]
+
+
+def random_population(prob, n):
+    """Population of n random individuals, without domination lists."""
+    pop = population(prob)
+    pop.dom_tracking = False
+    lb, ub = prob.lb, prob.ub
+    pop.push_back_batch([[random.uniform(l, u) for l, u in zip(lb, ub)] for i in range(n)])
+    return pop
+
+
+def timed(f, *args):
+    """Return value and wall time, in seconds, of f(*args)."""
+    start = time.time()
+    retval = f(*args)
+    return retval, time.time() - start
+
+
+if __name__ == '__main__':
+    prob = problem.zdt(1)
+    print('%8s%14s%14s%12s%12s%10s%10s' % ('size', 'pop [MB]', 'packed [MB]', 'copy [s]', 'copy p. [s]', 'pack [s]', 'unpack [s]'))
+    for n in pop_sizes:
+        pop = random_population(prob, n)
+        packed, t_pack = timed(packed_population, pop)
+        t_copy = timed(copy.copy, pop)[1]
+        t_copy_packed = timed(copy.copy, packed)[1]
+        t_unpack = timed(packed.unpack)[1]
+        print('%8d%14.2f%14.2f%12.3f%12.3f%10.3f%10.3f' % (n, pop.memory_footprint / 1e6, packed.memory_footprint / 1e6,
+                                                          t_copy, t_copy_packed, t_pack, t_unpack))
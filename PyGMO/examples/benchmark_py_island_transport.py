@@ -0,0 +1,74 @@
+"""
+Compares the two ways py_island can exchange populations with the process
+running the evolution: pickling the population through the multiprocessing
+queue, or reading and writing it in place in a shared memory buffer.
+
+For each population size the script reports the number of bytes the evolving
+process puts on the queue, the size of the shared memory buffer and the
+average round-trip latency of a null evolution. With the fork start method
+(the default on POSIX systems) the arguments of the process are inherited,
+hence the reply of the process is all that goes through the queue.
+"""
+from PyGMO import *
+import ctypes
+import multiprocessing as mp
+import pickle
+import time
+
+try:
+    from multiprocessing.reduction import ForkingPickler as _pickler
+except ImportError:
+    _pickler = None
+
+dim = 100
+pop_sizes = [100, 1000, 3000]
+n_trials = 10
+
+
+def transport_bytes(pop, use_shared_memory):
+    """Bytes put on the queue by the process, and size of the shared memory buffer, for one evolution."""
+    q = mp.Queue()
+    shm = None
+    if use_shared_memory:
+        shm = mp.RawArray('d', pop._buffer_size(len(pop)))
+        pop._buffer_dump(shm)
+        args = (q, algorithm.null(), pop.problem, shm)
+    else:
+        args = (q, algorithm.null(), pop)
+    process = mp.Process(target=core._process_target, args=args)
+    process.start()
+    retval = q.get()
+    process.join()
+    # The queue pickles the object with the multiprocessing pickler.
+    if _pickler is not None:
+        n_bytes = len(_pickler.dumps(retval))
+    else:
+        n_bytes = len(pickle.dumps(retval, pickle.HIGHEST_PROTOCOL))
+    return n_bytes, 0 if shm is None else ctypes.sizeof(shm)
+
+
+def round_trip(pop, use_shared_memory):
+    """Average wall time, in seconds, of one evolution with algorithm.null()."""
+    isl = py_island(algorithm.null(), pop)
+    isl.use_shared_memory = use_shared_memory
+    start = time.time()
+    for i in range(n_trials):
+        isl.evolve(1)
+        isl.join()
+    return (time.time() - start) / n_trials
+
+
+if __name__ == '__main__':
+    prob = problem.ackley(dim)
+    print('%10s %18s %18s %18s %12s %12s' % ('pop size', 'queue [bytes]', 'shm queue [bytes]', 'shm buffer [bytes]', 'queue [ms]', 'shm [ms]'))
+    for n in pop_sizes:
+        pop = population(prob, n)
+        queue_bytes = transport_bytes(pop, False)[0]
+        shm_queue_bytes, shm_buffer_bytes = transport_bytes(pop, True)
+        print('%10d %18d %18d %18d %12.1f %12.1f' % (
+            n,
+            queue_bytes,
+            shm_queue_bytes,
+            shm_buffer_bytes,
+            1000 * round_trip(pop, False),
+            1000 * round_trip(pop, True)))
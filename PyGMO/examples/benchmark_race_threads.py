@@ -0,0 +1,39 @@
+"""
+Measures the speedup of population.race() with several threads.
+
+At each iteration of a race the surviving racers are re-evaluated under a new
+seed. With n_threads > 1 these evaluations are split among threads, each with
+its own copy of the problem. For an expensive stochastic problem (a robust
+version of ackley averaging many trials) the script reports the time of the
+same race for increasing numbers of threads, and checks that the winners do
+not change.
+"""
+from PyGMO import *
+import copy
+import multiprocessing
+import time
+
+pop_size = 64
+n_winners = 4
+max_feval = 2000
+trials = 2000
+
+
+if __name__ == '__main__':
+    prob = problem.robust(problem.ackley(30), trials=trials, rho=0.1)
+    pop = population(prob, pop_size)
+    thread_counts = [1, 2, 4, 8]
+    thread_counts = [n for n in thread_counts if n <= multiprocessing.cpu_count()]
+    print('%10s%12s%10s%10s' % ('threads', 'time [s]', 'fevals', 'speedup'))
+    serial = None
+    for n in thread_counts:
+        # All the races start from identical copies, hence use the same seed.
+        p = copy.copy(pop)
+        start = time.time()
+        winners, fevals = p.race(n_winners, max_feval=max_feval, n_threads=n)
+        elapsed = time.time() - start
+        if serial is None:
+            serial = (elapsed, winners)
+        elif winners != serial[1]:
+            raise RuntimeError('the winners depend on the number of threads')
+        print('%10d%12.3f%10d%10.2f' % (n, elapsed, fevals, serial[0] / elapsed))
@@ -0,0 +1,39 @@
+"""
+Measures how a pure-Python problem scales with a sharded archipelago.
+
+The objective function of problem.py_example() is written in Python, so local
+islands evaluate it under the GIL and an archipelago of local islands runs at
+the speed of a single core. archipelago.shard() moves the islands to a fixed
+set of worker processes. For each number of processes the script reports the
+wall time of the evolution and the speedup over the local archipelago.
+"""
+from PyGMO import *
+import multiprocessing
+import time
+
+n_islands = 16
+pop_size = 20
+n_evolutions = 5
+
+
+def evolution_time(processes):
+    """Wall time, in seconds, of the evolution (local islands if processes is 0)."""
+    archi = archipelago(algorithm.de(20), problem.py_example(), n_islands, pop_size, topology=topology.ring())
+    if processes:
+        archi.shard(processes)
+    start = time.time()
+    archi.evolve(n_evolutions)
+    archi.join()
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    local = evolution_time(0)
+    print('%10s%12s%10s' % ('processes', 'time [s]', 'speedup'))
+    print('%10s%12.2f%10.2f' % ('local', local, 1.))
+    n = 1
+    while n <= multiprocessing.cpu_count():
+        t = evolution_time(n)
+        print('%10d%12.2f%10.2f' % (n, t, local / t))
+        n *= 2
+    mp_island.shutdown_pool()
@@ -0,0 +1,38 @@
+"""
+Compares the thread-per-island and the pooled execution of an archipelago.
+
+By default every island is evolved in its own thread, so that an archipelago
+with many more islands than cores oversubscribes the machine. In pooled mode
+(archipelago.set_pool_size()) the evolution rounds of the islands are queued
+and performed by a fixed number of worker threads. For each island count the
+script reports the throughput, in island rounds per second, of both modes on a
+ring topology, with the default pool size (the number of hardware threads).
+"""
+from PyGMO import *
+import time
+
+isl_counts = [16, 64, 256, 1024]
+pop_size = 20
+n_evolutions = 10
+
+
+def throughput(n_isl, pool_size):
+    """Island rounds per second of an archipelago of n_isl islands."""
+    archi = archipelago(topology=topology.ring())
+    for i in range(n_isl):
+        archi.push_back(local_island(algorithm.de(10), problem.ackley(10), pop_size))
+    archi.set_pool_size(pool_size)
+    start = time.time()
+    archi.evolve(n_evolutions)
+    archi.join()
+    return n_isl * n_evolutions / (time.time() - start)
+
+
+if __name__ == '__main__':
+    n_workers = archipelago.get_default_pool_size()
+    print('Pool size: %d' % n_workers)
+    print('%8s%22s%22s%10s' % ('islands', 'thread-per-island', 'pooled', 'speedup'))
+    for n in isl_counts:
+        threads = throughput(n, 0)
+        pooled = throughput(n, n_workers)
+        print('%8d%22.1f%22.1f%10.2f' % (n, threads, pooled, pooled / threads))
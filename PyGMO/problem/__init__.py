@@ -16,6 +16,7 @@ from PyGMO.problem._example import py_example
 from PyGMO.problem._example import py_example_max
 from PyGMO.problem._example_stochastic import py_example_stochastic
 from PyGMO.problem._pl2pl import py_pl2pl
+from PyGMO.problem._persistent_cache import persistent_cache
 from PyGMO.problem._mo import *
 from PyGMO.problem._tsp import *
 
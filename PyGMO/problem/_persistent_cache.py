@@ -0,0 +1,241 @@
+"""
+The _persistent_cache.py module stores the fitness and constraint vectors computed by
+expensive problems in an SQLite database, so that they can be reused by other runs,
+and by other processes (e.g. the workers of py_island or mp_island) running at the same time.
+
+The database holds one row per (fingerprint, decision vector), where the fingerprint
+identifies the problem. Each row records the time of its last use, so that the least
+recently used rows are evicted first when the store grows beyond its size cap.
+Hits and misses are counted per fingerprint, evictions for the whole store.
+"""
+
+from PyGMO.problem._base import base
+
+import threading as _threading
+
+# Connections cannot be shared between threads or inherited across a fork, so each
+# thread of each process opens its own, the first time it needs it.
+_local = _threading.local()
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS entries (fingerprint TEXT NOT NULL, x BLOB NOT NULL, f BLOB NOT NULL, c BLOB NOT NULL, '
+    'last_used REAL NOT NULL, PRIMARY KEY (fingerprint, x))',
+    'CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)',
+    'CREATE TABLE IF NOT EXISTS stats (fingerprint TEXT PRIMARY KEY, hits INTEGER NOT NULL, misses INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+    "INSERT OR IGNORE INTO meta VALUES ('entries', 0)",
+    "INSERT OR IGNORE INTO meta VALUES ('evictions', 0)",
+]
+
+
+def _connection(path):
+    """Connection to the store at path owned by the calling thread."""
+    import os
+    import sqlite3
+    if getattr(_local, 'pid', None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+    conn = _local.connections.get(path)
+    if conn is None:
+        # Transactions are issued explicitly, see _transaction().
+        conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        # WAL lets readers proceed while another process writes.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with _transaction(conn):
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        _local.connections[path] = conn
+    return conn
+
+
+class _transaction(object):
+
+    """Write transaction, taking the database lock at the start to avoid deadlocks between writers."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute('BEGIN IMMEDIATE')
+        return self._conn
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._conn.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+
+
+def _pack(v):
+    import struct
+    return struct.pack('<%dd' % len(v), *v)
+
+
+def _blob(b):
+    import sqlite3
+    return sqlite3.Binary(b)
+
+
+def _unpack(b):
+    import struct
+    b = bytes(b)
+    return struct.unpack('<%dd' % (len(b) // 8), b)
+
+
+class persistent_cache(base):
+
+    """
+    Meta-problem storing the fitness and constraint vectors of the wrapped problem in an
+    on-disk store, shared by all the processes using the same file.
+    """
+
+    def __init__(self, problem=None, path='pagmo_cache.db', max_entries=1000000, fingerprint=None):
+        """
+        Wraps a problem so that its evaluations are stored in, and retrieved from, an SQLite database
+
+        NOTE: only worth it for expensive problems (e.g. cassini_2, messenger_full, gtoc_1, py_pl2pl), as
+        a lookup costs tens of microseconds. The wrapper uses the default (minimisation) comparison of
+        fitness vectors and cannot wrap stochastic problems.
+
+        USAGE: problem.persistent_cache(problem=problem.cassini_2(), path='cassini_2.db', max_entries=1000000, fingerprint=None)
+
+        * problem: PyGMO problem one wants to cache
+        * path: database file, created if it does not exist. It must be on a local filesystem
+        * max_entries: maximum number of decision vectors kept in the store, for all the problems
+          sharing it. The least recently used ones are evicted first
+        * fingerprint: string identifying the problem in the store. Defaults to a hash of the type
+          and of the string representation of the problem, which must then reflect all the parameters
+          affecting the evaluation: pass an explicit fingerprint otherwise (e.g. for a problem
+          implemented in Python whose __str__ does not show its parameters)
+        """
+        import hashlib
+        import os
+        if problem is None:
+            from PyGMO.problem import ackley
+            problem = ackley(1)
+        if hasattr(problem, 'seed'):
+            raise ValueError('stochastic problems cannot be cached')
+        if max_entries < 1:
+            raise ValueError('max_entries must be positive')
+        super(persistent_cache, self).__init__(
+            problem.dimension, problem.i_dimension, problem.f_dimension,
+            problem.c_dimension, problem.ic_dimension, list(problem.c_tol))
+        self.set_bounds(problem.lb, problem.ub)
+        if fingerprint is None:
+            fingerprint = hashlib.sha1((str(type(problem)) + str(problem)).encode('utf-8')).hexdigest()
+        self._problem = problem
+        self._path = os.path.abspath(path)
+        self._max_entries = max_entries
+        self._fingerprint = fingerprint
+        # Keys and vectors of the last lookup, see _lookup().
+        self._last = (None, None)
+        # Create the store now, so that a wrong path is reported here.
+        _connection(self._path)
+
+    def _lookup(self, xs):
+        """List of (fitness, constraints) pairs of the decision vectors in xs."""
+        import time
+        keys = [_pack(x) for x in xs]
+        # Fitness and constraints are always requested in pairs (first one, then the other),
+        # the second request is served by the vectors kept from the first one.
+        if self._last[0] == keys:
+            retval, self._last = self._last[1], (None, None)
+            return retval
+        conn = _connection(self._path)
+        retval, misses = [], []
+        for i, key in enumerate(keys):
+            row = conn.execute('SELECT f, c FROM entries WHERE fingerprint = ? AND x = ?', (self._fingerprint, _blob(key))).fetchone()
+            if row is None:
+                misses.append(i)
+                retval.append(None)
+            else:
+                retval.append((_unpack(row[0]), _unpack(row[1])))
+        # The store is not locked during the evaluations: another process evaluating the same
+        # decision vectors at the same time is harmless, the first rows inserted win.
+        for i in misses:
+            retval[i] = (tuple(self._problem.objfun(xs[i])),
+                         tuple(self._problem.compute_constraints(xs[i])) if self.c_dimension else ())
+        now, missed = time.time(), set(misses)
+        with _transaction(conn):
+            inserted = 0
+            for i, key in enumerate(keys):
+                if i not in missed:
+                    conn.execute('UPDATE entries SET last_used = ? WHERE fingerprint = ? AND x = ?',
+                                 (now, self._fingerprint, _blob(key)))
+                else:
+                    inserted += conn.execute('INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?)',
+                                             (self._fingerprint, _blob(key), _blob(_pack(retval[i][0])),
+                                              _blob(_pack(retval[i][1])), now)).rowcount
+            if inserted:
+                n = conn.execute("SELECT value FROM meta WHERE key = 'entries'").fetchone()[0] + inserted
+                if n > self._max_entries:
+                    evicted = conn.execute('DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY last_used LIMIT ?)',
+                                           (n - self._max_entries,)).rowcount
+                    n -= evicted
+                    conn.execute("UPDATE meta SET value = value + ? WHERE key = 'evictions'", (evicted,))
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'entries'", (n,))
+            self._count(conn, len(keys) - len(misses), len(misses))
+        self._last = (keys, retval)
+        return retval
+
+    def _count(self, conn, hits, misses):
+        conn.execute('INSERT OR IGNORE INTO stats VALUES (?, 0, 0)', (self._fingerprint,))
+        conn.execute('UPDATE stats SET hits = hits + ?, misses = misses + ? WHERE fingerprint = ?',
+                     (hits, misses, self._fingerprint))
+
+    def _objfun_impl(self, x):
+        return self._lookup([x])[0][0]
+
+    def _compute_constraints_impl(self, x):
+        return self._lookup([x])[0][1]
+
+    def _objfun_batch_impl(self, X):
+        return [f for f, c in self._lookup(X.tolist())]
+
+    def _compute_constraints_batch_impl(self, X):
+        return [c for f, c in self._lookup(X.tolist())]
+
+    def stats(self):
+        """
+        Returns the statistics of the store, accumulated by all the processes using it
+
+        USAGE: s = prob.stats()
+
+        The returned dictionary holds the number of hits, misses and the hit rate for the
+        fingerprint of this problem, and the number of entries and evictions of the whole store.
+        """
+        conn = _connection(self._path)
+        row = conn.execute('SELECT hits, misses FROM stats WHERE fingerprint = ?', (self._fingerprint,)).fetchone()
+        hits, misses = row if row is not None else (0, 0)
+        meta = dict(conn.execute('SELECT key, value FROM meta').fetchall())
+        return {'hits': hits, 'misses': misses, 'hit_rate': float(hits) / (hits + misses) if hits + misses else 0.,
+                'entries': meta['entries'], 'evictions': meta['evictions']}
+
+    def clear(self):
+        """
+        Removes the entries and the statistics of this problem from the store
+
+        USAGE: prob.clear()
+        """
+        conn = _connection(self._path)
+        with _transaction(conn):
+            n = conn.execute('DELETE FROM entries WHERE fingerprint = ?', (self._fingerprint,)).rowcount
+            conn.execute("UPDATE meta SET value = value - ? WHERE key = 'entries'", (n,))
+            conn.execute('DELETE FROM stats WHERE fingerprint = ?', (self._fingerprint,))
+        self._last = (None, None)
+
+    @property
+    def problem(self):
+        """Copy of the wrapped problem."""
+        from copy import deepcopy
+        return deepcopy(self._problem)
+
+    @property
+    def fingerprint(self):
+        """String identifying the wrapped problem in the store."""
+        return self._fingerprint
+
+    def get_name(self):
+        return self._problem.get_name() + ' [persistent cache]'
+
+    def human_readable_extra(self):
+        return '\n\tStore: ' + self._path + '\n\tMaximum entries: ' + str(self._max_entries) + \
+            '\n\tFingerprint: ' + self._fingerprint + '\n\tWrapped problem:\n' + str(self._problem)
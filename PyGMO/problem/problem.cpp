@@ -62,6 +62,21 @@ static inline tuple find_subsequence_wrapper_cs(const problem::tsp_cs& p, const
 	return boost::python::make_tuple(retval_p,retval_l,retval_it_l,retval_it_r);
 }
 
+// Batch evaluation of fitness and constraint vectors.
+static inline std::vector<fitness_vector> problem_objfun_batch(const problem::base &p, const std::vector<decision_vector> &x)
+{
+	std::vector<fitness_vector> retval;
+	p.objfun_batch(retval,x);
+	return retval;
+}
+
+static inline std::vector<constraint_vector> problem_compute_constraints_batch(const problem::base &p, const std::vector<decision_vector> &x)
+{
+	std::vector<constraint_vector> retval;
+	p.compute_constraints_batch(retval,x);
+	return retval;
+}
+
 // Wrapper to expose problems.
 template <class Problem>
 static inline class_<Problem,bases<problem::base> > problem_wrapper(const char *name, const char *descr)
@@ -172,6 +187,7 @@ BOOST_PYTHON_MODULE(_problem) {
 		.def(self == self)
 		.def(self != self)
 		.def("is_compatible",&problem::base::is_compatible,"Check compatibility with other problem.")
+		.def("is_thread_safe",&problem::base::is_thread_safe,"Check whether the problem can be evaluated by threads not holding the Python GIL (i.e., it does not call into Python).")
 		.def("reset_caches",&problem::base::reset_caches,"Resets the internal caching system of PyGMO that stores previos calls to the objective function/ constraint function. This method should be called whenever a problem object is changed and the change affects the objective function.")
 		// Comparisons.
 		.def("compare_x",&problem::base::compare_x,"Compare decision vectors.")
@@ -180,11 +196,13 @@ BOOST_PYTHON_MODULE(_problem) {
 		// Constraints.
 		.def("compare_constraints",&problem::base::compare_constraints,"Compare constraint vectors.")
 		.def("compute_constraints",return_constraints(&problem::base::compute_constraints),"Compute and return constraint vector.")
+		.def("compute_constraints_batch",&problem_compute_constraints_batch,"Compute and return the constraint vectors of several decision vectors at once.")
 		.def("test_constraint",&problem::base::test_constraint,"Determine feasibility of the i-th constraint.")
 		.def("feasibility_x",&problem::base::feasibility_x,"Determine feasibility of decision vector.")
 		.def("feasibility_c",&problem::base::feasibility_c,"Determine feasibility of constraint vector.")
 		// Fitness.
 		.def("objfun",return_fitness(&problem::base::objfun),"Compute and return fitness vector.")
+		.def("objfun_batch",&problem_objfun_batch,"Compute and return the fitness vectors of several decision vectors at once.")
 		.def("compare_fitness",&problem::base::compare_fitness,"Compare fitness vectors.")
 		// Virtual methods that can be (re)implemented.
 		.def("get_name",&problem::base::get_name,&problem::python_base::default_get_name)
@@ -202,6 +220,11 @@ BOOST_PYTHON_MODULE(_problem) {
 		.add_property("best_c",make_function(&problem::base::get_best_c,return_value_policy<copy_const_reference>()),"Best known constraints vector(s).")
 		.add_property("fevals",&problem::base::get_fevals,"Number of function evaluations.")
 		.add_property("cevals",&problem::base::get_cevals,"Number of constraints evaluations.")
+		// Caches.
+		.add_property("cache_capacity",&problem::base::get_cache_capacity,&problem::base::set_cache_capacity,"Maximum number of entries of the fitness and of the constraint caches. 0 disables caching.")
+		.add_property("cache_hits",&problem::base::get_cache_hits,"Number of evaluations answered by the caches.")
+		.add_property("cache_misses",&problem::base::get_cache_misses,"Number of evaluations not answered by the caches.")
+		.add_property("cache_evictions",&problem::base::get_cache_evictions,"Number of entries evicted from the caches.")
 		.def_pickle(python_class_pickle_suite<problem::python_base>());
 
 	// Expose base stochastic problem class, including the virtual methods. Here we explicitly
@@ -228,6 +251,7 @@ BOOST_PYTHON_MODULE(_problem) {
 		.def(self == self)
 		.def(self != self)
 		.def("is_compatible",&problem::base::is_compatible,"Check compatibility with other problem.")
+		.def("is_thread_safe",&problem::base::is_thread_safe,"Check whether the problem can be evaluated by threads not holding the Python GIL (i.e., it does not call into Python).")
 		// Comparisons.
 		.def("compare_x",&problem::base::compare_x,"Compare decision vectors.")
 		.def("verify_x",&problem::base::verify_x,"Check if decision vector is compatible with problem.")
@@ -235,11 +259,13 @@ BOOST_PYTHON_MODULE(_problem) {
 		// Constraints.
 		.def("compare_constraints",&problem::base::compare_constraints,"Compare constraint vectors.")
 		.def("compute_constraints",return_constraints(&problem::base::compute_constraints),"Compute and return constraint vector.")
+		.def("compute_constraints_batch",&problem_compute_constraints_batch,"Compute and return the constraint vectors of several decision vectors at once.")
 		.def("test_constraint",&problem::base::test_constraint,"Determine feasibility of the i-th constraint.")
 		.def("feasibility_x",&problem::base::feasibility_x,"Determine feasibility of decision vector.")
 		.def("feasibility_c",&problem::base::feasibility_c,"Determine feasibility of constraint vector.")
 		// Fitness.
 		.def("objfun",return_fitness(&problem::base::objfun),"Compute and return fitness vector.")
+		.def("objfun_batch",&problem_objfun_batch,"Compute and return the fitness vectors of several decision vectors at once.")
 		.def("compare_fitness",&problem::base::compare_fitness,"Compare fitness vectors.")
 		// Seed.
 		.add_property("seed",&problem::base_stochastic::get_seed,&problem::base_stochastic::set_seed,"Random seed used in the objective function evaluation.")
@@ -244,6 +244,29 @@ BOOST_PYTHON_MODULE(_problem_space) {
         .add_property("epochs", make_function(&problem::tsp_ds::get_epochs, return_value_policy<copy_const_reference>()), "epoch schedule")
         .add_property("max_DV", &problem::tsp_ds::get_max_DV );
 
+	// Cache of the ephemerides and of the Lambert solutions of the AstroToolbox problems, shared by all the islands.
+	class_<problem::trajectory_cache>("trajectory_cache","Shared cache of planetary ephemerides and Lambert solutions (disabled by default).",no_init)
+		.def("set_tolerance", &problem::trajectory_cache::set_tolerance,"Enable the cache with tolerance *tol* on the positions [km], or disable it if *tol* is zero.",boost::python::args("tol"))
+		.staticmethod("set_tolerance")
+		.def("get_tolerance", &problem::trajectory_cache::get_tolerance,"Get the tolerance on the positions [km] (zero if the cache is disabled).")
+		.staticmethod("get_tolerance")
+		.def("set_capacity", &problem::trajectory_cache::set_capacity,"Set the maximum number of entries of each table to *n*.",boost::python::args("n"))
+		.staticmethod("set_capacity")
+		.def("get_capacity", &problem::trajectory_cache::get_capacity,"Get the maximum number of entries of each table.")
+		.staticmethod("get_capacity")
+		.def("clear", &problem::trajectory_cache::clear,"Remove all the entries and reset the counters.")
+		.staticmethod("clear")
+		.def("get_size", &problem::trajectory_cache::get_size,"Get the number of entries.")
+		.staticmethod("get_size")
+		.def("get_ephemerides_hits", &problem::trajectory_cache::get_ephemerides_hits,"Get the number of nodes of the ephemerides grids found in the cache.")
+		.staticmethod("get_ephemerides_hits")
+		.def("get_ephemerides_misses", &problem::trajectory_cache::get_ephemerides_misses,"Get the number of nodes of the ephemerides grids computed.")
+		.staticmethod("get_ephemerides_misses")
+		.def("get_lambert_hits", &problem::trajectory_cache::get_lambert_hits,"Get the number of Lambert solutions found in the cache.")
+		.staticmethod("get_lambert_hits")
+		.def("get_lambert_misses", &problem::trajectory_cache::get_lambert_misses,"Get the number of Lambert problems solved.")
+		.staticmethod("get_lambert_misses");
+
 #ifdef PAGMO_ENABLE_GSL
 	// Spheres Problems
 	stochastic_problem_wrapper<problem::spheres>("mit_spheres", "Spheres problem, a neurocontroller for the MIT test-bed (absolute perception-action)")
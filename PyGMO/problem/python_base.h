@@ -28,6 +28,7 @@
 #include <boost/numeric/conversion/cast.hpp>
 #include <boost/python/class.hpp>
 #include <string>
+#include <vector>
 
 #include "../../src/config.h"
 #include "../../src/exceptions.h"
@@ -72,6 +73,11 @@ class __PAGMO_VISIBLE python_base: public base, public boost::python::wrapper<ba
 			}
 			return retval;
 		}
+		// Python problems can be evaluated only by threads holding the GIL.
+		bool is_thread_safe() const
+		{
+			return false;
+		}
 		std::string get_name() const
 		{
 			if (boost::python::override f = this->get_override("get_name")) {
@@ -108,6 +114,12 @@ class __PAGMO_VISIBLE python_base: public base, public boost::python::wrapper<ba
 			if (boost::python::override f = this->get_override("_objfun_impl")) {
 				return f(x);
 			}
+			if (boost::python::override e = this->get_override("_evaluate_impl")) {
+				fitness_vector f;
+				constraint_vector c;
+				py_evaluate_call(e,x,f,c);
+				return f;
+			}
 			pagmo_throw(not_implemented_error,"objective function has not been implemented");
 		}
 		std::string get_typename() const
@@ -171,11 +183,40 @@ class __PAGMO_VISIBLE python_base: public base, public boost::python::wrapper<ba
 			if (this->get_override("_compute_constraints_impl")) {
 				// If the function is overridden, use it.
 				c = py_compute_constraints_impl(x);
+			} else if (boost::python::override e = this->get_override("_evaluate_impl")) {
+				fitness_vector f;
+				py_evaluate_call(e,x,f,c);
 			} else {
 				// Otherwise, avoid memory allocation by calling the base function directly.
 				base::compute_constraints_impl(c,x);
 			}
 		}
+		bool evaluate_impl(fitness_vector &f, constraint_vector &c, const decision_vector &x) const
+		{
+			if (boost::python::override e = this->get_override("_evaluate_impl")) {
+				// Fitness and constraints are computed by the same Python call.
+				py_evaluate_call(e,x,f,c);
+				return true;
+			}
+			return false;
+		}
+		void objfun_batch_impl(std::vector<fitness_vector> &f, const std::vector<decision_vector> &x) const
+		{
+			if (boost::python::override py_f = this->get_override("_objfun_batch_impl")) {
+				// If the batch method is implemented, evaluate all the decision vectors with a single call.
+				py_batch_call(py_f,x,get_dimension(),f,get_f_dimension());
+			} else {
+				base::objfun_batch_impl(f,x);
+			}
+		}
+		void compute_constraints_batch_impl(std::vector<constraint_vector> &c, const std::vector<decision_vector> &x) const
+		{
+			if (boost::python::override py_f = this->get_override("_compute_constraints_batch_impl")) {
+				py_batch_call(py_f,x,get_dimension(),c,get_c_dimension());
+			} else {
+				base::compute_constraints_batch_impl(c,x);
+			}
+		}
         bool compare_fitness_impl(const fitness_vector &f0, const fitness_vector &f1) const
         {
             if(this->get_override("_compare_fitness_impl")) {
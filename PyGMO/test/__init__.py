@@ -34,6 +34,8 @@ class _serialization_test(_ut.TestCase):
         # txt data files
         prob_list = deepcopy(problem_list)
         prob_list.remove(problem.cec2013)
+        # ... or without creating a database file
+        prob_list.remove(problem.persistent_cache)
 
         # Remove trajectory problems if PyKEP is not installed
         try:
@@ -50,6 +52,46 @@ class _serialization_test(_ut.TestCase):
                     a.push_back(isl(algo(), prob(), 20))
                     pickle.loads(pickle.dumps(a))
 
+    def test_binary_pickle(self):
+        from PyGMO import archipelago, local_island, algorithm, problem, population, serialization_mode, get_serialization_mode
+        import pickle
+        a = archipelago()
+        a.push_back(local_island(algorithm.de(5), problem.zdt(1), 20))
+        a.push_back(local_island(algorithm.ms(), problem.rosenbrock(10), 20))
+        pop = population(problem.dejong(10), 20)
+        self.assertEqual(get_serialization_mode(), 'text')
+        with serialization_mode('binary'):
+            s_a = pickle.dumps(a)
+            s_pop = pickle.dumps(pop)
+        self.assertEqual(get_serialization_mode(), 'text')
+        # Binary and text archives must both be loadable, whatever the current mode.
+        for mode in ['text', 'binary']:
+            with serialization_mode(mode):
+                b = pickle.loads(s_a)
+                pop_b = pickle.loads(pickle.dumps(pop))
+            self.assertEqual(len(b), len(a))
+            for i in range(len(a)):
+                self.assertEqual(b[i].algorithm.get_name(), a[i].algorithm.get_name())
+                self.assertEqual(b[i].population.champion.x, a[i].population.champion.x)
+            self.assertEqual(pop_b.champion.f, pop.champion.f)
+            for i in range(len(pop)):
+                self.assertEqual(pop_b[i].cur_x, pop[i].cur_x)
+                self.assertEqual(pop_b.get_domination_list(i), pop.get_domination_list(i))
+        pop_b = pickle.loads(s_pop)
+        for i in range(len(pop)):
+            self.assertEqual(pop_b[i].cur_x, pop[i].cur_x)
+            self.assertEqual(pop_b[i].cur_f, pop[i].cur_f)
+        self.assertRaises(ValueError, serialization_mode, 'xml')
+        # The mode selected by the context manager is local to the thread.
+        import threading
+        modes = []
+        with serialization_mode('binary'):
+            t = threading.Thread(target=lambda: modes.append(get_serialization_mode()))
+            t.start()
+            t.join()
+            self.assertEqual(get_serialization_mode(), 'binary')
+        self.assertEqual(modes, ['text'])
+
 # This class will stress the island and archipelago classes with highly
 # concurrent simple evolutions.
 
@@ -88,6 +130,34 @@ class _island_torture_test(_ut.TestCase):
             for prob in prob_list:
                 self.__test_impl(isl_type, algo, prob)
 
+    @_ut.skipIf(platform.system() == "Windows", "The mp_island test cannot be run on Windows")
+    def test_mp_island(self):
+        from PyGMO import mp_island, algorithm, problem
+        isl_type = mp_island
+        algo_list = [algorithm.py_example(1), algorithm.de(5)]
+        prob_list = [problem.py_example(), problem.dejong(1)]
+        for algo in algo_list:
+            for prob in prob_list:
+                self.__test_impl(isl_type, algo, prob)
+
+    @_ut.skipIf(platform.system() == "Windows", "The executor_island test cannot be run on Windows")
+    def test_executor_island(self):
+        from PyGMO import executor_island, algorithm, problem
+        try:
+            from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+        except ImportError:
+            return
+        algo_list = [algorithm.py_example(1), algorithm.de(5)]
+        prob_list = [problem.py_example(), problem.dejong(1)]
+        # All the islands share the same few workers.
+        for executor in [ThreadPoolExecutor(4), ProcessPoolExecutor(2)]:
+            def isl_type(algo, prob, n):
+                return executor_island(algo, prob, n, executor=executor)
+            for algo in algo_list:
+                for prob in prob_list:
+                    self.__test_impl(isl_type, algo, prob)
+            executor.shutdown()
+
     def test_ipy_island(self):
         from PyGMO import ipy_island, algorithm, problem
         try:
@@ -111,11 +181,352 @@ class _island_torture_test(_ut.TestCase):
                 self.__test_impl(isl_type, algo, prob)
 
 
+class _py_island_test(_ut.TestCase):
+
+    @_ut.skipIf(platform.system() == "Windows", "The py_island test cannot be run on Windows")
+    def test_shared_memory_roundtrip(self):
+        from PyGMO import py_island, algorithm, problem, population
+        pop = population(problem.zdt(1), 30)
+        for use_shm in [True, False]:
+            isl = py_island(algorithm.null(), pop)
+            isl.use_shared_memory = use_shm
+            isl.evolve(1)
+            isl.join()
+            out = isl.population
+            self.assertEqual(len(out), len(pop))
+            self.assertEqual(out.champion.x, pop.champion.x)
+            for i in range(len(pop)):
+                self.assertEqual(out[i].cur_x, pop[i].cur_x)
+                self.assertEqual(out[i].cur_v, pop[i].cur_v)
+                self.assertEqual(out[i].best_f, pop[i].best_f)
+                self.assertEqual(sorted(out.get_domination_list(i)), sorted(pop.get_domination_list(i)))
+
+    @_ut.skipIf(platform.system() == "Windows", "The py_island test cannot be run on Windows")
+    def test_problem_state(self):
+        from PyGMO import py_island, algorithm, problem, population
+        pop = population(problem.dejong(5), 20, 42)
+        for use_shm in [True, False]:
+            isl = py_island(algorithm.de(5), pop)
+            isl.use_shared_memory = use_shm
+            isl.evolve(1)
+            isl.join()
+            # The evaluations performed by the child process are accounted for.
+            self.assertTrue(isl.population.problem.fevals > pop.problem.fevals)
+
+
+class _mp_island_test(_ut.TestCase):
+
+    @_ut.skipIf(platform.system() == "Windows", "The mp_island test cannot be run on Windows")
+    def test_problem_state(self):
+        from PyGMO import mp_island, local_island, algorithm, problem, population
+        pop = population(problem.dejong(5), 20, 42)
+        fevals = pop.problem.fevals
+        # The evaluations performed by the worker are accounted for, at every evolution.
+        isl = mp_island(algorithm.de(5), pop)
+        for i in range(2):
+            isl.evolve(1)
+            isl.join()
+            self.assertTrue(isl.population.problem.fevals > fevals)
+            fevals = isl.population.problem.fevals
+        # The fingerprint of the residents is computed again only when they are replaced.
+        fp = isl._mp_fp
+        isl.evolve(1)
+        isl.join()
+        self.assertEqual(isl._mp_fp, fp)
+        isl.algorithm = algorithm.de(10)
+        self.assertFalse('_mp_fp' in isl.__dict__)
+        isl.evolve(1)
+        isl.join()
+        self.assertNotEqual(isl._mp_fp, fp)
+        self.assertTrue(isl.population.problem.fevals > fevals)
+
+
+class _problem_test(_ut.TestCase):
+
+    def test_cache(self):
+        from PyGMO import problem, population
+        import pickle
+        prob = problem.ackley(5)
+        x = [list(ind.cur_x) for ind in population(prob, 10)]
+        self.assertEqual(prob.cache_capacity, 5)
+        prob.cache_capacity = 100
+        prob.reset_caches()
+        fevals, hits, misses = prob.fevals, prob.cache_hits, prob.cache_misses
+        for i in range(3):
+            for xi in x:
+                prob.objfun(xi)
+        self.assertEqual(prob.fevals, fevals + 10)
+        self.assertEqual(prob.cache_hits, hits + 20)
+        self.assertEqual(prob.cache_misses, misses + 10)
+        # The capacity survives pickling, the entries do not.
+        prob2 = pickle.loads(pickle.dumps(prob))
+        self.assertEqual(prob2.cache_capacity, 100)
+        prob2.objfun(x[0])
+        self.assertEqual(prob2.fevals, fevals + 11)
+        prob.cache_capacity = 0
+        prob.objfun(x[0])
+        self.assertEqual(prob.fevals, fevals + 11)
+
+    def test_evaluate_impl(self):
+        from PyGMO import problem, population
+
+        class fused(problem.base):
+
+            def __init__(self, c_dim=1):
+                super(fused, self).__init__(3, 0, 1, c_dim, c_dim)
+                self.set_bounds(-1, 1)
+                self.simulations = 0
+
+            def _evaluate_impl(self, x):
+                self.simulations += 1
+                return (sum([xi ** 2 for xi in x]),), (sum(x) - 1,)[:self.c_dimension]
+
+        x = [.1, .2, .3]
+        f, c = (sum([xi ** 2 for xi in x]),), (sum(x) - 1,)
+        prob = fused()
+        self.assertEqual(prob.compute_constraints(x), c)
+        self.assertEqual(prob.objfun(x), f)
+        self.assertEqual((prob.simulations, prob.fevals, prob.cevals), (1, 1, 1))
+        # Each individual is simulated once.
+        pop = population(prob, 10)
+        pop.set_x(0, x)
+        self.assertEqual(pop[0].cur_c, c)
+        self.assertEqual(pop.problem.simulations, 11)
+        # Unconstrained problems use _evaluate_impl() as objective function.
+        prob = fused(0)
+        self.assertEqual(prob.objfun(x), f)
+        self.assertEqual(prob.simulations, 1)
+
+    def test_persistent_cache(self):
+        from PyGMO import problem, population
+        import os
+        import pickle
+        import shutil
+        import tempfile
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'cache.db')
+            prob = problem.persistent_cache(problem.cec2006(4), path, max_entries=12)
+            pop = population(prob, 10)
+            self.assertEqual(prob.stats()['misses'], 10)
+            self.assertEqual(prob.stats()['entries'], 10)
+            # Another instance of the same problem, e.g. in another process, finds the stored vectors.
+            prob2 = pickle.loads(pickle.dumps(problem.persistent_cache(problem.cec2006(4), path, max_entries=12)))
+            self.assertEqual(prob2.fingerprint, prob.fingerprint)
+            for ind in pop:
+                self.assertEqual(prob2.objfun(ind.cur_x), ind.cur_f)
+                self.assertEqual(prob2.compute_constraints(ind.cur_x), ind.cur_c)
+            s = prob2.stats()
+            self.assertEqual((s['hits'], s['misses'], s['hit_rate']), (10, 10, 0.5))
+            # A different problem gets its own entries, evicting the least recently used ones.
+            prob3 = problem.persistent_cache(problem.cec2006(5), path, max_entries=12)
+            self.assertNotEqual(prob3.fingerprint, prob.fingerprint)
+            population(prob3, 5)
+            s = prob3.stats()
+            self.assertEqual((s['hits'], s['misses'], s['entries'], s['evictions']), (0, 5, 12, 3))
+            prob3.clear()
+            self.assertEqual(prob3.stats()['entries'], 7)
+            self.assertEqual(prob.stats()['hits'], 10)
+            self.assertRaises(ValueError, problem.persistent_cache, problem.inventory(), path)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+class _population_test(_ut.TestCase):
+
+    def test_get_array(self):
+        from PyGMO import problem, population
+        pop = population(problem.zdt(1), 20)
+        for field in ['cur_x', 'cur_v', 'cur_c', 'cur_f', 'best_x', 'best_c', 'best_f']:
+            arr = pop.get_array(field)
+            self.assertEqual(arr.shape[0], len(pop))
+            for i in range(len(pop)):
+                self.assertEqual(tuple(arr[i]), getattr(pop[i], field))
+        self.assertEqual(population(problem.zdt(1)).get_array('cur_f').shape, (0, 2))
+        self.assertRaises(ValueError, pop.get_array, 'foo')
+
+    def test_set_array(self):
+        from PyGMO import problem, population
+        pop1 = population(problem.zdt(1), 20)
+        pop2 = population(pop1)
+        x = population(problem.zdt(1), 20).get_array('cur_x')
+        for i in range(len(pop1)):
+            pop1.set_x(i, x[i])
+        pop2.set_array('cur_x', x)
+        self.assertEqual(pop2.champion.x, pop1.champion.x)
+        for i in range(len(pop1)):
+            self.assertEqual(pop2[i].cur_f, pop1[i].cur_f)
+            self.assertEqual(pop2[i].best_x, pop1[i].best_x)
+            self.assertEqual(sorted(pop2.get_domination_list(i)), sorted(pop1.get_domination_list(i)))
+        pop2.set_array('cur_v', x)
+        self.assertEqual(pop2[3].cur_v, tuple(x[3]))
+        self.assertRaises(ValueError, pop2.set_array, 'cur_x', x[1:])
+        self.assertRaises(ValueError, pop2.set_array, 'cur_f', x)
+
+    def test_batch(self):
+        from PyGMO import problem, population
+        pop1 = population(problem.zdt(1), 10)
+        pop2 = population(problem.zdt(1))
+        x = [ind.cur_x for ind in pop1]
+        pop2.push_back_batch(x)
+        self.assertEqual(len(pop2), len(pop1))
+        self.assertTrue(pop2.dom_tracking)
+        pop2.dom_tracking = False
+        self.assertRaises(ValueError, pop2.get_domination_list, 0)
+        pop2.dom_tracking = True
+        self.assertEqual(pop2.compute_pareto_fronts(), pop1.compute_pareto_fronts())
+        pop2.set_x_batch([0, 5], [x[1], x[2]])
+        self.assertEqual(pop2[5].cur_x, x[2])
+        self.assertRaises(ValueError, pop2.set_x_batch, [0], [])
+
+    def test_nds(self):
+        from PyGMO import problem, population, nds_type
+        pop = population(problem.zdt(1), 100)
+        fronts = pop.compute_pareto_fronts()
+        for method in [nds_type.ens, nds_type.sweep_2d]:
+            pop.nds_method = method
+            self.assertEqual(pop.compute_pareto_fronts(), fronts)
+            self.assertEqual(pop.compute_first_front(), fronts[0])
+        pop = population(problem.dtlz(2, 5, 3), 100)
+        self.assertRaises(ValueError, setattr, pop, 'nds_method', nds_type.sweep_2d)
+
+    def test_packed_population(self):
+        from PyGMO import problem, population, packed_population, local_island, algorithm
+        import copy
+        pop = population(problem.zdt(1), 20)
+        packed = copy.copy(packed_population(pop))
+        self.assertEqual(len(packed), len(pop))
+        self.assertTrue(packed.memory_footprint < pop.memory_footprint)
+        for field in ['cur_x', 'cur_v', 'cur_f', 'best_x', 'best_f']:
+            self.assertEqual(packed.get_array(field).tolist(), pop.get_array(field).tolist())
+        pop2 = packed.unpack()
+        self.assertEqual(pop2.champion.x, pop.champion.x)
+        self.assertEqual(pop2.compute_pareto_fronts(), pop.compute_pareto_fronts())
+        for i in range(len(pop)):
+            self.assertEqual(pop2.get_domination_list(i), pop.get_domination_list(i))
+        isl = local_island(algorithm.null(), pop)
+        self.assertEqual(isl.get_packed_population().get_array('cur_x').tolist(), pop.get_array('cur_x').tolist())
+
+    def test_race_threads(self):
+        from PyGMO import problem, population
+        import copy
+        pop = population(problem.noisy(problem.ackley(5), 1, 0, 0.5), 20)
+        pop2 = copy.copy(pop)
+        self.assertEqual(pop.race(3, n_threads=1), pop2.race(3, n_threads=4))
+        self.assertRaises(ValueError, pop.race, 3, n_threads=0)
+        pop = population(problem.noisy(problem.py_example(), 1, 0, 0.5), 20)
+        self.assertRaises(ValueError, pop.race, 3, n_threads=4)
+
+    def test_population_file(self):
+        from PyGMO import problem, population, util
+        import os
+        import shutil
+        import tempfile
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'run.pop')
+            prob = problem.cec2006(4)
+            pops = [population(prob, 10), population(prob, 5)]
+            util.save_population(pops[0], path)
+            with util.population_writer(path, prob) as w:
+                w.append(pops[1])
+            self.assertRaises(ValueError, util.population_writer, path, problem.ackley(3))
+            pf = util.population_file(path)
+            self.assertEqual(len(pf), 15)
+            self.assertEqual(pf.problem.dimension, prob.dimension)
+            for field in ['cur_x', 'cur_v', 'cur_c', 'cur_f', 'best_x', 'best_c', 'best_f']:
+                self.assertEqual(pf.get_array(field, 10).tolist(), pops[1].get_array(field).tolist())
+            pop = pf.population(0, 10)
+            self.assertEqual(pop.get_array('best_f').tolist(), pops[0].get_array('best_f').tolist())
+            self.assertEqual(pop.champion.f, pops[0].champion.f)
+            self.assertEqual(len(pf.population(3, 3)), 0)
+            a = pf.analysis(5, 15)
+            self.assertEqual(a.npoints, 10)
+            del pf
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_objfun_batch(self):
+        from PyGMO import problem, population, algorithm, util
+
+        class batch_sphere(problem.base):
+
+            calls = []
+
+            def __init__(self, dim=5, c_dim=1):
+                super(batch_sphere, self).__init__(dim, 0, 1, c_dim, c_dim)
+                self.set_bounds(-1, 1)
+
+            def _objfun_impl(self, x):
+                self.calls.append(1)
+                return (sum([xi * xi for xi in x]),)
+
+            def _objfun_batch_impl(self, X):
+                self.calls.append(len(X))
+                return (X ** 2).sum(axis=1)
+
+            def _compute_constraints_impl(self, x):
+                return (x[0] - 0.5,)
+
+            def _compute_constraints_batch_impl(self, X):
+                return X[:, :1] - 0.5
+
+        prob = batch_sphere()
+        pop = population(prob, 50)
+        self.assertEqual(batch_sphere.calls, [50])
+        for i in range(len(pop)):
+            self.assertAlmostEqual(pop[i].cur_f[0], sum([xi * xi for xi in pop[i].cur_x]))
+            self.assertAlmostEqual(pop[i].cur_c[0], pop[i].cur_x[0] - 0.5)
+        pop.push_back_batch([[0.1] * 5, [0.2] * 5])
+        pop.set_x_batch([0, 1], [[0.3] * 5, [0.4] * 5])
+        self.assertEqual(batch_sphere.calls, [50, 2, 2])
+        # Every generation of sga is evaluated with one batch call.
+        del batch_sphere.calls[:]
+        algorithm.sga(gen=2).evolve(population(batch_sphere(c_dim=0), 20))
+        self.assertEqual(batch_sphere.calls.count(20), 3)
+        del batch_sphere.calls[:]
+        util.analysis(prob, 100, output_to_file=False)
+        self.assertEqual(batch_sphere.calls, [100])
+        self.assertEqual(prob.objfun_batch([[0.] * 5, [1.] * 5]), ((0.,), (5.,)))
+        self.assertEqual(len(prob.compute_constraints_batch([[0.] * 5])), 1)
+
+
+def _serialization_benchmark(n_trials=5):
+    """Print size and throughput of the text and binary archive formats."""
+    from PyGMO import archipelago, local_island, algorithm, problem, population, serialization_mode
+    import pickle
+    import time
+    archi = archipelago()
+    for i in range(8):
+        archi.push_back(local_island(algorithm.de(5), problem.ackley(100), 200))
+    objects = [
+        ('problem', problem.ackley(100)),
+        ('algorithm', algorithm.de(5)),
+        ('population', population(problem.ackley(100), 1000)),
+        ('island', archi[0]),
+        ('archipelago', archi)]
+    print('')
+    print('%12s %8s %15s %15s %15s' % ('object', 'mode', 'size [bytes]', 'dumps [ms]', 'loads [ms]'))
+    for name, obj in objects:
+        for mode in ['text', 'binary']:
+            with serialization_mode(mode):
+                start = time.time()
+                for i in range(n_trials):
+                    s = pickle.dumps(obj)
+                t_dumps = (time.time() - start) / n_trials
+                start = time.time()
+                for i in range(n_trials):
+                    pickle.loads(s)
+                t_loads = (time.time() - start) / n_trials
+            print('%12s %8s %15d %15.2f %15.2f' % (name, mode, len(s), 1000 * t_dumps, 1000 * t_loads))
+
+
 def run_serialization_test_suite():
-    """Run the serialization test suite."""
+    """Run the serialization test suite, and report size and throughput of the archive formats."""
     from PyGMO import test
     suite = _ut.TestLoader().loadTestsFromTestCase(_serialization_test)
     _ut.TextTestRunner(verbosity=2).run(suite)
+    _serialization_benchmark()
 
 
 def run_island_torture_test_suite():
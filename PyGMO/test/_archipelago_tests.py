@@ -1,4 +1,5 @@
-from PyGMO import topology, algorithm, problem, archipelago, distribution_type, migration_direction, island, population, migration
+from PyGMO import topology, algorithm, problem, archipelago, distribution_type, migration_direction, island, population, migration, checkpointer, metrics_exporter, migration_history_policy, mp_island
+import platform
 import unittest
 
 
@@ -86,6 +87,28 @@ class ArchipelagoTests(unittest.TestCase):
         top.set_weight(0.0)
         self.do_test_migr_setup(pop_xs, pop_xs, top, 1)
 
+    def test_pending_migrants_pickle(self):
+        """Testing whether the individuals waiting in the migration buffers survive pickling"""
+        import pickle
+        prob = problem.identity()
+        for migr_dir in [migration_direction.source, migration_direction.destination]:
+            archi = archipelago(distribution_type=distribution_type.broadcast, migration_direction=migr_dir)
+            for i in range(4):
+                pop = population(prob)
+                for j in range(3):
+                    pop.push_back((float(i + 1), ))
+                archi.push_back(island(algorithm.null(), pop, s_policy=migration.best_s_policy(), r_policy=migration.fair_r_policy()))
+            top = topology.one_way_ring(4)
+            top.set_weight(1.0)
+            archi.topology = top
+            archi.evolve_batch(1, 1, False)
+            # The emigrants of the last island are still buffered, they must reach the first island in both copies.
+            archi_copy = pickle.loads(pickle.dumps(archi))
+            for a in [archi, archi_copy]:
+                a.evolve_batch(1, 1, False)
+            for isl, isl_copy in zip(archi, archi_copy):
+                self.assertEqual(sorted([ind.cur_f for ind in isl.population]), sorted([ind.cur_f for ind in isl_copy.population]))
+
     def test_distribution_type(self):
         """Testing whether the distribution_type property works"""
 
@@ -99,6 +122,300 @@ class ArchipelagoTests(unittest.TestCase):
 
             self.assertEqual(a.distribution_type, dist_type)
 
+    def test_evolve_async(self):
+        """Testing the awaitable evolution and the per-island completions"""
+        try:
+            import asyncio
+        except ImportError:
+            return
+        loop = asyncio.new_event_loop()
+        try:
+            archi = archipelago(algorithm.de(5), problem.rosenbrock(10), 4, 20)
+            loop.run_until_complete(archi.evolve_async(3, loop=loop))
+            self.assertFalse(archi.busy())
+
+            # Iterate over the completions as async for would do.
+            evolution = archi.evolve_async(3, loop=loop)
+            it = evolution.__aiter__()
+            completed = []
+            while True:
+                try:
+                    completed.append(loop.run_until_complete(it.__anext__()))
+                except StopAsyncIteration:
+                    break
+            self.assertEqual(sorted(completed), list(range(4)))
+            self.assertEqual(evolution.generations, [3] * 4)
+            self.assertTrue(evolution.done())
+
+            # Cancelling detaches the evolution from the loop without interrupting the islands.
+            evolution = archi.evolve_async(50, loop=loop)
+            evolution.cancel()
+            self.assertRaises(asyncio.CancelledError, loop.run_until_complete, evolution)
+            archi.join()
+            loop.run_until_complete(archi.evolve_async(1, loop=loop))
+            self.assertFalse(archi.busy())
+
+            # Without an explicit loop, evolve_async() must be called from a coroutine.
+            self.assertRaises(RuntimeError, archi.evolve_async, 1)
+            archi.evolve(1000)
+            self.assertRaises(RuntimeError, archi.evolve_async, 1, loop)
+            archi.interrupt()
+            archi.join()
+        finally:
+            loop.close()
+
+    def test_checkpoint_restore(self):
+        """Testing incremental checkpoints and the restart from them"""
+        import json
+        import os
+        import shutil
+        import tempfile
+
+        def manifest_islands(path):
+            with open(os.path.join(path, 'manifest.json')) as f:
+                return json.load(f)['islands']
+        path = tempfile.mkdtemp()
+        try:
+            # Unconnected local islands evolve deterministically, regardless of thread scheduling.
+            archi = archipelago(algorithm.de(5), problem.rosenbrock(10), 4, 20)
+            cp = checkpointer(archi, path)
+            cp.evolve(2, 3)
+            restored = archipelago.restore(path)
+            self.assertEqual(len(restored), len(archi))
+            self.assertEqual(restored._state_dumps(), archi._state_dumps())
+            # The restored archipelago resumes exactly where the original is.
+            archi.evolve(2)
+            restored.evolve(2)
+            archi.join()
+            restored.join()
+            for i in range(len(archi)):
+                self.assertEqual([ind.cur_x for ind in restored[i].population], [ind.cur_x for ind in archi[i].population])
+                self.assertEqual(restored[i].population.champion.f, archi[i].population.champion.f)
+
+            # Only the modified islands are rewritten.
+            cp.checkpoint()
+            cp.wait()
+            before = manifest_islands(path)
+            archi[2] = island(algorithm.de(5), problem.rosenbrock(10), 20)
+            cp.checkpoint()
+            cp.wait()
+            after = manifest_islands(path)
+            self.assertEqual([before[i] == after[i] for i in range(4)], [True, True, False, True])
+            cp.checkpoint()
+            cp.wait()
+            self.assertEqual(manifest_islands(path), after)
+            # Chunks no longer referenced are removed.
+            self.assertEqual(len([n for n in os.listdir(path) if n.endswith('.chunk')]), 5)
+        finally:
+            shutil.rmtree(path)
+
+    def test_metrics(self):
+        """Testing the runtime counters of the islands and their export"""
+        import json
+        import os
+        import tempfile
+        archi = archipelago(algorithm.de(5), problem.rosenbrock(10), 4, 20, topology=topology.one_way_ring())
+        self.assertEqual([m['rounds'] for m in archi.metrics()], [0] * 4)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            with metrics_exporter(archi, path, interval=0.01):
+                archi.evolve(3)
+                archi.join()
+            with open(path) as f:
+                lines = [json.loads(l) for l in f]
+        finally:
+            os.remove(path)
+        self.assertTrue(len(lines) >= 1)
+        self.assertEqual(lines[-1]['islands'], archi.metrics())
+        metrics = archi.metrics()
+        for m in metrics:
+            self.assertEqual(m['rounds'], 3)
+            # 5 generations of 20 individuals per round, plus the immigrants.
+            self.assertTrue(m['fevals'] >= 300)
+            self.assertTrue(m['evolution_time'] >= 0)
+            self.assertTrue(m['improvements'] <= 3)
+        self.assertEqual(sum(m['migrants_sent'] for m in metrics), sum(m['migrants_received'] for m in metrics))
+        archi.reset_metrics()
+        self.assertEqual([m['fevals'] for m in archi.metrics()], [0] * 4)
+        try:
+            import numpy
+        except ImportError:
+            return
+        archi.evolve(1)
+        archi.join()
+        a = archi.metrics(as_array=True)
+        self.assertEqual(len(a), 4)
+        self.assertEqual(list(a.rounds), [1] * 4)
+
+    def test_migr_history(self):
+        """Testing the bounded migration history and its queries"""
+        for policy in [migration_history_policy.overwrite, migration_history_policy.decimate]:
+            archi = archipelago(algorithm.de(5), problem.rosenbrock(10), 4, 20, topology=topology.ring())
+            archi.set_migr_history_capacity(16, policy)
+            archi.evolve(20)
+            archi.join()
+            h = archi.get_migr_history()
+            self.assertEqual(h.capacity, 16)
+            self.assertEqual(h.policy, policy)
+            self.assertTrue(len(h) <= 16)
+            self.assertTrue(h.n_events >= len(h))
+            self.assertEqual(len(archi.dump_migr_history().splitlines()), len(h))
+            if policy == migration_history_policy.overwrite:
+                self.assertEqual(h.stride, 1)
+            edges = h.migrants_per_edge()
+            windows = h.migrants_per_window(5)
+            self.assertEqual(sum(edges.values()), sum(windows.values()))
+            for (src, dest) in edges:
+                self.assertTrue(src in [(dest - 1) % 4, (dest + 1) % 4])
+            self.assertTrue(all(w % 5 == 0 for w in windows))
+            archi.clear_migr_history()
+            self.assertEqual(len(archi.get_migr_history()), 0)
+            try:
+                import numpy
+            except ImportError:
+                continue
+            cols = h.as_numpy()
+            self.assertEqual(sorted(cols.keys()), ['count', 'destination', 'round', 'source'])
+            self.assertEqual(int(cols['count'].sum()), sum(edges.values()))
+            self.assertEqual(int(cols['count'][cols['round'] >= 10].sum()), sum(h.migrants_per_edge(10).values()))
+        self.assertRaises(ValueError, archipelago().set_migr_history_capacity, 1)
+
+    def test_termination(self):
+        """Testing the termination criteria"""
+        archi = archipelago(algorithm.de(1), problem.rosenbrock(10), 4, 20, topology=topology.ring())
+
+        def run(n, **kwargs):
+            archi.set_termination(**kwargs)
+            archi.reset_metrics()
+            archi.evolve(n)
+            archi.join()
+            return [m['rounds'] for m in archi.metrics()]
+        # The islands stop after their first round.
+        self.assertEqual(run(1000, target=[1e30]), [1] * 4)
+        self.assertEqual(archi.termination_reason, 'target fitness reached')
+        self.assertEqual(archi.get_termination()['target'], (1e30, ))
+        rounds = run(1000, max_fevals=2000)
+        self.assertEqual(archi.termination_reason, 'fevals budget exhausted')
+        self.assertTrue(sum(rounds) < 4000)
+        self.assertTrue(sum(m['fevals'] for m in archi.metrics()) >= 2000)
+        self.assertTrue(max(run(100000, max_time=100)) < 100000)
+        self.assertEqual(archi.termination_reason, 'time limit reached')
+        # Without criteria all the evolutions are performed.
+        self.assertEqual(run(3), [3] * 4)
+        self.assertEqual(archi.termination_reason, '')
+        # The null algorithm never improves the champion.
+        archi = archipelago(algorithm.null(), problem.rosenbrock(10), 4, 20)
+        self.assertTrue(max(run(1000, stall_rounds=3)) < 1000)
+        self.assertEqual(archi.termination_reason, 'champion stalled')
+        # Islands not started yet by evolve_batch are skipped.
+        archi.set_termination(target=[1e30])
+        archi.reset_metrics()
+        archi.evolve_batch(5, 1, False)
+        self.assertEqual([m['rounds'] for m in archi.metrics()], [1, 0, 0, 0])
+        self.assertRaises(ValueError, archi.set_termination, [1., 2.])
+
+    def test_pool(self):
+        """Testing the pooled execution of the islands"""
+        self.assertTrue(archipelago.get_default_pool_size() >= 1)
+        for dist in [distribution_type.point_to_point, distribution_type.broadcast]:
+            for direction in [migration_direction.source, migration_direction.destination]:
+                archi = archipelago(algorithm.de(1), problem.rosenbrock(10), 12, 20, topology=topology.ring(), distribution_type=dist, migration_direction=direction)
+                self.assertEqual(archi.pool_size, 0)
+                archi.set_pool_size(3)
+                self.assertEqual(archi.pool_size, 3)
+                archi.evolve(4)
+                archi.join()
+                metrics = archi.metrics()
+                self.assertEqual([m['rounds'] for m in metrics], [4] * 12)
+                self.assertTrue(sum(m['migrants_received'] for m in metrics) > 0)
+                self.assertEqual(archipelago(archi).pool_size, 3)
+        archi.set_pool_size()
+        self.assertEqual(archi.pool_size, archipelago.get_default_pool_size())
+        archi.reset_metrics()
+        archi.evolve_batch(2, 5, False)
+        archi.join()
+        self.assertEqual([m['rounds'] for m in archi.metrics()], [2] * 12)
+        archi.evolve_t(50)
+        archi.join()
+        self.assertFalse(archi.busy())
+        archi.set_pool_size(1)
+        archi.evolve(100000)
+        archi.interrupt()
+        self.assertFalse(archi.busy())
+        self.assertTrue(max(m['rounds'] for m in archi.metrics()) < 100000)
+
+    def test_evolve_adaptive(self):
+        """Testing the adaptive allocation of the rounds"""
+        archi = archipelago(algorithm.de(5), problem.rosenbrock(10), 6, 20, topology=topology.ring())
+        archi.evolve_adaptive(30, 2, stall=3)
+        log = archi.get_allocation_log()
+        rounds = [m['rounds'] for m in archi.metrics()]
+        self.assertEqual(len(log), 30)
+        self.assertEqual(sum(rounds), 30)
+        # Each island is evolved at least once before the scores are used.
+        self.assertTrue(min(rounds) >= 1)
+        self.assertEqual(sorted(e['island'] for e in log[:6]), list(range(6)))
+        for e in log:
+            self.assertTrue(e['reward'] >= 0 and e['cost'] >= 0)
+        # The null algorithm never improves: the islands are reseeded after 3 rounds.
+        archi = archipelago(algorithm.null(), problem.rosenbrock(10), 2, 20)
+        archi.evolve_adaptive(6, 2, stall=3)
+        self.assertEqual([e['reseeded'] for e in archi.get_allocation_log()], [False] * 4 + [True] * 2)
+        self.assertRaises(ValueError, archi.evolve_adaptive, 1, 0)
+
+    def test_push_back_islands(self):
+        """Testing the parallel initialisation of the islands"""
+        archi = archipelago(algorithm.de(5), problem.rosenbrock(10), 6, 8)
+        archi.push_back_islands(algorithm.de(5), problem.rosenbrock(10), 5, 8, processes=3, s_policy=migration.random_s_policy())
+        self.assertEqual(len(archi), 11)
+        for isl in archi:
+            self.assertEqual(len(isl.population), 8)
+        self.assertEqual(repr(archi[10].s_policy), repr(migration.random_s_policy()))
+        # Each population is initialised with its own seed.
+        self.assertEqual(len(set(isl.population[0].cur_x for isl in archi)), 11)
+        self.assertRaises(ValueError, archi.push_back_islands, algorithm.de(5), problem.rosenbrock(10), 2, 8, 0)
+        self.assertRaises(ValueError, archi.push_back_islands, algorithm.de(5), problem.rosenbrock(10), 2, -1)
+
+    @unittest.skipIf(platform.system() == "Windows", "The py_island test cannot be run on Windows")
+    def test_push_back_islands_python(self):
+        """Testing the parallel initialisation of the islands of a Python problem"""
+        archi = archipelago()
+        archi.push_back_islands(algorithm.de(5), problem.py_example(), 4, 6, processes=2)
+        self.assertEqual(len(archi), 4)
+        self.assertEqual(len(set(isl.population[0].cur_x for isl in archi)), 4)
+        for isl in archi:
+            pop = isl.population
+            self.assertEqual(len(pop), 6)
+            self.assertEqual(pop[0].cur_f, pop.problem.objfun(pop[0].cur_x))
+        # Without processes, and for meta-problems wrapping a Python problem, the initialisation is serial.
+        self.assertFalse(problem.noisy(problem.py_example()).is_thread_safe())
+        self.assertTrue(problem.noisy(problem.rosenbrock(10)).is_thread_safe())
+        archi = archipelago(algorithm.de(5), problem.py_example(), 2, 6)
+        archi.push_back_islands(algorithm.de(5), problem.noisy(problem.py_example()), 3, 6)
+        self.assertEqual(len(archi), 5)
+        for isl in archi:
+            self.assertEqual(len(isl.population), 6)
+
+    @unittest.skipIf(platform.system() == "Windows", "The mp_island test cannot be run on Windows")
+    def test_shard(self):
+        """Testing the partition of the islands across worker processes"""
+        archi = archipelago(algorithm.py_example(1), problem.py_example(), 6, 10, topology=topology.ring())
+        champions = [isl.population.champion.f for isl in archi]
+        archi.shard(2)
+        self.assertEqual(archi.pool_size, 2)
+        self.assertEqual(mp_island.get_pool_size(), 2)
+        self.assertEqual([isl._mp_shard for isl in archi], [0, 1, 0, 1, 0, 1])
+        self.assertEqual([isl.population.champion.f for isl in archi], champions)
+        archi.evolve(3)
+        archi.join()
+        self.assertEqual([m['rounds'] for m in archi.metrics()], [3] * 6)
+        self.assertTrue(len(archi.get_migr_history()) > 0)
+        for isl, f in zip(archi, champions):
+            self.assertTrue(isl.population.champion.f <= f)
+        self.assertRaises(ValueError, archi.shard, 0)
+        mp_island.shutdown_pool()
+
 
 def get_archipelago_test_suite():
     suite = unittest.TestSuite()
@@ -2,8 +2,9 @@
 from PyGMO.util._util import *
 from PyGMO.util._analysis import *
 from PyGMO.util._tsp import read_tsplib
+from PyGMO.util._population_file import population_file, population_writer, save_population
 
-__all__ = ['hypervolume', 'hv_algorithm', 'tsp']
+__all__ = ['hypervolume', 'hv_algorithm', 'tsp', 'population_file', 'population_writer', 'save_population']
 
 
 hv_algorithm.__doc__ = """Module containing available algorithms for the hypervolume computation
@@ -56,7 +56,9 @@ class analysis:
         self.lin_conv_npairs = 0
         self.c_lin_npairs = 0
         self.dir = None
+        self._pop_c = None
 
+        from PyGMO import core, problem
         if isinstance(input_object, core._core.population):
             self.prob = input_object.problem
             self.pop = input_object
@@ -147,12 +149,15 @@ class analysis:
 
 
         **NOTE:** when calling sample, all sampling methods can be used and the search space is sampled within its box constraints. If a population has been input to the
-        constructor, a subset of individuals are selected (randomly).
+        constructor, a subset of individuals are selected (randomly). The sampled points are evaluated all at
+        once with problem.objfun_batch and problem.compute_constraints_batch, so that problems implementing
+        _objfun_batch_impl are called only once.
         """
         from PyGMO.util import lhs, sobol, faure, halton
 
         self.points = []
         self.f = []
+        self._pop_c = None
         self.npoints = npoints
         self.lb = list(self.prob.lb)
         self.ub = list(self.prob.ub)
@@ -173,21 +178,19 @@ class analysis:
             elif poplength < npoints:
                 raise ValueError(
                     "analysis.sample: it is not possible to sample more points than there are in the population via 'pop'")
-            elif poplength == npoints:
-                self.points = [list(self.pop[i].cur_x)
-                               for i in range(poplength)]
-                self.f = [list(self.pop[i].cur_f) for i in range(poplength)]
+            try:
+                from numpy.random import permutation
+            except ImportError:
+                raise ImportError(
+                    "analysis.sample needs numpy to run when sampling a population. Is it installed?")
+            # The stored vectors are used directly, without re-evaluating the individuals.
+            if poplength == npoints:
+                idx = slice(None)
             else:
-                idx = range(poplength)
-                try:
-                    from numpy.random import randint
-                except ImportError:
-                    raise ImportError(
-                        "analysis.sample needs numpy to run when sampling partially a population. Is it installed?")
-                for i in range(poplength, poplength - npoints, -1):
-                    r = idx.pop(randint(i))
-                    self.points.append(list(self.pop[r].cur_x))
-                    self.f.append(list(self.pop[r].cur_f))
+                idx = permutation(poplength)[:npoints]
+            self.points = self.pop.get_array('cur_x')[idx].tolist()
+            self.f = self.pop.get_array('cur_f')[idx].tolist()
+            self._pop_c = self.pop.get_array('cur_c')[idx].tolist()
         elif method == 'montecarlo':
             try:
                 from numpy.random import random
@@ -202,7 +205,7 @@ class analysis:
                     if j >= self.cont_dim:
                         r = round(r, 0)
                     self.points[i].append(r)
-                self.f.append(list(self.prob.objfun(self.points[i])))
+            self.f = [list(f) for f in self.prob.objfun_batch(self.points)]
         else:
             if method == 'sobol':
                 sampler = sobol(self.dim, first)
@@ -223,7 +226,8 @@ class analysis:
                     if j >= self.cont_dim:
                         temp[j] = round(temp[j], 0)  # round if necessary
                 self.points.append(temp)
-                self.f.append(list(self.prob.objfun(temp)))
+            # All the points are evaluated at once, see problem.objfun_batch.
+            self.f = [list(f) for f in self.prob.objfun_batch(self.points)]
 
         self.f_offset = self._percentile(0)
         self.f_span = self._ptp()
@@ -2179,9 +2183,10 @@ class analysis:
         self.c = []
         self.c_span = []
         if self.c_dim != 0:
-            for i in range(self.npoints):
-                self.c.append(
-                    list(self.prob.compute_constraints(self.points[i])))
+            if self._pop_c is not None:
+                self.c = self._pop_c
+            else:
+                self.c = [list(c) for c in self.prob.compute_constraints_batch(self.points)]
 
             temp0 = ptp(self.c, 0).tolist()
             temp1 = amax(self.c, 0).tolist()
@@ -0,0 +1,229 @@
+"""
+The _population_file.py module stores evaluated individuals in binary files that
+can be memory-mapped, so that very large populations and archives can be analysed
+without loading them in memory.
+
+A file starts with a fixed-size preamble (magic string, number of individuals and
+length of the metadata) followed by the metadata, a JSON object holding the
+dimensions of the problem and the problem itself, pickled. The individuals follow,
+aligned to 64 bytes, one row of doubles per individual with the same layout as
+the buffers exchanged by py_island: cur_x, cur_v, cur_c, cur_f, best_x, best_c, best_f.
+"""
+
+_MAGIC = b'PAGMOPOP'
+_VERSION = 1
+# Magic string, number of individuals, metadata length.
+_PREAMBLE = 8 + 8 + 8
+_ALIGN = 64
+_FIELDS = ['cur_x', 'cur_v', 'cur_c', 'cur_f', 'best_x', 'best_c', 'best_f']
+
+
+def _field_columns(d, c, f):
+    """Dictionary field name -> (first column, width) in an individual row."""
+    widths = [d, d, c, f, d, c, f]
+    retval, start = {}, 0
+    for name, w in zip(_FIELDS, widths):
+        retval[name] = (start, w)
+        start += w
+    return retval
+
+
+class population_writer(object):
+
+    """
+    Writes the individuals of one or more populations to a population file.
+
+    USAGE:
+            with util.population_writer('run.pop', prob) as w:
+                    for i in range(100):
+                            isl.evolve(1)
+                            w.append(isl.population)
+
+    The individuals are appended at the end of the file as they come, so a file can
+    collect the whole history of a run. The number of individuals in the header is
+    updated only after their data has been written, so a reader never sees a
+    partially written individual. Opening an existing file continues it, provided
+    the problem has the same dimensions.
+    """
+
+    def __init__(self, path, prob):
+        import json
+        import os
+        import pickle
+        import base64
+        import struct
+        self._d, self._c, self._f = prob.dimension, prob.c_dimension, prob.f_dimension
+        self._width = 3 * self._d + 2 * self._c + 2 * self._f
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            r = population_file(path)
+            if (r.dimension, r.c_dimension, r.f_dimension) != (self._d, self._c, self._f):
+                raise ValueError(
+                    'the problem dimensions do not match those of the existing file ' + path)
+            self._n, self._offset = len(r), r._offset
+            del r
+            self._file = open(path, 'r+b')
+            self._file.truncate(self._offset + self._n * self._width * 8)
+        else:
+            meta = json.dumps({'version': _VERSION, 'dimension': self._d, 'c_dimension': self._c, 'f_dimension': self._f,
+                               'problem': base64.b64encode(pickle.dumps(prob, protocol=2)).decode('ascii')}).encode('ascii')
+            self._n = 0
+            self._offset = -(-(_PREAMBLE + len(meta)) // _ALIGN) * _ALIGN
+            self._file = open(path, 'w+b')
+            self._file.write(_MAGIC + struct.pack('<QQ', 0, len(meta)) + meta)
+            self._file.write(b'\0' * (self._offset - _PREAMBLE - len(meta)))
+        self._file.seek(0, 2)
+
+    def append(self, pop):
+        """
+        Appends the individuals of pop, without re-evaluating them.
+
+        USAGE: w.append(pop)
+        """
+        import numpy
+        import struct
+        prob = pop.problem
+        if (prob.dimension, prob.c_dimension, prob.f_dimension) != (self._d, self._c, self._f):
+            raise ValueError(
+                'the problem of the population does not match the problem of the file')
+        if len(pop) == 0:
+            return
+        buf = numpy.empty(pop._buffer_size(len(pop)), dtype=numpy.float64)
+        pop._buffer_dump(buf)
+        self._file.write(buf[2 + self._d + self._c + self._f:].tobytes())
+        self._file.flush()
+        self._n += len(pop)
+        self._file.seek(8)
+        self._file.write(struct.pack('<Q', self._n))
+        self._file.flush()
+        self._file.seek(0, 2)
+
+    def close(self):
+        """Closes the file."""
+        self._file.close()
+
+    def __len__(self):
+        return self._n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def save_population(pop, path):
+    """
+    Writes the individuals of pop to a new population file.
+
+    USAGE: util.save_population(pop, 'pop.pop')
+    """
+    import os
+    if os.path.exists(path):
+        os.remove(path)
+    with population_writer(path, pop.problem) as w:
+        w.append(pop)
+
+
+class population_file(object):
+
+    """
+    Read-only, memory-mapped access to a population file.
+
+    USAGE:
+            pf = util.population_file('run.pop')
+            f = pf.get_array('cur_f', 1000000, 2000000)
+            pop = pf.population(0, 1000)
+            a = pf.analysis(0, 10000, npoints=1000)
+
+    Opening the file reads only its metadata. The arrays returned by get_array()
+    are views on the file, and their data is read from disk when it is accessed.
+    Populations are built from the stored fitness and constraint vectors, so the
+    problem is never evaluated.
+    """
+
+    def __init__(self, path):
+        import json
+        import struct
+        import numpy
+        self.path = path
+        with open(path, 'rb') as f:
+            preamble = f.read(_PREAMBLE)
+            if len(preamble) != _PREAMBLE or preamble[:8] != _MAGIC:
+                raise ValueError(path + ' is not a population file')
+            n, meta_len = struct.unpack('<QQ', preamble[8:])
+            self._meta = json.loads(f.read(meta_len).decode('ascii'))
+        if self._meta['version'] != _VERSION:
+            raise ValueError('unsupported population file version: ' + str(self._meta['version']))
+        self.dimension = self._meta['dimension']
+        self.c_dimension = self._meta['c_dimension']
+        self.f_dimension = self._meta['f_dimension']
+        self._columns = _field_columns(self.dimension, self.c_dimension, self.f_dimension)
+        self._width = 3 * self.dimension + 2 * self.c_dimension + 2 * self.f_dimension
+        self._offset = -(-(_PREAMBLE + meta_len) // _ALIGN) * _ALIGN
+        if n == 0:
+            self._data = numpy.empty((0, self._width), dtype=numpy.float64)
+        else:
+            self._data = numpy.memmap(path, dtype=numpy.float64, mode='r', offset=self._offset, shape=(n, self._width))
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    @property
+    def problem(self):
+        """Copy of the problem stored in the file."""
+        import pickle
+        import base64
+        return pickle.loads(base64.b64decode(self._meta['problem']))
+
+    def get_array(self, field='cur_x', start=None, stop=None):
+        """
+        Returns one field of the individuals in [start, stop) as a read-only 2-D array, without copying it
+
+        USAGE: x = pf.get_array('cur_x', 0, 1000)
+
+        * field: one of 'cur_x', 'cur_v', 'cur_c', 'cur_f', 'best_x', 'best_c', 'best_f'
+        * start, stop: range of individuals, as in a slice
+        """
+        if field not in self._columns:
+            raise ValueError('field must be one of ' + ', '.join(_FIELDS))
+        first, width = self._columns[field]
+        return self._data[start:stop, first:first + width]
+
+    def population(self, start=None, stop=None, dom_tracking=True):
+        """
+        Returns a population made of the individuals in [start, stop)
+
+        USAGE: pop = pf.population(0, 1000)
+
+        * start, stop: range of individuals, as in a slice
+        * dom_tracking: value of the dom_tracking attribute of the population. Set it to False
+          for large slices, which would otherwise require the quadratic construction of the
+          domination lists
+
+        The individuals are not re-evaluated. The champion of the population is the best
+        individual of the range.
+        """
+        import numpy
+        from PyGMO.core import population
+        rows = self._data[start:stop]
+        pop = population(self.problem)
+        pop.dom_tracking = dom_tracking
+        head = 2 + self.dimension + self.c_dimension + self.f_dimension
+        buf = numpy.zeros(head + rows.size, dtype=numpy.float64)
+        buf[0] = rows.shape[0]
+        buf[head:] = rows.ravel()
+        pop._buffer_load(buf)
+        return pop
+
+    def analysis(self, start=None, stop=None, npoints='all', output_to_file=False):
+        """
+        Returns an analysis of the individuals in [start, stop)
+
+        USAGE: a = pf.analysis(0, 100000, npoints=1000)
+
+        * start, stop: range of individuals, as in a slice
+        * npoints: number of individuals of the range sampled by the analysis, or 'all'
+        * output_to_file: see analysis
+        """
+        from PyGMO.util._analysis import analysis
+        return analysis(self.population(start, stop, False), npoints=npoints, output_to_file=output_to_file)
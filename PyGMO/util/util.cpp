@@ -190,6 +190,14 @@ static inline boost::python::tuple race_pop_run_return_tuple(
 	return boost::python::make_tuple(res.first, res.second);
 }
 
+// Number of evaluations made at each iteration of the last race
+static inline std::vector<int> race_pop_get_iteration_evals(const racing::race_pop &race_obj)
+{
+	// boost python does not like vector of unsigned int......
+	const std::vector<unsigned int> &evals = race_obj.get_iteration_evals();
+	return std::vector<int>(evals.begin(), evals.end());
+}
+
 // Main method containing all the juice of race_algo
 static inline boost::python::tuple race_algo_run_return_tuple(
 	racing::race_algo& race_obj,
@@ -261,7 +269,8 @@ BOOST_PYTHON_MODULE(_util) {
 		.def("register_pop", &racing::race_pop::register_population, "Load a population into the race environment")
 		.def("inherit_memory", &racing::race_pop::inherit_memory, "Transfer memory of identical decision vectors")
 		.def("get_mean_fitness", &racing::race_pop::get_mean_fitness, "Returns the mean fitness of the individuals resulted from previously run race")
-		.def("set_seed", &racing::race_pop::set_seed, "Set the ground seed of the race");
+		.def("set_seed", &racing::race_pop::set_seed, "Set the ground seed of the race")
+		.def("get_iteration_evals", &race_pop_get_iteration_evals, "Returns the number of evaluations made at each iteration of the last race");
 
 	// Required by race_algo
 	//class_<std::vector<pagmo::algorithm::base_ptr> >("vector_of_algorithm_base_ptr")
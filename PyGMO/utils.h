@@ -28,17 +28,26 @@
 #define PYGMO_UTILS_H
 
 #include <Python.h>
+#include <boost/archive/binary_iarchive.hpp>
+#include <boost/archive/binary_oarchive.hpp>
 #include <boost/archive/text_iarchive.hpp>
 #include <boost/archive/text_oarchive.hpp>
+#include <boost/lexical_cast.hpp>
 #include <boost/serialization/serialization.hpp>
+#include <boost/python/call.hpp>
 #include <boost/python/class.hpp>
 #include <boost/python/dict.hpp>
 #include <boost/python/docstring_options.hpp>
 #include <boost/python/extract.hpp>
+#include <boost/python/handle.hpp>
+#include <boost/python/import.hpp>
+#include <boost/python/object.hpp>
 #include <boost/python/tuple.hpp>
+#include <algorithm>
 #include <csignal>
 #include <sstream>
 #include <string>
+#include <vector>
 
 #include "exceptions.h"
 
@@ -63,6 +72,77 @@ void serialize(Archive &, boost::python::wrapper<T> &, const unsigned int)
 
 }}
 
+// Archive formats used to serialize C++ objects from Python.
+enum py_archive_format
+{
+	py_text_archive,
+	py_binary_archive
+};
+
+// Binary archives start with this tag followed by the format version and a newline. Text archives
+// produced by Boost start with a number, so the two formats can always be told apart on load.
+const char py_binary_archive_tag[] = "pagmo_binary_archive ";
+const unsigned py_binary_archive_version = 1;
+
+// Archive format currently selected from Python for the calling thread, via PyGMO.serialization_mode
+// or the process default set by PyGMO.set_serialization_mode().
+// The mode lives in the PyGMO.core module so that it is shared by all the extension modules.
+inline py_archive_format py_get_archive_format()
+{
+	using namespace boost::python;
+	const std::string mode = extract<std::string>(import("PyGMO.core").attr("get_serialization_mode")());
+	return (mode == "binary") ? py_binary_archive : py_text_archive;
+}
+
+// Serialize x into a string (text format) or a bytes object (binary format).
+template <class T>
+inline boost::python::object py_archive_save(const T &x, py_archive_format format)
+{
+	std::stringstream ss;
+	if (format == py_binary_archive) {
+		ss << py_binary_archive_tag << py_binary_archive_version << '\n';
+		{
+			boost::archive::binary_oarchive oa(ss);
+			oa << x;
+		}
+		const std::string str = ss.str();
+		return boost::python::object(boost::python::handle<>(PyBytes_FromStringAndSize(str.data(),static_cast<Py_ssize_t>(str.size()))));
+	}
+	{
+		boost::archive::text_oarchive oa(ss);
+		oa << x;
+	}
+	return boost::python::object(ss.str());
+}
+
+template <class T>
+inline boost::python::object py_archive_save(const T &x)
+{
+	return py_archive_save(x,py_get_archive_format());
+}
+
+// Deserialize x from a string produced by py_archive_save(), in either format.
+template <class T>
+inline void py_archive_load(T &x, const std::string &str)
+{
+	const std::string tag(py_binary_archive_tag);
+	if (str.compare(0,tag.size(),tag) == 0) {
+		const std::string::size_type eol = str.find('\n',tag.size());
+		if (eol == std::string::npos || str.substr(tag.size(),eol - tag.size()) !=
+			boost::lexical_cast<std::string>(py_binary_archive_version))
+		{
+			pagmo_throw(value_error,"unsupported binary archive version");
+		}
+		std::stringstream ss(str.substr(eol + 1));
+		boost::archive::binary_iarchive ia(ss);
+		ia >> x;
+	} else {
+		std::stringstream ss(str);
+		boost::archive::text_iarchive ia(ss);
+		ia >> x;
+	}
+}
+
 // Generic pickle suite for C++ classes with default constructor extensible from Python.
 // Difference from above is that we need to take care of handling the derived class' dict.
 template <class T>
@@ -75,10 +155,7 @@ struct python_class_pickle_suite: boost::python::pickle_suite
 	static boost::python::tuple getstate(boost::python::object obj)
 	{
 		T const &x = boost::python::extract<T const &>(obj)();
-		std::stringstream ss;
-		boost::archive::text_oarchive oa(ss);
-		oa << x;
-		return boost::python::make_tuple(obj.attr("__dict__"),ss.str());
+		return boost::python::make_tuple(obj.attr("__dict__"),py_archive_save(x));
 	}
 	static void setstate(boost::python::object obj, boost::python::tuple state)
 	{
@@ -93,10 +170,7 @@ struct python_class_pickle_suite: boost::python::pickle_suite
 		dict d = extract<dict>(obj.attr("__dict__"))();
 		d.update(state[0]);
 		// Restore the internal state of the C++ object.
-		const std::string str = extract<std::string>(state[1]);
-		std::stringstream ss(str);
-		boost::archive::text_iarchive ia(ss);
-		ia >> x;
+		py_archive_load(x,extract<std::string>(state[1]));
 	}
 	static bool getstate_manages_dict()
 	{
@@ -107,18 +181,65 @@ struct python_class_pickle_suite: boost::python::pickle_suite
 template <class T>
 inline void py_cpp_loads(T &x, const std::string &s)
 {
-	std::stringstream ss(s);
-	boost::archive::text_iarchive ia(ss);
-	ia >> x;
+	py_archive_load(x,s);
 }
 
 template <class T>
-inline std::string py_cpp_dumps(const T &x)
+inline boost::python::object py_cpp_dumps(const T &x)
 {
-	std::stringstream ss;
-	boost::archive::text_oarchive oa(ss);
-	oa << x;
-	return ss.str();
+	return py_archive_save(x);
+}
+
+// Call the batch evaluation method f of a problem implemented in Python. The vectors in x, each of size x_width,
+// are passed to f as the rows of a 2-D NumPy array. f must return an array-like of shape (x.size(),width)
+// (or of shape (x.size(),) if width is 1), whose rows are copied into the vectors of retval.
+template <class Method>
+inline void py_batch_call(const Method &f, const std::vector<std::vector<double> > &x, std::vector<double>::size_type x_width,
+	std::vector<std::vector<double> > &retval, std::vector<double>::size_type width)
+{
+	using namespace boost::python;
+	object numpy = import("numpy");
+	object X = numpy.attr("empty")(make_tuple(x.size(),x_width));
+	Py_buffer view;
+	if (PyObject_GetBuffer(X.ptr(),&view,PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) != 0) {
+		throw_error_already_set();
+	}
+	double *out = static_cast<double *>(view.buf);
+	for (std::vector<std::vector<double> >::size_type i = 0; i < x.size(); ++i) {
+		out = std::copy(x[i].begin(),x[i].end(),out);
+	}
+	PyBuffer_Release(&view);
+	object R = numpy.attr("ascontiguousarray")(call<object>(f.ptr(),X),"float64");
+	const int ndim = extract<int>(R.attr("ndim"));
+	const object shape = R.attr("shape");
+	if (!((ndim == 2 && extract<std::size_t>(shape[0])() == x.size() && extract<std::size_t>(shape[1])() == width) ||
+		(ndim == 1 && width == 1u && extract<std::size_t>(shape[0])() == x.size())))
+	{
+		pagmo_throw(value_error,"the array returned by the batch evaluation method has the wrong shape");
+	}
+	if (PyObject_GetBuffer(R.ptr(),&view,PyBUF_C_CONTIGUOUS) != 0) {
+		throw_error_already_set();
+	}
+	const double *in = static_cast<const double *>(view.buf);
+	retval.resize(x.size());
+	for (std::vector<std::vector<double> >::size_type i = 0; i < x.size(); ++i, in += width) {
+		retval[i].assign(in,in + width);
+	}
+	PyBuffer_Release(&view);
+}
+
+// Call the fused evaluation method e of a problem implemented in Python, which must return the pair (f,c) of
+// the fitness and constraint vectors of x.
+template <class Method>
+inline void py_evaluate_call(const Method &e, const std::vector<double> &x, std::vector<double> &f, std::vector<double> &c)
+{
+	using namespace boost::python;
+	object r = call<object>(e.ptr(),x);
+	if (len(r) != 2) {
+		pagmo_throw(value_error,"_evaluate_impl() must return the pair (fitness vector, constraint vector)");
+	}
+	f = extract<std::vector<double> >(object(r[0]))();
+	c = extract<std::vector<double> >(object(r[1]))();
 }
 
 
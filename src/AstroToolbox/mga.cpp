@@ -30,6 +30,7 @@
 #include "Pl_Eph_An.h"
 #include "mga.h"
 #include "Lambert.h"
+#include "../problem/trajectory_cache.h"
 #include "PowSwingByInv.h"
 #include "Astro_Functions.h"
 #define MAX(a, b) (a > b ? a : b)
@@ -136,7 +137,7 @@ int MGA(vector<double> t,	// it is the vector which provides time in modified ju
 		{
 			T += t[i_count];
 			if (sequence[i_count]<10)
-				Planet_Ephemerides_Analytical (T, sequence[i_count],
+				pagmo::problem::trajectory_cache::ephemerides(T, sequence[i_count],
 					r[i_count], v[i_count]); //r and  v in heliocentric coordinate system
 			else
 			{
@@ -151,7 +152,7 @@ int MGA(vector<double> t,	// it is the vector which provides time in modified ju
 	    else
 			lw = (rev_flag[0] == 0) ? 1 : 0;
 
-		LambertI(r[0],r[1],t[1]*24*60*60,MU[0],lw,          // INPUT
+		pagmo::problem::trajectory_cache::lambert(r[0],r[1],t[1]*24*60*60,MU[0],lw,          // INPUT
 			     V_Lamb[0][0],V_Lamb[0][1],a,p,theta,iter); // OUTPUT
 		DV[0] = norm(V_Lamb[0][0], v[0]);                // Earth launch
 
@@ -165,7 +166,7 @@ int MGA(vector<double> t,	// it is the vector which provides time in modified ju
 				lw = (rev_flag[i_count] == 0) ? 1 : 0;
 
 			/*if (i_count%2 != 0)	{*/
-			LambertI(r[i_count],r[i_count+1],t[i_count + 1]*24*60*60,MU[0],lw, // INPUT
+			pagmo::problem::trajectory_cache::lambert(r[i_count],r[i_count+1],t[i_count + 1]*24*60*60,MU[0],lw, // INPUT
 				   V_Lamb[1][0],V_Lamb[1][1],a,p,theta,iter);                  // OUTPUT
 
 			// norm first perform the subtraction of vet1-vet2 and the evaluate ||...||
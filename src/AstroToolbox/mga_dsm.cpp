@@ -25,6 +25,7 @@
 #include <cmath>
 #include "Astro_Functions.h"
 #include "Lambert.h"
+#include "../problem/trajectory_cache.h"
 #include "mga_dsm.h"
 #include "propagateKEP.h"
 #include "time2distance.h"
@@ -76,7 +77,7 @@ void vector_normalize(const double in[3], double out[3])
 void get_celobj_r_and_v(const mgadsmproblem& problem, const double T, const int i_count, double* r, double* v)
 {
 	if (problem.sequence[i_count] < 10) { //normal planet
-		Planet_Ephemerides_Analytical (T, problem.sequence[i_count],
+		pagmo::problem::trajectory_cache::ephemerides(T, problem.sequence[i_count],
 			r, v); // r and  v in heliocentric coordinate system
 	} else { //asteroid
 		Custom_Eph(T + 2451544.5, problem.asteroid.epoch, problem.asteroid.keplerian,
@@ -185,7 +186,7 @@ void first_block(const vector<double>& t, const mgadsmproblem& problem, const st
 
 	double v_sc_dsm_out[3]; // DSM output speed
 
-	LambertI(rd, r[1], tof[0] * (1 - alpha[0]) * 86400, MU[0], lw,
+	pagmo::problem::trajectory_cache::lambert(rd, r[1], tof[0] * (1 - alpha[0]) * 86400, MU[0], lw,
 		v_sc_dsm_out, v_sc_nextpl_in, a, p, theta2, iter_unused);	// [MR] last 6 are output
 
 	// First Contribution to DV (the 1st deep space maneuver)
@@ -270,7 +271,7 @@ double intermediate_block(const vector<double>& t, const mgadsmproblem& problem,
 
 	double v_sc_dsm_out[3]; // DSM output speed
 
-	LambertI(rd, r[i_count + 2], tof[i_count + 1] * (1 - alpha[i_count + 1]) * 86400, MU[0], lw,
+	pagmo::problem::trajectory_cache::lambert(rd, r[i_count + 2], tof[i_count + 1] * (1 - alpha[i_count + 1]) * 86400, MU[0], lw,
 		v_sc_dsm_out, v_sc_nextpl_in, a, p, theta, iter_unused); // [MR] last 6 are output.
 
 	// DV contribution
@@ -313,23 +313,27 @@ void cmaes::evolve(population &pop) const
 			//would it make sense to use best_x also?
 			dynamic_cast<const pagmo::problem::base_stochastic &>(prob).set_seed(m_urng());
 			pop.clear(); // Removes memory based on different seeds (champion and best_x, best_f, best_c)
+			std::vector<decision_vector> X(lam,dumb);
 			for (population::size_type i = 0; i<lam; ++i ) {
 			  	for (decision_vector::size_type j = 0; j<N; ++j ) {
-					dumb[j] = newpop[i](j);
+					X[i][j] = newpop[i](j);
 				}
-				pop.push_back(dumb);
 			}
+			pop.push_back_batch(X);
 			counteval += lam;
 		}
 		catch (const std::bad_cast& e)
 		{
-			// Reinsertion (original method)
+			// Reinsertion (original method), evaluating the whole generation at once
+			std::vector<population::size_type> idx(lam);
+			std::vector<decision_vector> X(lam,dumb);
 			for (population::size_type i = 0; i<lam; ++i ) {
+				idx[i] = i;
 				for (decision_vector::size_type j = 0; j<N; ++j ) {
-					dumb[j] = newpop[i](j);
+					X[i][j] = newpop[i](j);
 				}
-				pop.set_x(i,dumb);
 			}
+			pop.set_x_batch(idx,X);
 			counteval += lam;
 		}
 		
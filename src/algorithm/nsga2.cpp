@@ -272,6 +272,8 @@ void nsga2::evolve(population &pop) const
 	std::vector<population::size_type> best_idx(NP), shuffle1(NP),shuffle2(NP);
 	population::size_type parent1_idx, parent2_idx;
 	decision_vector child1(D), child2(D);
+	std::vector<decision_vector> children;
+	children.reserve(NP);
 
 	for (pagmo::population::size_type i=0; i< NP; i++) shuffle1[i] = i;
 	for (pagmo::population::size_type i=0; i< NP; i++) shuffle2[i] = i;
@@ -291,7 +293,8 @@ void nsga2::evolve(population &pop) const
 		std::random_shuffle(shuffle2.begin(),shuffle2.end(),p_idx);
 
 		//We then loop thorugh all individuals with increment 4 to select two pairs of parents that will
-		//each create 2 new offspring
+		//each create 2 new offspring. The offspring are evaluated all at once at the end of the loop.
+		children.clear();
 		for (pagmo::population::size_type i=0; i< NP; i+=4) {
 			// We create two offsprings using the shuffled list 1
 			parent1_idx = tournament_selection(shuffle1[i], shuffle1[i+1],pop);
@@ -299,8 +302,8 @@ void nsga2::evolve(population &pop) const
 			crossover(child1, child2, parent1_idx,parent2_idx,pop);
 			mutate(child1,pop);
 			mutate(child2,pop);
-			popnew.push_back(child1);
-			popnew.push_back(child2);
+			children.push_back(child1);
+			children.push_back(child2);
 
 			// We repeat with the shuffled list 2
 			parent1_idx = tournament_selection(shuffle2[i], shuffle2[i+1],pop);
@@ -308,9 +311,11 @@ void nsga2::evolve(population &pop) const
 			crossover(child1, child2, parent1_idx,parent2_idx,pop);
 			mutate(child1,pop);
 			mutate(child2,pop);
-			popnew.push_back(child1);
-			popnew.push_back(child2);
-		} // popnew now contains 2NP individuals
+			children.push_back(child1);
+			children.push_back(child2);
+		}
+		popnew.push_back_batch(children);
+		// popnew now contains 2NP individuals
 
 		// This method returns the sorted N best individuals in the population according to the crowded comparison operator
 		// defined in population.cpp
@@ -318,7 +323,9 @@ void nsga2::evolve(population &pop) const
 		// We completely cancel the population (NOTE: memory of all individuals and the notion of
 		// champion is thus destroyed)
 		pop.clear();
-		for (population::size_type i=0; i < NP; ++i) pop.push_back(popnew.get_individual(best_idx[i]).cur_x);
+		std::vector<decision_vector> best_x(NP);
+		for (population::size_type i=0; i < NP; ++i) best_x[i] = popnew.get_individual(best_idx[i]).cur_x;
+		pop.push_back_batch(best_x);
 	} // end of main SGA loop
 }
 
@@ -304,16 +304,12 @@ void sga::evolve(population &pop) const
 			
 			// We re-evaluate the best individual (for elitism)
 			prob.objfun(bestfit,bestX);
-			// Re-evaluate wrt new seed the particle position and memory
+			// Re-evaluate wrt new seed the particle position and memory. We now set the cleared pop,
+			// evaluating the whole generation at once.
+			pop.push_back_batch(Xnew);
 			for (pagmo::population::size_type i = 0; i < NP;i++) {
-				// We evaluate here the new individual fitness
-				prob.objfun(fit[i],Xnew[i]);
-				// We update the velocity (in case coupling with PSO via archipelago)
-				//dummy = Xnew[i];
-				//std::transform(dummy.begin(), dummy.end(), pop.get_individual(i).cur_x.begin(), dummy.begin(),std::minus<double>());
-				///We now set the cleared pop. cur_x is the best_x, re-evaluated with new seed.
-				pop.push_back(Xnew[i]);
-				//pop.set_v(i,dummy);
+				// We read here the new individual fitness
+				fit[i] = pop.get_individual(i).cur_f;
 				if (prob.compare_fitness(fit[i], bestfit)) {
 					bestfit = fit[i];
 					bestX = Xnew[i];
@@ -323,13 +319,18 @@ void sga::evolve(population &pop) const
 		catch (const std::bad_cast& e)
 		{
 			//4 - Evaluate the new population (deterministic problem)
+			std::vector<pagmo::population::size_type> idx(NP);
+			std::vector<decision_vector> V(NP);
 			for (pagmo::population::size_type i = 0; i < NP;i++) {
-				prob.objfun(fit[i],Xnew[i]);
-				dummy = Xnew[i];
-				std::transform(dummy.begin(), dummy.end(), pop.get_individual(i).cur_x.begin(), dummy.begin(),std::minus<double>());
-				//updates x and v (cache avoids to recompute the objective function and constraints)
-				pop.set_x(i,Xnew[i]);
-				pop.set_v(i,dummy);
+				idx[i] = i;
+				V[i] = Xnew[i];
+				std::transform(V[i].begin(), V[i].end(), pop.get_individual(i).cur_x.begin(), V[i].begin(),std::minus<double>());
+			}
+			//updates x, evaluating the whole generation at once, and v
+			pop.set_x_batch(idx,Xnew);
+			for (pagmo::population::size_type i = 0; i < NP;i++) {
+				pop.set_v(i,V[i]);
+				fit[i] = pop.get_individual(i).cur_f;
 				if (prob.compare_fitness(fit[i], bestfit)) {
 					bestfit = fit[i];
 					bestX = Xnew[i];
@@ -22,16 +22,21 @@
  *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
  *****************************************************************************/
 
+#include <boost/bind.hpp>
 #include <boost/numeric/conversion/cast.hpp>
 #include <boost/random/uniform_int.hpp>
 #include <boost/thread/barrier.hpp>
+#include <boost/thread/thread.hpp>
 #include <boost/tuple/tuple.hpp>
 #include <boost/tuple/tuple_io.hpp>
 #include <boost/random/uniform_int.hpp>
 #include <boost/random/variate_generator.hpp>
+#include <algorithm>
+#include <cmath>
 #include <cstddef>
 #include <iostream>
 #include <iterator>
+#include <limits>
 #include <sstream>
 #include <stdexcept>
 #include <string>
@@ -67,7 +72,7 @@ void archipelago::check_migr_attributes() const
  */
 archipelago::archipelago(distribution_type dt, migration_direction md):m_islands_sync_point(),m_topology(new topology::unconnected()),
 	m_dist_type(dt),m_migr_dir(md),
-	m_migr_map(),m_drng(rng_generator::get<rng_double>()),m_urng(rng_generator::get<rng_uint32>()),m_migr_mutex()
+	m_migr_slots(),m_drng(rng_generator::get<rng_double>()),m_urng(rng_generator::get<rng_uint32>()),m_migr_mutex(),m_term_n_stalled(0),m_term_fevals(0),m_pool_size(0)
 {
 	check_migr_attributes();
 }
@@ -83,7 +88,7 @@ archipelago::archipelago(distribution_type dt, migration_direction md):m_islands
  */
 archipelago::archipelago(const topology::base &t, distribution_type dt, migration_direction md):
 	m_islands_sync_point(),m_topology(),m_dist_type(dt),m_migr_dir(md),
-	m_migr_map(),m_drng(rng_generator::get<rng_double>()),m_urng(rng_generator::get<rng_uint32>()),m_migr_mutex()
+	m_migr_slots(),m_drng(rng_generator::get<rng_double>()),m_urng(rng_generator::get<rng_uint32>()),m_migr_mutex(),m_term_n_stalled(0),m_term_fevals(0),m_pool_size(0)
 {
 	// NOTE: we cannot set the topology in the initialiser list directly,
 	// since we do not know if the topology is suitable. Set it here.
@@ -94,7 +99,8 @@ archipelago::archipelago(const topology::base &t, distribution_type dt, migratio
 /// Constructor from problem, algorithm, archipelago size, island sizes, topology and migration attributes.
 /**
  * Constructs n islands of m individuals each, with assigned problem p and algorithm a, and inserts them with push_back() into the archipelago,
- * whose topology is set to t, with point_to_point distribution_type and destination migration_direction.
+ * whose topology is set to t, with point_to_point distribution_type and destination migration_direction. The populations of the islands
+ * are initialised in parallel with init_populations().
  *
  * @param[in] a algorithm which will be assigned to all islands.
  * @param[in] p problem which will be assigned to all islands.
@@ -106,11 +112,12 @@ archipelago::archipelago(const topology::base &t, distribution_type dt, migratio
  */
 archipelago::archipelago(const algorithm::base &a, const problem::base &p, int n, int m, const topology::base &t, distribution_type dt, migration_direction md):
 	m_islands_sync_point(),m_topology(new topology::unconnected()),m_dist_type(dt),m_migr_dir(md),
-	m_migr_map(),m_drng(rng_generator::get<rng_double>()),m_urng(rng_generator::get<rng_uint32>()),m_migr_mutex()
+	m_migr_slots(),m_drng(rng_generator::get<rng_double>()),m_urng(rng_generator::get<rng_uint32>()),m_migr_mutex(),m_term_n_stalled(0),m_term_fevals(0),m_pool_size(0)
 {
 	check_migr_attributes();
-	for (size_type i = 0; i < boost::numeric_cast<size_type>(n); ++i) {
-		push_back(island(a,p,m));
+	const std::vector<population> pops(init_populations(p,n,m));
+	for (std::vector<population>::size_type i = 0; i < pops.size(); ++i) {
+		push_back(island(a,pops[i]));
 	}
 	// Set topology after pushing back, so that it is possible to give an already-built topology to the constructor
 	// without everything blowing up.
@@ -134,10 +141,16 @@ archipelago::archipelago(const archipelago &a)
 	m_topology = a.m_topology->clone();
 	m_dist_type = a.m_dist_type;
 	m_migr_dir = a.m_migr_dir;
-	m_migr_map = a.m_migr_map;
+	m_migr_slots = a.m_migr_slots;
 	m_drng = a.m_drng;
 	m_urng = a.m_urng;
 	m_migr_hist = a.m_migr_hist;
+	m_island_versions = a.m_island_versions;
+	m_island_rounds = a.m_island_rounds;
+	m_metrics = a.m_metrics;
+	m_term_criteria = a.m_term_criteria;
+	m_alloc_log = a.m_alloc_log;
+	m_pool_size = a.m_pool_size;
 }
 
 /// Assignment operator.
@@ -162,10 +175,16 @@ archipelago &archipelago::operator=(const archipelago &a)
 		m_topology = a.m_topology->clone();
 		m_dist_type = a.m_dist_type;
 		m_migr_dir = a.m_migr_dir;
-		m_migr_map = a.m_migr_map;
+		m_migr_slots = a.m_migr_slots;
 		m_drng = a.m_drng;
 		m_urng = a.m_urng;
 		m_migr_hist = a.m_migr_hist;
+		m_island_versions = a.m_island_versions;
+		m_island_rounds = a.m_island_rounds;
+		m_metrics = a.m_metrics;
+		m_term_criteria = a.m_term_criteria;
+		m_alloc_log = a.m_alloc_log;
+		m_pool_size = a.m_pool_size;
 	}
 	return *this;
 }
@@ -178,11 +197,17 @@ archipelago::~archipelago()
 {
 	join();
 	pagmo_assert(destruction_checks());
+	// The islands are destroyed after the members of the archipelago: detach them,
+	// so that they do not try to join on the worker pool.
+	for (size_type i = 0; i < m_container.size(); ++i) {
+		m_container[i]->m_archi = 0;
+	}
 }
 
 /// Wait until evolution on each island has terminated.
 /**
- * Will call iteratively island::join() on all islands of the archipelago.
+ * Will call iteratively island::join() on all islands of the archipelago, and then wait for the termination of the worker threads
+ * of the pooled mode.
  */
 void archipelago::join() const
 {
@@ -190,6 +215,7 @@ void archipelago::join() const
 	for (const_iterator it = m_container.begin(); it != it_f; ++it) {
 		(*it)->join();
 	}
+	pool_join_workers();
 }
 
 archipelago::size_type archipelago::locate_island(const base_island &isl) const
@@ -225,6 +251,10 @@ void archipelago::push_back(const base_island &isl)
 	m_container.push_back(isl.clone());
 	// Tell the island that it is living in an archipelago now.
 	m_container.back()->m_archi = this;
+	m_island_versions.push_back(0);
+	m_island_rounds.push_back(0);
+	m_migr_slots.push_back(migration_slot());
+	m_metrics.push_back(metrics_slot());
 	// Insert the island in the topology.
 	m_topology->push_back();
 }
@@ -245,6 +275,7 @@ void archipelago::set_algorithm(const size_type &idx, const algorithm::base &a)
 		pagmo_throw(index_error,"invalid island index");
 	}
 	m_container[idx]->set_algorithm(a);
+	++m_island_versions[idx];
 }
 
 /// Get the size of the archipelago.
@@ -381,7 +412,7 @@ bool archipelago::destruction_checks() const
 }
 
 // Helper function to insert a list of candidates immigrants into an immigrants vector, given the source and destination island.
-void archipelago::build_immigrants_vector(std::vector<std::pair<population::size_type, individual_type > > &immigrants, const base_island &src_isl,
+void archipelago::build_immigrants_vector(std::vector<std::pair<population::size_type, individual_type > > &immigrants, const size_type &src_isl_idx,
 	base_island &dest_isl, const std::vector<individual_type> &candidates) const
 {
 	for (std::vector<individual_type>::const_iterator ind_it = candidates.begin();
@@ -392,7 +423,7 @@ void archipelago::build_immigrants_vector(std::vector<std::pair<population::size
 		if (!dest_isl.m_pop.problem().verify_x(ind_it->cur_x)) {
 			continue;
 		}
-		immigrants.push_back(std::make_pair(locate_island(src_isl),*ind_it));
+		immigrants.push_back(std::make_pair(src_isl_idx,*ind_it));
 	}
 }
 
@@ -443,66 +474,84 @@ void archipelago::pre_evolution(base_island &isl)
 	// Determine the island's index in the archipelago.
 	const size_type isl_idx = locate_island(isl);
 	pagmo_assert(isl_idx < m_container.size());
+	// Open the round in the metrics.
+	metrics_slot &metrics = m_metrics[isl_idx];
+	metrics.m_fevals = isl.m_pop.problem().get_fevals();
+	metrics.m_cevals = isl.m_pop.problem().get_cevals();
+	metrics.m_migration_wait = 0;
+	metrics.m_champion_f.clear();
+	if (isl.m_pop.size()) {
+		metrics.m_champion_f = isl.m_pop.champion().f;
+	}
 	//1. Obtain immigrants.
 	std::vector<std::pair<population::size_type, individual_type> > immigrants;
 	switch (m_migr_dir) {
 		case source:
 		{
-			lock_type lock(m_migr_mutex);
-			// For source migration direction, migration map contains islands' "inboxes". Or, in other words, it contains
+			// For source migration direction, migration slots contain islands' "inboxes". Or, in other words, they contain
 			// the individuals that are destined to go into the island. Such inboxes have been assembled previously,
 			// during a post_evolution operation.
-			// Iterate over all the vectors of individuals provided by the different islands.
-			for (boost::unordered_map<size_type,std::vector<individual_type> >::iterator it = m_migr_map[isl_idx].begin();
-				it != m_migr_map[isl_idx].end(); ++it)
+			// Empty the inbox while holding its lock, then process its content.
+			boost::unordered_map<size_type,std::vector<individual_type> > inbox;
 			{
+				slot_write_lock_type lock(m_migr_slots[isl_idx].m_mutex,boost::defer_lock);
+				timed_lock(lock,metrics.m_migration_wait);
+				inbox.swap(m_migr_slots[isl_idx].m_individuals);
+			}
+			// Iterate over all the vectors of individuals provided by the different islands.
+			for (boost::unordered_map<size_type,std::vector<individual_type> >::iterator it = inbox.begin(); it != inbox.end(); ++it) {
 				pagmo_assert(it->first < m_container.size());
-				build_immigrants_vector(immigrants,*m_container[it->first],isl,it->second);
+				build_immigrants_vector(immigrants,it->first,isl,it->second);
 			}
-			// Delete stuff in the migration map.
-			m_migr_map.erase(isl_idx);
 			break;
 		}
 		case destination:
-			// For destination migration direction, items in the migration map behave like "outboxes", i.e. each one is a
+			// For destination migration direction, migration slots behave like "outboxes", i.e. each one is a
 			// "database of best individuals" seen in the islands of the archipelago.
 			// Get neighbours connecting into isl.
 			const std::vector<topology::base::vertices_size_type> inv_adj_islands(m_topology->get_v_inv_adjacent_vertices(boost::numeric_cast<topology::base::vertices_size_type>(isl_idx)));
 			// Do something only if there are adjacent islands.
 			if (inv_adj_islands.size()) {
-				switch (m_dist_type) {
-					case point_to_point:
-					{
-						lock_type lock(m_migr_mutex);
-						// Get the index of a random island connecting into isl.
-						boost::uniform_int<std::vector<topology::base::vertices_size_type>::size_type> u_int(0,inv_adj_islands.size() - 1);
-						const size_type rn_isl_idx = boost::numeric_cast<size_type>(inv_adj_islands[u_int(m_urng)]);
-						// Get the immigrants from the outbox of the random island. Note the redundant information in the last
-						// argument of the function.
-						pagmo_assert(m_migr_map[rn_isl_idx].size() <= 1);
-
-						double next_rng = m_drng();
-						double migr_prob = m_topology->get_weight(rn_isl_idx, isl_idx);
-						if (next_rng < migr_prob) {
-							build_immigrants_vector(immigrants,*m_container[rn_isl_idx],isl,m_migr_map[rn_isl_idx][rn_isl_idx]);
+				// Select the source islands. The rngs are shared, hence their use is serialised, but the
+				// (possibly expensive) access to the outboxes happens outside the lock.
+				std::vector<size_type> src_islands;
+				{
+					unique_lock_type lock(m_migr_mutex,boost::defer_lock);
+					timed_lock(lock,metrics.m_migration_wait);
+					switch (m_dist_type) {
+						case point_to_point:
+						{
+							// Get the index of a random island connecting into isl.
+							boost::uniform_int<std::vector<topology::base::vertices_size_type>::size_type> u_int(0,inv_adj_islands.size() - 1);
+							const size_type rn_isl_idx = boost::numeric_cast<size_type>(inv_adj_islands[u_int(m_urng)]);
+							if (m_drng() < m_topology->get_weight(rn_isl_idx, isl_idx)) {
+								src_islands.push_back(rn_isl_idx);
+							}
+							break;
 						}
-						break;
-					}
-					case broadcast:
-					{
-						lock_type lock(m_migr_mutex);
-						// For broadcast migration fetch immigrants from all neighbour islands' databases.
-						for (std::vector<topology::base::vertices_size_type>::size_type i = 0; i < inv_adj_islands.size(); ++i) {
-							const size_type src_isl_idx = boost::numeric_cast<size_type>(inv_adj_islands[i]);
-							pagmo_assert(m_migr_map[src_isl_idx].size() <= 1);
-							double next_rng = m_drng();
-							double migr_prob = m_topology->get_weight(src_isl_idx, isl_idx);
-							if (next_rng < migr_prob) {
-								build_immigrants_vector(immigrants,*m_container[src_isl_idx],isl,m_migr_map[src_isl_idx][src_isl_idx]);
+						case broadcast:
+						{
+							// For broadcast migration fetch immigrants from all neighbour islands' databases.
+							for (std::vector<topology::base::vertices_size_type>::size_type i = 0; i < inv_adj_islands.size(); ++i) {
+								const size_type src_isl_idx = boost::numeric_cast<size_type>(inv_adj_islands[i]);
+								if (m_drng() < m_topology->get_weight(src_isl_idx, isl_idx)) {
+									src_islands.push_back(src_isl_idx);
+								}
 							}
 						}
 					}
 				}
+				for (std::vector<size_type>::size_type i = 0; i < src_islands.size(); ++i) {
+					const migration_slot &slot = m_migr_slots[src_islands[i]];
+					// Get the immigrants from the outbox of the source island, which is keyed redundantly by the island's index.
+					slot_read_lock_type lock(slot.m_mutex,boost::defer_lock);
+					timed_lock(lock,metrics.m_migration_wait);
+					pagmo_assert(slot.m_individuals.size() <= 1);
+					const boost::unordered_map<size_type,std::vector<individual_type> >::const_iterator it = slot.m_individuals.find(src_islands[i]);
+					if (it != slot.m_individuals.end()) {
+						build_immigrants_vector(immigrants,src_islands[i],isl,it->second);
+					}
+				}
 			}
 	}
 	//2. Insert immigrants into population.
@@ -514,16 +563,26 @@ void archipelago::pre_evolution(base_island &isl)
 		// We then insert the incoming individuals into the population, storing how many from where
 		std::vector<std::pair<population::size_type, size_type> > rec_history;
 		rec_history = isl.accept_immigrants(immigrants);
-		lock_type lock(m_migr_mutex);
+		// NOTE: each island thread touches only its own version counter, no need to lock.
+		++m_island_versions[isl_idx];
+		// Credit the accepted individuals to the receiving and to the sending islands.
+		for (size_t i = 0; i < rec_history.size(); ++i) {
+			{
+				lock_type lock(metrics.m_mutex);
+				metrics.m_metrics.migrants_received += rec_history[i].first;
+			}
+			metrics_slot &src_metrics = m_metrics[rec_history[i].second];
+			lock_type lock(src_metrics.m_mutex);
+			src_metrics.m_metrics.migrants_sent += rec_history[i].first;
+		}
+		unique_lock_type lock(m_migr_mutex,boost::defer_lock);
+		timed_lock(lock,metrics.m_migration_wait);
 		// Record the migration history.
 		for (size_t i =0; i< rec_history.size(); ++i) {
-			m_migr_hist.push_back( boost::make_tuple(
-				rec_history[i].first,
-				rec_history[i].second,
-				isl_idx)
-			);
+			m_migr_hist.push_back(m_island_rounds[isl_idx],rec_history[i].second,isl_idx,rec_history[i].first);
 		}
 	}
+	metrics.m_evo_start = boost::posix_time::microsec_clock::universal_time();
 }
 
 // This method will be called after each island isl has completed an evolution. Its purpose is to get individuals
@@ -538,6 +597,8 @@ void archipelago::post_evolution(base_island &isl)
 	// Determine the island's index in the archipelago.
 	const size_type isl_idx = locate_island(isl);
 	pagmo_assert(isl_idx < m_container.size());
+	metrics_slot &metrics = m_metrics[isl_idx];
+	const double evo_time = elapsed_ms(metrics.m_evo_start);
 	// Create the vector of emigrants.
 	std::vector<individual_type> emigrants;
 	switch (m_migr_dir) {
@@ -549,60 +610,295 @@ void archipelago::post_evolution(base_island &isl)
 				emigrants = isl.get_emigrants();
 				// Do something only if we have emigrants.
 				if (emigrants.size()) {
-					switch (m_dist_type)
+					// Select the destination islands while holding the rngs' lock.
+					std::vector<size_type> dest_islands;
 					{
-						case point_to_point:
+						unique_lock_type lock(m_migr_mutex,boost::defer_lock);
+						timed_lock(lock,metrics.m_migration_wait);
+						switch (m_dist_type)
 						{
-							lock_type lock(m_migr_mutex);
-							// For one-to-one migration choose a random neighbour island and put immigrants to its inbox.
-							boost::uniform_int<std::vector<topology::base::vertices_size_type>::size_type> u_int(0,adj_islands.size() - 1);
-							const size_type chosen_adj = boost::numeric_cast<size_type>(adj_islands[u_int(m_urng)]);
-							double next_rng = m_drng();
-							double migr_prob = m_topology->get_weight(isl_idx, chosen_adj);
-							if (next_rng < migr_prob) {
-								m_migr_map[chosen_adj][isl_idx].insert(m_migr_map[chosen_adj][isl_idx].end(),emigrants.begin(),emigrants.end());
+							case point_to_point:
+							{
+								// For one-to-one migration choose a random neighbour island.
+								boost::uniform_int<std::vector<topology::base::vertices_size_type>::size_type> u_int(0,adj_islands.size() - 1);
+								const size_type chosen_adj = boost::numeric_cast<size_type>(adj_islands[u_int(m_urng)]);
+								if (m_drng() < m_topology->get_weight(isl_idx, chosen_adj)) {
+									dest_islands.push_back(chosen_adj);
+								}
+								break;
 							}
-							break;
-						}
-						case broadcast:
-						{
-							lock_type lock(m_migr_mutex);
-							// For broadcast migration put immigrants to all neighbour islands' inboxes.
-							for (std::vector<topology::base::vertices_size_type>::size_type i = 0; i < adj_islands.size(); ++i) {
-								double next_rng = m_drng();
-								double migr_prob = m_topology->get_weight(isl_idx, adj_islands[i]);
-								if (next_rng < migr_prob) {
-									m_migr_map[boost::numeric_cast<size_type>(adj_islands[i])][isl_idx]
-										.insert(m_migr_map[boost::numeric_cast<size_type>(adj_islands[i])][isl_idx].end(),
-										emigrants.begin(),emigrants.end());
+							case broadcast:
+							{
+								// For broadcast migration consider all neighbour islands.
+								for (std::vector<topology::base::vertices_size_type>::size_type i = 0; i < adj_islands.size(); ++i) {
+									if (m_drng() < m_topology->get_weight(isl_idx, adj_islands[i])) {
+										dest_islands.push_back(boost::numeric_cast<size_type>(adj_islands[i]));
+									}
 								}
 							}
 						}
 					}
+					// Put the emigrants into the inboxes of the destination islands, locking one inbox at a time.
+					for (std::vector<size_type>::size_type i = 0; i < dest_islands.size(); ++i) {
+						migration_slot &slot = m_migr_slots[dest_islands[i]];
+						slot_write_lock_type lock(slot.m_mutex,boost::defer_lock);
+						timed_lock(lock,metrics.m_migration_wait);
+						std::vector<individual_type> &inbox = slot.m_individuals[isl_idx];
+						inbox.insert(inbox.end(),emigrants.begin(),emigrants.end());
+					}
 				}
 			}
 			break;
 		}
 		case destination:
 		{
-			// For destination migration direction, migration map behaves like "outboxes", i.e. each is a "database of best individuals" for corresponding island.
+			// For destination migration direction, migration slots behave like "outboxes", i.e. each is a "database of best individuals" for corresponding island.
 			emigrants = isl.get_emigrants();
-			lock_type lock(m_migr_mutex);
-			pagmo_assert(m_migr_map[isl_idx].size() <= 1);
-			m_migr_map[isl_idx][isl_idx].swap(emigrants);
+			migration_slot &slot = m_migr_slots[isl_idx];
+			slot_write_lock_type lock(slot.m_mutex,boost::defer_lock);
+			timed_lock(lock,metrics.m_migration_wait);
+			pagmo_assert(slot.m_individuals.size() <= 1);
+			slot.m_individuals[isl_idx].swap(emigrants);
+		}
+	}
+	// Close the round in the metrics. The evaluation counters might have been reset during the round
+	// (e.g., by an island replacing its problem), in which case only the current counts are taken into account.
+	const std::size_t fevals = isl.m_pop.problem().get_fevals(), cevals = isl.m_pop.problem().get_cevals();
+	const std::size_t round_fevals = (fevals >= metrics.m_fevals) ? fevals - metrics.m_fevals : fevals;
+	const bool improved = metrics.m_champion_f.size() && isl.m_pop.size() &&
+		isl.m_pop.problem().compare_fitness(isl.m_pop.champion().f,metrics.m_champion_f);
+	{
+		lock_type lock(metrics.m_mutex);
+		island_metrics &m = metrics.m_metrics;
+		++m.rounds;
+		m.evolution_time += evo_time;
+		m.fevals += round_fevals;
+		m.cevals += (cevals >= metrics.m_cevals) ? cevals - metrics.m_cevals : cevals;
+		m.migration_wait += metrics.m_migration_wait;
+		if (improved) {
+			++m.improvements;
+			m.champion_improvement += metrics.m_champion_f[0] - isl.m_pop.champion().f[0];
+		}
+	}
+	check_termination(isl,isl_idx,round_fevals);
+	// NOTE: each island thread touches only its own counters, no need to lock.
+	++m_island_versions[isl_idx];
+	++m_island_rounds[isl_idx];
+	if (m_listener) {
+		m_listener(isl_idx,false);
+	}
+}
+
+// This method will be called by the evolution thread of island isl right before terminating.
+void archipelago::evolution_exit(base_island &isl)
+{
+	pagmo_assert(isl.m_archi == this);
+	if (m_listener) {
+		m_listener(locate_island(isl),true);
+	}
+}
+
+// Convert the migration slots to the migration map used for serialization. Empty slots are skipped.
+archipelago::migration_map_type archipelago::get_migration_map() const
+{
+	migration_map_type retval;
+	for (size_type i = 0; i < m_migr_slots.size(); ++i) {
+		if (m_migr_slots[i].m_individuals.size()) {
+			retval[i] = m_migr_slots[i].m_individuals;
+		}
+	}
+	return retval;
+}
+
+// Set the migration slots from a migration map.
+void archipelago::set_migration_map(const migration_map_type &migr_map)
+{
+	m_migr_slots.assign(m_container.size(),migration_slot());
+	for (migration_map_type::const_iterator it = migr_map.begin(); it != migr_map.end(); ++it) {
+		if (it->first >= m_migr_slots.size()) {
+			pagmo_throw(value_error,"invalid island index in migration map");
+		}
+		m_migr_slots[it->first].m_individuals = it->second;
+	}
+}
+
+/// Get the island versions.
+/**
+ * The version of an island is the number of modifications it has undergone since it was added to the archipelago
+ * (or since the archipelago was deserialized): it is increased by each evolution, by the arrival of immigrants and by
+ * set_island() and set_algorithm(). Versions can be used to detect which islands changed between two points in time.
+ *
+ * @return vector of island versions.
+ */
+std::vector<std::size_t> archipelago::get_island_versions() const
+{
+	join();
+	return m_island_versions;
+}
+
+/// Set the termination criteria.
+/**
+ * Will wait for the end of the ongoing evolutions, then set the criteria checked by the islands after each evolution round during the
+ * next calls to evolve(), evolve_batch() and evolve_t(). When one of the criteria is met, the islands stop at the end of their current round,
+ * and the islands of evolve_batch() which have not started yet are not evolved.
+ * Default-constructed criteria never stop the evolution.
+ *
+ * @param[in] c termination criteria.
+ *
+ * @throws value_error if the dimension of the target fitness does not match the fitness dimension of the islands' problems.
+ */
+void archipelago::set_termination_criteria(const termination_criteria &c)
+{
+	join();
+	if (c.target.size() && m_container.size() && c.target.size() != m_container[0]->m_pop.problem().get_f_dimension()) {
+		pagmo_throw(value_error,"the dimension of the target fitness is not compatible with the problem");
+	}
+	if (c.max_time < 0) {
+		pagmo_throw(value_error,"the time limit cannot be negative");
+	}
+	m_term_criteria = c;
+}
+
+/// Get the termination criteria.
+/**
+ * @return the termination criteria.
+ */
+archipelago::termination_criteria archipelago::get_termination_criteria() const
+{
+	join();
+	return m_term_criteria;
+}
+
+/// Get the reason of the termination.
+/**
+ * @return a description of the criterion that stopped the last evolution, or an empty string if the last evolution was not stopped
+ * (or is still running).
+ */
+std::string archipelago::get_termination_reason() const
+{
+	lock_type lock(m_term_mutex);
+	return m_term_reason;
+}
+
+// Reset the state of the termination criteria at the beginning of an evolution.
+void archipelago::reset_termination()
+{
+	m_term_reason.clear();
+	m_term_champion_f.clear();
+	m_term_stall.assign(m_container.size(),0);
+	m_term_n_stalled = 0;
+	m_term_fevals = 0;
+	m_term_start = boost::posix_time::microsec_clock::universal_time();
+}
+
+// Check whether a termination criterion was met by the round completed by island isl, which performed fevals function evaluations.
+void archipelago::check_termination(const base_island &isl, const size_type &isl_idx, const std::size_t &fevals)
+{
+	const termination_criteria &c = m_term_criteria;
+	lock_type lock(m_term_mutex);
+	if (m_term_reason.size()) {
+		return;
+	}
+	if (isl.m_pop.size()) {
+		const fitness_vector &f = isl.m_pop.champion().f;
+		if (c.target.size() == f.size() && (f == c.target || isl.m_pop.problem().compare_fitness(f,c.target))) {
+			m_term_reason = "target fitness reached";
+			return;
+		}
+		// Track the global champion and, for each island, the rounds elapsed since it last improved.
+		if (c.stall_rounds) {
+			if (!m_term_champion_f.size() || isl.m_pop.problem().compare_fitness(f,m_term_champion_f)) {
+				m_term_champion_f = f;
+				m_term_stall.assign(m_container.size(),0);
+				m_term_n_stalled = 0;
+			} else if (++m_term_stall[isl_idx] == c.stall_rounds && ++m_term_n_stalled == m_container.size()) {
+				m_term_reason = "champion stalled";
+				return;
+			}
 		}
 	}
+	m_term_fevals += fevals;
+	if (c.max_fevals && m_term_fevals >= c.max_fevals) {
+		m_term_reason = "fevals budget exhausted";
+		return;
+	}
+	if (c.max_time > 0 && elapsed_ms(m_term_start) >= c.max_time) {
+		m_term_reason = "time limit reached";
+	}
+}
+
+// Check whether the ongoing evolution has to stop.
+bool archipelago::termination_requested() const
+{
+	lock_type lock(m_term_mutex);
+	return !m_term_reason.empty();
+}
+
+/// Get the runtime counters of the islands.
+/**
+ * The counters are accumulated since the islands were added to the archipelago (or since the archipelago was deserialized,
+ * or since the last call to reset_metrics()). This method does not wait for the end of the ongoing evolutions: the counters of each island
+ * are consistent with the last round it completed.
+ *
+ * @return vector of archipelago::island_metrics, one per island.
+ */
+std::vector<archipelago::island_metrics> archipelago::get_metrics() const
+{
+	std::vector<island_metrics> retval;
+	retval.reserve(m_metrics.size());
+	for (size_type i = 0; i < m_metrics.size(); ++i) {
+		lock_type lock(m_metrics[i].m_mutex);
+		retval.push_back(m_metrics[i].m_metrics);
+	}
+	return retval;
+}
+
+/// Reset the runtime counters of the islands.
+/**
+ * Will wait for the end of the ongoing evolutions and set all the counters to zero. The rounds recorded in the migration
+ * history keep counting the evolutions of the islands, so that events recorded before and after the reset are not mixed up.
+ */
+void archipelago::reset_metrics()
+{
+	join();
+	m_metrics.assign(m_container.size(),metrics_slot());
+}
+
+/// Set the evolution listener.
+/**
+ * Will wait for the end of the ongoing evolutions, then the listener l will be called after each evolution of each island
+ * and when the evolution thread of each island terminates (see archipelago::listener_type). An empty listener
+ * disables notifications.
+ *
+ * Listeners are not copied along with the archipelago and they are not serialized.
+ *
+ * @param[in] l listener.
+ */
+void archipelago::set_listener(const listener_type &l)
+{
+	join();
+	m_listener = l;
 }
 
 /// Run the evolution for the given number of iterations.
 /**
- * Will iteratively call island::evolve(n) on each island of the archipelago and then return.
+ * Will iteratively call island::evolve(n) on each island of the archipelago and then return. In pooled mode (see set_pool_size()),
+ * the evolutions of the islands are instead queued for the worker threads.
  *
  * \param[in] n number of time each island will be evolved.
  */
 void archipelago::evolve(int n)
 {
 	join();
+	reset_termination();
+	if (m_pool_size) {
+		std::vector<size_type> indices;
+		for (size_type i = 0; i < m_container.size(); ++i) {
+			indices.push_back(i);
+		}
+		pool_evolve(indices,boost::numeric_cast<std::size_t>(n),false);
+		return;
+	}
 	const iterator it_f = m_container.end();
 	// Reset thread barrier.
 	reset_barrier(m_container.size());
@@ -625,6 +921,7 @@ void archipelago::evolve(int n)
 void archipelago::evolve_batch(int n, unsigned int b, bool randomize)
 {
 	join();
+	reset_termination();
 	container_type::size_type arch_size = this->get_size();
 	// Order of populations to evolve, by default biased by the index (lowest first)
 	std::vector<population::size_type> pop_order(arch_size);
@@ -640,29 +937,200 @@ void archipelago::evolve_batch(int n, unsigned int b, bool randomize)
 	}
 	
 	for(size_type p = 0; p < arch_size/b + 1; ++p) {
-		if(p == arch_size/b) { //for the last batch of islands decrease the barrier
-			reset_barrier(arch_size - p*b);
-		} else {
-			reset_barrier(b);
+		// Do not start the remaining batches if a termination criterion was met.
+		if (termination_requested()) {
+			break;
 		}
+		std::vector<size_type> batch;
 		for(size_type i=0; i<b && p*b+i < arch_size; ++i) {
-			m_container[pop_order[p*b+i]]->evolve(n);
+			batch.push_back(pop_order[p*b+i]);
 		}
-		for(size_type i=0; i<b && p*b+i < arch_size; ++i) {
-			m_container[pop_order[p*b+i]]->join();
+		evolve_group(batch,n);
+		for(size_type i=0; i<batch.size(); ++i) {
+			m_container[batch[i]]->join();
+		}
+	}
+}
+
+/// Run the evolution allocating the rounds adaptively to the islands.
+/**
+ * Will perform a total of n evolution rounds, in batches of (at most) b islands evolving at the same time for one round, like evolve_batch().
+ * Instead of giving the same number of rounds to each island, the islands of each batch are chosen according to their past performance,
+ * treating the allocation as a multi-armed bandit problem. The reward of a round is the decrease of the first objective of the island's
+ * champion, and each island is scored with the upper confidence bound
+ * \f[
+ * \frac{\bar r_i/r_{max} + c \sqrt{2 \ln N / n_i}}{\bar t_i / \bar t},
+ * \f]
+ * where \f$ n_i \f$, \f$ \bar r_i \f$ and \f$ \bar t_i \f$ are the number of rounds, the average reward and the average wall time of the rounds of island i,
+ * \f$ r_{max} \f$ is the largest reward observed, \f$ N \f$ is the number of rounds performed and \f$ \bar t \f$ is the average wall time of a round.
+ * Productive and cheap islands are hence evolved more often, while c controls the exploration of the other islands. Islands which have not been
+ * evolved yet are selected first.
+ *
+ * If stall is positive, an island whose champion has not improved for stall consecutive rounds is reseeded: all its individuals but the best one
+ * are re-initialised randomly, and the statistics of the island are reset.
+ *
+ * The decisions are recorded in a log, available via get_allocation_log() until the next call to this method.
+ * The evolution is synchronous, i.e., this method returns when all the rounds have been performed or a termination criterion was met.
+ *
+ * \param[in] n total number of evolution rounds.
+ * \param[in] b number of islands evolving at the same time.
+ * \param[in] c exploration coefficient.
+ * \param[in] stall number of rounds without improvement after which an island is reseeded (0 to disable reseeding).
+ *
+ * @throws value_error if b is zero or c is negative.
+ */
+void archipelago::evolve_adaptive(int n, unsigned int b, double c, unsigned int stall)
+{
+	join();
+	if (!b) {
+		pagmo_throw(value_error,"the batch size must be positive");
+	}
+	if (c < 0) {
+		pagmo_throw(value_error,"the exploration coefficient cannot be negative");
+	}
+	reset_termination();
+	m_alloc_log.clear();
+	std::size_t budget = boost::numeric_cast<std::size_t>(n);
+	const size_type arch_size = m_container.size();
+	if (!arch_size) {
+		return;
+	}
+	std::vector<allocation_arm> arms(arch_size);
+	std::size_t total_rounds = 0;
+	double total_cost = 0, max_reward = 0;
+	// Visit the islands in random order, so that ties are not broken in favour of the lowest indices.
+	std::vector<size_type> order(arch_size);
+	for (size_type i = 0; i < arch_size; ++i) {
+		order[i] = i;
+	}
+	boost::uniform_int<int> isl_idx(0,boost::numeric_cast<int>(arch_size) - 1);
+	boost::variate_generator<boost::mt19937 &, boost::uniform_int<int> > rand_idx(m_urng,isl_idx);
+	std::random_shuffle(order.begin(),order.end(),rand_idx);
+	for (std::size_t step = 0; budget && !termination_requested(); ++step) {
+		// Score the islands.
+		std::vector<std::pair<double,size_type> > scores;
+		for (size_type j = 0; j < arch_size; ++j) {
+			const size_type i = order[j];
+			const allocation_arm &arm = arms[i];
+			double score = std::numeric_limits<double>::infinity();
+			if (arm.m_rounds) {
+				const double mean_reward = (max_reward > 0) ? arm.m_reward / arm.m_rounds / max_reward : 0.;
+				const double bonus = c * std::sqrt(2. * std::log(static_cast<double>(total_rounds)) / arm.m_rounds);
+				const double rel_cost = (arm.m_cost > 0 && total_cost > 0) ? (arm.m_cost / arm.m_rounds) / (total_cost / total_rounds) : 1.;
+				score = (mean_reward + bonus) / rel_cost;
+			}
+			scores.push_back(std::make_pair(score,i));
+		}
+		// Pick the best islands, preserving the random order among equal scores.
+		const size_type batch_size = std::min<std::size_t>(std::min<std::size_t>(b,arch_size),budget);
+		std::stable_sort(scores.begin(),scores.end(),boost::bind(&std::pair<double,size_type>::first,_1) >
+			boost::bind(&std::pair<double,size_type>::first,_2));
+		std::vector<size_type> batch;
+		std::vector<island_metrics> before;
+		for (size_type j = 0; j < batch_size; ++j) {
+			batch.push_back(scores[j].second);
+			lock_type lock(m_metrics[batch.back()].m_mutex);
+			before.push_back(m_metrics[batch.back()].m_metrics);
+		}
+		evolve_group(batch,1);
+		for (size_type j = 0; j < batch.size(); ++j) {
+			m_container[batch[j]]->join();
+		}
+		// Update the statistics with the metrics of the rounds.
+		for (size_type j = 0; j < batch.size(); ++j) {
+			const size_type i = batch[j];
+			island_metrics after;
+			{
+				lock_type lock(m_metrics[i].m_mutex);
+				after = m_metrics[i].m_metrics;
+			}
+			if (after.rounds == before[j].rounds) {
+				// The round did not complete (e.g., because of an error).
+				continue;
+			}
+			allocation_event e;
+			e.step = step;
+			e.island = i;
+			e.score = scores[j].first;
+			e.reward = std::max(0.,after.champion_improvement - before[j].champion_improvement);
+			e.cost = after.evolution_time - before[j].evolution_time;
+			allocation_arm &arm = arms[i];
+			++arm.m_rounds;
+			arm.m_reward += e.reward;
+			arm.m_cost += e.cost;
+			arm.m_stall = (after.improvements > before[j].improvements) ? 0 : arm.m_stall + 1;
+			++total_rounds;
+			total_cost += e.cost;
+			max_reward = std::max(max_reward,e.reward);
+			if (stall && arm.m_stall >= stall) {
+				reseed_island(i);
+				arm = allocation_arm();
+				e.reseeded = true;
+			}
+			m_alloc_log.push_back(e);
+		}
+		budget -= batch.size();
+	}
+}
+
+/// Get the decisions of the adaptive scheduler.
+/**
+ * @return the rounds allotted to the islands during the last call to evolve_adaptive(), in chronological order.
+ */
+std::vector<archipelago::allocation_event> archipelago::get_allocation_log() const
+{
+	join();
+	return m_alloc_log;
+}
+
+// Start the evolution of the islands at the given indices for n rounds, the islands starting at the same time.
+void archipelago::evolve_group(const std::vector<size_type> &indices, int n)
+{
+	if (m_pool_size) {
+		pool_evolve(indices,boost::numeric_cast<std::size_t>(n),false);
+		return;
+	}
+	reset_barrier(indices.size());
+	for (std::vector<size_type>::size_type i = 0; i < indices.size(); ++i) {
+		m_container[indices[i]]->evolve(n);
+	}
+}
+
+// Reinitialise randomly all the individuals of an island but the best one.
+void archipelago::reseed_island(const size_type &idx)
+{
+	population &pop = m_container[idx]->m_pop;
+	if (!pop.size()) {
+		return;
+	}
+	const population::size_type best = pop.get_best_idx();
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		if (i != best) {
+			pop.reinit(i);
 		}
 	}
+	++m_island_versions[idx];
 }
 
 /// Run the evolution for a minimum amount of time.
 /**
- * Will iteratively call island::evolve_t(n) on each island of the archipelago and then return.
+ * Will iteratively call island::evolve_t(n) on each island of the archipelago and then return. In pooled mode (see set_pool_size()),
+ * the evolutions of the islands are instead queued for the worker threads.
  *
  * \param[in] t amount of time to evolve each island (in milliseconds).
  */
 void archipelago::evolve_t(int t)
 {
 	join();
+	reset_termination();
+	if (m_pool_size) {
+		std::vector<size_type> indices;
+		for (size_type i = 0; i < m_container.size(); ++i) {
+			indices.push_back(i);
+		}
+		pool_evolve(indices,boost::numeric_cast<std::size_t>(t),true);
+		return;
+	}
 	const iterator it_f = m_container.end();
 	reset_barrier(m_container.size());
 	for (iterator it = m_container.begin(); it != it_f; ++it) {
@@ -737,6 +1205,7 @@ void archipelago::set_island(const size_type &idx, const base_island &isl)
 	m_container[idx] = isl.clone();
 	// Tell the island that it is living in an archipelago now.
 	m_container[idx]->m_archi = this;
+	++m_island_versions[idx];
 }
 
 /// Get vector of islands in the archipelago.
@@ -755,11 +1224,275 @@ std::vector<base_island_ptr> archipelago::get_islands() const
 	return retval;
 }
 
+/// Set the size of the worker pool.
+/**
+ * Will wait for the end of the ongoing evolutions, then set the number of threads used to evolve the islands. By default (size equal to zero)
+ * each island is evolved in its own thread, spawned by base_island::evolve(). With a positive size, the archipelago runs instead in pooled mode:
+ * evolve(), evolve_t() and evolve_batch() queue the evolutions of the islands, which are performed one round at a time by at most size worker threads.
+ * In pooled mode the islands do not wait for each other before starting their evolution, and the island-specific evolution mechanism
+ * is bypassed (the rounds are performed by calling directly base_island::perform_evolution() from the workers).
+ *
+ * The size of the pool is copied along with the archipelago, but it is not serialized.
+ *
+ * @param[in] size number of worker threads, 0 for one thread per island.
+ */
+void archipelago::set_pool_size(const unsigned int &size)
+{
+	join();
+	m_pool_size = size;
+}
+
+/// Get the size of the worker pool.
+/**
+ * @return the number of worker threads used to evolve the islands, or 0 if each island is evolved in its own thread.
+ */
+unsigned int archipelago::get_pool_size() const
+{
+	return m_pool_size;
+}
+
+/// Default size of the worker pool.
+/**
+ * @return the number of hardware threads available on the machine, or 1 if it cannot be determined.
+ */
+unsigned int archipelago::get_default_pool_size()
+{
+	const unsigned int n = boost::thread::hardware_concurrency();
+	return n ? n : 1u;
+}
+
+/// Initialise populations in parallel.
+/**
+ * Builds n populations of m random individuals for problem p, distributing their initialisation (and hence the evaluation of
+ * the individuals) over n_threads threads. The seeds of the populations are drawn sequentially from the global
+ * rng_generator, so that the result does not depend on the number of threads and is the same as constructing the populations one after the other.
+ *
+ * The objective function and the constraints of p must be safe to call concurrently on distinct copies of the problem.
+ *
+ * @param[in] p problem.
+ * @param[in] n number of populations.
+ * @param[in] m number of individuals in each population.
+ * @param[in] n_threads number of threads (0 for get_default_pool_size()).
+ *
+ * @return vector of populations.
+ *
+ * @throws value_error if n or m are negative.
+ * @throws std::runtime_error if the initialisation of a population fails.
+ */
+std::vector<population> archipelago::init_populations(const problem::base &p, int n, int m, unsigned int n_threads)
+{
+	if (n < 0 || m < 0) {
+		pagmo_throw(value_error,"the number of populations and individuals cannot be negative");
+	}
+	const std::size_t n_pops = boost::numeric_cast<std::size_t>(n);
+	std::vector<boost::uint32_t> seeds;
+	for (std::size_t i = 0; i < n_pops; ++i) {
+		seeds.push_back(population::getSeed());
+	}
+	std::vector<population> retval(n_pops,population(p));
+	const std::size_t n_workers = std::min<std::size_t>(n_threads ? n_threads : get_default_pool_size(),n_pops);
+	if (n_workers <= 1) {
+		std::string error;
+		init_populations_chunk(retval,p,m,seeds,0,1,error);
+		if (error.size()) {
+			pagmo_throw(std::runtime_error,error);
+		}
+		return retval;
+	}
+	std::vector<std::string> errors(n_workers);
+	boost::thread_group workers;
+	for (std::size_t i = 0; i < n_workers; ++i) {
+		// NOTE: each thread works on its own copy of the problem.
+		workers.create_thread(boost::bind(&archipelago::init_populations_chunk,boost::ref(retval),boost::cref(p),m,
+			boost::cref(seeds),i,n_workers,boost::ref(errors[i])));
+	}
+	workers.join_all();
+	for (std::size_t i = 0; i < n_workers; ++i) {
+		if (errors[i].size()) {
+			pagmo_throw(std::runtime_error,errors[i]);
+		}
+	}
+	return retval;
+}
+
+// Initialise the populations at positions first, first + step, first + 2 * step, ... of pops. In case of error,
+// the message is stored in error and the remaining populations are skipped.
+void archipelago::init_populations_chunk(std::vector<population> &pops, const problem::base &p, int m, const std::vector<boost::uint32_t> &seeds,
+	std::size_t first, std::size_t step, std::string &error)
+{
+	try {
+		const problem::base_ptr prob = p.clone();
+		for (std::size_t i = first; i < pops.size(); i += step) {
+			pops[i] = population(*prob,m,seeds[i]);
+		}
+	} catch (const std::exception &e) {
+		error = e.what();
+	} catch (...) {
+		error = "unknown exception caught during the initialisation of a population";
+	}
+}
+
+// Queue the evolution of the islands at the given indices, for n rounds or for n milliseconds if timed is true, and start the workers.
+void archipelago::pool_evolve(const std::vector<size_type> &indices, const std::size_t &n, bool timed)
+{
+	pagmo_assert(m_pool_size);
+	// Wait for the workers of the previous evolution to terminate.
+	pool_join_workers();
+	if (!indices.size()) {
+		return;
+	}
+	{
+		lock_type lock(m_pool_mutex);
+		for (std::vector<size_type>::size_type i = 0; i < indices.size(); ++i) {
+			base_island *isl = m_container[indices[i]].get();
+			isl->m_pool_pending = true;
+			isl->m_pool_cancel = false;
+			m_pool_queue.push_back(pool_task(isl,n,timed));
+		}
+	}
+	const std::size_t n_workers = std::min<std::size_t>(m_pool_size,indices.size());
+	for (std::size_t i = 0; i < n_workers; ++i) {
+		try {
+			m_pool_workers.push_back(boost::shared_ptr<boost::thread>(new boost::thread(boost::bind(&archipelago::pool_worker,this))));
+		} catch (...) {
+			// The workers already started will take care of the queue.
+			if (m_pool_workers.size()) {
+				break;
+			}
+			lock_type lock(m_pool_mutex);
+			for (std::vector<size_type>::size_type j = 0; j < indices.size(); ++j) {
+				m_container[indices[j]]->m_pool_pending = false;
+			}
+			m_pool_queue.clear();
+			pagmo_throw(std::runtime_error,"failed to launch the thread");
+		}
+	}
+}
+
+// Body of the worker threads: perform one round of the first task in the queue, and put it back at the end of the queue
+// if it is not completed, until the queue is empty.
+void archipelago::pool_worker()
+{
+	while (true) {
+		pool_task task;
+		{
+			lock_type lock(m_pool_mutex);
+			if (!m_pool_queue.size()) {
+				return;
+			}
+			task = m_pool_queue.front();
+			m_pool_queue.pop_front();
+		}
+		if (!pool_round(task)) {
+			lock_type lock(m_pool_mutex);
+			m_pool_queue.push_back(task);
+			continue;
+		}
+		base_island &isl = *task.m_isl;
+		isl.m_evo_time += static_cast<std::size_t>(task.m_evo_time);
+		try {
+			evolution_exit(isl);
+		} catch (...) {
+			std::cout << "Error notifying the end of the evolution.\n";
+		}
+		lock_type lock(m_pool_mutex);
+		isl.m_pool_pending = false;
+		m_pool_cond.notify_all();
+	}
+}
+
+// Perform one round of the evolution of a task. Return true if the task is completed.
+bool archipelago::pool_round(pool_task &task)
+{
+	base_island &isl = *task.m_isl;
+	bool failed = false;
+	if (task.m_timed || task.m_rounds < task.m_n) {
+		const boost::posix_time::ptime start(boost::posix_time::microsec_clock::universal_time());
+		isl.thread_entry();
+		try {
+			pre_evolution(isl);
+			isl.m_pop.problem().pre_evolution(isl.m_pop);
+			isl.perform_evolution(*isl.m_algo,isl.m_pop);
+			post_evolution(isl);
+			isl.m_pop.problem().post_evolution(isl.m_pop);
+		} catch (const std::exception &e) {
+			std::cout << "Error during island evolution using " << isl.m_algo->get_name() << ": " << e.what() << std::endl;
+			failed = true;
+		} catch (...) {
+			std::cout << "Error during island evolution using " << isl.m_algo->get_name() << ", unknown exception caught. :(" << std::endl;
+			failed = true;
+		}
+		isl.thread_exit();
+		++task.m_rounds;
+		task.m_evo_time += elapsed_ms(start);
+	}
+	bool cancelled;
+	{
+		lock_type lock(m_pool_mutex);
+		cancelled = isl.m_pool_cancel;
+	}
+	if (failed || cancelled || termination_requested()) {
+		return true;
+	}
+	if (task.m_timed) {
+		return elapsed_ms(task.m_start) >= static_cast<double>(task.m_n);
+	}
+	return task.m_rounds >= task.m_n;
+}
+
+// Wait for the end of the pooled evolution of island isl.
+void archipelago::pool_join(const base_island &isl) const
+{
+	unique_lock_type lock(m_pool_mutex);
+	while (isl.m_pool_pending) {
+		m_pool_cond.wait(lock);
+	}
+}
+
+// Check whether the pooled evolution of island isl is ongoing.
+bool archipelago::pool_busy(const base_island &isl) const
+{
+	lock_type lock(m_pool_mutex);
+	return isl.m_pool_pending;
+}
+
+// Ask the pooled evolution of island isl to stop at the end of the current round.
+void archipelago::pool_interrupt(base_island &isl)
+{
+	lock_type lock(m_pool_mutex);
+	if (isl.m_pool_pending) {
+		isl.m_pool_cancel = true;
+	}
+}
+
+// Wait for the termination of the worker threads.
+void archipelago::pool_join_workers() const
+{
+	std::vector<boost::shared_ptr<boost::thread> > workers;
+	{
+		lock_type lock(m_pool_mutex);
+		workers.swap(m_pool_workers);
+	}
+	for (std::vector<boost::shared_ptr<boost::thread> >::size_type i = 0; i < workers.size(); ++i) {
+		workers[i]->join();
+	}
+}
+
 // Synchronise the start of evolution in each island so that all threads are created and initialised
 // before actually doing any computation.
-void archipelago::sync_island_start() const
+void archipelago::sync_island_start(const base_island &isl)
 {
+	const boost::posix_time::ptime start(boost::posix_time::microsec_clock::universal_time());
 	m_islands_sync_point->wait();
+	metrics_slot &slot = m_metrics[locate_island(isl)];
+	lock_type lock(slot.m_mutex);
+	slot.m_metrics.barrier_wait += elapsed_ms(start);
+}
+
+// Milliseconds elapsed since start.
+double archipelago::elapsed_ms(const boost::posix_time::ptime &start)
+{
+	return static_cast<double>((boost::posix_time::microsec_clock::universal_time() - start).total_microseconds()) / 1000.;
 }
 
 /// Dumps the archipelago migration history
@@ -770,14 +1503,7 @@ void archipelago::sync_island_start() const
 std::string archipelago::dump_migr_history() const
 {
 	join();
-	std::ostringstream oss;
-	for (migr_hist_type::const_iterator it = m_migr_hist.begin(); it != m_migr_hist.end(); ++it) {
-		oss << "(" << (*it).get<0>()
-			<< "," << (*it).get<1>()
-			<< "," << (*it).get<2>() << ")"
-			<< '\n';
-	}
-	return oss.str();
+	return m_migr_hist.human_readable();
 }
 
 /// Clears the archipelago migration history
@@ -791,6 +1517,34 @@ void archipelago::clear_migr_history()
 	m_migr_hist.clear();
 }
 
+/// Get the migration history.
+/**
+ * This method does not wait for the end of the ongoing evolutions: the returned copy contains the events recorded so far.
+ *
+ * @return copy of the migration history.
+ */
+migration_history archipelago::get_migr_history() const
+{
+	lock_type lock(m_migr_mutex);
+	return m_migr_hist;
+}
+
+/// Set the capacity of the migration history.
+/**
+ * Will wait for the end of the ongoing evolutions, then replace the migration history with an empty one able to hold
+ * up to capacity events, managed according to policy when full (see migration_history).
+ *
+ * @param[in] capacity maximum number of events.
+ * @param[in] policy policy used when the history is full.
+ *
+ * @throws value_error if capacity is less than 2 or policy is invalid.
+ */
+void archipelago::set_migr_history_capacity(const migration_history::size_type &capacity, migration_history::policy_type policy)
+{
+	join();
+	m_migr_hist = migration_history(capacity,policy);
+}
+
 /// Overload stream operator for pagmo::archipelago.
 /**
  * Equivalent to printing archipelago::human_readable() to stream.
@@ -25,13 +25,22 @@
 #ifndef PAGMO_ARCHIPELAGO_H
 #define PAGMO_ARCHIPELAGO_H
 
+#include <boost/cstdint.hpp>
+#include <boost/date_time/posix_time/posix_time_types.hpp>
+#include <boost/function.hpp>
 #include <boost/scoped_ptr.hpp>
+#include <boost/shared_ptr.hpp>
 #include <boost/thread/barrier.hpp>
+#include <boost/thread/condition_variable.hpp>
 #include <boost/thread/locks.hpp>
 #include <boost/thread/mutex.hpp>
+#include <boost/thread/shared_mutex.hpp>
+#include <boost/thread/thread.hpp>
 #include <boost/tuple/tuple.hpp>
 #include <boost/serialization/map.hpp>
 #include <boost/unordered_map.hpp>
+#include <cstddef>
+#include <deque>
 #include <iostream>
 #include <string>
 #include <utility>
@@ -40,6 +49,7 @@
 #include "algorithm/base.h"
 #include "base_island.h"
 #include "config.h"
+#include "migration_history.h"
 #include "population.h"
 #include "problem/base.h"
 #include "rng.h"
@@ -49,6 +59,9 @@
 
 namespace pagmo {
 
+// Forward declaration.
+struct archipelago_access;
+
 /// Archipelago class.
 /**
  * @author Francesco Biscani (bluescarni@gmail.com)
@@ -59,6 +72,7 @@ class __PAGMO_VISIBLE archipelago
 	public:
 		/// Base island class must have access to internal archipelago methods.
 		friend class base_island;
+		friend struct archipelago_access;
 		/// Internal container of islands.
 		typedef std::vector<base_island_ptr> container_type;
 		/// Archipelago size type.
@@ -105,21 +119,158 @@ class __PAGMO_VISIBLE archipelago
 			 */
 			destination = 1
 		};
+		/// Evolution listener type.
+		/**
+		 * A listener is called from the evolution threads with the index of an island and a flag. The flag is false when the island
+		 * has completed an evolution (at the end of post_evolution()), true when the island's evolution thread is about to terminate,
+		 * whether all the evolutions have been performed or not (e.g., because of an interruption or of an error). Listeners must be thread-safe
+		 * and must not call methods of the archipelago.
+		 */
+		typedef boost::function<void (size_type, bool)> listener_type;
+		/// Runtime counters of an island.
+		/**
+		 * The counters are accumulated by the archipelago over the evolution rounds of the island (one round being one call of
+		 * algorithm::base::evolve() preceded and followed by migration). Times are expressed in milliseconds.
+		 */
+		struct island_metrics
+		{
+			island_metrics():rounds(0),evolution_time(0),fevals(0),cevals(0),migrants_sent(0),migrants_received(0),
+				barrier_wait(0),migration_wait(0),improvements(0),champion_improvement(0) {}
+			/// Number of completed evolution rounds.
+			std::size_t	rounds;
+			/// Wall time spent in the algorithm.
+			double		evolution_time;
+			/// Objective function evaluations performed, including the re-evaluation of immigrants.
+			std::size_t	fevals;
+			/// Constraints evaluations performed, including the re-evaluation of immigrants.
+			std::size_t	cevals;
+			/// Number of individuals sent to other islands.
+			std::size_t	migrants_sent;
+			/// Number of individuals accepted from other islands.
+			std::size_t	migrants_received;
+			/// Time spent waiting for the other islands at the start of the evolution.
+			double		barrier_wait;
+			/// Time spent waiting for the migration locks.
+			double		migration_wait;
+			/// Number of rounds that improved the champion.
+			std::size_t	improvements;
+			/// Total decrease of the first objective of the champion over the improving rounds.
+			double		champion_improvement;
+		};
+		/// Termination criteria.
+		/**
+		 * Criteria stopping the evolution of the archipelago, checked by each island at the end of each evolution round. The criteria are
+		 * evaluated over a single call to archipelago::evolve(), archipelago::evolve_batch(), archipelago::evolve_adaptive() or archipelago::evolve_t(). Each criterion is disabled
+		 * when left to its default value.
+		 */
+		struct termination_criteria
+		{
+			termination_criteria():stall_rounds(0),max_fevals(0),max_time(0) {}
+			/// Stop when the champion of an island is equal to, or better than, this fitness.
+			fitness_vector	target;
+			/// Stop when each island has completed this number of rounds since the last improvement of the global champion.
+			std::size_t	stall_rounds;
+			/// Stop when the islands have performed in total at least this number of function evaluations.
+			std::size_t	max_fevals;
+			/// Stop when this number of milliseconds has elapsed.
+			double		max_time;
+		};
+		/// Decision of the adaptive scheduler.
+		/**
+		 * Record of an evolution round allotted to an island by archipelago::evolve_adaptive().
+		 */
+		struct allocation_event
+		{
+			allocation_event():step(0),island(0),score(0),reward(0),cost(0),reseeded(false) {}
+			/// Index of the batch in which the round was performed.
+			std::size_t	step;
+			/// Index of the island.
+			size_type	island;
+			/// Score of the island when it was selected (infinite for the islands not evolved yet).
+			double		score;
+			/// Decrease of the first objective of the island's champion during the round.
+			double		reward;
+			/// Wall time of the round in the algorithm, in milliseconds.
+			double		cost;
+			/// True if the island stagnated and was reseeded after the round.
+			bool		reseeded;
+		};
 	private:
 		// Iterators.
 		typedef container_type::iterator iterator;
 		typedef container_type::const_iterator const_iterator;
-		// Container for migrating individuals. This a hash map containing hash maps as values.
+		// Container for migrating individuals, as serialized. This a hash map containing hash maps as values.
 		// Please NOTE carefully: in case of desination migration, item n in the outer hash map is supposed to contain a hash map with a single
 		// (n,emigrants vector) pair (in other words, containing redundantly n twice). In case of source migration, item n will contain a map of
 		// emigrants from other islands.
 		typedef boost::unordered_map<size_type,boost::unordered_map<size_type,std::vector<individual_type> > > migration_map_type;
-		// Lock type.
+		// Migration slot of an island: item n of the migration map above, with its own lock. Islands access only the slots
+		// of their neighbours, so that migration between disjoint groups of islands does not contend on a global lock.
+		// In case of destination migration, many islands read the same slot while only its owner writes it, hence
+		// the readers-writer lock.
+		struct migration_slot
+		{
+			migration_slot() {}
+			// NOTE: the mutex is not copied.
+			migration_slot(const migration_slot &other):m_individuals(other.m_individuals) {}
+			migration_slot &operator=(const migration_slot &other)
+			{
+				m_individuals = other.m_individuals;
+				return *this;
+			}
+			boost::unordered_map<size_type,std::vector<individual_type> >	m_individuals;
+			mutable boost::shared_mutex					m_mutex;
+		};
+		// Counters of an island, together with the state of its current evolution round. The state of the round is accessed only
+		// by the evolution thread of the island, the counters are updated at the end of each round under the lock.
+		struct metrics_slot
+		{
+			metrics_slot():m_fevals(0),m_cevals(0),m_migration_wait(0) {}
+			// NOTE: only the counters are copied.
+			metrics_slot(const metrics_slot &other):m_metrics(other.m_metrics),m_fevals(0),m_cevals(0),m_migration_wait(0) {}
+			metrics_slot &operator=(const metrics_slot &other)
+			{
+				m_metrics = other.m_metrics;
+				return *this;
+			}
+			island_metrics			m_metrics;
+			boost::posix_time::ptime	m_evo_start;
+			std::size_t			m_fevals;
+			std::size_t			m_cevals;
+			double				m_migration_wait;
+			fitness_vector			m_champion_f;
+			mutable boost::mutex		m_mutex;
+		};
+		// Evolution of an island in pooled mode: the task performs one round at a time and is then put back
+		// at the end of the queue, so that all islands make progress even when they outnumber the workers.
+		// m_n is the number of rounds (or the number of milliseconds, for timed evolutions).
+		struct pool_task
+		{
+			pool_task():m_isl(0),m_n(0),m_timed(false),m_rounds(0),m_evo_time(0) {}
+			pool_task(base_island *isl, const std::size_t &n, bool timed):m_isl(isl),m_n(n),m_timed(timed),m_rounds(0),m_evo_time(0),
+				m_start(boost::posix_time::microsec_clock::universal_time()) {}
+			base_island			*m_isl;
+			std::size_t			m_n;
+			bool				m_timed;
+			std::size_t			m_rounds;
+			double				m_evo_time;
+			boost::posix_time::ptime	m_start;
+		};
+		// Statistics of an island collected by the adaptive scheduler: number of rounds, total reward and cost, and
+		// number of consecutive rounds without improvement.
+		struct allocation_arm
+		{
+			allocation_arm():m_rounds(0),m_reward(0),m_cost(0),m_stall(0) {}
+			std::size_t	m_rounds;
+			double		m_reward;
+			double		m_cost;
+			std::size_t	m_stall;
+		};
+		// Lock types.
 		typedef boost::lock_guard<boost::mutex> lock_type;
-		// Migration history item: (n_individuals,orig_island,dest_island) tuple.
-		typedef boost::tuple<population::size_type,size_type,size_type> migr_hist_item;
-		// Container of migration history: vector of history items.
-		typedef std::vector<migr_hist_item> migr_hist_type;
+		typedef boost::unique_lock<boost::mutex> unique_lock_type;
+		typedef boost::shared_lock<boost::shared_mutex> slot_read_lock_type;
+		typedef boost::unique_lock<boost::shared_mutex> slot_write_lock_type;
 	public:
 		explicit archipelago(distribution_type = point_to_point, migration_direction = destination);
 		explicit archipelago(const topology::base &, distribution_type = point_to_point, migration_direction = destination);
@@ -141,23 +292,64 @@ class __PAGMO_VISIBLE archipelago
 		void evolve(int = 1);
 		void evolve_batch(int, unsigned int, bool = true);
 		void evolve_t(int);
+		void evolve_adaptive(int, unsigned int, double = 1., unsigned int = 0);
+		std::vector<allocation_event> get_allocation_log() const;
 		bool busy() const;
 		void interrupt();
 		std::string dump_migr_history() const;
 		void clear_migr_history();
+		migration_history get_migr_history() const;
+		void set_migr_history_capacity(const migration_history::size_type &, migration_history::policy_type = migration_history::overwrite);
 		void set_island(const size_type &, const base_island &);
 		std::vector<base_island_ptr> get_islands() const;
 		base_island_ptr get_island(const size_type &) const;
 		void set_seeds(unsigned int);
+		void set_listener(const listener_type &);
+		std::vector<std::size_t> get_island_versions() const;
+		std::vector<island_metrics> get_metrics() const;
+		void reset_metrics();
+		void set_termination_criteria(const termination_criteria &);
+		termination_criteria get_termination_criteria() const;
+		std::string get_termination_reason() const;
+		void set_pool_size(const unsigned int &);
+		unsigned int get_pool_size() const;
+		static unsigned int get_default_pool_size();
+		static std::vector<population> init_populations(const problem::base &, int, int, unsigned int = 0);
 	private:
 		void pre_evolution(base_island &);
 		void post_evolution(base_island &);
+		void evolution_exit(base_island &);
 		void reset_barrier(const size_type &);
+		void evolve_group(const std::vector<size_type> &, int);
+		void reseed_island(const size_type &);
 		void build_immigrants_vector(std::vector<std::pair<population::size_type, individual_type > > &,
-			const base_island &, base_island &,
+			const size_type &, base_island &,
 			const std::vector<individual_type> &) const;
+		migration_map_type get_migration_map() const;
+		void set_migration_map(const migration_map_type &);
 		void check_migr_attributes() const;
-		void sync_island_start() const;
+		void sync_island_start(const base_island &);
+		void reset_termination();
+		void check_termination(const base_island &, const size_type &, const std::size_t &);
+		bool termination_requested() const;
+		void pool_evolve(const std::vector<size_type> &, const std::size_t &, bool);
+		void pool_worker();
+		bool pool_round(pool_task &);
+		void pool_join(const base_island &) const;
+		bool pool_busy(const base_island &) const;
+		void pool_interrupt(base_island &);
+		void pool_join_workers() const;
+		static void init_populations_chunk(std::vector<population> &, const problem::base &, int, const std::vector<boost::uint32_t> &,
+			std::size_t, std::size_t, std::string &);
+		static double elapsed_ms(const boost::posix_time::ptime &);
+		// Acquire the deferred lock l, adding to wait the milliseconds spent waiting for it.
+		template <class Lock>
+		static void timed_lock(Lock &l, double &wait)
+		{
+			const boost::posix_time::ptime start(boost::posix_time::microsec_clock::universal_time());
+			l.lock();
+			wait += elapsed_ms(start);
+		}
 		size_type locate_island(const base_island &) const;
 		bool destruction_checks() const;
 		void reevaluate_immigrants(std::vector<std::pair<population::size_type, individual_type> > &,
@@ -168,24 +360,36 @@ class __PAGMO_VISIBLE archipelago
 		void serialize(Archive &ar, const unsigned int version)
 		{
 			join();
-			ar & m_container;
-			ar & m_topology;
-			ar & m_dist_type;
-			ar & m_migr_dir;
-			ar & m_migr_map;
-			ar & m_drng;
-			ar & m_urng;
-			// NOTE: this would need tuple serialization...
-			//ar & m_migr_hist;
+			// NOTE: the migration history is deliberately not serialized: it is a diagnostic record of the
+			// past migrations, and it is emptied upon loading.
 			boost::serialization::split_member(ar, *this, version);
 		}
 
 		template <class Archive>
-		void save(Archive &, const unsigned int) const
-		{}
+		void save(Archive &ar, const unsigned int) const
+		{
+			ar << m_container;
+			ar << m_topology;
+			ar << m_dist_type;
+			ar << m_migr_dir;
+			// The migration slots are saved in the form of the migration map.
+			const migration_map_type migr_map(get_migration_map());
+			ar << migr_map;
+			ar << m_drng;
+			ar << m_urng;
+		}
 		template <class Archive>
-		void load(Archive &, const unsigned int)
+		void load(Archive &ar, const unsigned int)
 		{
+			ar >> m_container;
+			ar >> m_topology;
+			ar >> m_dist_type;
+			ar >> m_migr_dir;
+			migration_map_type migr_map;
+			ar >> migr_map;
+			set_migration_map(migr_map);
+			ar >> m_drng;
+			ar >> m_urng;
 			// NOTE: archi pointer is not saved during island serialization. Hence, upon loading,
 			// we are going to set the archi pointer of the islands to this. 
 			for (size_type i = 0; i < m_container.size(); ++i) {
@@ -193,6 +397,11 @@ class __PAGMO_VISIBLE archipelago
 			}
 			// NOTE: migr history is not saved, so upon loading we clear it.
 			m_migr_hist.clear();
+			// NOTE: island versions are not saved either, they restart from zero.
+			m_island_versions.assign(m_container.size(),0);
+			m_island_rounds.assign(m_container.size(),0);
+			// NOTE: same for the metrics.
+			m_metrics.assign(m_container.size(),metrics_slot());
 		}
 		// Container of islands.
 		container_type				m_container;
@@ -204,20 +413,78 @@ class __PAGMO_VISIBLE archipelago
 		distribution_type			m_dist_type;
 		// Migration direction.
 		migration_direction			m_migr_dir;
-		// Migration container.
-		migration_map_type			m_migr_map;
+		// Migration slots, one per island.
+		std::vector<migration_slot>		m_migr_slots;
 		// Rngs used during migration.
 		rng_double					m_drng;
 		rng_uint32					m_urng;
-		// Migration mutex.
-		boost::mutex				m_migr_mutex;
+		// Mutex protecting the migration rngs and the migration history.
+		mutable boost::mutex			m_migr_mutex;
 		// Migration history.
-		migr_hist_type				m_migr_hist;
+		migration_history			m_migr_hist;
+		// Evolution listener (not copied and not serialized).
+		listener_type				m_listener;
+		// Number of modifications undergone by each island (not serialized).
+		std::vector<std::size_t>		m_island_versions;
+		// Number of evolutions completed by each island, used to stamp the migration history. Unlike the metrics, it is not
+		// reset by reset_metrics() (not serialized, as the history).
+		std::vector<std::size_t>		m_island_rounds;
+		// Runtime counters of each island (not serialized).
+		std::vector<metrics_slot>		m_metrics;
+		// Termination criteria (not serialized).
+		termination_criteria			m_term_criteria;
+		// State of the termination criteria during an evolution, protected by m_term_mutex: reason of the termination (empty
+		// if the evolution must go on), global champion, rounds since its last improvement for each island, number of islands
+		// which reached the stall limit, function evaluations performed and start time of the evolution.
+		mutable boost::mutex			m_term_mutex;
+		std::string				m_term_reason;
+		fitness_vector				m_term_champion_f;
+		std::vector<std::size_t>		m_term_stall;
+		size_type				m_term_n_stalled;
+		std::size_t				m_term_fevals;
+		boost::posix_time::ptime		m_term_start;
+		// Decisions of the last call to evolve_adaptive() (not serialized).
+		std::vector<allocation_event>		m_alloc_log;
+		// Number of worker threads used to evolve the islands, 0 meaning one thread per island (not serialized).
+		unsigned int				m_pool_size;
+		// Pending tasks and worker threads of the pooled mode. The queue and the pending/cancel flags of the islands
+		// are protected by m_pool_mutex, and m_pool_cond is notified each time an island completes its evolution.
+		std::deque<pool_task>			m_pool_queue;
+		mutable std::vector<boost::shared_ptr<boost::thread> >	m_pool_workers;
+		mutable boost::mutex			m_pool_mutex;
+		mutable boost::condition_variable	m_pool_cond;
 
 };
 
 std::ostream __PAGMO_VISIBLE_FUNC &operator<<(std::ostream &, const archipelago &);
 
+/// Back door for PyGMO's checkpointing.
+/**
+ * Serializes the state of the archipelago other than the islands: topology, migration attributes,
+ * pending migrants and rngs.
+ */
+struct archipelago_access
+{
+	template <class Archive>
+	static void serialize_state(Archive &ar, archipelago &a)
+	{
+		a.join();
+		ar & a.m_topology;
+		ar & a.m_dist_type;
+		ar & a.m_migr_dir;
+		archipelago::migration_map_type migr_map;
+		if (Archive::is_saving::value) {
+			migr_map = a.get_migration_map();
+		}
+		ar & migr_map;
+		if (Archive::is_loading::value) {
+			a.set_migration_map(migr_map);
+		}
+		ar & a.m_drng;
+		ar & a.m_urng;
+	}
+};
+
 }
 
 #endif
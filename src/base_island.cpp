@@ -64,7 +64,8 @@ namespace pagmo
  */
 base_island::base_island(const algorithm::base &a, const problem::base &p, int n,
 	const migration::base_s_policy &s_policy, const migration::base_r_policy &r_policy):
-	m_algo(a.clone()),m_pop(p,n),m_archi(0),m_evo_time(0),m_s_policy(s_policy.clone()),m_r_policy(r_policy.clone()) { }
+	m_algo(a.clone()),m_pop(p,n),m_archi(0),m_evo_time(0),m_s_policy(s_policy.clone()),m_r_policy(r_policy.clone()),
+	m_pool_pending(false),m_pool_cancel(false) { }
 
 /// Copy constructor.
 /**
@@ -81,6 +82,8 @@ base_island::base_island(const base_island &isl):m_pop(isl.get_population())
 	m_s_policy = isl.m_s_policy->clone();
 	m_r_policy = isl.m_r_policy->clone();
 	m_evo_thread.reset(0);
+	m_pool_pending = false;
+	m_pool_cancel = false;
 }
 
 /// Constructor from population.
@@ -96,7 +99,8 @@ base_island::base_island(const base_island &isl):m_pop(isl.get_population())
  */
 base_island::base_island(const algorithm::base &a, const population &pop,
 	const migration::base_s_policy &s_policy, const migration::base_r_policy &r_policy):
-	m_algo(a.clone()),m_pop(pop),m_archi(0),m_evo_time(0),m_s_policy(s_policy.clone()),m_r_policy(r_policy.clone()) { }
+	m_algo(a.clone()),m_pop(pop),m_archi(0),m_evo_time(0),m_s_policy(s_policy.clone()),m_r_policy(r_policy.clone()),
+	m_pool_pending(false),m_pool_cancel(false) { }
 
 /// Assignment operator.
 /**
@@ -193,7 +197,7 @@ std::string base_island::human_readable() const
 /**
  * This method is intended to block the flow of the program until any ongoing evolution has terminated.
  * The default implementation will join on the internal thread object if an evolution is ongoing,
- * otherwise it will be a no-op.
+ * and on the worker pool of the archipelago if the island is being evolved there. Otherwise it will be a no-op.
  * Re-implementation of this method should always call the default implementation.
  */
 void base_island::join() const
@@ -201,6 +205,9 @@ void base_island::join() const
 	if (m_evo_thread && m_evo_thread->joinable()) {
 		m_evo_thread->join();
 	}
+	if (m_archi) {
+		m_archi->pool_join(*this);
+	}
 }
 
 /// Thread entry hook.
@@ -247,7 +254,7 @@ void base_island::int_evolver::juice_impl(boost::posix_time::ptime &start)
 	start = boost::posix_time::microsec_clock::local_time();
 	// Synchronise start with all other threads if we are in an archi.
 	if (m_i->m_archi) {
-		m_i->m_archi->sync_island_start();
+		m_i->m_archi->sync_island_start(*m_i);
 	}
 	const raii_thread_hook hook(m_i);
 	for (std::size_t i = 0; i < m_n; ++i) {
@@ -265,6 +272,10 @@ void base_island::int_evolver::juice_impl(boost::posix_time::ptime &start)
 		m_i->m_pop.problem().post_evolution(m_i->m_pop);
 		// Set the interruption point.
 		boost::this_thread::interruption_point();
+		// Stop if a termination criterion of the archipelago was met.
+		if (m_i->m_archi && m_i->m_archi->termination_requested()) {
+			break;
+		}
 	}
 }
 
@@ -292,6 +303,14 @@ void base_island::int_evolver::operator()()
 	} catch (...) {
 		std::cout << "Error calculating evolution time.\n";
 	}
+	// Notify the archipelago that the evolution is over.
+	if (m_i->m_archi) {
+		try {
+			m_i->m_archi->evolution_exit(*m_i);
+		} catch (...) {
+			std::cout << "Error notifying the end of the evolution.\n";
+		}
+	}
 }
 
 /// Evolve island n times.
@@ -331,7 +350,7 @@ void base_island::t_evolver::juice_impl(boost::posix_time::ptime &start)
 	start = boost::posix_time::microsec_clock::local_time();
 	// Synchronise start.
 	if (m_i->m_archi) {
-		m_i->m_archi->sync_island_start();
+		m_i->m_archi->sync_island_start(*m_i);
 	}
 	const raii_thread_hook hook(m_i);
 	do {
@@ -346,6 +365,10 @@ void base_island::t_evolver::juice_impl(boost::posix_time::ptime &start)
 		m_i->m_pop.problem().post_evolution(m_i->m_pop);
 		// Set the interruption point.
 		boost::this_thread::interruption_point();
+		// Stop if a termination criterion of the archipelago was met.
+		if (m_i->m_archi && m_i->m_archi->termination_requested()) {
+			break;
+		}
 		diff = boost::posix_time::microsec_clock::local_time() - start;
 		// Take care of negative timings.
 	} while (diff.total_milliseconds() < 0 || boost::numeric_cast<std::size_t>(diff.total_milliseconds()) < m_t);
@@ -375,6 +398,14 @@ void base_island::t_evolver::operator()()
 	} catch (...) {
 		std::cout << "Error calculating evolution time.\n";
 	}
+	// Notify the archipelago that the evolution is over.
+	if (m_i->m_archi) {
+		try {
+			m_i->m_archi->evolution_exit(*m_i);
+		} catch (...) {
+			std::cout << "Error notifying the end of the evolution.\n";
+		}
+	}
 }
 
 /// Evolve island for a specified minimum amount of time.
@@ -406,10 +437,13 @@ void base_island::evolve_t(int t)
  */
 void base_island::interrupt()
 {
+	if (m_archi) {
+		m_archi->pool_interrupt(*this);
+	}
 	if (m_evo_thread) {
 		m_evo_thread->interrupt();
-		join();
 	}
+	join();
 }
 
 /// Query the status of the island.
@@ -418,6 +452,9 @@ void base_island::interrupt()
  */
 bool base_island::busy() const
 {
+	if (m_archi && m_archi->pool_busy(*this)) {
+		return true;
+	}
 	if (!m_evo_thread) {
 		return false;
 	}
@@ -535,6 +572,18 @@ population base_island::get_population() const
 	return m_pop;
 }
 
+/// Get a packed copy of the internal population.
+/**
+ * Cheaper than get_population() for large populations that are only inspected.
+ *
+ * @return packed copy of the population contained in the island.
+ */
+packed_population base_island::get_packed_population() const
+{
+	join();
+	return packed_population(m_pop);
+}
+
 /// Set internal population.
 /**
  * @param[in] pop to be copied into the island.
@@ -37,6 +37,7 @@
 #include "algorithm/base.h"
 #include "migration/base_r_policy.h"
 #include "migration/base_s_policy.h"
+#include "packed_population.h"
 #include "population.h"
 #include "problem/base.h"
 #include "serialization.h"
@@ -140,6 +141,7 @@ class __PAGMO_VISIBLE base_island
 		migration::base_s_policy_ptr get_s_policy() const;
 		migration::base_r_policy_ptr get_r_policy() const;
 		population get_population() const;
+		packed_population get_packed_population() const;
 		void set_population(const population &);
 		//@}
 	private:
@@ -169,6 +171,11 @@ class __PAGMO_VISIBLE base_island
 		migration::base_r_policy_ptr		m_r_policy;
 		/// Evolution thread.
 		boost::scoped_ptr<boost::thread>	m_evo_thread;
+	private:
+		// Flags of the evolution in the worker pool of the archipelago (pending evolution, interruption request),
+		// protected by the archipelago's pool mutex.
+		bool					m_pool_pending;
+		bool					m_pool_cancel;
 	private:
 		friend class boost::serialization::access;
 		template <class Archive>
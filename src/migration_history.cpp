@@ -0,0 +1,268 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#include <algorithm>
+#include <boost/numeric/conversion/cast.hpp>
+#include <cstddef>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "exceptions.h"
+#include "migration_history.h"
+
+namespace pagmo {
+
+const migration_history::size_type migration_history::default_capacity;
+
+/// Constructor.
+/**
+ * Builds an empty history.
+ *
+ * @param[in] capacity maximum number of events stored in the history.
+ * @param[in] policy policy used when the history is full.
+ *
+ * @throws value_error if capacity is less than 2 or policy is invalid.
+ */
+migration_history::migration_history(const size_type &capacity, policy_type policy):
+	m_begin(0),m_capacity(capacity),m_policy(policy),m_stride(1),m_n_events(0)
+{
+	if (capacity < 2) {
+		pagmo_throw(value_error,"the capacity of the migration history must be at least 2");
+	}
+	if (policy < 0 || policy > 1) {
+		pagmo_throw(value_error,"invalid migration history policy");
+	}
+}
+
+/// Record a migration event.
+/**
+ * @param[in] r round of the destination island.
+ * @param[in] src index of the source island.
+ * @param[in] dest index of the destination island.
+ * @param[in] n number of migrants.
+ */
+void migration_history::push_back(const std::size_t &r, const std::size_t &src, const std::size_t &dest, const std::size_t &n)
+{
+	const value_type values[4] = {boost::numeric_cast<value_type>(r),boost::numeric_cast<value_type>(src),
+		boost::numeric_cast<value_type>(dest),boost::numeric_cast<value_type>(n)};
+	++m_n_events;
+	if ((m_n_events - 1) % m_stride) {
+		return;
+	}
+	if (size() == m_capacity) {
+		if (m_policy == overwrite) {
+			for (int i = 0; i < 4; ++i) {
+				m_columns[i][m_begin] = values[i];
+			}
+			m_begin = (m_begin + 1) % m_capacity;
+			return;
+		}
+		decimate_columns();
+		// The next event is recorded only if it falls on the new stride.
+		if ((m_n_events - 1) % m_stride) {
+			return;
+		}
+	}
+	for (int i = 0; i < 4; ++i) {
+		m_columns[i].push_back(values[i]);
+	}
+}
+
+// Keep the events at even positions and double the stride.
+void migration_history::decimate_columns()
+{
+	pagmo_assert(m_begin == 0);
+	for (int i = 0; i < 4; ++i) {
+		std::vector<value_type> &c = m_columns[i];
+		size_type j = 0;
+		for (size_type k = 0; k < c.size(); k += 2, ++j) {
+			c[j] = c[k];
+		}
+		c.resize(j);
+	}
+	m_stride *= 2;
+}
+
+// Position in the columns of the n-th oldest event.
+migration_history::size_type migration_history::physical_index(const size_type &n) const
+{
+	return (m_begin + n) % m_columns[0].size();
+}
+
+/// Remove all the events.
+/**
+ * Capacity and policy are preserved, the recording rate is restored.
+ */
+void migration_history::clear()
+{
+	for (int i = 0; i < 4; ++i) {
+		m_columns[i].clear();
+	}
+	m_begin = 0;
+	m_stride = 1;
+	m_n_events = 0;
+}
+
+/// Number of events in the history.
+/**
+ * @return number of events currently stored.
+ */
+migration_history::size_type migration_history::size() const
+{
+	return m_columns[0].size();
+}
+
+/// Get the capacity.
+/**
+ * @return maximum number of events stored in the history.
+ */
+migration_history::size_type migration_history::get_capacity() const
+{
+	return m_capacity;
+}
+
+/// Get the policy.
+/**
+ * @return policy used when the history is full.
+ */
+migration_history::policy_type migration_history::get_policy() const
+{
+	return m_policy;
+}
+
+/// Get the recording stride.
+/**
+ * @return the history records one event every get_stride() (always 1 with the overwrite policy).
+ */
+std::size_t migration_history::get_stride() const
+{
+	return m_stride;
+}
+
+/// Get the number of events.
+/**
+ * @return number of events received since construction or since the last clear(), including the discarded ones.
+ */
+std::size_t migration_history::get_n_events() const
+{
+	return m_n_events;
+}
+
+/// Get a column.
+/**
+ * @param[in] c column.
+ *
+ * @return the values of column c, from the oldest to the most recent event.
+ *
+ * @throws value_error if c is invalid.
+ */
+std::vector<migration_history::value_type> migration_history::get_column(column_type c) const
+{
+	if (c < 0 || c > 3) {
+		pagmo_throw(value_error,"invalid migration history column");
+	}
+	const std::vector<value_type> &col = m_columns[c];
+	std::vector<value_type> retval(col.begin() + m_begin,col.end());
+	retval.insert(retval.end(),col.begin(),col.begin() + m_begin);
+	return retval;
+}
+
+/// Copy the columns into a buffer.
+/**
+ * The four columns are copied one after the other (in the order of migration_history::column_type) into out, which must have room
+ * for 4 * size() values. The events of each column are ordered from the oldest to the most recent.
+ *
+ * @param[out] out output buffer.
+ */
+void migration_history::copy_columns(value_type *out) const
+{
+	for (int i = 0; i < 4; ++i) {
+		const std::vector<value_type> &col = m_columns[i];
+		out = std::copy(col.begin() + m_begin,col.end(),out);
+		out = std::copy(col.begin(),col.begin() + m_begin,out);
+	}
+}
+
+/// Number of migrants per edge.
+/**
+ * @param[in] first first round taken into account.
+ * @param[in] last round after the last one taken into account.
+ *
+ * @return number of migrants for each (source,destination) pair, over the events whose round is in [first,last).
+ */
+migration_history::edge_map_type migration_history::migrants_per_edge(const std::size_t &first, const std::size_t &last) const
+{
+	edge_map_type retval;
+	for (size_type i = 0; i < size(); ++i) {
+		const value_type r = m_columns[round][i];
+		if (r >= first && r < last) {
+			retval[std::make_pair(m_columns[source][i],m_columns[destination][i])] += m_columns[count][i];
+		}
+	}
+	return retval;
+}
+
+/// Number of migrants per round window.
+/**
+ * Rounds are grouped in consecutive windows of w rounds, [0,w), [w,2w), and so on.
+ *
+ * @param[in] w number of rounds in each window.
+ *
+ * @return number of migrants for each window with at least one event, indexed by the first round of the window.
+ *
+ * @throws value_error if w is zero.
+ */
+migration_history::window_map_type migration_history::migrants_per_window(const std::size_t &w) const
+{
+	if (!w) {
+		pagmo_throw(value_error,"the window size must be positive");
+	}
+	window_map_type retval;
+	for (size_type i = 0; i < size(); ++i) {
+		const value_type r = m_columns[round][i];
+		retval[boost::numeric_cast<value_type>((r / w) * w)] += m_columns[count][i];
+	}
+	return retval;
+}
+
+/// Human-readable representation.
+/**
+ * @return a line with the (number of migrants,source,destination) tuple of each event, from the oldest to the most recent.
+ */
+std::string migration_history::human_readable() const
+{
+	std::ostringstream oss;
+	for (size_type i = 0; i < size(); ++i) {
+		const size_type idx = physical_index(i);
+		oss << "(" << m_columns[count][idx]
+			<< "," << m_columns[source][idx]
+			<< "," << m_columns[destination][idx] << ")"
+			<< '\n';
+	}
+	return oss.str();
+}
+
+}
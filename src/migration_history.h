@@ -0,0 +1,114 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#ifndef PAGMO_MIGRATION_HISTORY_H
+#define PAGMO_MIGRATION_HISTORY_H
+
+#include <boost/cstdint.hpp>
+#include <cstddef>
+#include <map>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "config.h"
+
+namespace pagmo {
+
+/// Migration history.
+/**
+ * Bounded record of the migrations occurred in an archipelago. Each migration event is made of four values: the round in which it happened
+ * (i.e., the number of evolutions completed by the destination island), the index of the source island, the index of the destination island
+ * and the number of individuals accepted by the destination island. Events are stored column-wise in buffers of fixed maximum size.
+ *
+ * When the history is full, new events are dealt with according to the policy:
+ * - migration_history::overwrite: the oldest events are replaced by the new ones, so that the history contains the most recent events;
+ * - migration_history::decimate: every other event is discarded, and from then on only one event every two is recorded (halving again the rate each time the history fills up),
+ * so that the history covers uniformly the whole run.
+ *
+ * This class is not thread-safe, the archipelago serialises the accesses to its history.
+ */
+class __PAGMO_VISIBLE migration_history
+{
+	public:
+		/// Type of the values stored in the history.
+		typedef boost::uint32_t value_type;
+		/// Size type.
+		typedef std::vector<value_type>::size_type size_type;
+		/// Policy used when the history is full.
+		enum policy_type
+		{
+			/// Replace the oldest events.
+			overwrite = 0,
+			/// Halve the recording rate.
+			decimate = 1
+		};
+		/// Columns of the history.
+		enum column_type
+		{
+			/// Round of the destination island.
+			round = 0,
+			/// Index of the source island.
+			source = 1,
+			/// Index of the destination island.
+			destination = 2,
+			/// Number of migrants.
+			count = 3
+		};
+		/// Number of migrants for each (source,destination) pair.
+		typedef std::map<std::pair<value_type,value_type>,std::size_t> edge_map_type;
+		/// Number of migrants for each round window, indexed by the first round of the window.
+		typedef std::map<value_type,std::size_t> window_map_type;
+		/// Default maximum number of events.
+		static const size_type default_capacity = 100000;
+		explicit migration_history(const size_type & = default_capacity, policy_type = overwrite);
+		void push_back(const std::size_t &, const std::size_t &, const std::size_t &, const std::size_t &);
+		void clear();
+		size_type size() const;
+		size_type get_capacity() const;
+		policy_type get_policy() const;
+		std::size_t get_stride() const;
+		std::size_t get_n_events() const;
+		std::vector<value_type> get_column(column_type) const;
+		void copy_columns(value_type *) const;
+		edge_map_type migrants_per_edge(const std::size_t & = 0, const std::size_t & = std::size_t(-1)) const;
+		window_map_type migrants_per_window(const std::size_t &) const;
+		std::string human_readable() const;
+	private:
+		size_type physical_index(const size_type &) const;
+		void decimate_columns();
+		// Columns of the history, stored as ring buffers starting at m_begin.
+		std::vector<value_type>	m_columns[4];
+		size_type		m_begin;
+		size_type		m_capacity;
+		policy_type		m_policy;
+		// Record one event every m_stride (decimate policy only).
+		std::size_t		m_stride;
+		// Number of events received since the last clear().
+		std::size_t		m_n_events;
+};
+
+}
+
+#endif
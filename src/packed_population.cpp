@@ -0,0 +1,294 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+#include <cstddef>
+#include <vector>
+
+#include "exceptions.h"
+#include "packed_population.h"
+#include "population.h"
+#include "problem/base.h"
+
+namespace pagmo {
+
+// Members of the individual corresponding to the fields, in the order of packed_population::field_type.
+static std::vector<double> population::individual_type::* const packed_members[7] = {
+	&population::individual_type::cur_x,
+	&population::individual_type::cur_v,
+	&population::individual_type::cur_c,
+	&population::individual_type::cur_f,
+	&population::individual_type::best_x,
+	&population::individual_type::best_c,
+	&population::individual_type::best_f
+};
+
+/// Constructor from population.
+/**
+ * Copies the individuals, the champion and the domination lists of pop into contiguous buffers.
+ *
+ * @param[in] pop population to be packed.
+ *
+ * @throws value_error if the vectors of an individual do not have the sizes prescribed by the problem.
+ */
+packed_population::packed_population(const population &pop):m_prob(pop.problem().clone()),m_size(pop.size()),m_champion(pop.champion()),
+	m_dom_tracking(pop.get_dom_tracking()),m_nds(pop.get_nds_method())
+{
+	for (int i = 0; i < 7; ++i) {
+		const std::size_t width = get_width(static_cast<field_type>(i));
+		m_fields[i].reserve(m_size * width);
+		for (population::const_iterator it = pop.begin(); it != pop.end(); ++it) {
+			const std::vector<double> &v = (*it).*packed_members[i];
+			if (v.size() != width) {
+				pagmo_throw(value_error,"inconsistent vector size in population, cannot pack it");
+			}
+			m_fields[i].insert(m_fields[i].end(),v.begin(),v.end());
+		}
+	}
+	m_dom_offset.reserve(m_size + 1);
+	m_dom_offset.push_back(0);
+	m_dom_count.assign(m_size,0);
+	if (m_dom_tracking) {
+		for (size_type i = 0; i < m_size; ++i) {
+			const std::vector<size_type> &list = pop.get_domination_list(i);
+			m_dom_list.insert(m_dom_list.end(),list.begin(),list.end());
+			m_dom_offset.push_back(m_dom_list.size());
+			m_dom_count[i] = pop.get_domination_count(i);
+		}
+	} else {
+		m_dom_offset.resize(m_size + 1,0);
+	}
+}
+
+/// Copy constructor.
+/**
+ * Will perform a deep copy of all the elements.
+ *
+ * @param[in] p packed population used to initialise this.
+ */
+packed_population::packed_population(const packed_population &p):m_prob(p.m_prob->clone()),m_size(p.m_size),m_champion(p.m_champion),
+	m_dom_offset(p.m_dom_offset),m_dom_list(p.m_dom_list),m_dom_count(p.m_dom_count),m_dom_tracking(p.m_dom_tracking),m_nds(p.m_nds)
+{
+	for (int i = 0; i < 7; ++i) {
+		m_fields[i] = p.m_fields[i];
+	}
+}
+
+/// Assignment operator.
+/**
+ * Performs a deep copy of all the elements of p into this.
+ *
+ * @param[in] p packed population to be assigned to this.
+ *
+ * @return reference to this.
+ */
+packed_population &packed_population::operator=(const packed_population &p)
+{
+	if (this != &p) {
+		m_prob = p.m_prob->clone();
+		m_size = p.m_size;
+		for (int i = 0; i < 7; ++i) {
+			m_fields[i] = p.m_fields[i];
+		}
+		m_champion = p.m_champion;
+		m_dom_offset = p.m_dom_offset;
+		m_dom_list = p.m_dom_list;
+		m_dom_count = p.m_dom_count;
+		m_dom_tracking = p.m_dom_tracking;
+		m_nds = p.m_nds;
+	}
+	return *this;
+}
+
+/// Convert back to population.
+/**
+ * The individuals, the champion, the domination lists and the domination and sorting settings are restored
+ * without re-evaluating the individuals. The random number generators of the new population are seeded anew.
+ *
+ * @return a population equivalent to the one this was built from.
+ */
+population packed_population::unpack() const
+{
+	population retval(*m_prob);
+	retval.set_dom_tracking(m_dom_tracking);
+	retval.set_nds_method(m_nds);
+	population::container_type &container = population_access::get_container(retval);
+	container.resize(m_size);
+	for (size_type j = 0; j < m_size; ++j) {
+		for (int i = 0; i < 7; ++i) {
+			const range row = get_row(static_cast<field_type>(i),j);
+			(container[j].*packed_members[i]).assign(row.begin(),row.end());
+		}
+	}
+	population_access::get_champion(retval) = m_champion;
+	std::vector<std::vector<size_type> > &dom_list = population_access::get_dom_list(retval);
+	dom_list.resize(m_size);
+	for (size_type j = 0; j < m_size; ++j) {
+		dom_list[j].assign(m_dom_list.begin() + m_dom_offset[j],m_dom_list.begin() + m_dom_offset[j + 1]);
+	}
+	population_access::get_dom_count(retval) = m_dom_count;
+	return retval;
+}
+
+/// Number of individuals.
+/**
+ * @return the number of individuals in the packed population.
+ */
+packed_population::size_type packed_population::size() const
+{
+	return m_size;
+}
+
+/// Get constant reference to the problem.
+/**
+ * @return const reference to the problem of the packed population.
+ */
+const problem::base &packed_population::problem() const
+{
+	return *m_prob;
+}
+
+/// Get constant reference to the champion.
+/**
+ * @return const reference to the champion of the population this was built from.
+ */
+const population::champion_type &packed_population::champion() const
+{
+	return m_champion;
+}
+
+/// View of the individual at position idx.
+/**
+ * @param[in] idx positional index of the individual.
+ *
+ * @return read-only view of the vectors of the individual.
+ *
+ * @throws index_error if idx is not smaller than size().
+ */
+packed_population::individual_view packed_population::get_individual(const size_type &idx) const
+{
+	if (idx >= m_size) {
+		pagmo_throw(index_error,"invalid index");
+	}
+	const individual_view retval = {get_row(cur_x,idx),get_row(cur_v,idx),get_row(cur_c,idx),get_row(cur_f,idx),
+		get_row(best_x,idx),get_row(best_c,idx),get_row(best_f,idx)};
+	return retval;
+}
+
+/// View of a field of all the individuals.
+/**
+ * @param[in] field field of the individuals.
+ *
+ * @return read-only view of size() * get_width(field) doubles, the field of each individual one after the other.
+ */
+packed_population::range packed_population::get_field(field_type field) const
+{
+	const double *begin = m_fields[field].empty() ? 0 : &m_fields[field][0];
+	return range(begin,begin + m_fields[field].size());
+}
+
+/// Width of a field.
+/**
+ * @param[in] field field of the individuals.
+ *
+ * @return the number of doubles of field for each individual.
+ */
+std::size_t packed_population::get_width(field_type field) const
+{
+	switch (field) {
+		case cur_c:
+		case best_c:
+			return m_prob->get_c_dimension();
+		case cur_f:
+		case best_f:
+			return m_prob->get_f_dimension();
+		default:
+			return m_prob->get_dimension();
+	}
+}
+
+/// Get domination list.
+/**
+ * @param[in] idx position of the individual whose domination list will be retrieved.
+ *
+ * @return the indices of the individuals dominated by the individual at position idx.
+ *
+ * @throws index_error if idx is not smaller than size().
+ * @throws value_error if domination tracking was disabled in the packed population.
+ */
+std::vector<packed_population::size_type> packed_population::get_domination_list(const size_type &idx) const
+{
+	if (idx >= m_size) {
+		pagmo_throw(index_error,"invalid index");
+	}
+	if (!m_dom_tracking) {
+		pagmo_throw(value_error,"domination tracking is disabled for this population");
+	}
+	return std::vector<size_type>(m_dom_list.begin() + m_dom_offset[idx],m_dom_list.begin() + m_dom_offset[idx + 1]);
+}
+
+/// Get domination count.
+/**
+ * @param[in] idx position of the individual whose domination count will be retrieved.
+ *
+ * @return the number of individuals that dominate the individual at position idx.
+ *
+ * @throws index_error if idx is not smaller than size().
+ * @throws value_error if domination tracking was disabled in the packed population.
+ */
+packed_population::size_type packed_population::get_domination_count(const size_type &idx) const
+{
+	if (idx >= m_size) {
+		pagmo_throw(index_error,"invalid index");
+	}
+	if (!m_dom_tracking) {
+		pagmo_throw(value_error,"domination tracking is disabled for this population");
+	}
+	return m_dom_count[idx];
+}
+
+/// Memory footprint.
+/**
+ * @return the number of bytes used by the packed population, not counting the problem.
+ *
+ * @see population::memory_footprint().
+ */
+std::size_t packed_population::memory_footprint() const
+{
+	std::size_t retval = sizeof(packed_population);
+	for (int i = 0; i < 7; ++i) {
+		retval += m_fields[i].capacity() * sizeof(double);
+	}
+	retval += (m_champion.x.capacity() + m_champion.c.capacity() + m_champion.f.capacity()) * sizeof(double);
+	retval += (m_dom_offset.capacity() + m_dom_list.capacity() + m_dom_count.capacity()) * sizeof(size_type);
+	return retval;
+}
+
+// View of the field of the individual at position idx.
+packed_population::range packed_population::get_row(field_type field, const size_type &idx) const
+{
+	const std::size_t width = get_width(field);
+	const double *begin = m_fields[field].empty() ? 0 : &m_fields[field][0] + idx * width;
+	return range(begin,begin + width);
+}
+
+}
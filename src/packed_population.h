@@ -0,0 +1,160 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#ifndef PAGMO_PACKED_POPULATION_H
+#define PAGMO_PACKED_POPULATION_H
+
+#include <cstddef>
+#include <vector>
+
+#include "config.h"
+#include "population.h"
+#include "problem/base.h"
+
+namespace pagmo {
+
+/// Packed population.
+/**
+ * Structure-of-arrays copy of a population. Each field of the individuals (current and best decision, velocity, constraint and fitness vectors)
+ * is stored for the whole population in a single contiguous buffer, row after row, and the domination lists are stored in compressed form
+ * (one buffer of indices plus one of offsets). A packed population thus takes a handful of heap blocks regardless of its size, against the
+ * seven vectors per individual (plus one domination list) of population, which makes it cheaper to store, to copy and to scan.
+ *
+ * The individuals are accessed through read-only views into the buffers. A packed population is not meant to be evolved: unpack() converts it
+ * back to a population, without re-evaluating the individuals.
+ */
+class __PAGMO_VISIBLE packed_population
+{
+	public:
+		/// Size type.
+		typedef population::size_type size_type;
+		/// Fields of the individuals.
+		enum field_type
+		{
+			/// Current decision vector.
+			cur_x = 0,
+			/// Current velocity vector.
+			cur_v = 1,
+			/// Current constraint vector.
+			cur_c = 2,
+			/// Current fitness vector.
+			cur_f = 3,
+			/// Best decision vector.
+			best_x = 4,
+			/// Best constraint vector.
+			best_c = 5,
+			/// Best fitness vector.
+			best_f = 6
+		};
+		/// Read-only view of a contiguous range of doubles.
+		class range
+		{
+			public:
+				/// Const iterator.
+				typedef const double * const_iterator;
+				/// Constructor from the bounds of the range.
+				range(const double *begin, const double *end):m_begin(begin),m_end(end) {}
+				/// Iterator to the beginning of the range.
+				const_iterator begin() const
+				{
+					return m_begin;
+				}
+				/// Iterator to the end of the range.
+				const_iterator end() const
+				{
+					return m_end;
+				}
+				/// Number of elements in the range.
+				std::size_t size() const
+				{
+					return static_cast<std::size_t>(m_end - m_begin);
+				}
+				/// Element at position i.
+				const double &operator[](const std::size_t &i) const
+				{
+					return m_begin[i];
+				}
+				/// Copy of the range.
+				std::vector<double> to_vector() const
+				{
+					return std::vector<double>(m_begin,m_end);
+				}
+			private:
+				const double	*m_begin;
+				const double	*m_end;
+		};
+		/// Read-only view of an individual.
+		/**
+		 * The ranges are valid as long as the packed population they refer to is alive and unmodified.
+		 */
+		struct individual_view
+		{
+			/// Current decision vector.
+			range	cur_x;
+			/// Current velocity vector.
+			range	cur_v;
+			/// Current constraint vector.
+			range	cur_c;
+			/// Current fitness vector.
+			range	cur_f;
+			/// Best decision vector so far.
+			range	best_x;
+			/// Best constraint vector so far.
+			range	best_c;
+			/// Best fitness vector so far.
+			range	best_f;
+		};
+		explicit packed_population(const population &);
+		packed_population(const packed_population &);
+		packed_population &operator=(const packed_population &);
+		population unpack() const;
+		size_type size() const;
+		const problem::base &problem() const;
+		const population::champion_type &champion() const;
+		individual_view get_individual(const size_type &) const;
+		range get_field(field_type) const;
+		std::size_t get_width(field_type) const;
+		std::vector<size_type> get_domination_list(const size_type &) const;
+		size_type get_domination_count(const size_type &) const;
+		std::size_t memory_footprint() const;
+	private:
+		range get_row(field_type, const size_type &) const;
+		// Problem.
+		problem::base_ptr		m_prob;
+		// Number of individuals.
+		size_type			m_size;
+		// One buffer per field, m_size rows of get_width() doubles each.
+		std::vector<double>		m_fields[7];
+		population::champion_type	m_champion;
+		// Domination list of individual i: m_dom_list[m_dom_offset[i]] to m_dom_list[m_dom_offset[i + 1]] (excluded).
+		std::vector<size_type>		m_dom_offset;
+		std::vector<size_type>		m_dom_list;
+		std::vector<size_type>		m_dom_count;
+		bool				m_dom_tracking;
+		population::nds_type		m_nds;
+};
+
+}
+
+#endif
@@ -33,6 +33,8 @@
 #include "exceptions.h"
 #include "island.h"
 #include "migration.h"
+#include "migration_history.h"
+#include "packed_population.h"
 #include "population.h"
 #include "problems.h"
 #include "rng.h"  
@@ -42,6 +42,7 @@
 #include "types.h"
 #include "util/racing.h"
 #include "util/race_pop.h"
+#include "util/nds.h"
 
 #include "algorithm/base.h"
 #include "problem/con2uncon.h"
@@ -55,9 +56,50 @@ problem::base_ptr &population_access::get_problem_ptr(population &pop)
 	return pop.m_prob;
 }
 
+/// Get a reference to the container of individuals.
+/**
+ * Meant for code restoring the state of a population from an external representation: the
+ * domination information must be recomputed with rebuild_dom() once the individuals are in place.
+ */
+population::container_type &population_access::get_container(population &pop)
+{
+	return pop.m_container;
+}
+
+/// Get a reference to the champion of the population.
+population::champion_type &population_access::get_champion(population &pop)
+{
+	return pop.m_champion;
+}
+
+/// Recompute from scratch the domination information of the population.
+void population_access::rebuild_dom(population &pop)
+{
+	pop.rebuild_dom();
+}
+
+/// Get a reference to the domination lists of the population.
+/**
+ * Meant for code restoring domination information computed elsewhere, which must be consistent with the individuals.
+ */
+std::vector<std::vector<population::size_type> > &population_access::get_dom_list(population &pop)
+{
+	return pop.m_dom_list;
+}
+
+/// Get a reference to the domination counts of the population.
+/**
+ * @see population_access::get_dom_list().
+ */
+std::vector<population::size_type> &population_access::get_dom_count(population &pop)
+{
+	return pop.m_dom_count;
+}
+
 /// Constructor from problem::base and number of individuals.
 /**
  * Will store a copy of the problem and will initialise the population to n randomly-generated individuals.
+ * The individuals are evaluated with a single call to problem::base::evaluate_batch().
  * Will fail if n is negative.
  *
  * @param[in] p problem::base that will be associated to the population.
@@ -66,7 +108,7 @@ problem::base_ptr &population_access::get_problem_ptr(population &pop)
  *
  * @throw value_error if n is negative.
  */
-population::population(const problem::base &p, int n, const boost::uint32_t &seed):m_prob(p.clone()), m_pareto_rank(n), m_crowding_d(n), m_drng(seed),m_urng(seed)
+population::population(const problem::base &p, int n, const boost::uint32_t &seed):m_prob(p.clone()), m_dom_tracking(true), m_nds(dom_lists), m_pareto_rank(n), m_crowding_d(n), m_drng(seed),m_urng(seed)
 {
 	if (n < 0) {
 		pagmo_throw(value_error,"number of individuals cannot be negative");
@@ -89,9 +131,15 @@ population::population(const problem::base &p, int n, const boost::uint32_t &see
 		m_container.back().best_x.resize(p_size);
 		m_container.back().best_c.resize(c_size);
 		m_container.back().best_f.resize(f_size);
-		// Initialise randomly the individual.
-		reinit(i);
 	}
+	// Initialise randomly the individuals, evaluating them all at once.
+	std::vector<size_type> idx(size);
+	for (size_type i = 0; i < size; ++i) {
+		idx[i] = i;
+	}
+	reinit_batch_impl(idx);
+	// Build the domination lists once all the individuals are in place.
+	rebuild_dom();
 }
 
 /// Copy constructor.
@@ -101,7 +149,7 @@ population::population(const problem::base &p, int n, const boost::uint32_t &see
  * @param[in] p population used to initialise this.
  */
 population::population(const population &p):m_prob(p.m_prob->clone()),m_container(p.m_container),m_dom_list(p.m_dom_list),m_dom_count(p.m_dom_count),
-	m_champion(p.m_champion), m_pareto_rank(p.m_pareto_rank), m_crowding_d(p.m_crowding_d),m_drng(p.m_drng),m_urng(p.m_urng)
+	m_dom_tracking(p.m_dom_tracking),m_nds(p.m_nds),m_champion(p.m_champion), m_pareto_rank(p.m_pareto_rank), m_crowding_d(p.m_crowding_d),m_drng(p.m_drng),m_urng(p.m_urng)
 {}
 
 /// Assignment operator.
@@ -121,6 +169,8 @@ population &population::operator=(const population &p)
 		m_container = p.m_container;
 		m_dom_list = p.m_dom_list;
 		m_dom_count = p.m_dom_count;
+		m_dom_tracking = p.m_dom_tracking;
+		m_nds = p.m_nds;
 		m_champion = p.m_champion;
 		m_pareto_rank = p.m_pareto_rank;
 		m_crowding_d = p.m_crowding_d;
@@ -133,6 +183,9 @@ population &population::operator=(const population &p)
 // Update the domination list and the domination count when the individual at position n has changed
 void population::update_dom(const size_type &n)
 {
+	if (!m_dom_tracking) {
+		return;
+	}
 	// The algorithm works as follow:
 	// 1) For each element in m_dom_list[n] decrease the domination count by one. (m_dom_count[m_dom_list[n][j]] -= 1)
 	// 2) We empty the dom_list and reinitialize m_dom_count[n] = 0-
@@ -179,6 +232,27 @@ void population::update_dom(const size_type &n)
 	}
 }
 
+// Rebuild the domination lists and the domination counts of the whole population from scratch.
+// This is much cheaper than calling update_dom() on each individual, as no search/erase in the
+// domination lists is needed.
+void population::rebuild_dom()
+{
+	const size_type size = m_container.size();
+	m_dom_list.assign(size,std::vector<size_type>());
+	m_dom_count.assign(size,0);
+	if (!m_dom_tracking) {
+		return;
+	}
+	for (size_type i = 0; i < size; ++i) {
+		for (size_type j = 0; j < size; ++j) {
+			if (i != j && m_prob->compare_fc(m_container[i].best_f,m_container[i].best_c,m_container[j].best_f,m_container[j].best_c)) {
+				m_dom_list[i].push_back(j);
+				m_dom_count[j]++;
+			}
+		}
+	}
+}
+
 // Init randomly the velocity of the individual in position idx.
 void population::init_velocity(const size_type &idx)
 {
@@ -192,6 +266,70 @@ void population::init_velocity(const size_type &idx)
 	}
 }
 
+/// Enable or disable domination tracking.
+/**
+ * By default the population keeps the domination lists and counts of its individuals up to date, which costs
+ * a scan of the whole population each time an individual changes. Single-objective algorithms never use this
+ * information and can switch it off. While tracking is disabled, the domination lists and counts and all the
+ * Pareto information (fronts, ranks, crowding distances) are not available. Enabling tracking again rebuilds
+ * the domination lists from scratch.
+ *
+ * @param[in] flag true to enable domination tracking, false to disable it.
+ */
+void population::set_dom_tracking(bool flag)
+{
+	if (flag == m_dom_tracking) {
+		return;
+	}
+	m_dom_tracking = flag;
+	rebuild_dom();
+}
+
+/// Get the domination tracking flag.
+/**
+ * @return true if the domination lists and counts of the individuals are kept up to date.
+ *
+ * @see population::set_dom_tracking().
+ */
+bool population::get_dom_tracking() const
+{
+	return m_dom_tracking;
+}
+
+/// Memory footprint.
+/**
+ * Each individual holds seven vectors and a domination list, each one allocated separately on the heap.
+ * The count does not include the overhead of the memory allocator, nor the problem.
+ *
+ * @return the number of bytes used by the individuals, the domination information and the champion.
+ *
+ * @see packed_population::memory_footprint().
+ */
+std::size_t population::memory_footprint() const
+{
+	std::size_t retval = sizeof(population) + m_container.capacity() * sizeof(individual_type);
+	for (size_type i = 0; i < m_container.size(); ++i) {
+		const individual_type &ind = m_container[i];
+		retval += (ind.cur_x.capacity() + ind.cur_v.capacity() + ind.cur_c.capacity() + ind.cur_f.capacity() +
+			ind.best_x.capacity() + ind.best_c.capacity() + ind.best_f.capacity()) * sizeof(double);
+	}
+	retval += m_dom_list.capacity() * sizeof(std::vector<size_type>) + m_dom_count.capacity() * sizeof(size_type);
+	for (size_type i = 0; i < m_dom_list.size(); ++i) {
+		retval += m_dom_list[i].capacity() * sizeof(size_type);
+	}
+	retval += m_pareto_rank.capacity() * sizeof(size_type) + m_crowding_d.capacity() * sizeof(double);
+	retval += (m_champion.x.capacity() + m_champion.c.capacity() + m_champion.f.capacity()) * sizeof(double);
+	return retval;
+}
+
+// Throw if the domination information is not available.
+void population::check_dom_tracking() const
+{
+	if (!m_dom_tracking) {
+		pagmo_throw(value_error,"domination tracking is disabled for this population");
+	}
+}
+
 /// Computes the mean curent velocity of all individuals in the population
 double population::mean_velocity() const {
 	const population::size_type pop_size(m_container.size());
@@ -213,14 +351,19 @@ double population::mean_velocity() const {
 
 /// Re-initialise all individuals
 /**
+ * The individuals are evaluated with a single call to problem::base::evaluate_batch().
+ *
  * @see population::reinit(const size_type &).
  */
 void population::reinit()
 {
+	std::vector<size_type> idx(size());
 	for (size_type i = 0; i < size(); ++i)
 	{
-		reinit(i);
+		idx[i] = i;
 	}
+	reinit_batch_impl(idx);
+	rebuild_dom();
 }
 
 /// Re-initialise individual at position idx.
@@ -238,6 +381,44 @@ void population::reinit(const size_type &idx)
 	if (idx >= size()) {
 		pagmo_throw(index_error,"invalid index");
 	}
+	reinit_impl(idx);
+	// Update the domination lists.
+	update_dom(idx);
+}
+
+// Re-initialise the individual at position idx, leaving the domination lists untouched.
+void population::reinit_impl(const size_type &idx)
+{
+	randomise_impl(idx);
+	// Fill in the constraints.
+	m_prob->compute_constraints(m_container[idx].cur_c,m_container[idx].cur_x);
+	// Compute the fitness.
+	m_prob->objfun(m_container[idx].cur_f,m_container[idx].cur_x);
+	reset_best_impl(idx);
+}
+
+// Re-initialise the individuals at positions idx, leaving the domination lists untouched. The individuals
+// are evaluated with a single call to the batch methods of the problem.
+void population::reinit_batch_impl(const std::vector<size_type> &idx)
+{
+	std::vector<decision_vector> x(idx.size());
+	for (std::vector<size_type>::size_type i = 0; i < idx.size(); ++i) {
+		randomise_impl(idx[i]);
+		x[i] = m_container[idx[i]].cur_x;
+	}
+	std::vector<constraint_vector> c;
+	std::vector<fitness_vector> f;
+	m_prob->evaluate_batch(f,c,x);
+	for (std::vector<size_type>::size_type i = 0; i < idx.size(); ++i) {
+		m_container[idx[i]].cur_c.swap(c[i]);
+		m_container[idx[i]].cur_f.swap(f[i]);
+		reset_best_impl(idx[i]);
+	}
+}
+
+// Pick randomly the decision and velocity vectors of the individual at position idx.
+void population::randomise_impl(const size_type &idx)
+{
 	const decision_vector::size_type p_size = m_prob->get_dimension(), i_size = m_prob->get_i_dimension();
 	// Initialise randomly the continuous part of the decision vector.
 	for (decision_vector::size_type j = 0; j < p_size - i_size; ++j) {
@@ -249,18 +430,17 @@ void population::reinit(const size_type &idx)
 	}
 	// Initialise randomly the velocity vector.
 	init_velocity(idx);
-	// Fill in the constraints.
-	m_prob->compute_constraints(m_container[idx].cur_c,m_container[idx].cur_x);
-	// Compute the fitness.
-	m_prob->objfun(m_container[idx].cur_f,m_container[idx].cur_x);
+}
+
+// Reset the bests of the individual at position idx to its current values and update the champion.
+void population::reset_best_impl(const size_type &idx)
+{
 	// Best decision vector is current decision vector, best fitness is current fitness, best constraints are current constraints.
 	m_container[idx].best_x = m_container[idx].cur_x;
 	m_container[idx].best_f = m_container[idx].cur_f;
 	m_container[idx].best_c = m_container[idx].cur_c;
 	// Update the champion.
 	update_champion(idx);
-	// Update the domination lists.
-	update_dom(idx);
 }
 
 
@@ -298,6 +478,7 @@ const std::vector<population::size_type> &population::get_domination_list(const
 	if (idx >= size()) {
 		pagmo_throw(index_error,"invalid index");
 	}
+	check_dom_tracking();
 	return m_dom_list[idx];
 }
 
@@ -316,6 +497,7 @@ population::size_type population::get_domination_count(const size_type &idx) con
 	if (idx >= size()) {
 		pagmo_throw(index_error,"invalid index");
 	}
+	check_dom_tracking();
 	return m_dom_count[idx];
 }
 
@@ -377,11 +559,14 @@ struct one_dim_fit_comp {
 /// Update Pareto Information
 /**
  * Computes all pareto fronts, updates the pareto rank and the crowding distance of each individual.
- * Member variables for rank and crowding distance are set to zero and domination lists and
- * domination count are used to for the computation.
+ * Member variables for rank and crowding distance are set to zero and the fronts are computed with
+ * the method selected by set_nds_method() (by default, from the domination lists and domination count).
  */
 
 void population::update_pareto_information() const {
+	if (m_nds == dom_lists) {
+		check_dom_tracking();
+	}
 	// Population size can change between calls and m_pareto_rank, m_crowding_d are updated if necessary
 	m_pareto_rank.resize(size());
 	m_crowding_d.resize(size());
@@ -390,6 +575,22 @@ void population::update_pareto_information() const {
 	std::fill(m_pareto_rank.begin(), m_pareto_rank.end(), 0);
 	std::fill(m_crowding_d.begin(), m_crowding_d.end(), 0);
 
+	if (m_nds != dom_lists) {
+		const std::vector<std::size_t> rank = (m_nds == ens) ? util::nds::ens(best_fitnesses()) : util::nds::sweep_2d(best_fitnesses());
+		std::vector<std::vector<population::size_type> > fronts;
+		for (population::size_type idx = 0; idx < rank.size(); ++idx) {
+			m_pareto_rank[idx] = rank[idx];
+			if (rank[idx] >= fronts.size()) {
+				fronts.resize(rank[idx] + 1);
+			}
+			fronts[rank[idx]].push_back(idx);
+		}
+		for (population::size_type i = 0; i < fronts.size(); ++i) {
+			update_crowding_d(fronts[i]);
+		}
+		return;
+	}
+
 	// We define some utility vectors .....
 	std::vector<population::size_type> F,S;
 
@@ -488,6 +689,75 @@ std::vector<std::vector<population::size_type> > population::compute_pareto_fron
 	return retval;
 }
 
+/// Computes and returns the first Pareto front
+/**
+ * Cheaper than compute_pareto_fronts() when only the non-dominated individuals are needed: the Pareto
+ * ranks and crowding distances are not computed.
+ *
+ * @return the positional indices of the individuals in the first Pareto front, in increasing order.
+ */
+std::vector<population::size_type> population::compute_first_front() const {
+	std::vector<population::size_type> retval;
+	if (m_nds == dom_lists) {
+		check_dom_tracking();
+		for (population::size_type idx = 0; idx < size(); ++idx) {
+			if (m_dom_count[idx] == 0) {
+				retval.push_back(idx);
+			}
+		}
+	} else {
+		const std::vector<std::size_t> front = util::nds::first_front(best_fitnesses());
+		retval.assign(front.begin(),front.end());
+	}
+	return retval;
+}
+
+/// Set the non-dominated sorting method.
+/**
+ * Selects the method used to compute the Pareto fronts and ranks of the population. The default, dom_lists, builds
+ * the fronts from the domination lists and honours any problem::base::compare_fc() reimplementation. The ens and
+ * sweep_2d methods do not need the domination lists (see set_dom_tracking()) and are much faster on large
+ * populations, but they assume the default Pareto dominance (minimisation of every objective) and are
+ * therefore only allowed for unconstrained problems.
+ *
+ * @param[in] method non-dominated sorting method.
+ *
+ * @throws value_error if the problem has constraints and method is not dom_lists, or if method is sweep_2d and the
+ * problem does not have two objectives.
+ */
+void population::set_nds_method(const nds_type &method)
+{
+	if (method != dom_lists && m_prob->get_c_dimension()) {
+		pagmo_throw(value_error,"this non-dominated sorting method is only available for unconstrained problems");
+	}
+	if (method == sweep_2d && m_prob->get_f_dimension() != 2) {
+		pagmo_throw(value_error,"the sweep_2d non-dominated sorting method requires a problem with two objectives");
+	}
+	m_nds = method;
+}
+
+/// Get the non-dominated sorting method.
+/**
+ * @return the method used to compute the Pareto fronts and ranks.
+ *
+ * @see population::set_nds_method().
+ */
+population::nds_type population::get_nds_method() const
+{
+	return m_nds;
+}
+
+// Best fitness vectors of the individuals, used by the non-dominated sorting methods of util::nds.
+std::vector<fitness_vector> population::best_fitnesses() const
+{
+	std::vector<fitness_vector> retval;
+	retval.reserve(size());
+	for (population::size_type idx = 0; idx < size(); ++idx) {
+		retval.push_back(m_container[idx].best_f);
+	}
+	return retval;
+}
+
 /// Compute and return the ideal objective vector
 /**
  * This method returns the ideal objective vector for the current optimal pareto set.
@@ -894,12 +1164,37 @@ void population::set_x(const size_type &idx, const decision_vector &x)
 		pagmo_throw(value_error,"decision vector is not compatible with problem");
 
 	}
+	set_x_impl(idx,x);
+	// Updated domination lists.
+	update_dom(idx);
+}
+
+// Set the decision vector of the individual at position idx, evaluate it and update its bests and the champion.
+// The domination lists are left untouched.
+void population::set_x_impl(const size_type &idx, const decision_vector &x)
+{
 	// Set decision vector.
 	m_container[idx].cur_x = x;
 	// Update current fitness vector.
 	m_prob->objfun(m_container[idx].cur_f,x);
 	// Update current constraints vector.
 	m_prob->compute_constraints(m_container[idx].cur_c,x);
+	update_best_impl(idx);
+}
+
+// Set the decision vector of the individual at position idx, together with its already computed fitness
+// and constraint vectors, and update its bests and the champion. The domination lists are left untouched.
+void population::set_x_impl(const size_type &idx, const decision_vector &x, const fitness_vector &f, const constraint_vector &c)
+{
+	m_container[idx].cur_x = x;
+	m_container[idx].cur_f = f;
+	m_container[idx].cur_c = c;
+	update_best_impl(idx);
+}
+
+// Update the bests of the individual at position idx if its current values are better, and update the champion.
+void population::update_best_impl(const size_type &idx)
+{
 	// If needed, update the best decision, fitness and constraint vectors for the individual.
 	// NOTE: we update the bests in two cases:
 	// - the bests are empty, meaning they are not defined and we are being called by push_back()
@@ -915,8 +1210,42 @@ void population::set_x(const size_type &idx, const decision_vector &x)
 	}
 	// Update the champion.
 	update_champion(idx);
-	// Updated domination lists.
-	update_dom(idx);
+}
+
+/// Set the decision vectors of several individuals.
+/**
+ * Equivalent to calling set_x() on each pair of position and decision vector, but the domination lists
+ * are rebuilt only once, after all the individuals have been evaluated. All positions and decision vectors
+ * are checked, and the decision vectors are evaluated with a single call to problem::base::evaluate_batch(),
+ * before the population is modified.
+ *
+ * @param[in] idx positional indices of the individuals to be set.
+ * @param[in] x decision vectors to be set for the individuals at positions idx.
+ *
+ * @throws value_error if idx and x have different sizes or if any decision vector is not compatible with the problem.
+ * @throws index_error if any position is out of range.
+ */
+void population::set_x_batch(const std::vector<size_type> &idx, const std::vector<decision_vector> &x)
+{
+	if (idx.size() != x.size()) {
+		pagmo_throw(value_error,"the number of positions and of decision vectors must be equal");
+	}
+	for (std::vector<size_type>::size_type i = 0; i < idx.size(); ++i) {
+		if (idx[i] >= size()) {
+			pagmo_throw(index_error,"invalid individual position");
+		}
+		if (!m_prob->verify_x(x[i])) {
+			pagmo_throw(value_error,"decision vector is not compatible with problem");
+		}
+	}
+	// Evaluate all the decision vectors at once, before modifying the population.
+	std::vector<fitness_vector> f;
+	std::vector<constraint_vector> c;
+	m_prob->evaluate_batch(f,c,x);
+	for (std::vector<size_type>::size_type i = 0; i < idx.size(); ++i) {
+		set_x_impl(idx[i],x[i],f[i],c[i]);
+	}
+	rebuild_dom();
 }
 
 /// Erase individual idx
@@ -992,6 +1321,38 @@ void population::push_back(const decision_vector &x)
 	init_velocity(m_container.size() - 1);
 }
 
+/// Append several individuals with given decision vectors.
+/**
+ * Equivalent to calling push_back() on each decision vector, but the domination lists are rebuilt
+ * only once, after all the new individuals have been evaluated. All decision vectors are checked, and evaluated
+ * with a single call to problem::base::evaluate_batch(), before the population is modified.
+ *
+ * @param[in] x decision vectors of the individuals to be appended.
+ *
+ * @throws value_error if any decision vector is not compatible with the problem.
+ */
+void population::push_back_batch(const std::vector<decision_vector> &x)
+{
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		if (!m_prob->verify_x(x[i])) {
+			pagmo_throw(value_error,"decision vector is not compatible with problem");
+		}
+	}
+	// Evaluate all the decision vectors at once, before modifying the population.
+	std::vector<fitness_vector> f;
+	std::vector<constraint_vector> c;
+	m_prob->evaluate_batch(f,c,x);
+	const decision_vector::size_type p_size = m_prob->get_dimension();
+	m_container.reserve(m_container.size() + x.size());
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		m_container.push_back(individual_type());
+		m_container.back().cur_v.resize(p_size);
+		set_x_impl(m_container.size() - 1,x[i],f[i],c[i]);
+		init_velocity(m_container.size() - 1);
+	}
+	rebuild_dom();
+}
+
 /// Set the velocity vector of individual at position idx.
 /**
  * Will fail if dimension of v differs from the problem dimension.
@@ -1088,15 +1449,17 @@ population::const_iterator population::end() const
  * @param[in] active_set Indices of individuals that should participate in the race. If empty, race on the whole population.
  * @param[in] race_best If true winners are the best, otherwise winners are the worst
  * @param[in] screen_output If true some screen output is produced
+ * @param[in] n_threads Number of threads evaluating the racers at each iteration (see util::racing::race_pop::set_n_threads()).
  *
  * @return Indices of the individuals that remain in the race in the end, a.k.a the winners.
  *
  * @see pagmo::util::racing::race
  */
-std::pair<std::vector<population::size_type>, unsigned int> population::race(const size_type n_final, const unsigned int min_trials, const unsigned int max_count, double delta, const std::vector<size_type>& active_set, const bool race_best, const bool screen_output) const
+std::pair<std::vector<population::size_type>, unsigned int> population::race(const size_type n_final, const unsigned int min_trials, const unsigned int max_count, double delta, const std::vector<size_type>& active_set, const bool race_best, const bool screen_output, const unsigned int n_threads) const
 {
 	unsigned int seed = m_urng();
 	util::racing::race_pop m_race_pop(*this, seed);
+	m_race_pop.set_n_threads(n_threads);
 	return m_race_pop.run(n_final, min_trials, max_count, delta, active_set, util::racing::race_pop::MAX_BUDGET, race_best, screen_output);
 }
 
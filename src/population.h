@@ -193,6 +193,32 @@ class __PAGMO_VISIBLE population
 
 		/// Const iterator.
 		typedef container_type::const_iterator const_iterator;
+		/// Non-dominated sorting method.
+		/**
+		 * Method used to compute the Pareto fronts and ranks of the individuals.
+		 */
+		enum nds_type
+		{
+			/// Fronts are built from the domination lists.
+			/**
+			 * The domination relation is the one of problem::base::compare_fc(), and domination tracking must be enabled.
+			 */
+			dom_lists = 0,
+			/// Efficient non-dominated sort.
+			/**
+			 * Pareto dominance on the best fitness vectors, assuming minimisation. Only for unconstrained problems.
+			 *
+			 * @see util::nds::ens().
+			 */
+			ens = 1,
+			/// Sweep for problems with two objectives.
+			/**
+			 * Same domination relation as ens, in O(N log N) time.
+			 *
+			 * @see util::nds::sweep_2d().
+			 */
+			sweep_2d = 2
+		};
 		explicit population(const problem::base &, int = 0, const boost::uint32_t &seed = getSeed());
         static boost::uint32_t getSeed(){
 			return rng_generator::get<rng_uint32>()();
@@ -209,6 +235,9 @@ class __PAGMO_VISIBLE population
 		void update_pareto_information() const;
 		size_type n_dominated(const individual_type &) const;
 		std::vector<std::vector<size_type> > compute_pareto_fronts() const;
+		std::vector<size_type> compute_first_front() const;
+		void set_nds_method(const nds_type &);
+		nds_type get_nds_method() const;
 		fitness_vector compute_ideal() const;
 		fitness_vector compute_nadir() const;
 
@@ -222,6 +251,8 @@ class __PAGMO_VISIBLE population
 		void set_x(const size_type &, const decision_vector &);
 		void set_v(const size_type &, const decision_vector &);
 		void push_back(const decision_vector &);
+		void push_back_batch(const std::vector<decision_vector> &);
+		void set_x_batch(const std::vector<size_type> &, const std::vector<decision_vector> &);
 		void erase(const size_type &);
 		size_type size() const;
 		const_iterator begin() const;
@@ -231,6 +262,9 @@ class __PAGMO_VISIBLE population
 		void reinit();
 		void clear();
 		double mean_velocity() const;
+		void set_dom_tracking(bool);
+		bool get_dom_tracking() const;
+		std::size_t memory_footprint() const;
 
 		// Constraints repairing methods
 		void repair(const size_type &, const algorithm::base_ptr &);
@@ -242,7 +276,8 @@ class __PAGMO_VISIBLE population
 									double delta = 0.05,
 									const std::vector<size_type>& = std::vector<size_type>(),
 									const bool race_best = true,
-									const bool screen_output = false) const;
+									const bool screen_output = false,
+									const unsigned int n_threads = 1) const;
 
 		struct crowded_comparison_operator {
 			crowded_comparison_operator(const population &);
@@ -261,23 +296,42 @@ class __PAGMO_VISIBLE population
 	private:
 		void init_velocity(const size_type &);
 		void update_champion(const size_type &);
+		void reinit_impl(const size_type &);
+		void reinit_batch_impl(const std::vector<size_type> &);
+		void randomise_impl(const size_type &);
+		void reset_best_impl(const size_type &);
+		void set_x_impl(const size_type &, const decision_vector &);
+		void set_x_impl(const size_type &, const decision_vector &, const fitness_vector &, const constraint_vector &);
+		void update_best_impl(const size_type &);
+		void check_dom_tracking() const;
+		std::vector<fitness_vector> best_fitnesses() const;
 
 		// Multi-objective stuff
 		void update_crowding_d(std::vector<size_type>) const;
 
 	protected:
 		void update_dom(const size_type &);
+		void rebuild_dom();
 
 	private:
 		// Data members + their serialization
 		friend class boost::serialization::access;
 		template <class Archive>
-		void serialize(Archive &ar, const unsigned int)
+		void serialize(Archive &ar, const unsigned int version)
 		{
 			ar & m_prob;
 			ar & m_container;
 			ar & m_dom_list;
 			ar & m_dom_count;
+			// Version 0 archives predate the domination tracking flag and the choice of the non-dominated sorting,
+			// and always tracked domination with the domination lists.
+			if (version > 0) {
+				ar & m_dom_tracking;
+				ar & m_nds;
+			} else {
+				m_dom_tracking = true;
+				m_nds = dom_lists;
+			}
 			ar & m_pareto_rank;
 			ar & m_crowding_d;
 			ar & m_champion;
@@ -294,6 +348,10 @@ class __PAGMO_VISIBLE population
 		std::vector<std::vector<size_type> >		m_dom_list;
 		// Domination Count (number of dominant individuals)
 		std::vector<size_type>				m_dom_count;
+		// Domination tracking flag. When false, domination lists and counts are left empty.
+		bool						m_dom_tracking;
+		// Non-dominated sorting method.
+		nds_type					m_nds;
 	private:
 		// Population champion.
 		champion_type					m_champion;
@@ -317,6 +375,11 @@ __PAGMO_VISIBLE_FUNC std::ostream &operator<<(std::ostream &, const population::
 struct __PAGMO_VISIBLE population_access
 {
 	static problem::base_ptr &get_problem_ptr(population &);
+	static population::container_type &get_container(population &);
+	static population::champion_type &get_champion(population &);
+	static void rebuild_dom(population &);
+	static std::vector<std::vector<population::size_type> > &get_dom_list(population &);
+	static std::vector<population::size_type> &get_dom_count(population &);
 };
 
 }
@@ -343,4 +406,6 @@ inline void load_construct_data(Archive &ar, pagmo::population *pop, const unsig
 
 }} //namespaces
 
+BOOST_CLASS_VERSION(pagmo::population,1)
+
 #endif
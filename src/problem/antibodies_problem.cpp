@@ -92,6 +92,15 @@ base_ptr antibodies_problem::clone() const
 	return base_ptr(new antibodies_problem(*this));
 }
 
+/// Thread safety.
+/**
+ * @return true if the original problem is thread safe.
+ */
+bool antibodies_problem::is_thread_safe() const
+{
+	return m_original_problem->is_thread_safe();
+}
+
 /// Implementation of the objective function.
 /// (Wraps over the original implementation)
 /**
@@ -64,6 +64,7 @@ public:
 	//copy constructor
 	antibodies_problem(const antibodies_problem &);
 	base_ptr clone() const;
+	bool is_thread_safe() const;
 	std::string get_name() const;
 
 	void set_antigens(const std::vector<decision_vector> &);
@@ -66,10 +66,8 @@ base::base(int n, int ni, int nf, int nc, int nic, const double &c_tol): //TODO
 	m_i_dimension(boost::numeric_cast<size_type>(ni)),m_f_dimension(boost::numeric_cast<f_size_type>(nf)),
 	m_c_dimension(boost::numeric_cast<c_size_type>(nc)),m_ic_dimension(boost::numeric_cast<c_size_type>(nic)),
 	m_c_tol(nc,c_tol),
-	m_decision_vector_cache_f(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_fitness_vector_cache(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity)),
-	m_decision_vector_cache_c(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_constraint_vector_cache(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity)),
+	m_f_cache(cache_capacity),
+	m_c_cache(cache_capacity),
 	m_best_x(0),
 	m_best_f(0),
 	m_best_c(0),
@@ -112,10 +110,8 @@ base::base(int n, int ni, int nf, int nc, int nic, const std::vector<double> &c_
 	m_i_dimension(boost::numeric_cast<size_type>(ni)),m_f_dimension(boost::numeric_cast<f_size_type>(nf)),
 	m_c_dimension(boost::numeric_cast<c_size_type>(nc)),m_ic_dimension(boost::numeric_cast<c_size_type>(nic)),
 	m_c_tol(c_tol),
-	m_decision_vector_cache_f(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_fitness_vector_cache(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity)),
-	m_decision_vector_cache_c(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_constraint_vector_cache(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity)),
+	m_f_cache(cache_capacity),
+	m_c_cache(cache_capacity),
 	m_best_x(0),
 	m_best_f(0),
 	m_best_c(0),
@@ -165,10 +161,8 @@ base::base(const double &l_value, const double &u_value, int n, int ni, int nf,
 	m_i_dimension(boost::numeric_cast<size_type>(ni)),m_f_dimension(boost::numeric_cast<f_size_type>(nf)),
 	m_c_dimension(boost::numeric_cast<c_size_type>(nc)),m_ic_dimension(boost::numeric_cast<c_size_type>(nic)),
 	m_c_tol(nc,c_tol),
-	m_decision_vector_cache_f(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_fitness_vector_cache(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity)),
-	m_decision_vector_cache_c(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_constraint_vector_cache(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity)),
+	m_f_cache(cache_capacity),
+	m_c_cache(cache_capacity),
 	m_best_x(0),
 	m_best_f(0),
 	m_best_c(0),
@@ -216,10 +210,8 @@ base::base(const decision_vector &lb, const decision_vector &ub, int ni, int nf,
 	m_i_dimension(boost::numeric_cast<size_type>(ni)),m_f_dimension(boost::numeric_cast<f_size_type>(nf)),
 	m_c_dimension(boost::numeric_cast<c_size_type>(nc)),m_ic_dimension(boost::numeric_cast<c_size_type>(nic)),
 	m_c_tol(nc,c_tol),
-	m_decision_vector_cache_f(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_fitness_vector_cache(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity)),
-	m_decision_vector_cache_c(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-	m_constraint_vector_cache(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity)),
+	m_f_cache(cache_capacity),
+	m_c_cache(cache_capacity),
 	m_best_x(0),
 	m_best_f(0),
 	m_best_c(0),
@@ -457,6 +449,19 @@ unsigned int base::get_cevals() const
 	return m_cevals;
 }
 
+/// Add evaluations to the counters.
+/**
+ * Used to account for the evaluations performed on a copy of the problem (e.g., by another process).
+ *
+ * @param[in] fevals number of function evaluations to be added.
+ * @param[in] cevals number of constraints function evaluations to be added.
+ */
+void base::add_evals(unsigned int fevals, unsigned int cevals) const
+{
+	m_fevals += fevals;
+	m_cevals += cevals;
+}
+
 
 /// Return global dimension.
 /**
@@ -553,7 +558,7 @@ fitness_vector base::objfun(const decision_vector &x) const
 
 /// Write fitness of pagmo::decision_vector into pagmo::fitness_vector.
 /**
- * Will call objfun_impl() internally.
+ * Will call objfun_impl() internally, or evaluate_impl() for constrained problems implementing it.
  * The implementation internally uses a caching mechanism, so that recently-computed quantities are remembered and re-used when appropriate.
  *
  * @param[out] f fitness vector to which x's fitness will be written.
@@ -571,11 +576,14 @@ void base::objfun(fitness_vector &f, const decision_vector &x) const
 		pagmo_throw(value_error,"wrong decision vector size when calling objective function");
 	}
 	// Look into the cache.
-	typedef decision_vector_cache_type::iterator x_iterator;
-	typedef fitness_vector_cache_type::iterator f_iterator;
-	const x_iterator x_it = std::find(m_decision_vector_cache_f.begin(),m_decision_vector_cache_f.end(),x);
-	if (x_it == m_decision_vector_cache_f.end()) {
-		// Fitness is not into memory. Calculate it.
+	if (!m_f_cache.get(x,f)) {
+		// Fitness is not into memory. Calculate it, together with the constraints if the problem can.
+		if (m_c_dimension) {
+			constraint_vector c(m_c_dimension);
+			if (fused_evaluation(f,c,x)) {
+				return;
+			}
+		}
 		objfun_impl(f,x);
 		// Increase function evaluation counter.
 		m_fevals++;
@@ -583,30 +591,160 @@ void base::objfun(fitness_vector &f, const decision_vector &x) const
 		if (f.size() != m_f_dimension) {
 			pagmo_throw(value_error,"fitness dimension was changed inside objfun_impl()");
 		}
-		// Store the decision vector and the newly-calculated fitness in the front of the buffers.
-		m_decision_vector_cache_f.push_front(x);
-		m_fitness_vector_cache.push_front(f);
-	} else {
-		// Compute the corresponding iterator in the fitness vector cache.
-		f_iterator f_it = m_fitness_vector_cache.begin();
-		std::advance(f_it,std::distance(m_decision_vector_cache_f.begin(),x_it));
-		pagmo_assert(f_it != m_fitness_vector_cache.end());
-		// Assign to the fitness vector the value in the cache.
-		f = *f_it;
-		// Move the content of the current positions to the front of the buffers, and shift everything else down
-		// by one position.
-		x_iterator tmp_x_it = m_decision_vector_cache_f.begin();
-		f_iterator tmp_f_it = m_fitness_vector_cache.begin();
-		while (x_it != tmp_x_it) {
-			x_it->swap(*tmp_x_it);
-			f_it->swap(*tmp_f_it);
-			++tmp_x_it;
-			++tmp_f_it;
+		// Store the decision vector and the newly-calculated fitness in the cache.
+		m_f_cache.put(x,f);
+	}
+}
+
+/// Compute the fitness of several decision vectors.
+/**
+ * Will call objfun_batch_impl() once for the whole set of decision vectors, so that problems able to
+ * evaluate many decision vectors at once (e.g., problems implemented in Python on top of NumPy) can do so.
+ * The function evaluation counter is increased by the number of decision vectors.
+ * Contrary to objfun(), the caches are neither looked into nor updated.
+ *
+ * @param[out] f fitness vectors to which the fitnesses of x will be written. It will be resized to the size of x.
+ * @param[in] x decision vectors whose fitnesses will be calculated.
+ *
+ * @throws value_error if the dimension of any decision vector is different from the dimension of the problem, or if
+ * objfun_batch_impl() changed the number or the dimension of the fitness vectors.
+ */
+void base::objfun_batch(std::vector<fitness_vector> &f, const std::vector<decision_vector> &x) const
+{
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		if (x[i].size() != get_dimension()) {
+			pagmo_throw(value_error,"wrong decision vector size when calling objective function");
+		}
+	}
+	f.resize(x.size());
+	for (std::vector<fitness_vector>::size_type i = 0; i < f.size(); ++i) {
+		f[i].resize(m_f_dimension);
+	}
+	if (x.empty()) {
+		return;
+	}
+	objfun_batch_impl(f,x);
+	m_fevals += boost::numeric_cast<unsigned int>(x.size());
+	if (f.size() != x.size()) {
+		pagmo_throw(value_error,"number of fitness vectors was changed inside objfun_batch_impl()");
+	}
+	for (std::vector<fitness_vector>::size_type i = 0; i < f.size(); ++i) {
+		if (f[i].size() != m_f_dimension) {
+			pagmo_throw(value_error,"fitness dimension was changed inside objfun_batch_impl()");
 		}
-		pagmo_assert(tmp_f_it == f_it);
 	}
 }
 
+/// Batch objective function implementation.
+/**
+ * Writes to f the fitness vectors of the decision vectors in x. f has already been sized by objfun_batch().
+ * The default implementation calls objfun_impl() on each decision vector; problems able to evaluate many
+ * decision vectors at once should reimplement it.
+ *
+ * @param[out] f fitness vectors into which the fitnesses of x will be written.
+ * @param[in] x decision vectors whose fitnesses will be calculated.
+ */
+void base::objfun_batch_impl(std::vector<fitness_vector> &f, const std::vector<decision_vector> &x) const
+{
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		objfun_impl(f[i],x[i]);
+	}
+}
+
+/// Compute the fitness and the constraints of several decision vectors.
+/**
+ * Problems implementing evaluate_impl() compute the fitness and the constraint vectors of each decision vector with a single call
+ * to evaluate_impl(). Otherwise, this method is equivalent to objfun_batch() followed by compute_constraints_batch(). As in those
+ * methods, the caches are neither looked into nor updated.
+ *
+ * @param[out] f fitness vectors to which the fitnesses of x will be written. It will be resized to the size of x.
+ * @param[out] c constraint vectors into which the constraints of x will be written. It will be resized to the size of x.
+ * @param[in] x decision vectors which will be evaluated.
+ *
+ * @throws value_error if the dimension of any decision vector is different from the dimension of the problem, or if
+ * the implementation changed the number or the dimension of the fitness or constraint vectors.
+ */
+void base::evaluate_batch(std::vector<fitness_vector> &f, std::vector<constraint_vector> &c, const std::vector<decision_vector> &x) const
+{
+	if (!m_c_dimension || x.empty()) {
+		objfun_batch(f,x);
+		compute_constraints_batch(c,x);
+		return;
+	}
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		if (x[i].size() != get_dimension()) {
+			pagmo_throw(value_error,"wrong decision vector size when calling objective function");
+		}
+	}
+	f.resize(x.size());
+	c.resize(x.size());
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		f[i].resize(m_f_dimension);
+		c[i].resize(m_c_dimension);
+	}
+	// If the first decision vector cannot be evaluated with evaluate_impl(), none can.
+	if (!evaluate_impl(f[0],c[0],x[0])) {
+		objfun_batch(f,x);
+		compute_constraints_batch(c,x);
+		return;
+	}
+	for (std::vector<decision_vector>::size_type i = 1; i < x.size(); ++i) {
+		evaluate_impl(f[i],c[i],x[i]);
+	}
+	m_fevals += boost::numeric_cast<unsigned int>(x.size());
+	m_cevals += boost::numeric_cast<unsigned int>(x.size());
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		if (f[i].size() != m_f_dimension) {
+			pagmo_throw(value_error,"fitness dimension was changed inside evaluate_impl()");
+		}
+		if (c[i].size() != m_c_dimension) {
+			pagmo_throw(value_error,"constraints dimension was changed inside evaluate_impl()");
+		}
+	}
+}
+
+/// Fused implementation of fitness and constraint computation.
+/**
+ * Problems whose fitness and constraint vectors are the outcome of the same computation (e.g., of a simulation) can reimplement
+ * this method to write both of them at once, and return true. objfun() and compute_constraints() will then fill both caches with
+ * a single evaluation, and evaluate_batch() will evaluate each decision vector once. f and c have already been sized.
+ *
+ * The default implementation does nothing and returns false, in which case objfun_impl() and compute_constraints_impl() are used.
+ *
+ * @param[out] f fitness vector into which x's fitness will be written.
+ * @param[out] c constraint vector into which x's constraints will be written.
+ * @param[in] x decision vector which will be evaluated.
+ *
+ * @return true if f and c have been computed, false otherwise.
+ */
+bool base::evaluate_impl(fitness_vector &f, constraint_vector &c, const decision_vector &x) const
+{
+	(void)f;
+	(void)c;
+	(void)x;
+	return false;
+}
+
+// Evaluate x with evaluate_impl(), if the problem implements it, updating the counters and both caches.
+// Return false without touching f and c otherwise.
+bool base::fused_evaluation(fitness_vector &f, constraint_vector &c, const decision_vector &x) const
+{
+	if (!evaluate_impl(f,c,x)) {
+		return false;
+	}
+	m_fevals++;
+	m_cevals++;
+	if (f.size() != m_f_dimension) {
+		pagmo_throw(value_error,"fitness dimension was changed inside evaluate_impl()");
+	}
+	if (c.size() != m_c_dimension) {
+		pagmo_throw(value_error,"constraints dimension was changed inside evaluate_impl()");
+	}
+	m_f_cache.put(x,f);
+	m_c_cache.put(x,c);
+	return true;
+}
+
 /// Compare fitness vectors.
 /**
  * Will perform sanity checks on v_f1 and v_f2 and then will call base::compare_fitness_impl().
@@ -864,7 +1002,7 @@ void base::compute_constraints_impl(constraint_vector &c, const decision_vector
 
 /// Compute constraints and write them into contraint vector.
 /**
- * This function will perform sanity checks on c and x and will then call compute_constraints_impl().
+ * This function will perform sanity checks on c and x and will then call compute_constraints_impl(), or evaluate_impl() for problems implementing it.
  *
  * The implementation internally uses a caching mechanism, so that recently-computed quantities are remembered and re-used when appropriate.
  *
@@ -881,38 +1019,20 @@ void base::compute_constraints(constraint_vector &c, const decision_vector &x) c
 		return;
 	}
 	// Look into the cache.
-	typedef decision_vector_cache_type::iterator x_iterator;
-	typedef constraint_vector_cache_type::iterator c_iterator;
-	const x_iterator x_it = std::find(m_decision_vector_cache_c.begin(),m_decision_vector_cache_c.end(),x);
-	if (x_it == m_decision_vector_cache_c.end()) {
-		// Constraint vector is not into memory. Calculate it.
+	if (!m_c_cache.get(x,c)) {
+		// Constraint vector is not into memory. Calculate it, together with the fitness if the problem can.
+		fitness_vector f(m_f_dimension);
+		if (fused_evaluation(f,c,x)) {
+			return;
+		}
 		compute_constraints_impl(c,x);
 		m_cevals++;
 		// Make sure c was not fucked up in the implementation of constraints calculation.
 		if (c.size() != get_c_dimension()) {
 			pagmo_throw(value_error,"constraints dimension was changed inside compute_constraints_impl()");
 		}
-		// Store the decision vector and the newly-calculated constraint vector in the front of the buffers.
-		m_decision_vector_cache_c.push_front(x);
-		m_constraint_vector_cache.push_front(c);
-	} else {
-		// Compute the corresponding iterator in the constraint vector cache.
-		c_iterator c_it = m_constraint_vector_cache.begin();
-		std::advance(c_it,std::distance(m_decision_vector_cache_c.begin(),x_it));
-		pagmo_assert(c_it != m_constraint_vector_cache.end());
-		// Assign to the fitness vector the value in the cache.
-		c = *c_it;
-		// Move the content of the current positions to the front of the buffers, and shift everything else down
-		// by one position.
-		x_iterator tmp_x_it = m_decision_vector_cache_c.begin();
-		c_iterator tmp_c_it = m_constraint_vector_cache.begin();
-		while (x_it != tmp_x_it) {
-			x_it->swap(*tmp_x_it);
-			c_it->swap(*tmp_c_it);
-			++tmp_x_it;
-			++tmp_c_it;
-		}
-		pagmo_assert(tmp_c_it == c_it);
+		// Store the decision vector and the newly-calculated constraint vector in the cache.
+		m_c_cache.put(x,c);
 	}
 }
 
@@ -936,6 +1056,60 @@ constraint_vector base::compute_constraints(const decision_vector &x) const
 	return c;
 }
 
+/// Compute the constraints of several decision vectors.
+/**
+ * Will call compute_constraints_batch_impl() once for the whole set of decision vectors. The constraints evaluation
+ * counter is increased by the number of decision vectors. Contrary to compute_constraints(), the caches are neither
+ * looked into nor updated.
+ *
+ * @param[out] c constraint vectors into which the constraints of x will be written. It will be resized to the size of x.
+ * @param[in] x decision vectors whose constraints will be computed.
+ *
+ * @throws value_error if the dimension of any decision vector is different from the dimension of the problem, or if
+ * compute_constraints_batch_impl() changed the number or the dimension of the constraint vectors.
+ */
+void base::compute_constraints_batch(std::vector<constraint_vector> &c, const std::vector<decision_vector> &x) const
+{
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		if (x[i].size() != get_dimension()) {
+			pagmo_throw(value_error,"invalid decision vector size during constraint testing");
+		}
+	}
+	c.resize(x.size());
+	for (std::vector<constraint_vector>::size_type i = 0; i < c.size(); ++i) {
+		c[i].resize(m_c_dimension);
+	}
+	// Do not do anything if constraints size is 0.
+	if (!m_c_dimension || x.empty()) {
+		return;
+	}
+	compute_constraints_batch_impl(c,x);
+	m_cevals += boost::numeric_cast<unsigned int>(x.size());
+	if (c.size() != x.size()) {
+		pagmo_throw(value_error,"number of constraint vectors was changed inside compute_constraints_batch_impl()");
+	}
+	for (std::vector<constraint_vector>::size_type i = 0; i < c.size(); ++i) {
+		if (c[i].size() != m_c_dimension) {
+			pagmo_throw(value_error,"constraints dimension was changed inside compute_constraints_batch_impl()");
+		}
+	}
+}
+
+/// Batch implementation of constraint computation.
+/**
+ * Writes to c the constraint vectors of the decision vectors in x. c has already been sized by compute_constraints_batch().
+ * The default implementation calls compute_constraints_impl() on each decision vector.
+ *
+ * @param[out] c constraint vectors into which the constraints of x will be written.
+ * @param[in] x decision vectors whose constraints will be computed.
+ */
+void base::compute_constraints_batch_impl(std::vector<constraint_vector> &c, const std::vector<decision_vector> &x) const
+{
+	for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+		compute_constraints_impl(c[i],x[i]);
+	}
+}
+
 /// Test feasibility of decision vector.
 /**
  * This method will compute the constraint vector associated to x and test it with feasibility_c().
@@ -1403,6 +1577,19 @@ void base::post_evolution(population &pop) const
 	(void)pop;
 }
 
+/// Thread safety.
+/**
+ * Tells whether copies of the problem can be evaluated concurrently by threads other than the one which created the problem.
+ * Default implementation will return true. Problems implemented in an interpreted language (e.g., the problems implemented
+ * in Python) must return false, and problems wrapping other problems must forward the answer of the wrapped problem.
+ *
+ * @return true if the problem can be evaluated from any thread, false otherwise.
+ */
+bool base::is_thread_safe() const
+{
+	return true;
+}
+
 /// Reset internal caches.
 /**
  * This method will reset the internal caches used when (re)evaluating decision vectors for fitnesses and/or constraints.
@@ -1412,10 +1599,58 @@ void base::post_evolution(population &pop) const
  */
 void base::reset_caches() const
 {
-	m_decision_vector_cache_f = decision_vector_cache_type(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity));
-	m_fitness_vector_cache = fitness_vector_cache_type(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity));
-	m_decision_vector_cache_c = decision_vector_cache_type(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity));
-	m_constraint_vector_cache = constraint_vector_cache_type(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity));
+	m_f_cache.clear();
+	m_c_cache.clear();
+}
+
+/// Get the capacity of the caches.
+/**
+ * @return maximum number of entries of the fitness cache and of the constraint cache.
+ */
+std::size_t base::get_cache_capacity() const
+{
+	return m_f_cache.get_capacity();
+}
+
+/// Set the capacity of the caches.
+/**
+ * Sets the maximum number of entries of the fitness cache and of the constraint cache. If the caches hold more entries,
+ * the least recently used ones are evicted. A capacity of zero disables caching: every call to objfun() and compute_constraints()
+ * will then evaluate the problem.
+ *
+ * @param[in] n new capacity of the caches.
+ */
+void base::set_cache_capacity(std::size_t n)
+{
+	m_f_cache.set_capacity(n);
+	m_c_cache.set_capacity(n);
+}
+
+/// Get the number of cache hits.
+/**
+ * @return number of calls to objfun() and compute_constraints() answered by the caches.
+ */
+std::size_t base::get_cache_hits() const
+{
+	return m_f_cache.get_hits() + m_c_cache.get_hits();
+}
+
+/// Get the number of cache misses.
+/**
+ * @return number of calls to objfun() and compute_constraints() not answered by the caches.
+ */
+std::size_t base::get_cache_misses() const
+{
+	return m_f_cache.get_misses() + m_c_cache.get_misses();
+}
+
+/// Get the number of cache evictions.
+/**
+ * @return number of entries evicted from the caches to make room for new ones.
+ */
+std::size_t base::get_cache_evictions() const
+{
+	return m_f_cache.get_evictions() + m_c_cache.get_evictions();
 }
 
 }} //namespaces
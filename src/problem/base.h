@@ -44,6 +44,7 @@
 #include "../exceptions.h"
 #include "../serialization.h"
 #include "../types.h"
+#include "evaluation_cache.h"
 //#include "base_meta.h"
 
 namespace pagmo
@@ -109,13 +110,19 @@ typedef boost::shared_ptr<base> base_ptr;
  * - compute_constraints_impl(), to calculate the constraint vector associated to a decision vector,
  * - compare_constraints_impl(), to compare two constraint vectors,
  * - compare_fc_impl(), to perform a simultaneous fitness/constraint vector pairs comparison.
+ * - objfun_batch_impl() and compute_constraints_batch_impl(), to evaluate many decision vectors at once.
+ * - evaluate_impl(), to compute the fitness and the constraint vectors of a decision vector together, when they are the outcome of the same computation.
  *
  * Please note that while a problem is intended to provide methods for ranking decision and constraint vectors, such methods are not to be used
  * mandatorily by an algorithm: each algorithm can decide to use its own ranking schemes during an optimisation. The ranking methods provided
  * by the problem are always used instead during the migration of decision vectors from one island to the other.
  *
  * \section Caching
- * A caching mechanism is implemented to make sure the objective function is never evaluated twice on the very same chromosome
+ * A caching mechanism is implemented to avoid evaluating the objective function and the constraints twice on the very same chromosome.
+ * The fitness and constraint vectors of the most recently evaluated chromosomes are kept in two LRU caches (see problem::evaluation_cache),
+ * holding cache_capacity entries each by default. The capacity can be changed with set_cache_capacity(), and a capacity of zero disables caching,
+ * which is convenient for problems cheaper to evaluate than to look up. Problems implementing evaluate_impl() fill both caches with a single
+ * evaluation, so that computing the constraints right after the fitness (or vice versa) does not evaluate the decision vector again.
  *
  * \section Serialization
  * The problem classes are serialized for the purpose of transmitting their corresponding objects over a distributed environment, as being part of the population class.
@@ -149,12 +156,8 @@ class __PAGMO_VISIBLE base
 {
 		// Meta problems need to be able to access protected virtual functions
 		friend class base_meta;
-		// Underlying containers used for caching decision and fitness vectors.
-		typedef boost::circular_buffer<decision_vector> decision_vector_cache_type;
-		typedef boost::circular_buffer<fitness_vector> fitness_vector_cache_type;
-		typedef boost::circular_buffer<constraint_vector> constraint_vector_cache_type;
 	public:
-		/// Capacity of the internal caches.
+		/// Default capacity of the internal caches.
 		static const std::size_t cache_capacity = 5;
 		/// Problem's size type: the same as pagmo::decision_vector's size type.
 		typedef decision_vector::size_type size_type;
@@ -187,10 +190,8 @@ class __PAGMO_VISIBLE base
 			m_i_dimension(boost::numeric_cast<size_type>(ni)),m_f_dimension(boost::numeric_cast<f_size_type>(nf)),
 			m_c_dimension(boost::numeric_cast<c_size_type>(nc)),m_ic_dimension(boost::numeric_cast<c_size_type>(nic)),
 			m_c_tol(nc,c_tol),
-			m_decision_vector_cache_f(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-			m_fitness_vector_cache(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity)),
-			m_decision_vector_cache_c(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-			m_constraint_vector_cache(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity))
+			m_f_cache(cache_capacity),
+			m_c_cache(cache_capacity)
 		{
 			if (c_tol < 0) {
 				pagmo_throw(value_error,"constraints tolerance must be non-negative");
@@ -236,10 +237,8 @@ class __PAGMO_VISIBLE base
 			m_i_dimension(boost::numeric_cast<size_type>(ni)),m_f_dimension(boost::numeric_cast<f_size_type>(nf)),
 			m_c_dimension(boost::numeric_cast<c_size_type>(nc)),m_ic_dimension(boost::numeric_cast<c_size_type>(nic)),
 			m_c_tol(nc,c_tol),
-			m_decision_vector_cache_f(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-			m_fitness_vector_cache(boost::numeric_cast<fitness_vector_cache_type::size_type>(cache_capacity)),
-			m_decision_vector_cache_c(boost::numeric_cast<decision_vector_cache_type::size_type>(cache_capacity)),
-			m_constraint_vector_cache(boost::numeric_cast<constraint_vector_cache_type::size_type>(cache_capacity))
+			m_f_cache(cache_capacity),
+			m_c_cache(cache_capacity)
 		{
 			if (c_tol < 0) {
 				pagmo_throw(value_error,"constraints tolerance must be non-negative");
@@ -414,6 +413,7 @@ class __PAGMO_VISIBLE base
 		//@}
 		constraint_vector compute_constraints(const decision_vector &) const;
 		void compute_constraints(constraint_vector &, const decision_vector &) const;
+		void compute_constraints_batch(std::vector<constraint_vector> &, const std::vector<decision_vector> &) const;
 		bool compare_constraints(const constraint_vector &, const constraint_vector &) const;
 		bool test_constraint(const constraint_vector &, const c_size_type &) const;
 		bool feasibility_x(const decision_vector &) const;
@@ -439,9 +439,12 @@ return base_ptr(new derived_problem(*this));
 		bool compare_fc(const fitness_vector &, const constraint_vector &, const fitness_vector &, const constraint_vector &) const;
 		virtual void pre_evolution(population &) const;
 		virtual void post_evolution(population &) const;
+		virtual bool is_thread_safe() const;
+		void add_evals(unsigned int, unsigned int) const;
 	protected:
 		virtual bool equality_operator_extra(const base &) const;
 		virtual void compute_constraints_impl(constraint_vector &, const decision_vector &) const;
+		virtual void compute_constraints_batch_impl(std::vector<constraint_vector> &, const std::vector<decision_vector> &) const;
 		virtual bool compare_constraints_impl(const constraint_vector &, const constraint_vector &) const;
 		virtual bool compare_fc_impl(const fitness_vector &, const constraint_vector &, const fitness_vector &, const constraint_vector &) const;
 		void estimate_sparsity(const decision_vector &, int& lenG, std::vector<int>& iGfun, std::vector<int>& jGvar) const;
@@ -454,8 +457,20 @@ return base_ptr(new derived_problem(*this));
 		//@{
 		fitness_vector objfun(const decision_vector &) const;
 		void objfun(fitness_vector &, const decision_vector &) const;
+		void objfun_batch(std::vector<fitness_vector> &, const std::vector<decision_vector> &) const;
+		void evaluate_batch(std::vector<fitness_vector> &, std::vector<constraint_vector> &, const std::vector<decision_vector> &) const;
 		bool compare_fitness(const fitness_vector &, const fitness_vector &) const;
 		void reset_caches() const;
+		/** @name Caches.
+		 * Methods used to configure and monitor the caches of fitness and constraint vectors.
+		 */
+		//@{
+		std::size_t get_cache_capacity() const;
+		void set_cache_capacity(std::size_t);
+		std::size_t get_cache_hits() const;
+		std::size_t get_cache_misses() const;
+		std::size_t get_cache_evictions() const;
+		//@}
 	public:
 		const std::vector<constraint_vector>& get_best_c(void) const;
 		const std::vector<decision_vector>& get_best_x(void) const;
@@ -472,9 +487,12 @@ return base_ptr(new derived_problem(*this));
 		 * @param[in] x decision vector whose fitness will be calculated.
 		 */
 		virtual void objfun_impl(fitness_vector &f, const decision_vector &x) const = 0;
+		virtual void objfun_batch_impl(std::vector<fitness_vector> &, const std::vector<decision_vector> &) const;
+		virtual bool evaluate_impl(fitness_vector &, constraint_vector &, const decision_vector &) const;
 		//@}
 	private:
 		void normalise_bounds();
+		bool fused_evaluation(fitness_vector &, constraint_vector &, const decision_vector &) const;
 		// Construct from iterators.
 		template <class Iterator1, class Iterator2>
 		void construct_from_iterators(Iterator1 start1, Iterator1 end1, Iterator2 start2, Iterator2 end2)
@@ -500,7 +518,7 @@ return base_ptr(new derived_problem(*this));
 	private:
 		friend class boost::serialization::access;
 		template <class Archive>
-		void serialize(Archive &ar, const unsigned int)
+		void serialize(Archive &ar, const unsigned int version)
 		{
 			ar & const_cast<size_type &>(m_i_dimension);
 			ar & const_cast<f_size_type &>(m_f_dimension);
@@ -509,10 +527,19 @@ return base_ptr(new derived_problem(*this));
 			ar & m_lb;
 			ar & m_ub;
 			ar & const_cast<std::vector<double> &>(m_c_tol);
-			ar & m_decision_vector_cache_f;
-			ar & m_fitness_vector_cache;
-			ar & m_decision_vector_cache_c;
-			ar & m_constraint_vector_cache;
+			// Version 0 archives store the caches as four circular buffers (decision and fitness vectors,
+			// decision and constraint vectors): they are read and discarded, and the default caches are used.
+			if (version > 0) {
+				ar & m_f_cache;
+				ar & m_c_cache;
+			} else {
+				boost::circular_buffer<decision_vector> old_caches[4];
+				for (int i = 0; i < 4; ++i) {
+					ar & old_caches[i];
+				}
+				m_f_cache = evaluation_cache(cache_capacity);
+				m_c_cache = evaluation_cache(cache_capacity);
+			}
 			ar & m_tmp_f1;
 			ar & m_tmp_f2;
 			ar & m_tmp_c1;
@@ -539,14 +566,10 @@ return base_ptr(new derived_problem(*this));
 		decision_vector				m_ub;
 		// Tolerance for constraints analysis.
 		const std::vector<double>   m_c_tol;
-		// Decision vector cache for fitness.
-		mutable decision_vector_cache_type	m_decision_vector_cache_f;
 		// Fitness vector cache.
-		mutable fitness_vector_cache_type	m_fitness_vector_cache;
-		// Decision vector cache for constraints.
-		mutable decision_vector_cache_type	m_decision_vector_cache_c;
+		mutable evaluation_cache		m_f_cache;
 		// Constraint vector cache.
-		mutable constraint_vector_cache_type	m_constraint_vector_cache;
+		mutable evaluation_cache		m_c_cache;
 		// Temporary storage used during decision_vector comparisons.
 		mutable fitness_vector			m_tmp_f1;
 		mutable fitness_vector			m_tmp_f2;
@@ -571,4 +594,6 @@ std::ostream __PAGMO_VISIBLE_FUNC &operator<<(std::ostream &, const base &);
 
 BOOST_SERIALIZATION_ASSUME_ABSTRACT(pagmo::problem::base)
 
+BOOST_CLASS_VERSION(pagmo::problem::base,1)
+
 #endif
@@ -58,6 +58,9 @@ class __PAGMO_VISIBLE base_meta : public base
 			 }
 		/// Copy constructor
 		base_meta(const base_meta &p):base(p), m_original_problem(p.m_original_problem->clone()) {}
+		/// The meta-problem is thread safe if the original problem is.
+		bool is_thread_safe() const
+			{return m_original_problem->is_thread_safe();}
 	protected:
 		bool compare_fitness_impl(const fitness_vector &f1, const fitness_vector &f2) const 
 			{return m_original_problem->compare_fitness_impl(f1,f2);}
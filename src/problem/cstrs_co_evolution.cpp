@@ -420,6 +420,15 @@ base_ptr cstrs_co_evolution_penalty::clone() const
 	return base_ptr(new cstrs_co_evolution_penalty(*this));
 }
 
+/// Thread safety.
+/**
+ * @return true if the original problem is thread safe.
+ */
+bool cstrs_co_evolution_penalty::is_thread_safe() const
+{
+	return m_original_problem->is_thread_safe();
+}
+
 /// Implementation of the objective function.
 /// (Wraps over the original implementation)
 /**
@@ -111,6 +111,7 @@ public:
 	//copy constructor
 	cstrs_co_evolution_penalty(const cstrs_co_evolution_penalty &);
 	base_ptr clone() const;
+	bool is_thread_safe() const;
 	std::string get_name() const;
 
 	void update_penalty_coeff(population::size_type &, const decision_vector &, const population  &);
@@ -0,0 +1,228 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#include <boost/functional/hash.hpp>
+#include <cstddef>
+#include <utility>
+#include <vector>
+
+#include "../exceptions.h"
+#include "../types.h"
+#include "evaluation_cache.h"
+
+namespace pagmo { namespace problem {
+
+/// Constructor from capacity.
+/**
+ * @param[in] capacity maximum number of entries. 0 disables the cache.
+ */
+evaluation_cache::evaluation_cache(std::size_t capacity):m_capacity(capacity),m_hits(0),m_misses(0),m_evictions(0) {}
+
+/// Copy constructor.
+/**
+ * Copies the entries and the counters of other.
+ *
+ * @param[in] other cache to be copied.
+ */
+evaluation_cache::evaluation_cache(const evaluation_cache &other):m_list(other.m_list),m_capacity(other.m_capacity),
+	m_hits(other.m_hits),m_misses(other.m_misses),m_evictions(other.m_evictions)
+{
+	rebuild_index();
+}
+
+/// Assignment operator.
+/**
+ * @param[in] other cache to be copied.
+ *
+ * @return reference to this.
+ */
+evaluation_cache &evaluation_cache::operator=(const evaluation_cache &other)
+{
+	if (this != &other) {
+		m_list = other.m_list;
+		m_capacity = other.m_capacity;
+		m_hits = other.m_hits;
+		m_misses = other.m_misses;
+		m_evictions = other.m_evictions;
+		rebuild_index();
+	}
+	return *this;
+}
+
+/// Look up a decision vector.
+/**
+ * If x is in the cache, its vector is copied into v and x becomes the most recently used entry.
+ *
+ * @param[in] x decision vector to be looked up.
+ * @param[out] v vector into which the stored vector of x will be copied.
+ *
+ * @return true if x was found in the cache, false otherwise.
+ */
+bool evaluation_cache::get(const decision_vector &x, std::vector<double> &v)
+{
+	if (!m_capacity) {
+		return false;
+	}
+	const std::pair<index_type::iterator,index_type::iterator> r = m_index.equal_range(boost::hash_range(x.begin(),x.end()));
+	for (index_type::iterator it = r.first; it != r.second; ++it) {
+		if (it->second->x == x) {
+			// Move the entry to the front of the list. The iterators stay valid.
+			m_list.splice(m_list.begin(),m_list,it->second);
+			v = it->second->v;
+			++m_hits;
+			return true;
+		}
+	}
+	++m_misses;
+	return false;
+}
+
+/// Store the vector of a decision vector.
+/**
+ * x becomes the most recently used entry. If x was already in the cache its vector is replaced, otherwise
+ * the least recently used entry is evicted if the cache is full.
+ *
+ * @param[in] x decision vector.
+ * @param[in] v vector to be associated to x.
+ */
+void evaluation_cache::put(const decision_vector &x, const std::vector<double> &v)
+{
+	if (!m_capacity) {
+		return;
+	}
+	const std::size_t hash = boost::hash_range(x.begin(),x.end());
+	const std::pair<index_type::iterator,index_type::iterator> r = m_index.equal_range(hash);
+	for (index_type::iterator it = r.first; it != r.second; ++it) {
+		if (it->second->x == x) {
+			m_list.splice(m_list.begin(),m_list,it->second);
+			it->second->v = v;
+			return;
+		}
+	}
+	if (m_list.size() >= m_capacity) {
+		evict();
+	}
+	m_list.push_front(entry());
+	m_list.front().x = x;
+	m_list.front().v = v;
+	m_list.front().hash = hash;
+	m_index.insert(std::make_pair(hash,m_list.begin()));
+}
+
+/// Remove all the entries.
+/**
+ * The capacity and the counters are left untouched.
+ */
+void evaluation_cache::clear()
+{
+	m_index.clear();
+	m_list.clear();
+}
+
+/// Number of entries.
+/**
+ * @return number of entries currently stored.
+ */
+std::size_t evaluation_cache::size() const
+{
+	return m_list.size();
+}
+
+/// Get capacity.
+/**
+ * @return maximum number of entries.
+ */
+std::size_t evaluation_cache::get_capacity() const
+{
+	return m_capacity;
+}
+
+/// Set capacity.
+/**
+ * If the cache holds more than capacity entries, the least recently used ones are evicted.
+ *
+ * @param[in] capacity maximum number of entries. 0 disables the cache.
+ */
+void evaluation_cache::set_capacity(std::size_t capacity)
+{
+	m_capacity = capacity;
+	while (m_list.size() > m_capacity) {
+		evict();
+	}
+}
+
+/// Number of hits.
+/**
+ * @return number of lookups that found the decision vector.
+ */
+std::size_t evaluation_cache::get_hits() const
+{
+	return m_hits;
+}
+
+/// Number of misses.
+/**
+ * @return number of lookups that did not find the decision vector.
+ */
+std::size_t evaluation_cache::get_misses() const
+{
+	return m_misses;
+}
+
+/// Number of evictions.
+/**
+ * @return number of entries removed to make room for new ones.
+ */
+std::size_t evaluation_cache::get_evictions() const
+{
+	return m_evictions;
+}
+
+// Remove the least recently used entry.
+void evaluation_cache::evict()
+{
+	pagmo_assert(!m_list.empty());
+	list_type::iterator last = m_list.end();
+	--last;
+	const std::pair<index_type::iterator,index_type::iterator> r = m_index.equal_range(last->hash);
+	for (index_type::iterator it = r.first; it != r.second; ++it) {
+		if (it->second == last) {
+			m_index.erase(it);
+			break;
+		}
+	}
+	m_list.erase(last);
+	++m_evictions;
+}
+
+// Rebuild the index after the list has been copied.
+void evaluation_cache::rebuild_index()
+{
+	m_index.clear();
+	for (list_type::iterator it = m_list.begin(); it != m_list.end(); ++it) {
+		m_index.insert(std::make_pair(it->hash,it));
+	}
+}
+
+}}
@@ -0,0 +1,107 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#ifndef PAGMO_PROBLEM_EVALUATION_CACHE_H
+#define PAGMO_PROBLEM_EVALUATION_CACHE_H
+
+#include <boost/unordered_map.hpp>
+#include <cstddef>
+#include <list>
+#include <vector>
+
+#include "../config.h"
+#include "../serialization.h"
+#include "../types.h"
+
+namespace pagmo { namespace problem {
+
+/// LRU cache of evaluations.
+/**
+ * Stores the vectors (fitness or constraint vectors) computed for the most recently used decision vectors, up to a maximum number of entries.
+ * Entries are looked up through a hash of the decision vector, so the cost of a lookup does not depend on the number of entries. When the cache
+ * is full, inserting a new entry evicts the least recently used one. A cache with zero capacity is disabled: it never stores anything.
+ *
+ * The number of hits, misses and evictions is recorded. Lookups in a disabled cache are not counted.
+ *
+ * The entries of the cache are not serialized, only its capacity and its counters are.
+ *
+ * @see problem::base::set_cache_capacity().
+ */
+class __PAGMO_VISIBLE evaluation_cache
+{
+		struct entry
+		{
+			decision_vector		x;
+			std::vector<double>	v;
+			std::size_t		hash;
+		};
+		typedef std::list<entry> list_type;
+		typedef boost::unordered_multimap<std::size_t,list_type::iterator> index_type;
+	public:
+		explicit evaluation_cache(std::size_t = 5);
+		evaluation_cache(const evaluation_cache &);
+		evaluation_cache &operator=(const evaluation_cache &);
+		bool get(const decision_vector &, std::vector<double> &);
+		void put(const decision_vector &, const std::vector<double> &);
+		void clear();
+		std::size_t size() const;
+		std::size_t get_capacity() const;
+		void set_capacity(std::size_t);
+		std::size_t get_hits() const;
+		std::size_t get_misses() const;
+		std::size_t get_evictions() const;
+	private:
+		void evict();
+		void rebuild_index();
+		friend class boost::serialization::access;
+		template <class Archive>
+		void serialize(Archive &ar, const unsigned int version)
+		{
+			ar & m_capacity;
+			ar & m_hits;
+			ar & m_misses;
+			ar & m_evictions;
+			boost::serialization::split_member(ar, *this, version);
+		}
+		template <class Archive>
+		void save(Archive &, const unsigned int) const
+		{}
+		template <class Archive>
+		void load(Archive &, const unsigned int)
+		{
+			clear();
+		}
+		// Entries, from the most to the least recently used.
+		list_type	m_list;
+		// Hash of the decision vector -> entry.
+		index_type	m_index;
+		std::size_t	m_capacity;
+		std::size_t	m_hits;
+		std::size_t	m_misses;
+		std::size_t	m_evictions;
+};
+
+}}
+
+#endif
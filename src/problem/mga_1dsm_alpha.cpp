@@ -32,6 +32,7 @@
 #include <keplerian_toolbox/lambert_problem.h>
 
 #include "mga_1dsm_alpha.h"
+#include "trajectory_cache.h"
 
 
 namespace pagmo { namespace problem {
@@ -142,7 +143,7 @@ try {
 	std::vector<double> DV(m_n_legs + 1);
 	for (size_t i = 0; i<(m_n_legs + 1); ++i) {
 		t_P[i] = kep_toolbox::epoch(x[0] + std::accumulate(T.begin(), T.begin()+i, 0.0));
-		m_seq[i]->eph(t_P[i], r_P[i], v_P[i]);
+		trajectory_cache::ephemerides(*m_seq[i],t_P[i],r_P[i],v_P[i]);
 	}
 
 	// 3 - We start with the first leg
@@ -157,9 +158,8 @@ try {
 
 	// Lambert arc to reach seq[1]
 	double dt = (1-x[5])*T[0]*ASTRO_DAY2SEC;
-	kep_toolbox::lambert_problem l(r,r_P[1],dt,common_mu);
-	kep_toolbox::array3D v_end_l = l.get_v2()[0];
-	kep_toolbox::array3D v_beg_l = l.get_v1()[0];
+	kep_toolbox::array3D v_beg_l, v_end_l;
+	trajectory_cache::lambert(r,r_P[1],dt,common_mu,false,v_beg_l,v_end_l);
 
 	// First DSM occuring at time nu1*T1
 	kep_toolbox::diff(v, v_beg_l, v);
@@ -177,9 +177,7 @@ try {
 
 		// Lambert arc to reach Earth during (1-nu2)*T2 (second segment)
 		dt = (1-x[9+(i-1)*4])*T[i]*ASTRO_DAY2SEC;
-		kep_toolbox::lambert_problem l2(r,r_P[i+1],dt,common_mu);
-	  	v_end_l = l2.get_v2()[0];
-		v_beg_l = l2.get_v1()[0];
+		trajectory_cache::lambert(r,r_P[i+1],dt,common_mu,false,v_beg_l,v_end_l);
 
 		// DSM occuring at time nu2*T2
 		kep_toolbox::diff(v, v_beg_l, v);
@@ -33,6 +33,7 @@
 #include <keplerian_toolbox/lambert_problem.h>
 
 #include "mga_incipit.h"
+#include "trajectory_cache.h"
 
 
 namespace pagmo { namespace problem {
@@ -136,7 +137,7 @@ try {
 	std::vector<double> DV(m_seq.size());
 	for (size_t i = 0; i<r_P.size(); ++i) {
 		t_P[i] = kep_toolbox::epoch(x[0] + std::accumulate(T.begin(),T.begin()+1+i,0.0));
-		m_seq[i]->eph(t_P[i], r_P[i], v_P[i]);
+		trajectory_cache::ephemerides(*m_seq[i],t_P[i],r_P[i],v_P[i]);
 	}
 
 	// 3 - We start with the first leg
@@ -145,9 +146,8 @@ try {
 	double d,d2,ra,ra2;
 	kep_toolbox::array3D r = { {ASTRO_JR*1000*cos(phi)*sin(theta), ASTRO_JR*1000*cos(phi)*cos(theta), ASTRO_JR*1000*sin(phi)} };
 	kep_toolbox::array3D v;
-	kep_toolbox::lambert_problem l(r,r_P[0],T[0]*ASTRO_DAY2SEC,common_mu,false,false);
-	kep_toolbox::array3D v_beg_l = l.get_v1()[0];
-	kep_toolbox::array3D v_end_l = l.get_v2()[0];
+	kep_toolbox::array3D v_beg_l, v_end_l;
+	trajectory_cache::lambert(r,r_P[0],T[0]*ASTRO_DAY2SEC,common_mu,false,v_beg_l,v_end_l);
 
 	DV[0] = std::abs(kep_toolbox::norm(v_beg_l)-3400.0);
 	
@@ -164,9 +164,7 @@ try {
 
 		// Lambert arc to reach Earth during (1-nu2)*T2 (second segment)
 		double dt = (1-x[4*i+2])*T[i]*ASTRO_DAY2SEC;
-		kep_toolbox::lambert_problem l2(r,r_P[i],dt,common_mu,false,false);
-		v_end_l = l2.get_v2()[0];
-		v_beg_l = l2.get_v1()[0];
+		trajectory_cache::lambert(r,r_P[i],dt,common_mu,false,v_beg_l,v_end_l);
 		kep_toolbox::closest_distance(d2,ra2,r,v_beg_l, r_P[i], v_end_l, common_mu);
 		if (d < d2)
 		{
@@ -33,6 +33,7 @@
 #include <keplerian_toolbox/lambert_problem.h>
 
 #include "mga_part.h"
+#include "trajectory_cache.h"
 
 
 #define ASTRO_JR 71492000.0 //m
@@ -140,7 +141,7 @@ try {
 	std::vector<double> DV(m_seq.size() - 1);
 	for (size_t i = 0; i<m_seq.size(); ++i) {
 		t_P[i] = kep_toolbox::epoch(m_t0.mjd2000() + std::accumulate(T.begin(),T.begin()+i,0.0));
-		m_seq[i]->eph(t_P[i], r_P[i], v_P[i]);
+		trajectory_cache::ephemerides(*m_seq[i],t_P[i],r_P[i],v_P[i]);
 	}
 
 	// 3 - We loop over the legs
@@ -159,9 +160,7 @@ try {
 		
 		// Lambert arc to reach Earth during (1-nu2)*T2 (second segment)
 		double dt = (1-x[4*i+2])*T[i]*ASTRO_DAY2SEC;
-		kep_toolbox::lambert_problem l2(r,r_P[i+1],dt,common_mu,false,false);
-		v_end_l = l2.get_v2()[0];
-		v_beg_l = l2.get_v1()[0];
+		trajectory_cache::lambert(r,r_P[i+1],dt,common_mu,false,v_beg_l,v_end_l);
 		kep_toolbox::closest_distance(d2,ra2,r,v_beg_l, r_P[i+1], v_end_l, common_mu);
 		
 		if (d < d2)
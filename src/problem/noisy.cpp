@@ -91,6 +91,15 @@ base_ptr noisy::clone() const
 	return base_ptr(new noisy(*this));
 }
 
+/// Thread safety.
+/**
+ * @return true if the original problem is thread safe.
+ */
+bool noisy::is_thread_safe() const
+{
+	return m_original_problem->is_thread_safe();
+}
+
 /**
  * Configure parameters for the noise distribution
  * 
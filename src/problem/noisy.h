@@ -72,6 +72,7 @@ class __PAGMO_VISIBLE noisy : public base_stochastic
 		//copy constructor
 		noisy(const noisy &);
 		base_ptr clone() const;
+		bool is_thread_safe() const;
 		std::string get_name() const;
 
 		void set_noise_param(double, double);
@@ -79,6 +79,15 @@ base_ptr robust::clone() const
 	return base_ptr(new robust(*this));
 }
 
+/// Thread safety.
+/**
+ * @return true if the original problem is thread safe.
+ */
+bool robust::is_thread_safe() const
+{
+	return m_original_problem->is_thread_safe();
+}
+
 /**
  * Configure parameter to control the noise
  *
@@ -61,6 +61,7 @@ class __PAGMO_VISIBLE robust : public base_stochastic
 		//copy constructor
 		robust(const robust &);
 		base_ptr clone() const;
+		bool is_thread_safe() const;
 		std::string get_name() const;
 
 		void set_rho(double);
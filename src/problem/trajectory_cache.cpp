@@ -0,0 +1,600 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#include <algorithm>
+#include <boost/array.hpp>
+#include <boost/functional/hash.hpp>
+#include <boost/thread/locks.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/unordered_map.hpp>
+#include <cmath>
+#include <cstddef>
+#include <cstring>
+#include <limits>
+#include <string>
+#include <utility>
+
+#include "../AstroToolbox/Lambert.h"
+#include "../AstroToolbox/Pl_Eph_An.h"
+#include "../exceptions.h"
+#include "trajectory_cache.h"
+
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+#include <keplerian_toolbox/lambert_problem.h>
+#endif
+
+namespace pagmo { namespace problem {
+
+namespace {
+
+// Number of independently locked stripes of each table.
+const std::size_t n_stripes = 16;
+
+// Gravitational parameter of the Sun used by Planet_Ephemerides_Analytical() [km^3/s^2].
+const double mu_sun = 1.32712428e11;
+
+// Hash table split in stripes, each with its own lock and counters.
+template <class Key, class Value, class Hash = boost::hash<Key> >
+class striped_table
+{
+		struct stripe
+		{
+			stripe():hits(0),misses(0) {}
+			boost::mutex					mutex;
+			boost::unordered_map<Key,Value,Hash>		map;
+			std::size_t					hits;
+			std::size_t					misses;
+		};
+		typedef boost::lock_guard<boost::mutex> lock_type;
+	public:
+		striped_table():m_stripe_capacity(0) {}
+		bool get(const Key &k, Value &v)
+		{
+			stripe &s = m_stripes[Hash()(k) % n_stripes];
+			lock_type lock(s.mutex);
+			const typename boost::unordered_map<Key,Value,Hash>::const_iterator it = s.map.find(k);
+			if (it == s.map.end()) {
+				++s.misses;
+				return false;
+			}
+			++s.hits;
+			v = it->second;
+			return true;
+		}
+		void put(const Key &k, const Value &v)
+		{
+			stripe &s = m_stripes[Hash()(k) % n_stripes];
+			lock_type lock(s.mutex);
+			if (s.map.size() >= m_stripe_capacity) {
+				s.map.clear();
+			}
+			s.map[k] = v;
+		}
+		void set_capacity(std::size_t capacity)
+		{
+			m_stripe_capacity = capacity / n_stripes + (capacity % n_stripes != 0);
+			clear();
+		}
+		void clear()
+		{
+			for (std::size_t i = 0; i < n_stripes; ++i) {
+				lock_type lock(m_stripes[i].mutex);
+				m_stripes[i].map.clear();
+				m_stripes[i].hits = 0;
+				m_stripes[i].misses = 0;
+			}
+		}
+		std::size_t size()
+		{
+			std::size_t retval = 0;
+			for (std::size_t i = 0; i < n_stripes; ++i) {
+				lock_type lock(m_stripes[i].mutex);
+				retval += m_stripes[i].map.size();
+			}
+			return retval;
+		}
+		std::size_t hits()
+		{
+			std::size_t retval = 0;
+			for (std::size_t i = 0; i < n_stripes; ++i) {
+				lock_type lock(m_stripes[i].mutex);
+				retval += m_stripes[i].hits;
+			}
+			return retval;
+		}
+		std::size_t misses()
+		{
+			std::size_t retval = 0;
+			for (std::size_t i = 0; i < n_stripes; ++i) {
+				lock_type lock(m_stripes[i].mutex);
+				retval += m_stripes[i].misses;
+			}
+			return retval;
+		}
+	private:
+		stripe		m_stripes[n_stripes];
+		std::size_t	m_stripe_capacity;
+};
+
+// Position and velocity of a planet at a node of the grid of epochs.
+struct state
+{
+	double r[3];
+	double v[3];
+};
+
+// Solution of Lambert's problem, as returned by LambertI().
+struct lambert_solution
+{
+	double	v1[3];
+	double	v2[3];
+	double	a;
+	double	p;
+	double	theta;
+	int	iter;
+};
+
+// Direction of motion, rounded boundary positions and time of flight, bits of the gravitational parameter.
+typedef boost::array<long long,9> lambert_key;
+
+struct lambert_key_hash
+{
+	std::size_t operator()(const lambert_key &k) const
+	{
+		return boost::hash_range(k.begin(),k.end());
+	}
+};
+
+// The ephemerides nodes are identified by the planet and the index of the node in the grid.
+striped_table<std::pair<int,long long>,state> ephemerides_table;
+striped_table<lambert_key,lambert_solution,lambert_key_hash> lambert_table;
+double tolerance = 0.;
+std::size_t capacity = 0;
+// Step of the grid of epochs of each planet [days].
+double steps[10];
+
+// Position and velocity of planet at the node n of its grid.
+void get_node(const int &planet, const long long &n, state &s)
+{
+	const std::pair<int,long long> key(planet,n);
+	if (!ephemerides_table.get(key,s)) {
+		Planet_Ephemerides_Analytical(n * steps[planet],planet,s.r,s.v);
+		ephemerides_table.put(key,s);
+	}
+}
+
+// Step of the grid of epochs [s] for a body at position r and velocity v on a Keplerian orbit around mu, with tolerance tol
+// (consistent units), zero if the orbit is not elliptic. The step is the largest for which the error bound of cubic Lagrange
+// interpolation, 3 h^4 / 128 times the maximum of the fourth derivative of the position, is below the tolerance. The fourth
+// derivative is bounded by that of the Keplerian motion at perihelion.
+double grid_step(const double *r, const double *v, const double &mu, const double &tol)
+{
+	// Perihelion radius and eccentricity of the osculating orbit.
+	const double norm_r = std::sqrt(r[0] * r[0] + r[1] * r[1] + r[2] * r[2]);
+	const double v2 = v[0] * v[0] + v[1] * v[1] + v[2] * v[2];
+	const double h[3] = {r[1] * v[2] - r[2] * v[1], r[2] * v[0] - r[0] * v[2], r[0] * v[1] - r[1] * v[0]};
+	const double a = 1. / (2. / norm_r - v2 / mu);
+	if (!(a > 0) || a > std::numeric_limits<double>::max()) {
+		return 0.;
+	}
+	const double e = std::sqrt(std::max(0.,1. - (h[0] * h[0] + h[1] * h[1] + h[2] * h[2]) / (mu * a)));
+	const double r_p = a * (1. - e);
+	// Acceleration times the square of the angular velocity at perihelion, with a safety factor.
+	const double d4 = 3. * mu / (r_p * r_p) * mu * (1. + e) / (r_p * r_p * r_p);
+	return std::pow(128. * tol / (3. * d4),.25);
+}
+
+// Cubic Lagrange interpolation of the state at t (in steps of the grid) on the nodes n - 1, n, n + 1 and n + 2, with n = floor(t).
+void interpolate(const double &t, const state *s, double *r, double *v)
+{
+	const double x = t - std::floor(t);
+	const double w[4] = {-x * (x - 1) * (x - 2) / 6, (x + 1) * (x - 1) * (x - 2) / 2, -(x + 1) * x * (x - 2) / 2, (x + 1) * x * (x - 1) / 6};
+	for (int i = 0; i < 3; ++i) {
+		r[i] = w[0] * s[0].r[i] + w[1] * s[1].r[i] + w[2] * s[2].r[i] + w[3] * s[3].r[i];
+		v[i] = w[0] * s[0].v[i] + w[1] * s[1].v[i] + w[2] * s[2].v[i] + w[3] * s[3].v[i];
+	}
+}
+
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+
+// A keplerian_toolbox planet is identified by its name and physical parameters.
+struct kep_planet_key
+{
+	bool operator==(const kep_planet_key &other) const
+	{
+		return name == other.name && mu_central_body == other.mu_central_body && mu_self == other.mu_self && radius == other.radius;
+	}
+	std::string	name;
+	double		mu_central_body;
+	double		mu_self;
+	double		radius;
+};
+
+struct kep_planet_key_hash
+{
+	std::size_t operator()(const kep_planet_key &k) const
+	{
+		std::size_t seed = boost::hash<std::string>()(k.name);
+		boost::hash_combine(seed,k.mu_central_body);
+		boost::hash_combine(seed,k.mu_self);
+		boost::hash_combine(seed,k.radius);
+		return seed;
+	}
+};
+
+// Identifier of the grid of epochs of a keplerian_toolbox planet in the ephemerides table, and step of the grid [days].
+struct kep_planet_grid
+{
+	int	id;
+	double	step;
+};
+
+striped_table<kep_planet_key,kep_planet_grid,kep_planet_key_hash> kep_planets_table;
+boost::mutex kep_planets_mutex;
+// The identifiers 1 to 9 are those of the planets of the AstroToolbox.
+const int kep_planets_first_id = 16;
+int kep_planets_next_id = kep_planets_first_id;
+
+// Grid of epochs of a keplerian_toolbox planet, created on first use.
+kep_planet_grid get_grid(const kep_toolbox::planet::base &planet)
+{
+	kep_planet_key key;
+	key.name = planet.get_name();
+	key.mu_central_body = planet.get_mu_central_body();
+	key.mu_self = planet.get_mu_self();
+	key.radius = planet.get_radius();
+	kep_planet_grid grid;
+	if (!kep_planets_table.get(key,grid)) {
+		kep_toolbox::array3D r, v;
+		planet.eph(kep_toolbox::epoch(0.),r,v);
+		// Tolerance in m, step in days.
+		grid.step = grid_step(&r[0],&v[0],key.mu_central_body,tolerance * 1000.) / 86400.;
+		{
+			boost::lock_guard<boost::mutex> lock(kep_planets_mutex);
+			grid.id = kep_planets_next_id++;
+		}
+		kep_planets_table.put(key,grid);
+	}
+	return grid;
+}
+
+// Position and velocity of a keplerian_toolbox planet at the node n of its grid.
+void get_node(const kep_toolbox::planet::base &planet, const kep_planet_grid &grid, const long long &n, state &s)
+{
+	const std::pair<int,long long> key(grid.id,n);
+	if (!ephemerides_table.get(key,s)) {
+		kep_toolbox::array3D r, v;
+		planet.eph(kep_toolbox::epoch(n * grid.step),r,v);
+		std::copy(r.begin(),r.end(),s.r);
+		std::copy(v.begin(),v.end(),s.v);
+		ephemerides_table.put(key,s);
+	}
+}
+
+#endif
+
+}
+
+/// Ephemerides of a planet.
+/**
+ * Same as Planet_Ephemerides_Analytical(). When the cache is enabled, the position and the velocity are interpolated
+ * on the four nodes of the grid of epochs of the planet surrounding mjd2000. The velocities given by the analytical ephemerides
+ * are not the derivatives of the positions (the drift of the orbital elements is neglected), hence the two are interpolated separately.
+ *
+ * @param[in] mjd2000 epoch, in days since 1 January 2000.
+ * @param[in] planet planet (1 for Mercury to 9 for Pluto).
+ * @param[out] r position of the planet [km].
+ * @param[out] v velocity of the planet [km/s].
+ */
+void trajectory_cache::ephemerides(const double &mjd2000, const int &planet, double *r, double *v)
+{
+	if (tolerance <= 0 || planet < 1 || planet > 9) {
+		Planet_Ephemerides_Analytical(mjd2000,planet,r,v);
+		return;
+	}
+	const double t = mjd2000 / steps[planet];
+	const long long n = static_cast<long long>(std::floor(t));
+	state s[4];
+	for (int j = 0; j < 4; ++j) {
+		get_node(planet,n + j - 1,s[j]);
+	}
+	interpolate(t,s,r,v);
+}
+
+/// Solution of Lambert's problem.
+/**
+ * Same as LambertI(). When the cache is enabled, the solution is looked up with a key obtained by rounding r1 and r2 to multiples
+ * of the tolerance, and t to multiples of the time needed to cover the tolerance at the circular speed at r1. On a miss, the problem
+ * is solved and its solution stored.
+ *
+ * @param[in] r1 initial position [km].
+ * @param[in] r2 final position [km].
+ * @param[in] t time of flight [s].
+ * @param[in] mu gravitational parameter [km^3/s^2].
+ * @param[in] lw direction of motion (0 for counterclockwise, 1 for clockwise).
+ * @param[out] v1 initial velocity [km/s].
+ * @param[out] v2 final velocity [km/s].
+ * @param[out] a semi-major axis of the transfer orbit.
+ * @param[out] p parameter of the transfer orbit.
+ * @param[out] theta transfer angle.
+ * @param[out] iter number of iterations of the solver.
+ */
+void trajectory_cache::lambert(const double *r1, const double *r2, const double &t, const double &mu, const int &lw,
+	double *v1, double *v2, double &a, double &p, double &theta, int &iter)
+{
+	if (tolerance <= 0) {
+		LambertI(r1,r2,t,mu,lw,v1,v2,a,p,theta,iter);
+		return;
+	}
+	const double norm_r1 = std::sqrt(r1[0] * r1[0] + r1[1] * r1[1] + r1[2] * r1[2]);
+	lambert_key key;
+	key[0] = lw;
+	for (int i = 0; i < 3; ++i) {
+		key[i + 1] = static_cast<long long>(std::floor(r1[i] / tolerance + .5));
+		key[i + 4] = static_cast<long long>(std::floor(r2[i] / tolerance + .5));
+	}
+	key[7] = static_cast<long long>(std::floor(t * std::sqrt(mu / norm_r1) / tolerance + .5));
+	std::memcpy(&key[8],&mu,sizeof(double));
+	lambert_solution s;
+	if (!lambert_table.get(key,s)) {
+		LambertI(r1,r2,t,mu,lw,s.v1,s.v2,s.a,s.p,s.theta,s.iter);
+		lambert_table.put(key,s);
+	}
+	for (int i = 0; i < 3; ++i) {
+		v1[i] = s.v1[i];
+		v2[i] = s.v2[i];
+	}
+	a = s.a;
+	p = s.p;
+	theta = s.theta;
+	iter = s.iter;
+}
+
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+
+/// Ephemerides of a keplerian_toolbox planet.
+/**
+ * Same as planet.eph(). When the cache is enabled, the position and the velocity are interpolated on the four nodes of the grid of
+ * epochs of the planet surrounding the epoch, as for the planets of the AstroToolbox. The grid is built the first time the planet is
+ * used, from its osculating orbit around the central body at epoch zero; the ephemerides of the planets whose osculating orbit is
+ * not elliptic are not cached. Close to the ends of the validity range of the ephemerides, where the nodes cannot be computed,
+ * planet.eph() is called instead.
+ *
+ * @param[in] planet planet.
+ * @param[in] when epoch.
+ * @param[out] r position of the planet [m].
+ * @param[out] v velocity of the planet [m/s].
+ */
+void trajectory_cache::ephemerides(const kep_toolbox::planet::base &planet, const kep_toolbox::epoch &when, kep_toolbox::array3D &r,
+	kep_toolbox::array3D &v)
+{
+	if (tolerance <= 0) {
+		planet.eph(when,r,v);
+		return;
+	}
+	const kep_planet_grid grid = get_grid(planet);
+	if (grid.step <= 0) {
+		planet.eph(when,r,v);
+		return;
+	}
+	const double t = when.mjd2000() / grid.step;
+	const long long n = static_cast<long long>(std::floor(t));
+	state s[4];
+	try {
+		for (int j = 0; j < 4; ++j) {
+			get_node(planet,grid,n + j - 1,s[j]);
+		}
+	} catch (...) {
+		// A node is out of the validity range of the ephemerides: only the epoch itself might be in it.
+		planet.eph(when,r,v);
+		return;
+	}
+	interpolate(t,s,&r[0],&v[0]);
+}
+
+/// Solution of Lambert's problem, keplerian_toolbox version.
+/**
+ * Velocities of the zero-revolution solution of kep_toolbox::lambert_problem. When the cache is enabled, the solution is looked up
+ * with a key built as in the AstroToolbox version, in SI units. Entries of the two versions never collide, since the direction of
+ * motion is stored with an offset in the key. Errors of the solver are not cached.
+ *
+ * @param[in] r1 initial position [m].
+ * @param[in] r2 final position [m].
+ * @param[in] t time of flight [s].
+ * @param[in] mu gravitational parameter [m^3/s^2].
+ * @param[in] cw direction of motion (true for clockwise).
+ * @param[out] v1 initial velocity [m/s].
+ * @param[out] v2 final velocity [m/s].
+ *
+ * @throws any exception thrown by kep_toolbox::lambert_problem.
+ */
+void trajectory_cache::lambert(const kep_toolbox::array3D &r1, const kep_toolbox::array3D &r2, const double &t, const double &mu,
+	const bool &cw, kep_toolbox::array3D &v1, kep_toolbox::array3D &v2)
+{
+	if (tolerance <= 0) {
+		const kep_toolbox::lambert_problem l(r1,r2,t,mu,cw,0);
+		v1 = l.get_v1()[0];
+		v2 = l.get_v2()[0];
+		return;
+	}
+	// Tolerance in m.
+	const double tol = tolerance * 1000.;
+	const double norm_r1 = std::sqrt(r1[0] * r1[0] + r1[1] * r1[1] + r1[2] * r1[2]);
+	lambert_key key;
+	key[0] = cw + 2;
+	for (int i = 0; i < 3; ++i) {
+		key[i + 1] = static_cast<long long>(std::floor(r1[i] / tol + .5));
+		key[i + 4] = static_cast<long long>(std::floor(r2[i] / tol + .5));
+	}
+	key[7] = static_cast<long long>(std::floor(t * std::sqrt(mu / norm_r1) / tol + .5));
+	std::memcpy(&key[8],&mu,sizeof(double));
+	lambert_solution s;
+	if (!lambert_table.get(key,s)) {
+		const kep_toolbox::lambert_problem l(r1,r2,t,mu,cw,0);
+		std::copy(l.get_v1()[0].begin(),l.get_v1()[0].end(),s.v1);
+		std::copy(l.get_v2()[0].begin(),l.get_v2()[0].end(),s.v2);
+		// Only the velocities are returned by this version.
+		s.a = s.p = s.theta = 0.;
+		s.iter = 0;
+		lambert_table.put(key,s);
+	}
+	std::copy(s.v1,s.v1 + 3,v1.begin());
+	std::copy(s.v2,s.v2 + 3,v2.begin());
+}
+
+#endif
+
+/// Set the tolerance.
+/**
+ * Enables the cache with the given tolerance on the positions [km], or disables it if the tolerance is zero. The grids of
+ * epochs of the planets are rebuilt (those of the keplerian_toolbox planets on their first use) and both tables are emptied. The step of the grid of each planet is the largest for which
+ * the error bound of cubic Lagrange interpolation, 3 h^4 / 128 times the maximum of the fourth derivative of the position,
+ * is below the tolerance. The fourth derivative is bounded by that of the Keplerian motion at perihelion. The error on the
+ * velocities is then a fraction of the tolerance divided by the orbital period.
+ *
+ * Setting the tolerance also sets the capacity to 100000 entries per table, if it has not been set before.
+ *
+ * @param[in] tol tolerance [km].
+ *
+ * @throws value_error if the tolerance is negative or not finite.
+ */
+void trajectory_cache::set_tolerance(const double &tol)
+{
+	if (!(tol >= 0) || tol > std::numeric_limits<double>::max()) {
+		pagmo_throw(value_error,"the tolerance must be a non-negative finite number");
+	}
+	if (!capacity) {
+		set_capacity(100000);
+	}
+	tolerance = tol;
+	for (int planet = 1; planet <= 9 && tol > 0; ++planet) {
+		double r[3], v[3];
+		Planet_Ephemerides_Analytical(0.,planet,r,v);
+		steps[planet] = grid_step(r,v,mu_sun,tol) / 86400.;
+	}
+	clear();
+}
+
+/// Get the tolerance.
+/**
+ * @return the tolerance [km], zero if the cache is disabled.
+ */
+double trajectory_cache::get_tolerance()
+{
+	return tolerance;
+}
+
+/// Set the capacity.
+/**
+ * Sets the maximum number of entries of each table, and empties them.
+ *
+ * @param[in] n maximum number of entries.
+ *
+ * @throws value_error if n is zero.
+ */
+void trajectory_cache::set_capacity(std::size_t n)
+{
+	if (!n) {
+		pagmo_throw(value_error,"the capacity must be positive");
+	}
+	capacity = n;
+	ephemerides_table.set_capacity(n);
+	lambert_table.set_capacity(n);
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+	kep_planets_table.set_capacity(n);
+	kep_planets_next_id = kep_planets_first_id;
+#endif
+}
+
+/// Get the capacity.
+/**
+ * @return the maximum number of entries of each table.
+ */
+std::size_t trajectory_cache::get_capacity()
+{
+	return capacity;
+}
+
+/// Empty the tables.
+/**
+ * Removes all the entries and resets the counters.
+ */
+void trajectory_cache::clear()
+{
+	ephemerides_table.clear();
+	lambert_table.clear();
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+	kep_planets_table.clear();
+	kep_planets_next_id = kep_planets_first_id;
+#endif
+}
+
+/// Number of entries.
+/**
+ * @return the number of entries in the two tables.
+ */
+std::size_t trajectory_cache::get_size()
+{
+	return ephemerides_table.size() + lambert_table.size();
+}
+
+/// Number of ephemerides hits.
+/**
+ * Each interpolation looks up four nodes of the grid of the planet (the two nodes around the epoch and their neighbours).
+ *
+ * @return the number of nodes of the grids found in the table.
+ */
+std::size_t trajectory_cache::get_ephemerides_hits()
+{
+	return ephemerides_table.hits();
+}
+
+/// Number of ephemerides misses.
+/**
+ * @return the number of nodes of the grids computed.
+ */
+std::size_t trajectory_cache::get_ephemerides_misses()
+{
+	return ephemerides_table.misses();
+}
+
+/// Number of Lambert hits.
+/**
+ * @return the number of solutions of Lambert's problem found in the table.
+ */
+std::size_t trajectory_cache::get_lambert_hits()
+{
+	return lambert_table.hits();
+}
+
+/// Number of Lambert misses.
+/**
+ * @return the number of Lambert's problems solved.
+ */
+std::size_t trajectory_cache::get_lambert_misses()
+{
+	return lambert_table.misses();
+}
+
+}}
@@ -0,0 +1,91 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#ifndef PAGMO_PROBLEM_TRAJECTORY_CACHE_H
+#define PAGMO_PROBLEM_TRAJECTORY_CACHE_H
+
+#include <cstddef>
+
+#include "../config.h"
+
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+#include <keplerian_toolbox/astro_constants.h>
+#include <keplerian_toolbox/epoch.h>
+#include <keplerian_toolbox/planet/base.h>
+#endif
+
+namespace pagmo { namespace problem {
+
+/// Shared cache of planetary ephemerides and Lambert solutions.
+/**
+ * The trajectory problems built on the AstroToolbox (cassini_1, cassini_2, gtoc_1, messenger, messenger_full, rosetta, sagas,
+ * tandem, laplace, sample_return) and on the keplerian_toolbox (mga_1dsm_alpha, mga_1dsm_tof, mga_incipit, mga_part) compute the
+ * ephemerides of the planets and solve Lambert's problem from scratch on every evaluation, while population-based algorithms keep
+ * probing very similar epochs. This class replaces those computations with lookups in two
+ * tables shared by all the problems, and hence by all the islands, of the process:
+ *
+ * - the ephemerides of the planets are interpolated (cubic Lagrange interpolation of the positions and of the velocities)
+ *   between the nodes of a regular grid of epochs, computed once. The step of the grid of each planet is chosen so that the
+ *   interpolation error on the position stays below the tolerance;
+ * - the solutions of Lambert's problem are memoised, with keys obtained by rounding the positions to multiples of the tolerance and the
+ *   time of flight to the time needed to cover the tolerance at circular speed. A lookup hence returns the solution of a Lambert problem
+ *   whose boundary positions differ from the requested ones by less than the tolerance.
+ *
+ * The cache is disabled by default (zero tolerance), so that the problems give their reference values: set_tolerance() enables it.
+ * Each table holds at most get_capacity() entries, and is split into independently locked stripes, so that concurrent islands
+ * rarely wait for each other; a stripe is emptied when it is full. The custom ephemerides of asteroids and comets of the AstroToolbox
+ * are not cached.
+ *
+ * The keplerian_toolbox planets are told apart by their name and their physical parameters (gravitational parameters and radius),
+ * hence two planets with the same name and parameters but different orbits must not be used in the same process while the cache
+ * is enabled. The keplerian_toolbox entry points work in SI units, the tolerance is still given in km.
+ *
+ * The configuration methods (set_tolerance(), set_capacity(), clear()) must not be called while problems are being evaluated.
+ */
+class __PAGMO_VISIBLE trajectory_cache
+{
+	public:
+		static void ephemerides(const double &, const int &, double *, double *);
+		static void lambert(const double *, const double *, const double &, const double &, const int &,
+			double *, double *, double &, double &, double &, int &);
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+		static void ephemerides(const kep_toolbox::planet::base &, const kep_toolbox::epoch &, kep_toolbox::array3D &, kep_toolbox::array3D &);
+		static void lambert(const kep_toolbox::array3D &, const kep_toolbox::array3D &, const double &, const double &, const bool &,
+			kep_toolbox::array3D &, kep_toolbox::array3D &);
+#endif
+		static void set_tolerance(const double &);
+		static double get_tolerance();
+		static void set_capacity(std::size_t);
+		static std::size_t get_capacity();
+		static void clear();
+		static std::size_t get_size();
+		static std::size_t get_ephemerides_hits();
+		static std::size_t get_ephemerides_misses();
+		static std::size_t get_lambert_hits();
+		static std::size_t get_lambert_misses();
+};
+
+}}
+
+#endif
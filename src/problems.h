@@ -111,6 +111,7 @@
         #include "problem/mga_part.h"
 	#include "problem/mga_target_event.h"
         #include "problem/tsp_ds.h"
+	#include "problem/trajectory_cache.h"
 #endif
 
 #endif
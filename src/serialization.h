@@ -46,6 +46,8 @@
 #include <boost/serialization/utility.hpp>
 #include <boost/serialization/vector.hpp>
 #include <boost/serialization/version.hpp>
+#include <boost/type_traits/integral_constant.hpp>
+#include <boost/type_traits/is_same.hpp>
 #include <limits>
 
 // Serialization of circular buffer, unordered map.
@@ -62,9 +64,14 @@
 
 namespace pagmo {
 
-/// Custom save function for the serialization of vector of doubles that handle also inf and NaN.
 template <class Archive>
-void custom_vector_double_save(Archive &ar, const std::vector<double> &v, const unsigned int)
+void custom_vector_double_save_impl(Archive &ar, const std::vector<double> &v, const unsigned int, const boost::true_type &)
+{
+	ar << v;
+}
+
+template <class Archive>
+void custom_vector_double_save_impl(Archive &ar, const std::vector<double> &v, const unsigned int, const boost::false_type &)
 {
 	const std::vector<double>::size_type size = v.size();
 	// Save size.
@@ -87,9 +94,25 @@ void custom_vector_double_save(Archive &ar, const std::vector<double> &v, const
 	}
 }
 
-/// Custom load function for the serialization of vector of doubles that handle also inf and NaN.
+/// Custom save function for the serialization of vector of doubles that handle also inf and NaN.
+/**
+ * Binary archives store the raw doubles, which already covers inf and NaN. All the other archives
+ * store each element as a string.
+ */
+template <class Archive>
+void custom_vector_double_save(Archive &ar, const std::vector<double> &v, const unsigned int version)
+{
+	custom_vector_double_save_impl(ar,v,version,boost::is_same<Archive,boost::archive::binary_oarchive>());
+}
+
+template <class Archive>
+void custom_vector_double_load_impl(Archive &ar, std::vector<double> &v, const unsigned int, const boost::true_type &)
+{
+	ar >> v;
+}
+
 template <class Archive>
-void custom_vector_double_load(Archive &ar, std::vector<double> &v, const unsigned int)
+void custom_vector_double_load_impl(Archive &ar, std::vector<double> &v, const unsigned int, const boost::false_type &)
 {
 	std::vector<double>::size_type size = 0;
 	// Load size.
@@ -110,6 +133,13 @@ void custom_vector_double_load(Archive &ar, std::vector<double> &v, const unsign
 	}
 }
 
+/// Custom load function for the serialization of vector of doubles that handle also inf and NaN.
+template <class Archive>
+void custom_vector_double_load(Archive &ar, std::vector<double> &v, const unsigned int version)
+{
+	custom_vector_double_load_impl(ar,v,version,boost::is_same<Archive,boost::archive::binary_iarchive>());
+}
+
 }
 
 namespace boost { namespace serialization {
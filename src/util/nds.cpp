@@ -0,0 +1,205 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#include <algorithm>
+#include <cstddef>
+#include <vector>
+
+#include "../exceptions.h"
+#include "../types.h"
+#include "nds.h"
+
+namespace pagmo{ namespace util { namespace nds {
+
+// Lexicographic order of the points, ties broken by position. A point can only be dominated by the
+// points that precede it in this order.
+struct lexicographic_less
+{
+	lexicographic_less(const std::vector<fitness_vector> &points):m_points(points) {}
+	bool operator()(const std::size_t &a, const std::size_t &b) const
+	{
+		if (m_points[a] == m_points[b]) {
+			return a < b;
+		}
+		return m_points[a] < m_points[b];
+	}
+	const std::vector<fitness_vector> &m_points;
+};
+
+static std::vector<std::size_t> sorted_positions(const std::vector<fitness_vector> &points)
+{
+	std::vector<std::size_t> retval(points.size());
+	for (std::size_t i = 0; i < retval.size(); ++i) {
+		if (points[i].size() != points[0].size()) {
+			pagmo_throw(value_error,"fitness vectors must all have the same dimension");
+		}
+		retval[i] = i;
+	}
+	std::sort(retval.begin(),retval.end(),lexicographic_less(points));
+	return retval;
+}
+
+// True if one of the members of front dominates p. The most recent members are checked first,
+// as they are the closest to p in the lexicographic order.
+static bool front_dominates(const std::vector<fitness_vector> &points, const std::vector<std::size_t> &front, const fitness_vector &p)
+{
+	for (std::vector<std::size_t>::const_reverse_iterator it = front.rbegin(); it != front.rend(); ++it) {
+		if (dominates(points[*it],p)) {
+			return true;
+		}
+	}
+	return false;
+}
+
+/// Pareto dominance.
+/**
+ * @param[in] f1 first fitness vector.
+ * @param[in] f2 second fitness vector.
+ *
+ * @return true if f1 is not worse than f2 in all the objectives and better in at least one.
+ */
+bool dominates(const fitness_vector &f1, const fitness_vector &f2)
+{
+	bool better = false;
+	for (fitness_vector::size_type i = 0; i < f1.size(); ++i) {
+		if (f1[i] > f2[i]) {
+			return false;
+		}
+		if (f1[i] < f2[i]) {
+			better = true;
+		}
+	}
+	return better;
+}
+
+/// Efficient non-dominated sort.
+/**
+ * The points are visited in lexicographic order, and each one is placed in the first front none of whose
+ * members dominates it, found by binary search over the fronts (ENS-BS). The cost is O(M N log N) comparisons
+ * for populations spread over few fronts and O(M N^2) in the worst case, against the O(M N^2) time and O(N^2) memory
+ * of the domination lists.
+ *
+ * @param[in] points fitness vectors to be sorted.
+ *
+ * @return the Pareto rank of each point (0 for the non-dominated points).
+ *
+ * @throws value_error if the fitness vectors have different dimensions.
+ */
+std::vector<std::size_t> ens(const std::vector<fitness_vector> &points)
+{
+	std::vector<std::size_t> retval(points.size());
+	const std::vector<std::size_t> order = sorted_positions(points);
+	std::vector<std::vector<std::size_t> > fronts;
+	for (std::size_t i = 0; i < order.size(); ++i) {
+		const fitness_vector &p = points[order[i]];
+		std::size_t lo = 0, hi = fronts.size();
+		while (lo < hi) {
+			const std::size_t mid = lo + (hi - lo) / 2;
+			if (front_dominates(points,fronts[mid],p)) {
+				lo = mid + 1;
+			} else {
+				hi = mid;
+			}
+		}
+		if (lo == fronts.size()) {
+			fronts.push_back(std::vector<std::size_t>());
+		}
+		fronts[lo].push_back(order[i]);
+		retval[order[i]] = lo;
+	}
+	return retval;
+}
+
+/// Non-dominated sort of two-objective points.
+/**
+ * After sorting the points lexicographically, the members of each front have decreasing second objective,
+ * so that a point is dominated by a front if and only if it is dominated by the last member added to it.
+ * The front of each point is then found by binary search, for a total cost of O(N log N).
+ *
+ * @param[in] points fitness vectors to be sorted.
+ *
+ * @return the Pareto rank of each point (0 for the non-dominated points).
+ *
+ * @throws value_error if the fitness vectors are not two-dimensional.
+ */
+std::vector<std::size_t> sweep_2d(const std::vector<fitness_vector> &points)
+{
+	std::vector<std::size_t> retval(points.size());
+	if (points.size() && points[0].size() != 2) {
+		pagmo_throw(value_error,"the sweep method requires two-dimensional fitness vectors");
+	}
+	const std::vector<std::size_t> order = sorted_positions(points);
+	// Last point added to each front.
+	std::vector<std::size_t> last;
+	for (std::size_t i = 0; i < order.size(); ++i) {
+		const fitness_vector &p = points[order[i]];
+		std::size_t lo = 0, hi = last.size();
+		while (lo < hi) {
+			const std::size_t mid = lo + (hi - lo) / 2;
+			if (dominates(points[last[mid]],p)) {
+				lo = mid + 1;
+			} else {
+				hi = mid;
+			}
+		}
+		if (lo == last.size()) {
+			last.push_back(order[i]);
+		} else {
+			last[lo] = order[i];
+		}
+		retval[order[i]] = lo;
+	}
+	return retval;
+}
+
+/// Non-dominated points.
+/**
+ * Only the first front is computed: each point is compared with the non-dominated points found so far,
+ * and the dominated points are discarded.
+ *
+ * @param[in] points fitness vectors.
+ *
+ * @return the positions of the non-dominated points, in increasing order.
+ *
+ * @throws value_error if the fitness vectors have different dimensions.
+ */
+std::vector<std::size_t> first_front(const std::vector<fitness_vector> &points)
+{
+	const std::vector<std::size_t> order = sorted_positions(points);
+	std::vector<std::size_t> retval;
+	for (std::size_t i = 0; i < order.size(); ++i) {
+		const fitness_vector &p = points[order[i]];
+		// For two objectives only the last non-dominated point needs to be checked (see sweep_2d()).
+		if ((p.size() == 2 && retval.size() && dominates(points[retval.back()],p)) ||
+			(p.size() != 2 && front_dominates(points,retval,p)))
+		{
+			continue;
+		}
+		retval.push_back(order[i]);
+	}
+	std::sort(retval.begin(),retval.end());
+	return retval;
+}
+
+}}} //namespaces
@@ -0,0 +1,54 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+#ifndef PAGMO_UTIL_NDS_H
+#define PAGMO_UTIL_NDS_H
+
+#include <cstddef>
+#include <vector>
+
+#include "../config.h"
+#include "../types.h"
+
+namespace pagmo{ namespace util {
+
+/// Non-dominated sorting namespace.
+/**
+ * Non-dominated sorting of a set of fitness vectors, assuming minimisation of each objective
+ * (i.e., the default problem::base::compare_fitness_impl()). The methods here avoid building the
+ * O(N^2) domination lists used by the population class.
+ *
+ * @see Zhang, X. and Tian, Y. and Cheng, R. and Jin, Y., "An Efficient Approach to Nondominated
+ * Sorting for Evolutionary Multiobjective Optimization", IEEE Transactions on Evolutionary Computation, 2015.
+ */
+namespace nds {
+
+__PAGMO_VISIBLE_FUNC bool dominates(const fitness_vector &, const fitness_vector &);
+__PAGMO_VISIBLE_FUNC std::vector<std::size_t> ens(const std::vector<fitness_vector> &);
+__PAGMO_VISIBLE_FUNC std::vector<std::size_t> sweep_2d(const std::vector<fitness_vector> &);
+__PAGMO_VISIBLE_FUNC std::vector<std::size_t> first_front(const std::vector<fitness_vector> &);
+
+}}}
+
+#endif
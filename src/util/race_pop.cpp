@@ -2,7 +2,12 @@
 #include "../problem/ackley.h"
 #include "../problem/base_stochastic.h"
 
+#include <algorithm>
+#include <boost/bind.hpp>
+#include <boost/thread/thread.hpp>
 #include <map>
+#include <stdexcept>
+#include <string>
 #include <utility>
 
 namespace pagmo { namespace util { namespace racing {
@@ -15,7 +20,7 @@ namespace pagmo { namespace util { namespace racing {
  * @param[in] pop population containing the individuals to race
  * @param[in] seed seed of the race
  */
-race_pop::race_pop(const population& pop, unsigned int seed): m_race_seed(seed), m_pop(pop), m_pop_wilcoxon(pop), m_seeds(), m_seeder(seed), m_use_caching(true), m_cache_data(pop.size()), m_cache_averaged_data(pop.size())
+race_pop::race_pop(const population& pop, unsigned int seed): m_race_seed(seed), m_pop(pop), m_pop_wilcoxon(pop), m_seeds(), m_seeder(seed), m_use_caching(true), m_cache_data(pop.size()), m_cache_averaged_data(pop.size()), m_n_threads(1), m_iteration_evals()
 {
 	register_population(pop);
 }
@@ -28,7 +33,7 @@ race_pop::race_pop(const population& pop, unsigned int seed): m_race_seed(seed),
  *
  * @param[in] seed seed of the race
  */
-race_pop::race_pop(unsigned int seed): m_race_seed(seed), m_pop(population(problem::ackley())), m_pop_wilcoxon(population(problem::ackley())), m_pop_registered(false), m_seeds(), m_seeder(seed), m_use_caching(true), m_cache_data(0), m_cache_averaged_data(0)
+race_pop::race_pop(unsigned int seed): m_race_seed(seed), m_pop(population(problem::ackley())), m_pop_wilcoxon(population(problem::ackley())), m_pop_registered(false), m_seeds(), m_seeder(seed), m_use_caching(true), m_cache_data(0), m_cache_averaged_data(0), m_n_threads(1), m_iteration_evals()
 {
 }
 
@@ -162,7 +167,7 @@ std::vector<population::size_type> race_pop::construct_output_list(
 // @return The number of objective function calls made
 unsigned int race_pop::prepare_population_friedman(const std::vector<population::size_type>& in_race, unsigned int count_iter)
 {
-	unsigned int count_nfes = 0;
+	std::vector<population::size_type> to_eval;
 	// Perform re-evaluation on necessary individuals under current seed
 	for(std::vector<population::size_type>::const_iterator it = in_race.begin(); it != in_race.end(); ++it) {
 		// Case 1: Current racer has previous data that can be reused, no
@@ -172,18 +177,20 @@ unsigned int race_pop::prepare_population_friedman(const std::vector<population:
 			m_pop.set_fc(*it, cached_data.f, cached_data.c);
 		}
 		// Case 2: No previous data can be reused, perform actual
-		// re-evaluation and update the cache
+		// re-evaluation (below, all at once) and update the cache
 		else{
-			count_nfes++;
-			const population::individual_type &ind = m_pop.get_individual(*it);
-			fitness_vector f_vec = m_pop.problem().objfun(ind.cur_x);
-			constraint_vector c_vec = m_pop.problem().compute_constraints(ind.cur_x);
-			m_pop.set_fc(*it, f_vec, c_vec);
-			if(m_use_caching)
-				cache_insert_data(*it, f_vec, c_vec);
+			to_eval.push_back(*it);
 		}
 	}
-	return count_nfes;
+	std::vector<eval_data> evals;
+	evaluate_racers(to_eval, evals);
+	for(unsigned int i = 0; i < to_eval.size(); i++){
+		m_pop.set_fc(to_eval[i], evals[i].f, evals[i].c);
+		if(m_use_caching)
+			cache_insert_data(to_eval[i], evals[i].f, evals[i].c);
+	}
+	m_iteration_evals.push_back(to_eval.size());
+	return to_eval.size();
 }
 
 /// Update m_pop_wilcoxon to contain evaluation data required for Wilcoxon test
@@ -211,6 +218,19 @@ unsigned int race_pop::prepare_population_wilcoxon(const std::vector<population:
 	else{
 		start_count_iter = count_iter;
 	}
+	// The data points missing from the cache are the same as those that
+	// would be inserted one after the other in the loop below, so they can be
+	// evaluated all at once beforehand.
+	std::vector<population::size_type> to_eval;
+	for(std::vector<population::size_type>::const_iterator it = in_race.begin(); it != in_race.end(); ++it) {
+		for(unsigned int i = start_count_iter; i <= count_iter; i++){
+			if(!(m_use_caching && cache_data_exist(*it, i-1))){
+				to_eval.push_back(*it);
+			}
+		}
+	}
+	std::vector<eval_data> evals;
+	evaluate_racers(to_eval, evals);
 	for(std::vector<population::size_type>::const_iterator it = in_race.begin(); it != in_race.end(); ++it) {
 		decision_vector dummy_x;
 		for(unsigned int i = start_count_iter; i <= count_iter; i++){
@@ -221,23 +241,75 @@ unsigned int race_pop::prepare_population_wilcoxon(const std::vector<population:
 				const eval_data& cached_data = cache_get_entry(*it, i-1);
 				m_pop_wilcoxon.set_fc(m_pop_wilcoxon.size()-1, cached_data.f, cached_data.c);
 			}
-			// Case 2: No previous data can be reused, perform actual
+			// Case 2: No previous data can be reused, use the result of the
 			// re-evaluation and update the cache
 			else{
-				count_nfes++;
-				const population::individual_type &ind = m_pop.get_individual(*it);
-				fitness_vector f_vec = m_pop.problem().objfun(ind.cur_x);
-				constraint_vector c_vec = m_pop.problem().compute_constraints(ind.cur_x);
+				const eval_data &data = evals[count_nfes++];
 				m_pop_wilcoxon.push_back_noeval(dummy_x);
-				m_pop_wilcoxon.set_fc(m_pop_wilcoxon.size()-1, f_vec, c_vec);
+				m_pop_wilcoxon.set_fc(m_pop_wilcoxon.size()-1, data.f, data.c);
 				if(m_use_caching)
-					cache_insert_data(*it, f_vec, c_vec);
+					cache_insert_data(*it, data.f, data.c);
 			}
 		}
 	}
+	m_iteration_evals.push_back(count_nfes);
 	return count_nfes;
 }
 
+// Evaluate the fitness and constraint vectors of the racers in idx under the
+// current seed of the problem, storing them in out (in the same order). With
+// more than one thread, the racers are split among m_n_threads threads, each
+// evaluating its racers on its own copy of the problem: as the evaluations
+// depend only on the decision vector and on the seed, the results do not
+// depend on the number of threads.
+void race_pop::evaluate_racers(const std::vector<population::size_type> &idx, std::vector<eval_data> &out) const
+{
+	out.resize(idx.size());
+	const std::size_t n_workers = std::min<std::size_t>(m_n_threads, idx.size());
+	if(n_workers <= 1){
+		for(unsigned int i = 0; i < idx.size(); i++){
+			const population::individual_type &ind = m_pop.get_individual(idx[i]);
+			out[i].f = m_pop.problem().objfun(ind.cur_x);
+			out[i].c = m_pop.problem().compute_constraints(ind.cur_x);
+		}
+		return;
+	}
+	std::vector<std::string> errors(n_workers);
+	boost::thread_group workers;
+	for(std::size_t i = 0; i < n_workers; i++){
+		workers.create_thread(boost::bind(&race_pop::evaluate_racers_chunk,boost::cref(m_pop),boost::cref(idx),boost::ref(out),
+			i,n_workers,boost::ref(errors[i])));
+	}
+	workers.join_all();
+	for(std::size_t i = 0; i < n_workers; i++){
+		if(errors[i].size()){
+			pagmo_throw(std::runtime_error,errors[i]);
+		}
+	}
+}
+
+// Evaluate the racers at positions first, first + step, first + 2 * step, ...
+// of idx. In case of error, the message is stored in error and the remaining
+// racers are skipped.
+void race_pop::evaluate_racers_chunk(const population &pop, const std::vector<population::size_type> &idx, std::vector<eval_data> &out,
+	std::size_t first, std::size_t step, std::string &error)
+{
+	try{
+		const problem::base_ptr prob = pop.problem().clone();
+		for(std::size_t i = first; i < idx.size(); i += step){
+			const population::individual_type &ind = pop.get_individual(idx[i]);
+			out[i].f = prob->objfun(ind.cur_x);
+			out[i].c = prob->compute_constraints(ind.cur_x);
+		}
+	}
+	catch(const std::exception &e){
+		error = e.what();
+	}
+	catch(...){
+		error = "unknown exception caught during the evaluation of a racer";
+	}
+}
+
 /// Computes the required number of actual fevals to complete the current iteration
 /*
  * This function takes into account the existence of cache. For example, if the
@@ -373,6 +445,7 @@ std::pair<std::vector<population::size_type>, unsigned int> race_pop::run(
 
 	// Reset data holder for wilcoxon test
 	m_pop_wilcoxon.clear();
+	m_iteration_evals.clear();
 	bool use_wilcoxon = false;
 
 	unsigned int count_iter = 0;
@@ -445,6 +518,11 @@ std::pair<std::vector<population::size_type>, unsigned int> race_pop::run(
 
 		}
 
+		if(screen_output){
+			const unsigned int n_evals = m_iteration_evals.back();
+			std::cout << "Evaluations: " << n_evals << ", concurrently on " << std::max(1u, std::min(m_n_threads, n_evals)) << " thread(s)" << std::endl;
+		}
+
 		if(count_iter < min_trials)
 			continue;
 
@@ -700,6 +778,44 @@ void race_pop::set_seed(unsigned int seed)
 	reset_cache();
 }
 
+/// Set the number of threads evaluating the racers
+/**
+ * At each iteration of the race, the racers that have to be re-evaluated are
+ * split among n threads, each with its own copy of the problem. The result of
+ * the race does not depend on the number of threads. The objective function
+ * and the constraints of the problem must be safe to call concurrently on
+ * distinct copies of the problem.
+ *
+ * @param[in] n Number of threads (1, the default, evaluates the racers serially).
+ *
+ * @throws value_error if n is zero.
+ */
+void race_pop::set_n_threads(unsigned int n)
+{
+	if(n == 0){
+		pagmo_throw(value_error, "the number of threads must be at least one");
+	}
+	m_n_threads = n;
+}
+
+/// Get the number of threads evaluating the racers
+unsigned int race_pop::get_n_threads() const
+{
+	return m_n_threads;
+}
+
+/// Number of evaluations made at each iteration of the last race
+/**
+ * The evaluations of an iteration are performed concurrently, on
+ * min(get_n_threads(), evaluations) threads.
+ *
+ * @return Vector with the number of objective function evaluations of each iteration of the last call to run().
+ */
+const std::vector<unsigned int> &race_pop::get_iteration_evals() const
+{
+	return m_iteration_evals;
+}
+
 // Produce new seeds and append to the list of seeds
 void race_pop::generate_seeds(unsigned int num_seeds)
 {
@@ -25,6 +25,7 @@
 #ifndef PAGMO_UTIL_RACE_POP_H
 #define PAGMO_UTIL_RACE_POP_H
 
+#include <cstddef>
 #include <iostream>
 #include <string>
 #include <vector>
@@ -88,6 +89,9 @@ public:
 	void inherit_memory(const race_pop&);
 	std::vector<fitness_vector> get_mean_fitness(const std::vector<population::size_type> &active_set = std::vector<population::size_type>()) const;
 	void set_seed(unsigned int);
+	void set_n_threads(unsigned int);
+	unsigned int get_n_threads() const;
+	const std::vector<unsigned int> &get_iteration_evals() const;
 
 private:
 	// Helper methods to validate input data
@@ -109,6 +113,11 @@ private:
 		constraint_vector c;
 	};
 
+	// Evaluation of the racers under the current seed, possibly on several threads
+	void evaluate_racers(const std::vector<population::size_type> &, std::vector<eval_data> &) const;
+	static void evaluate_racers_chunk(const population &, const std::vector<population::size_type> &, std::vector<eval_data> &,
+		std::size_t, std::size_t, std::string &);
+
 	std::vector<population::size_type> construct_output_list(
 			const std::vector<racer_type>& racers,
 			const std::vector<population::size_type>& decided,
@@ -140,6 +149,8 @@ private:
 	std::vector<std::vector<eval_data> > m_cache_data;
 	std::vector<eval_data> m_cache_averaged_data;
 	std::vector<decision_vector> m_cache_signatures;
+	unsigned int m_n_threads;
+	std::vector<unsigned int> m_iteration_evals;
 };
 
 }}}
@@ -50,6 +50,90 @@ int test_distribution_type() {
 	return 0;
 }
 
+int test_migration_history() {
+	// Overwrite policy: the most recent events are kept, in order.
+	migration_history h(4,migration_history::overwrite);
+	for (std::size_t i = 0; i < 10; ++i) {
+		h.push_back(i,i % 2,(i + 1) % 2,1);
+	}
+	std::vector<migration_history::value_type> rounds = h.get_column(migration_history::round);
+	if (h.size() != 4 || h.get_n_events() != 10 || rounds != std::vector<migration_history::value_type>{6,7,8,9}) {
+		return 1;
+	}
+	std::vector<migration_history::value_type> columns(4 * h.size());
+	h.copy_columns(&columns[0]);
+	if (std::vector<migration_history::value_type>(columns.begin(),columns.begin() + 4) != rounds) {
+		return 1;
+	}
+	migration_history::edge_map_type edges = h.migrants_per_edge(7);
+	if (edges.size() != 2 || edges[std::make_pair(1u,0u)] != 2 || edges[std::make_pair(0u,1u)] != 1) {
+		return 1;
+	}
+	migration_history::window_map_type windows = h.migrants_per_window(4);
+	if (windows.size() != 2 || windows[4] != 2 || windows[8] != 2) {
+		return 1;
+	}
+	// Decimate policy: the whole run is covered with decreasing resolution.
+	migration_history d(4,migration_history::decimate);
+	for (std::size_t i = 0; i < 10; ++i) {
+		d.push_back(i,0,1,1);
+	}
+	if (d.get_stride() != 4 || d.get_column(migration_history::round) != std::vector<migration_history::value_type>{0,4,8}) {
+		return 1;
+	}
+	d.clear();
+	if (d.size() || d.get_stride() != 1) {
+		return 1;
+	}
+	return 0;
+}
+
+int test_init_populations() {
+	// The populations do not depend on the number of threads.
+	rng_generator::set_seed(42);
+	std::vector<population> serial = archipelago::init_populations(problem::ackley(10),13,7,1);
+	rng_generator::set_seed(42);
+	std::vector<population> parallel = archipelago::init_populations(problem::ackley(10),13,7,4);
+	if (serial.size() != 13 || parallel.size() != 13) {
+		return 1;
+	}
+	for (std::size_t i = 0; i < serial.size(); ++i) {
+		if (serial[i].size() != 7) {
+			return 1;
+		}
+		for (population::size_type j = 0; j < serial[i].size(); ++j) {
+			if (serial[i].get_individual(j).cur_x != parallel[i].get_individual(j).cur_x ||
+				serial[i].get_individual(j).cur_f != parallel[i].get_individual(j).cur_f)
+			{
+				return 1;
+			}
+		}
+	}
+	return 0;
+}
+
+int test_migration_history_rounds() {
+	// The rounds of the migration history keep increasing across reset_metrics().
+	archipelago a(algorithm::de(5),problem::ackley(10),4,10,topology::ring());
+	a.evolve(10);
+	a.join();
+	const migration_history::size_type n_before = a.get_migr_history().size();
+	a.reset_metrics();
+	a.evolve(10);
+	a.join();
+	const migration_history h = a.get_migr_history();
+	if (h.size() <= n_before) {
+		return 1;
+	}
+	const std::vector<migration_history::value_type> rounds = h.get_column(migration_history::round);
+	for (migration_history::size_type i = n_before; i < h.size(); ++i) {
+		if (rounds[i] < 10) {
+			return 1;
+		}
+	}
+	return 0;
+}
+
 int main() {
-	return test_distribution_type();
+	return test_distribution_type() || test_migration_history() || test_init_populations() || test_migration_history_rounds();
 }
@@ -0,0 +1,178 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+// Tests for the LRU caches of the problems.
+
+#include <cmath>
+#include <cstddef>
+#include <vector>
+#include "../src/pagmo.h"
+
+using namespace pagmo;
+
+int test_lru() {
+	problem::evaluation_cache cache(2);
+	std::vector<double> v;
+	const decision_vector a(3,1.), b(3,2.), c(3,3.);
+	cache.put(a,std::vector<double>(1,10.));
+	cache.put(b,std::vector<double>(1,20.));
+	// a becomes the most recently used entry, so c evicts b.
+	if (!cache.get(a,v) || v[0] != 10.) {
+		return 1;
+	}
+	cache.put(c,std::vector<double>(1,30.));
+	if (cache.get(b,v) || !cache.get(c,v) || v[0] != 30. || !cache.get(a,v)) {
+		return 1;
+	}
+	if (cache.get_hits() != 3 || cache.get_misses() != 1 || cache.get_evictions() != 1 || cache.size() != 2) {
+		return 1;
+	}
+	// Copies have their own index.
+	problem::evaluation_cache copy(cache);
+	cache.clear();
+	if (!copy.get(c,v) || v[0] != 30. || cache.get(c,v)) {
+		return 1;
+	}
+	copy.set_capacity(1);
+	if (copy.size() != 1 || copy.get_evictions() != 2 || !copy.get(c,v)) {
+		return 1;
+	}
+	// A cache with zero capacity stores and counts nothing.
+	copy.set_capacity(0);
+	copy.put(a,std::vector<double>(1,10.));
+	return copy.size() != 0 || copy.get(a,v) || copy.get_misses() != 1;
+}
+
+int test_problem_cache() {
+	problem::cec2006 prob(5);
+	population pop(prob,10,3);
+	std::vector<decision_vector> x;
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		x.push_back(pop.get_individual(i).cur_x);
+	}
+	// The constructor of the problem evaluates its best known solution.
+	prob.reset_caches();
+	const unsigned int fevals = prob.get_fevals(), cevals = prob.get_cevals();
+	const std::size_t hits = prob.get_cache_hits(), evictions = prob.get_cache_evictions();
+	// With the default capacity revisiting the ten points always misses.
+	for (int k = 0; k < 2; ++k) {
+		for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+			prob.objfun(x[i]);
+		}
+	}
+	if (prob.get_fevals() != fevals + 20 || prob.get_cache_hits() != hits || prob.get_cache_evictions() != evictions + 15) {
+		return 1;
+	}
+	// With a larger capacity the second visit hits, for both fitness and constraints.
+	prob.set_cache_capacity(100);
+	for (int k = 0; k < 2; ++k) {
+		for (std::vector<decision_vector>::size_type i = 0; i < x.size(); ++i) {
+			if (prob.objfun(x[i]) != pop.get_individual(i).cur_f || prob.compute_constraints(x[i]) != pop.get_individual(i).cur_c) {
+				return 1;
+			}
+		}
+	}
+	if (prob.get_fevals() != fevals + 25 || prob.get_cevals() != cevals + 10 || prob.get_cache_hits() != hits + 25) {
+		return 1;
+	}
+	// Copies keep the capacity and the entries.
+	problem::base_ptr clone = prob.clone();
+	clone->objfun(x[0]);
+	if (clone->get_cache_capacity() != 100 || clone->get_fevals() != prob.get_fevals()) {
+		return 1;
+	}
+	// Disabling the caches evaluates every call.
+	prob.set_cache_capacity(0);
+	prob.objfun(x[0]);
+	prob.objfun(x[0]);
+	return prob.get_fevals() != fevals + 27;
+}
+
+// Constrained problem computing fitness and constraints with the same simulation, which is counted.
+class fused_problem: public problem::base
+{
+	public:
+		fused_problem():base(-1.,1.,3,0,1,1,1),m_simulations(0) {}
+		problem::base_ptr clone() const
+		{
+			return problem::base_ptr(new fused_problem(*this));
+		}
+		mutable unsigned int m_simulations;
+	protected:
+		void objfun_impl(fitness_vector &f, const decision_vector &x) const
+		{
+			constraint_vector c(1);
+			simulate(f,c,x);
+		}
+		void compute_constraints_impl(constraint_vector &c, const decision_vector &x) const
+		{
+			fitness_vector f(1);
+			simulate(f,c,x);
+		}
+		bool evaluate_impl(fitness_vector &f, constraint_vector &c, const decision_vector &x) const
+		{
+			simulate(f,c,x);
+			return true;
+		}
+	private:
+		void simulate(fitness_vector &f, constraint_vector &c, const decision_vector &x) const
+		{
+			++m_simulations;
+			f[0] = x[0] * x[0] + x[1] * x[1] + x[2] * x[2];
+			c[0] = x[0] + x[1] + x[2] - 1.;
+		}
+};
+
+int test_fused_evaluation() {
+	fused_problem prob;
+	// Every individual is simulated once, by the batch evaluation.
+	population pop(prob,10,3);
+	const fused_problem &p = dynamic_cast<const fused_problem &>(pop.problem());
+	if (p.m_simulations != 10 || p.get_fevals() != 10 || p.get_cevals() != 10) {
+		return 1;
+	}
+	// Fitness and constraints fill both caches at once, whatever the order.
+	const decision_vector a(3,.1), b(3,.2);
+	if (std::abs(prob.objfun(a)[0] - .03) > 1e-15 || std::abs(prob.compute_constraints(a)[0] + .7) > 1e-15 ||
+		std::abs(prob.compute_constraints(b)[0] + .4) > 1e-15 || std::abs(prob.objfun(b)[0] - .12) > 1e-15)
+	{
+		return 1;
+	}
+	if (prob.m_simulations != 2 || prob.get_fevals() != 2 || prob.get_cevals() != 2) {
+		return 1;
+	}
+	// Without caches, fitness and constraints are computed separately.
+	prob.set_cache_capacity(0);
+	prob.objfun(a);
+	prob.compute_constraints(a);
+	if (prob.m_simulations != 4) {
+		return 1;
+	}
+	pop.set_x(0,b);
+	return p.m_simulations != 11 || pop.get_individual(0).cur_c != prob.compute_constraints(b);
+}
+
+int main() {
+	return test_lru() || test_problem_cache() || test_fused_evaluation();
+}
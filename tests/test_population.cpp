@@ -0,0 +1,224 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+// Tests for the population class.
+
+#include <algorithm>
+#include <vector>
+#include "../src/pagmo.h"
+
+using namespace pagmo;
+
+// Check that the domination lists and counts of pop match the definition.
+static bool check_dom(const population &pop) {
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		std::vector<population::size_type> list(pop.get_domination_list(i)), expected;
+		population::size_type count = 0;
+		for (population::size_type j = 0; j < pop.size(); ++j) {
+			const population::individual_type &a = pop.get_individual(i), &b = pop.get_individual(j);
+			if (i != j && pop.problem().compare_fc(a.best_f,a.best_c,b.best_f,b.best_c)) {
+				expected.push_back(j);
+			}
+			if (i != j && pop.problem().compare_fc(b.best_f,b.best_c,a.best_f,a.best_c)) {
+				++count;
+			}
+		}
+		std::sort(list.begin(),list.end());
+		if (list != expected || pop.get_domination_count(i) != count) {
+			return false;
+		}
+	}
+	return true;
+}
+
+int test_batch() {
+	problem::zdt prob(1,10);
+	population src(prob,30,7);
+	std::vector<decision_vector> x;
+	std::vector<population::size_type> idx;
+	for (population::size_type i = 0; i < src.size(); ++i) {
+		x.push_back(src.get_individual(i).cur_x);
+		idx.push_back((i * 7) % 50);
+	}
+	// Batch replacement is equivalent to a sequence of set_x().
+	population a(prob,50,42), b(prob,50,42);
+	for (population::size_type i = 0; i < idx.size(); ++i) {
+		a.set_x(idx[i],x[i]);
+	}
+	b.set_x_batch(idx,x);
+	if (!check_dom(a) || !check_dom(b) || a.champion().x != b.champion().x) {
+		return 1;
+	}
+	for (population::size_type i = 0; i < a.size(); ++i) {
+		if (a.get_individual(i).best_x != b.get_individual(i).best_x) {
+			return 1;
+		}
+	}
+	// Batch insertion is equivalent to a sequence of push_back().
+	population c(prob,0,3), d(prob,0,3);
+	for (population::size_type i = 0; i < x.size(); ++i) {
+		c.push_back(x[i]);
+	}
+	d.push_back_batch(x);
+	if (d.size() != x.size() || !check_dom(d)) {
+		return 1;
+	}
+	for (population::size_type i = 0; i < d.size(); ++i) {
+		if (c.get_individual(i).cur_v != d.get_individual(i).cur_v || c.get_domination_list(i) != d.get_domination_list(i)) {
+			return 1;
+		}
+	}
+	// Invalid input leaves the population untouched.
+	try {
+		d.push_back_batch(std::vector<decision_vector>(2,decision_vector(3)));
+		return 1;
+	} catch (const value_error &) {}
+	return d.size() != x.size();
+}
+
+int test_dom_tracking() {
+	problem::zdt prob(1,10);
+	population pop(prob,40,1), other(prob,10,2);
+	pop.set_dom_tracking(false);
+	try {
+		pop.get_domination_list(0);
+		return 1;
+	} catch (const value_error &) {}
+	pop.set_x(0,other.get_individual(0).cur_x);
+	pop.push_back(other.get_individual(1).cur_x);
+	pop.erase(3);
+	pop.set_dom_tracking(true);
+	return !check_dom(pop) || !check_dom(population(prob,40,1));
+}
+
+// Pareto fronts computed with the given method, on a copy of pop.
+static std::vector<std::vector<population::size_type> > fronts(population pop, population::nds_type method) {
+	pop.set_nds_method(method);
+	return pop.compute_pareto_fronts();
+}
+
+int test_nds() {
+	problem::zdt zdt(1,10);
+	problem::dtlz dtlz(2,5,4);
+	population pop2(zdt,300,1), pop4(dtlz,300,1);
+	// Duplicated individuals.
+	pop2.push_back(pop2.get_individual(3).cur_x);
+	pop4.push_back(pop4.get_individual(3).cur_x);
+	const std::vector<std::vector<population::size_type> > f2 = fronts(pop2,population::dom_lists), f4 = fronts(pop4,population::dom_lists);
+	if (f2.size() < 2 || f4.size() < 2 || fronts(pop2,population::ens) != f2 || fronts(pop2,population::sweep_2d) != f2 || fronts(pop4,population::ens) != f4) {
+		return 1;
+	}
+	pop2.set_nds_method(population::sweep_2d);
+	pop4.set_nds_method(population::ens);
+	if (pop2.compute_first_front() != f2[0] || pop4.compute_first_front() != f4[0]) {
+		return 1;
+	}
+	// The fast methods do not need the domination lists.
+	pop4.set_dom_tracking(false);
+	if (pop4.compute_pareto_fronts() != f4) {
+		return 1;
+	}
+	try {
+		pop4.set_nds_method(population::sweep_2d);
+		return 1;
+	} catch (const value_error &) {}
+	return 0;
+}
+
+int test_packed() {
+	problem::zdt prob(1,10);
+	population pop(prob,50,1);
+	const packed_population packed(pop);
+	if (packed.size() != pop.size() || packed.champion().x != pop.champion().x || packed.memory_footprint() >= pop.memory_footprint()) {
+		return 1;
+	}
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		const packed_population::individual_view v = packed.get_individual(i);
+		if (v.cur_x.to_vector() != pop.get_individual(i).cur_x || v.best_f.to_vector() != pop.get_individual(i).best_f ||
+			v.cur_c.size() != 0 || packed.get_domination_list(i) != pop.get_domination_list(i))
+		{
+			return 1;
+		}
+	}
+	const packed_population::range f = packed.get_field(packed_population::cur_f);
+	if (f.size() != 2 * pop.size() || f[7] != pop.get_individual(3).cur_f[1]) {
+		return 1;
+	}
+	// The unpacked population is equivalent to the original one.
+	const population unpacked = packed_population(packed).unpack();
+	if (unpacked.size() != pop.size() || unpacked.champion().f != pop.champion().f) {
+		return 1;
+	}
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		if (unpacked.get_individual(i).cur_v != pop.get_individual(i).cur_v || unpacked.get_individual(i).best_x != pop.get_individual(i).best_x ||
+			unpacked.get_domination_list(i) != pop.get_domination_list(i) || unpacked.get_domination_count(i) != pop.get_domination_count(i))
+		{
+			return 1;
+		}
+	}
+	return unpacked.compute_pareto_fronts() != pop.compute_pareto_fronts();
+}
+
+int test_objfun_batch() {
+	problem::cec2006 prob(5);
+	population pop(prob,20,11);
+	std::vector<decision_vector> x;
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		// The individuals evaluated at once have the same vectors as if they were evaluated one by one.
+		if (pop.get_individual(i).cur_f != prob.objfun(pop.get_individual(i).cur_x) ||
+			pop.get_individual(i).cur_c != prob.compute_constraints(pop.get_individual(i).cur_x))
+		{
+			return 1;
+		}
+		x.push_back(pop.get_individual(i).cur_x);
+	}
+	// Every decision vector of the batch is counted as an evaluation, as the caches are not used.
+	const unsigned int fevals = prob.get_fevals(), cevals = prob.get_cevals();
+	std::vector<fitness_vector> f;
+	std::vector<constraint_vector> c;
+	prob.objfun_batch(f,x);
+	prob.compute_constraints_batch(c,x);
+	if (prob.get_fevals() != fevals + x.size() || prob.get_cevals() != cevals + x.size() || f.size() != x.size() || c.size() != x.size()) {
+		return 1;
+	}
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		if (f[i] != pop.get_individual(i).cur_f || c[i] != pop.get_individual(i).cur_c) {
+			return 1;
+		}
+	}
+	// Re-initialising all the individuals at once is reproducible.
+	population other(prob,20,11);
+	pop.reinit();
+	other.reinit();
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		if (pop.get_individual(i).cur_x != other.get_individual(i).cur_x || pop.get_individual(i).cur_f != other.get_individual(i).cur_f) {
+			return 1;
+		}
+	}
+	return 0;
+}
+
+int main() {
+	return test_batch() || test_dom_tracking() || test_nds() || test_packed() || test_objfun_batch();
+}
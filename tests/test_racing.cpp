@@ -407,6 +407,44 @@ int test_race_pop_constructor(const problem::base_ptr& prob)
 }
 
 
+/// Check that the result of a race does not depend on the number of threads
+int test_racing_threads(const problem::base_ptr& prob)
+{
+	std::cout << "Testing race with several threads" << std::endl;
+
+	unsigned int seed = 123;
+	problem::noisy prob_noisy(*prob, 1, 0, 0.5, problem::noisy::NORMAL, seed);
+	population pop(prob_noisy, 20, seed);
+
+	std::vector<population::size_type> active_set;
+	for(unsigned int i = 0; i < pop.size(); i++){
+		active_set.push_back(i);
+	}
+	util::racing::race_pop race_serial(pop, seed), race_threaded(pop, seed);
+	race_threaded.set_n_threads(4);
+	std::pair<std::vector<population::size_type>, unsigned int> res1 = race_serial.run(2, 0, 500, 0.05, active_set, race_pop::MAX_BUDGET, true, false);
+	std::pair<std::vector<population::size_type>, unsigned int> res2 = race_threaded.run(2, 0, 500, 0.05, active_set, race_pop::MAX_BUDGET, true, false);
+
+	if(res1 != res2 || race_serial.get_iteration_evals() != race_threaded.get_iteration_evals()){
+		std::cout << "\tFAILED threads: the result depends on the number of threads" << std::endl;
+		return 1;
+	}
+	if(race_threaded.get_iteration_evals().empty() || race_threaded.get_iteration_evals()[0] != pop.size() ||
+		std::accumulate(race_threaded.get_iteration_evals().begin(), race_threaded.get_iteration_evals().end(), 0u) != res2.second)
+	{
+		std::cout << "\tFAILED threads: wrong count of evaluations per iteration" << std::endl;
+		return 1;
+	}
+	if(race_serial.get_mean_fitness(res1.first) != race_threaded.get_mean_fitness(res2.first)){
+		std::cout << "\tFAILED threads: mean fitness vectors are different" << std::endl;
+		return 1;
+	}
+
+	std::cout << "\tPASSED race with several threads." << std::endl;
+	return 0;
+}
+
+
 int main()
 {
 	int dimension = 10;
@@ -446,5 +484,8 @@ int main()
 
 		   test_racing_get_mean_fitness(prob_ackley) ||
 
-		   test_race_pop_constructor(prob_ackley);
+		   test_race_pop_constructor(prob_ackley) ||
+
+		   test_racing_threads(prob_ackley) ||
+		   test_racing_threads(prob_cec2006);
 }
@@ -0,0 +1,210 @@
+/*****************************************************************************
+ *   Copyright (C) 2004-2015 The PaGMO development team,                     *
+ *   Advanced Concepts Team (ACT), European Space Agency (ESA)               *
+ *                                                                           *
+ *   https://github.com/esa/pagmo                                            *
+ *                                                                           *
+ *   act@esa.int                                                             *
+ *                                                                           *
+ *   This program is free software; you can redistribute it and/or modify    *
+ *   it under the terms of the GNU General Public License as published by    *
+ *   the Free Software Foundation; either version 2 of the License, or       *
+ *   (at your option) any later version.                                     *
+ *                                                                           *
+ *   This program is distributed in the hope that it will be useful,         *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of          *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           *
+ *   GNU General Public License for more details.                            *
+ *                                                                           *
+ *   You should have received a copy of the GNU General Public License       *
+ *   along with this program; if not, write to the                           *
+ *   Free Software Foundation, Inc.,                                         *
+ *   59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.               *
+ *****************************************************************************/
+
+// Tests for the cache of ephemerides and Lambert solutions of the trajectory problems.
+
+#include <boost/random/mersenne_twister.hpp>
+#include <boost/random/uniform_real.hpp>
+#include <boost/random/variate_generator.hpp>
+#include <cmath>
+#include <iostream>
+#include "../src/AstroToolbox/Lambert.h"
+#include "../src/AstroToolbox/Pl_Eph_An.h"
+#include "../src/population.h"
+#include "../src/problem/cassini_1.h"
+#include "../src/problem/messenger.h"
+#include "../src/problem/trajectory_cache.h"
+
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+#include <keplerian_toolbox/lambert_problem.h>
+#include <keplerian_toolbox/planet/jpl_low_precision.h>
+#include "../src/problem/mga_1dsm_alpha.h"
+#endif
+
+using namespace pagmo;
+
+static double distance(const double *a, const double *b)
+{
+	return std::sqrt((a[0] - b[0]) * (a[0] - b[0]) + (a[1] - b[1]) * (a[1] - b[1]) + (a[2] - b[2]) * (a[2] - b[2]));
+}
+
+int test_ephemerides() {
+	boost::mt19937 engine(42);
+	boost::variate_generator<boost::mt19937 &,boost::uniform_real<double> > epoch(engine,boost::uniform_real<double>(-1000.,10000.));
+	double r[3], v[3], r_ref[3], v_ref[3];
+	// Disabled by default.
+	problem::trajectory_cache::ephemerides(1234.5,3,r,v);
+	Planet_Ephemerides_Analytical(1234.5,3,r_ref,v_ref);
+	if (distance(r,r_ref) != 0 || distance(v,v_ref) != 0 || problem::trajectory_cache::get_size() != 0) {
+		return 1;
+	}
+	const double tol[] = {10.,1.};
+	for (int k = 0; k < 2; ++k) {
+		problem::trajectory_cache::set_tolerance(tol[k]);
+		for (int planet = 1; planet <= 9; ++planet) {
+			for (int i = 0; i < 1000; ++i) {
+				const double mjd2000 = epoch();
+				problem::trajectory_cache::ephemerides(mjd2000,planet,r,v);
+				Planet_Ephemerides_Analytical(mjd2000,planet,r_ref,v_ref);
+				if (distance(r,r_ref) > tol[k]) {
+					std::cout << "planet " << planet << ", epoch " << mjd2000 << ": error " << distance(r,r_ref) << " km" << std::endl;
+					return 1;
+				}
+				// The velocities are a by-product: require an accuracy well below the usual 1 m/s.
+				if (distance(v,v_ref) > 1e-3) {
+					std::cout << "planet " << planet << ", epoch " << mjd2000 << ": error " << distance(v,v_ref) << " km/s" << std::endl;
+					return 1;
+				}
+			}
+		}
+	}
+	if (problem::trajectory_cache::get_ephemerides_hits() == 0 || problem::trajectory_cache::get_ephemerides_misses() == 0) {
+		return 1;
+	}
+	problem::trajectory_cache::set_tolerance(0);
+	return 0;
+}
+
+int test_lambert() {
+	problem::trajectory_cache::set_tolerance(1.);
+	const double r1[] = {1.5e8,0.,0.}, r2[] = {0.,2.2e8,1e6}, mu = 1.32712428e11, t = 200. * 86400.;
+	double v1[3], v2[3], v1_ref[3], v2_ref[3], a, p, theta, a_ref, p_ref, theta_ref;
+	int iter, iter_ref;
+	LambertI(r1,r2,t,mu,0,v1_ref,v2_ref,a_ref,p_ref,theta_ref,iter_ref);
+	problem::trajectory_cache::lambert(r1,r2,t,mu,0,v1,v2,a,p,theta,iter);
+	if (distance(v1,v1_ref) != 0 || distance(v2,v2_ref) != 0 || a != a_ref || p != p_ref || theta != theta_ref || iter != iter_ref) {
+		return 1;
+	}
+	// Positions within the rounding step hit the stored solution, a time of flight one second longer does not.
+	const double r1_near[] = {1.5e8 + .1,0.,0.};
+	problem::trajectory_cache::lambert(r1_near,r2,t,mu,0,v1,v2,a,p,theta,iter);
+	if (distance(v1,v1_ref) != 0 || problem::trajectory_cache::get_lambert_hits() != 1 || problem::trajectory_cache::get_lambert_misses() != 1) {
+		return 1;
+	}
+	problem::trajectory_cache::lambert(r1,r2,t + 1.,mu,0,v1,v2,a,p,theta,iter);
+	// The direction of motion is part of the key.
+	problem::trajectory_cache::lambert(r1,r2,t,mu,1,v1,v2,a,p,theta,iter);
+	if (problem::trajectory_cache::get_lambert_misses() != 3) {
+		return 1;
+	}
+	// The tables are bounded.
+	problem::trajectory_cache::set_capacity(32);
+	for (int i = 0; i < 1000; ++i) {
+		const double r2_i[] = {0.,2.2e8 + 10. * i,1e6};
+		problem::trajectory_cache::lambert(r1,r2_i,t,mu,0,v1,v2,a,p,theta,iter);
+	}
+	if (problem::trajectory_cache::get_size() > 32) {
+		return 1;
+	}
+	problem::trajectory_cache::set_capacity(100000);
+	problem::trajectory_cache::set_tolerance(0);
+	return 0;
+}
+
+int test_problems() {
+	// The cached objective functions of the MGA and MGA-DSM problems are close to the reference ones.
+	problem::cassini_1 prob_1;
+	problem::messenger prob_2;
+	// Make sure the problems evaluate the decision vectors again.
+	prob_1.set_cache_capacity(0);
+	prob_2.set_cache_capacity(0);
+	const problem::base *probs[] = {&prob_1,&prob_2};
+	for (int k = 0; k < 2; ++k) {
+		population pop(*probs[k],50,7);
+		problem::trajectory_cache::set_tolerance(1.);
+		for (population::size_type i = 0; i < pop.size(); ++i) {
+			const fitness_vector f_ref = pop.get_individual(i).cur_f;
+			const fitness_vector f = probs[k]->objfun(pop.get_individual(i).cur_x);
+			if (std::abs(f[0] - f_ref[0]) > 1e-3 * std::abs(f_ref[0])) {
+				std::cout << probs[k]->get_name() << ": " << f[0] << " instead of " << f_ref[0] << std::endl;
+				return 1;
+			}
+		}
+		problem::trajectory_cache::set_tolerance(0);
+	}
+	return 0;
+}
+
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+
+int test_kep() {
+	// The keplerian_toolbox entry points work in m and m/s, the tolerance is in km.
+	boost::mt19937 engine(42);
+	boost::variate_generator<boost::mt19937 &,boost::uniform_real<double> > epoch(engine,boost::uniform_real<double>(-1000.,10000.));
+	const char *names[] = {"mercury","venus","earth","mars","jupiter"};
+	kep_toolbox::array3D r, v, r_ref, v_ref;
+	problem::trajectory_cache::set_tolerance(1.);
+	for (int k = 0; k < 5; ++k) {
+		const kep_toolbox::planet::jpl_lp planet(names[k]);
+		for (int i = 0; i < 1000; ++i) {
+			const kep_toolbox::epoch when(epoch());
+			problem::trajectory_cache::ephemerides(planet,when,r,v);
+			planet.eph(when,r_ref,v_ref);
+			if (distance(&r[0],&r_ref[0]) > 1000. || distance(&v[0],&v_ref[0]) > 1.) {
+				std::cout << names[k] << ", epoch " << when.mjd2000() << ": error " << distance(&r[0],&r_ref[0]) << " m" << std::endl;
+				return 1;
+			}
+		}
+	}
+	if (problem::trajectory_cache::get_ephemerides_hits() == 0 || problem::trajectory_cache::get_ephemerides_misses() == 0) {
+		return 1;
+	}
+	// Lambert solutions are reused for positions within the rounding step.
+	const kep_toolbox::array3D r1 = {{1.5e11,0.,0.}}, r2 = {{0.,2.2e11,1e9}}, r1_near = {{1.5e11 + 100.,0.,0.}};
+	const double mu = 1.32712428e20, t = 200. * 86400.;
+	const kep_toolbox::lambert_problem l(r1,r2,t,mu);
+	kep_toolbox::array3D v1, v2;
+	problem::trajectory_cache::lambert(r1,r2,t,mu,false,v1,v2);
+	problem::trajectory_cache::lambert(r1_near,r2,t,mu,false,v1,v2);
+	if (distance(&v1[0],&l.get_v1()[0][0]) != 0 || distance(&v2[0],&l.get_v2()[0][0]) != 0 || problem::trajectory_cache::get_lambert_hits() != 1) {
+		return 1;
+	}
+	// The cached objective function is close to the reference one.
+	problem::trajectory_cache::set_tolerance(0);
+	problem::mga_1dsm_alpha prob;
+	prob.set_cache_capacity(0);
+	population pop(prob,50,7);
+	problem::trajectory_cache::set_tolerance(1.);
+	for (population::size_type i = 0; i < pop.size(); ++i) {
+		const fitness_vector f_ref = pop.get_individual(i).cur_f;
+		const fitness_vector f = prob.objfun(pop.get_individual(i).cur_x);
+		if (std::abs(f[0] - f_ref[0]) > 1e-3 * std::abs(f_ref[0])) {
+			std::cout << prob.get_name() << ": " << f[0] << " instead of " << f_ref[0] << std::endl;
+			return 1;
+		}
+	}
+	problem::trajectory_cache::set_tolerance(0);
+	return 0;
+}
+
+#endif
+
+int main()
+{
+#ifdef PAGMO_ENABLE_KEP_TOOLBOX
+	return test_ephemerides() || test_lambert() || test_problems() || test_kep();
+#else
+	return test_ephemerides() || test_lambert() || test_problems();
+#endif
+}